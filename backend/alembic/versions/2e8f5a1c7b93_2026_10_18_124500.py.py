@@ -0,0 +1,46 @@
+"""asset_location_trigram_indexes
+
+Revision ID: 2e8f5a1c7b93
+Revises: 9c41e8b27d05
+Create Date: 2026-10-18 12:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2e8f5a1c7b93'
+down_revision: Union[str, None] = '9c41e8b27d05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ASSET_TRGM_COLUMNS = ['hostname', 'ip_address', 'mac_address', 'serial', 'dependencia', 'codigo_dependencia']
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    # unaccent() es STABLE (depende del search_path): no se puede indexar directamente.
+    # Fijando el diccionario con esquema, el envoltorio puede declararse IMMUTABLE.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION public.f_unaccent(text) RETURNS text AS $$
+            SELECT public.unaccent('public.unaccent'::regdictionary, $1)
+        $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    """)
+    for column in ASSET_TRGM_COLUMNS:
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_assets_{column}_trgm ON assets USING gin ({column} gin_trgm_ops)")
+    op.create_index('ix_assets_location_node_id', 'assets', ['location_node_id'], unique=False, if_not_exists=True)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_location_nodes_name_unaccent_trgm ON location_nodes USING gin (f_unaccent(name) gin_trgm_ops)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_location_nodes_dependency_code_trgm ON location_nodes USING gin (dependency_code gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_location_nodes_dependency_code_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_location_nodes_name_unaccent_trgm")
+    op.drop_index('ix_assets_location_node_id', table_name='assets', if_exists=True)
+    for column in ASSET_TRGM_COLUMNS:
+        op.execute(f"DROP INDEX IF EXISTS ix_assets_{column}_trgm")
+    op.execute("DROP FUNCTION IF EXISTS public.f_unaccent(text)")
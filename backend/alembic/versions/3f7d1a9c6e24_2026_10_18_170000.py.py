@@ -0,0 +1,31 @@
+"""updated_at_for_etags
+
+Revision ID: 3f7d1a9c6e24
+Revises: 5b9e2d7c4a18
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f7d1a9c6e24'
+down_revision: Union[str, None] = '5b9e2d7c4a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tablas sin marca de modificación que forman parte de un ETag (GET condicionales)
+TABLES = ('ticket_types', 'system_settings', 'sla_metrics', 'ticket_subtasks')
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_column(table, 'updated_at')
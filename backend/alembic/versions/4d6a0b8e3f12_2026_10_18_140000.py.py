@@ -0,0 +1,27 @@
+"""attachments_ticket_id_index
+
+Revision ID: 4d6a0b8e3f12
+Revises: 2e8f5a1c7b93
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d6a0b8e3f12'
+down_revision: Union[str, None] = '2e8f5a1c7b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Conteo de adjuntos por ticket en la vista summary del listado
+    op.create_index(op.f('ix_attachments_ticket_id'), 'attachments', ['ticket_id'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_attachments_ticket_id'), table_name='attachments', if_exists=True)
@@ -0,0 +1,51 @@
+"""group_closure_table
+
+Revision ID: 5a7c3e91d2b4
+Revises: c40000d870e6
+Create Date: 2026-10-18 09:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a7c3e91d2b4'
+down_revision: Union[str, None] = 'c40000d870e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'group_closure',
+        sa.Column('ancestor_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('descendant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('depth', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['ancestor_id'], ['groups.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['descendant_id'], ['groups.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id'),
+    )
+    op.create_index(op.f('ix_group_closure_descendant_id'), 'group_closure', ['descendant_id'], unique=False)
+    # Backfill desde la jerarquía actual (parent_id). El límite de profundidad
+    # protege contra ciclos preexistentes en los datos.
+    op.execute("""
+        INSERT INTO group_closure (ancestor_id, descendant_id, depth)
+        WITH RECURSIVE tree AS (
+            SELECT id AS ancestor_id, id AS descendant_id, 0 AS depth FROM groups
+            UNION ALL
+            SELECT t.ancestor_id, g.id, t.depth + 1
+            FROM tree t JOIN groups g ON g.parent_id = t.descendant_id
+            WHERE t.depth < 64
+        )
+        SELECT ancestor_id, descendant_id, MIN(depth) FROM tree
+        GROUP BY ancestor_id, descendant_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_group_closure_descendant_id'), table_name='group_closure')
+    op.drop_table('group_closure')
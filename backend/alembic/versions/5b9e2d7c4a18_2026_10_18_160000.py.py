@@ -0,0 +1,126 @@
+"""ticket_counters
+
+Revision ID: 5b9e2d7c4a18
+Revises: 8e3c5f7a2b61
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b9e2d7c4a18'
+down_revision: Union[str, None] = '8e3c5f7a2b61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FUNCTIONS = (
+    """
+    CREATE OR REPLACE FUNCTION ticket_is_siem(p_title text, p_type_id uuid, p_created_by uuid) RETURNS boolean AS $$
+    BEGIN
+        RETURN p_title ILIKE '%SOC%' OR p_title ILIKE '%SIEM%' OR p_title ILIKE '%ALERTA%'
+            OR EXISTS (SELECT 1 FROM ticket_types WHERE id = p_type_id AND name ILIKE '%SIEM%')
+            OR EXISTS (SELECT 1 FROM users WHERE id = p_created_by AND email = 'fortisiem@example.com');
+    END
+    $$ LANGUAGE plpgsql STABLE
+    """,
+    """
+    CREATE OR REPLACE FUNCTION ticket_counters_add(p_group uuid, p_status text, p_priority text, p_siem boolean, p_delta integer) RETURNS void AS $$
+    BEGIN
+        INSERT INTO ticket_counters AS c (group_id, status, priority, is_siem, count)
+        VALUES (p_group, p_status, p_priority, p_siem, p_delta)
+        ON CONFLICT (group_id, status, priority, is_siem) DO UPDATE SET count = c.count + EXCLUDED.count;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION tickets_counters_update() RETURNS trigger AS $$
+    DECLARE
+        old_siem boolean;
+        new_siem boolean;
+    BEGIN
+        IF TG_OP <> 'INSERT' AND OLD.deleted_at IS NULL THEN
+            old_siem := ticket_is_siem(OLD.title, OLD.ticket_type_id, OLD.created_by_id);
+        END IF;
+        IF TG_OP <> 'DELETE' AND NEW.deleted_at IS NULL THEN
+            new_siem := ticket_is_siem(NEW.title, NEW.ticket_type_id, NEW.created_by_id);
+        END IF;
+        IF TG_OP = 'UPDATE' AND old_siem IS NOT NULL AND new_siem IS NOT NULL
+           AND OLD.group_id IS NOT DISTINCT FROM NEW.group_id AND OLD.status IS NOT DISTINCT FROM NEW.status
+           AND OLD.priority IS NOT DISTINCT FROM NEW.priority AND old_siem = new_siem THEN
+            RETURN NULL;
+        END IF;
+        IF old_siem IS NOT NULL THEN
+            PERFORM ticket_counters_add(OLD.group_id, OLD.status, OLD.priority, old_siem, -1);
+        END IF;
+        IF new_siem IS NOT NULL THEN
+            PERFORM ticket_counters_add(NEW.group_id, NEW.status, NEW.priority, new_siem, 1);
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION ticket_counters_rebuild() RETURNS void AS $$
+    BEGIN
+        LOCK TABLE tickets IN SHARE ROW EXCLUSIVE MODE;
+        DELETE FROM ticket_counters;
+        INSERT INTO ticket_counters (group_id, status, priority, is_siem, count)
+        SELECT group_id, status, priority, ticket_is_siem(title, ticket_type_id, created_by_id), count(*)
+        FROM tickets WHERE deleted_at IS NULL
+        GROUP BY 1, 2, 3, 4;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ticket_counters',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('group_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('status', sa.String(length=50), nullable=True),
+        sa.Column('priority', sa.String(length=50), nullable=True),
+        sa.Column('is_siem', sa.Boolean(), nullable=False),
+        sa.Column('count', sa.Integer(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ux_ticket_counters_key', 'ticket_counters', ['group_id', 'status', 'priority', 'is_siem'],
+        unique=True, postgresql_nulls_not_distinct=True
+    )
+    for statement in FUNCTIONS:
+        op.execute(statement)
+    # Trigger y carga inicial bajo el mismo bloqueo: ninguna escritura queda fuera de los contadores
+    op.execute("LOCK TABLE tickets IN SHARE ROW EXCLUSIVE MODE")
+    op.execute("""
+        CREATE TRIGGER tickets_counters_trigger
+        AFTER INSERT OR DELETE OR UPDATE OF group_id, status, priority, title, ticket_type_id, created_by_id, deleted_at
+        ON tickets FOR EACH ROW EXECUTE FUNCTION tickets_counters_update()
+    """)
+    op.execute("""
+        INSERT INTO ticket_counters (group_id, status, priority, is_siem, count)
+        SELECT group_id, status, priority, ticket_is_siem(title, ticket_type_id, created_by_id), count(*)
+        FROM tickets WHERE deleted_at IS NULL
+        GROUP BY 1, 2, 3, 4
+    """)
+    op.create_index(
+        'ix_tickets_open_sla_deadline', 'tickets', ['sla_deadline'], unique=False,
+        postgresql_where=sa.text("status <> 'closed' AND deleted_at IS NULL")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tickets_open_sla_deadline', table_name='tickets')
+    op.execute("DROP TRIGGER IF EXISTS tickets_counters_trigger ON tickets")
+    op.execute("DROP FUNCTION IF EXISTS tickets_counters_update()")
+    op.execute("DROP FUNCTION IF EXISTS ticket_counters_rebuild()")
+    op.execute("DROP FUNCTION IF EXISTS ticket_counters_add(uuid, text, text, boolean, integer)")
+    op.execute("DROP FUNCTION IF EXISTS ticket_is_siem(text, uuid, uuid)")
+    op.drop_index('ux_ticket_counters_key', table_name='ticket_counters')
+    op.drop_table('ticket_counters')
@@ -0,0 +1,27 @@
+"""ticket_comments_keyset_index
+
+Revision ID: 6c2a8e4f1b37
+Revises: 3f7d1a9c6e24
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c2a8e4f1b37'
+down_revision: Union[str, None] = '3f7d1a9c6e24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Comentarios de un ticket por cursor (created_at, id) y carga incremental (since)
+    op.create_index('ix_ticket_comments_ticket_created_id', 'ticket_comments', ['ticket_id', 'created_at', 'id'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ticket_comments_ticket_created_id', table_name='ticket_comments', if_exists=True)
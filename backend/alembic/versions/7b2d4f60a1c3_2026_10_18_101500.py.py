@@ -0,0 +1,36 @@
+"""ticket_keyset_indexes
+
+Revision ID: 7b2d4f60a1c3
+Revises: 5a7c3e91d2b4
+Create Date: 2026-10-18 10:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2d4f60a1c3'
+down_revision: Union[str, None] = '5a7c3e91d2b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+KEYSET_INDEXES = {
+    'ix_tickets_created_at_id': ['created_at', 'id'],
+    'ix_tickets_status_id': ['status', 'id'],
+    'ix_tickets_priority_id': ['priority', 'id'],
+    'ix_tickets_title_id': ['title', 'id'],
+    'ix_tickets_platform_id': ['platform', 'id'],
+}
+
+
+def upgrade() -> None:
+    for name, columns in KEYSET_INDEXES.items():
+        op.create_index(name, 'tickets', columns, unique=False)
+
+
+def downgrade() -> None:
+    for name in KEYSET_INDEXES:
+        op.drop_index(name, table_name='tickets')
@@ -0,0 +1,29 @@
+"""sla_metrics_pause_columns
+
+Revision ID: 8e3c5f7a2b61
+Revises: 4d6a0b8e3f12
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e3c5f7a2b61'
+down_revision: Union[str, None] = '4d6a0b8e3f12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Estado de pausa del SLA (pending / waiting_info / on_hold)
+    op.add_column('sla_metrics', sa.Column('last_paused_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('sla_metrics', sa.Column('total_paused_seconds', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('sla_metrics', 'total_paused_seconds')
+    op.drop_column('sla_metrics', 'last_paused_at')
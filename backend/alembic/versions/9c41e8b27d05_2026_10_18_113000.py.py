@@ -0,0 +1,64 @@
+"""ticket_full_text_search
+
+Revision ID: 9c41e8b27d05
+Revises: 7b2d4f60a1c3
+Create Date: 2026-10-18 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c41e8b27d05'
+down_revision: Union[str, None] = '7b2d4f60a1c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# La descripción se recorta: los logs SIEM pegados pueden superar el límite de 1MB de tsvector
+VECTOR_EXPR = """
+    setweight(to_tsvector('public.spanish_unaccent', coalesce({row}title, '')), 'A') ||
+    setweight(to_tsvector('public.spanish_unaccent', left(coalesce({row}description, ''), 100000)), 'B')
+"""
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'spanish_unaccent') THEN
+                CREATE TEXT SEARCH CONFIGURATION public.spanish_unaccent (COPY = pg_catalog.spanish);
+                ALTER TEXT SEARCH CONFIGURATION public.spanish_unaccent
+                    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem;
+            END IF;
+        END
+        $$;
+    """)
+    op.add_column('tickets', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION tickets_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {VECTOR_EXPR.format(row='NEW.')};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER tickets_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, description ON tickets
+        FOR EACH ROW EXECUTE FUNCTION tickets_search_vector_update();
+    """)
+    op.execute(f"UPDATE tickets SET search_vector = {VECTOR_EXPR.format(row='')}")
+    op.create_index('ix_tickets_search_vector', 'tickets', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tickets_search_vector', table_name='tickets', postgresql_using='gin')
+    op.execute("DROP TRIGGER IF EXISTS tickets_search_vector_trigger ON tickets")
+    op.execute("DROP FUNCTION IF EXISTS tickets_search_vector_update()")
+    op.drop_column('tickets', 'search_vector')
+    op.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS public.spanish_unaccent")
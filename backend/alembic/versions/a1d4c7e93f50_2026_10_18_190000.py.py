@@ -0,0 +1,42 @@
+"""audit_logs_target_columns
+
+Revision ID: a1d4c7e93f50
+Revises: 6c2a8e4f1b37
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1d4c7e93f50'
+down_revision: Union[str, None] = '6c2a8e4f1b37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UUID_RE = '^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'
+
+
+def upgrade() -> None:
+    op.add_column('audit_logs', sa.Column('target_type', sa.String(length=50), nullable=True))
+    op.add_column('audit_logs', sa.Column('target_id', postgresql.UUID(as_uuid=True), nullable=True))
+    # Backfill desde details: target_type/target_id (create_log) o ticket_id (eventos de los routers)
+    op.execute(f"""
+        UPDATE audit_logs SET
+            target_type = CASE WHEN details->>'target_id' ~ '{UUID_RE}' THEN details->>'target_type' ELSE 'ticket' END,
+            target_id = CAST(CASE WHEN details->>'target_id' ~ '{UUID_RE}' THEN details->>'target_id'
+                                  ELSE details->>'ticket_id' END AS uuid)
+        WHERE details->>'target_id' ~ '{UUID_RE}' OR details->>'ticket_id' ~ '{UUID_RE}'
+    """)
+    # Después del backfill: construir el índice una vez es más barato que mantenerlo fila a fila
+    op.create_index('ix_audit_logs_target', 'audit_logs', ['target_type', 'target_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audit_logs_target', table_name='audit_logs')
+    op.drop_column('audit_logs', 'target_id')
+    op.drop_column('audit_logs', 'target_type')
@@ -0,0 +1,56 @@
+"""assets_search_outbox_columns
+
+Revision ID: a3e9b7d5c2f8
+Revises: c8d2f6a1e9b4
+Create Date: 2026-10-18 23:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3e9b7d5c2f8'
+down_revision: Union[str, None] = 'c8d2f6a1e9b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Sin last_seen (latido del agente) y sólo si algún valor cambia
+TRIGGERS = (
+    """
+    CREATE TRIGGER assets_search_outbox
+    AFTER INSERT OR DELETE ON assets FOR EACH ROW EXECUTE FUNCTION search_outbox_enqueue('assets')
+    """,
+    """
+    CREATE TRIGGER assets_search_outbox_update
+    AFTER UPDATE OF hostname, ip_address, mac_address, serial, asset_tag, codigo_dependencia, dependencia,
+        status, criticality, location_node_id, device_type, deleted_at
+    ON assets FOR EACH ROW
+    WHEN ((OLD.hostname, OLD.ip_address, OLD.mac_address, OLD.serial, OLD.asset_tag, OLD.codigo_dependencia,
+           OLD.dependencia, OLD.status, OLD.criticality, OLD.location_node_id, OLD.device_type, OLD.deleted_at)
+          IS DISTINCT FROM
+          (NEW.hostname, NEW.ip_address, NEW.mac_address, NEW.serial, NEW.asset_tag, NEW.codigo_dependencia,
+           NEW.dependencia, NEW.status, NEW.criticality, NEW.location_node_id, NEW.device_type, NEW.deleted_at))
+    EXECUTE FUNCTION search_outbox_enqueue('assets')
+    """,
+)
+PREVIOUS_TRIGGER = """
+    CREATE TRIGGER assets_search_outbox
+    AFTER INSERT OR DELETE OR UPDATE OF hostname, ip_address, mac_address, serial, asset_tag, status, criticality,
+        location_node_id, dependencia, codigo_dependencia, device_type, last_seen, deleted_at
+    ON assets FOR EACH ROW EXECUTE FUNCTION search_outbox_enqueue('assets')
+"""
+
+
+def upgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS assets_search_outbox ON assets")
+    for trigger in TRIGGERS:
+        op.execute(trigger)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS assets_search_outbox_update ON assets")
+    op.execute("DROP TRIGGER IF EXISTS assets_search_outbox ON assets")
+    op.execute(PREVIOUS_TRIGGER)
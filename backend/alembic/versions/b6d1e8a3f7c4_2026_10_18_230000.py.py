@@ -0,0 +1,46 @@
+"""search_scope_fields
+
+Revision ID: b6d1e8a3f7c4
+Revises: f4a9c3e7d2b8
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d1e8a3f7c4'
+down_revision: Union[str, None] = 'f4a9c3e7d2b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGGER = """
+    CREATE TRIGGER tickets_search_outbox
+    AFTER INSERT OR DELETE OR UPDATE OF title, description, status, priority, group_id, owner_group_id,
+        assigned_to_id, created_by_id, ticket_type_id, is_global, is_private, deleted_at
+    ON tickets FOR EACH ROW EXECUTE FUNCTION search_outbox_enqueue('tickets')
+"""
+PREVIOUS_TRIGGER = """
+    CREATE TRIGGER tickets_search_outbox
+    AFTER INSERT OR DELETE OR UPDATE OF title, description, status, priority, group_id, assigned_to_id,
+        created_by_id, ticket_type_id, is_global, deleted_at
+    ON tickets FOR EACH ROW EXECUTE FUNCTION search_outbox_enqueue('tickets')
+"""
+
+
+def upgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS tickets_search_outbox ON tickets")
+    op.execute(TRIGGER)
+    # Los documentos ya indexados no tienen owner_group_id / is_private: el outbox los reenvía
+    op.execute(
+        "INSERT INTO search_outbox (index_name, document_id) "
+        "SELECT 'tickets', id::text FROM tickets WHERE deleted_at IS NULL ORDER BY id"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS tickets_search_outbox ON tickets")
+    op.execute(PREVIOUS_TRIGGER)
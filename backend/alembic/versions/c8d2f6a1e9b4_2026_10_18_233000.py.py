@@ -0,0 +1,262 @@
+"""ticket_counters_siem_flags
+
+Revision ID: c8d2f6a1e9b4
+Revises: b6d1e8a3f7c4
+Create Date: 2026-10-18 23:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8d2f6a1e9b4'
+down_revision: Union[str, None] = 'b6d1e8a3f7c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# is_siem se separa en las dos definiciones previas: created_by_siem (usuario de
+# siem_configuration, /tickets/stats) y title_or_type_siem (título o tipo, dashboard)
+FUNCTIONS = (
+    """
+    CREATE OR REPLACE FUNCTION ticket_created_by_siem(p_created_by uuid) RETURNS boolean AS $$
+    BEGIN
+        RETURN EXISTS (SELECT 1 FROM siem_configuration WHERE siem_user_id = p_created_by);
+    END
+    $$ LANGUAGE plpgsql STABLE
+    """,
+    """
+    CREATE OR REPLACE FUNCTION ticket_title_is_siem(p_title text) RETURNS boolean AS $$
+    BEGIN
+        RETURN COALESCE(p_title ILIKE '%SOC%' OR p_title ILIKE '%SIEM%' OR p_title ILIKE '%ALERTA%', false);
+    END
+    $$ LANGUAGE plpgsql IMMUTABLE
+    """,
+    """
+    CREATE OR REPLACE FUNCTION ticket_title_or_type_siem(p_title text, p_type_id uuid) RETURNS boolean AS $$
+    BEGIN
+        RETURN ticket_title_is_siem(p_title)
+            OR EXISTS (SELECT 1 FROM ticket_types WHERE id = p_type_id AND name ILIKE '%SIEM%');
+    END
+    $$ LANGUAGE plpgsql STABLE
+    """,
+    """
+    CREATE OR REPLACE FUNCTION ticket_counters_add(
+        p_group uuid, p_status text, p_priority text, p_by_siem boolean, p_title_siem boolean, p_delta integer
+    ) RETURNS void AS $$
+    BEGIN
+        INSERT INTO ticket_counters AS c (group_id, status, priority, created_by_siem, title_or_type_siem, count)
+        VALUES (p_group, p_status, p_priority, p_by_siem, p_title_siem, p_delta)
+        ON CONFLICT (group_id, status, priority, created_by_siem, title_or_type_siem)
+        DO UPDATE SET count = c.count + EXCLUDED.count;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION tickets_counters_update() RETURNS trigger AS $$
+    DECLARE
+        old_by boolean;
+        old_title boolean;
+        new_by boolean;
+        new_title boolean;
+    BEGIN
+        IF TG_OP <> 'INSERT' AND OLD.deleted_at IS NULL THEN
+            old_by := ticket_created_by_siem(OLD.created_by_id);
+            old_title := ticket_title_or_type_siem(OLD.title, OLD.ticket_type_id);
+        END IF;
+        IF TG_OP <> 'DELETE' AND NEW.deleted_at IS NULL THEN
+            new_by := ticket_created_by_siem(NEW.created_by_id);
+            new_title := ticket_title_or_type_siem(NEW.title, NEW.ticket_type_id);
+        END IF;
+        IF TG_OP = 'UPDATE' AND old_by IS NOT NULL AND new_by IS NOT NULL
+           AND OLD.group_id IS NOT DISTINCT FROM NEW.group_id AND OLD.status IS NOT DISTINCT FROM NEW.status
+           AND OLD.priority IS NOT DISTINCT FROM NEW.priority AND old_by = new_by AND old_title = new_title THEN
+            RETURN NULL;
+        END IF;
+        IF old_by IS NOT NULL THEN
+            PERFORM ticket_counters_add(OLD.group_id, OLD.status, OLD.priority, old_by, old_title, -1);
+        END IF;
+        IF new_by IS NOT NULL THEN
+            PERFORM ticket_counters_add(NEW.group_id, NEW.status, NEW.priority, new_by, new_title, 1);
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION ticket_counters_rebuild() RETURNS void AS $$
+    BEGIN
+        LOCK TABLE tickets IN SHARE ROW EXCLUSIVE MODE;
+        DELETE FROM ticket_counters;
+        INSERT INTO ticket_counters (group_id, status, priority, created_by_siem, title_or_type_siem, count)
+        SELECT group_id, status, priority, ticket_created_by_siem(created_by_id),
+            ticket_title_or_type_siem(title, ticket_type_id), count(*)
+        FROM tickets WHERE deleted_at IS NULL
+        GROUP BY 1, 2, 3, 4, 5;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION ticket_types_counters_update() RETURNS trigger AS $$
+    DECLARE
+        old_siem boolean;
+        new_siem boolean;
+        r record;
+    BEGIN
+        old_siem := COALESCE(OLD.name ILIKE '%SIEM%', false);
+        new_siem := COALESCE(NEW.name ILIKE '%SIEM%', false);
+        IF old_siem = new_siem THEN
+            RETURN NULL;
+        END IF;
+        LOCK TABLE tickets IN SHARE ROW EXCLUSIVE MODE;
+        FOR r IN
+            SELECT group_id, status, priority, ticket_created_by_siem(created_by_id) AS by_siem, count(*)::integer AS n
+            FROM tickets
+            WHERE ticket_type_id = NEW.id AND deleted_at IS NULL AND NOT ticket_title_is_siem(title)
+            GROUP BY 1, 2, 3, 4
+        LOOP
+            PERFORM ticket_counters_add(r.group_id, r.status, r.priority, r.by_siem, old_siem, -r.n);
+            PERFORM ticket_counters_add(r.group_id, r.status, r.priority, r.by_siem, new_siem, r.n);
+        END LOOP;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION siem_configuration_counters_update() RETURNS trigger AS $$
+    BEGIN
+        PERFORM ticket_counters_rebuild();
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+)
+TRIGGERS = (
+    """
+    CREATE TRIGGER tickets_counters_trigger
+    AFTER INSERT OR DELETE OR UPDATE OF group_id, status, priority, title, ticket_type_id, created_by_id, deleted_at
+    ON tickets FOR EACH ROW EXECUTE FUNCTION tickets_counters_update()
+    """,
+    """
+    CREATE TRIGGER ticket_types_counters_trigger
+    AFTER UPDATE OF name ON ticket_types
+    FOR EACH ROW EXECUTE FUNCTION ticket_types_counters_update()
+    """,
+    """
+    CREATE TRIGGER siem_configuration_counters_trigger
+    AFTER INSERT OR DELETE OR UPDATE OF siem_user_id ON siem_configuration
+    FOR EACH STATEMENT EXECUTE FUNCTION siem_configuration_counters_update()
+    """,
+)
+PREVIOUS_FUNCTIONS = (
+    """
+    CREATE OR REPLACE FUNCTION ticket_is_siem(p_title text, p_type_id uuid, p_created_by uuid) RETURNS boolean AS $$
+    BEGIN
+        RETURN p_title ILIKE '%SOC%' OR p_title ILIKE '%SIEM%' OR p_title ILIKE '%ALERTA%'
+            OR EXISTS (SELECT 1 FROM ticket_types WHERE id = p_type_id AND name ILIKE '%SIEM%')
+            OR EXISTS (SELECT 1 FROM users WHERE id = p_created_by AND email = 'fortisiem@example.com');
+    END
+    $$ LANGUAGE plpgsql STABLE
+    """,
+    """
+    CREATE OR REPLACE FUNCTION ticket_counters_add(p_group uuid, p_status text, p_priority text, p_siem boolean, p_delta integer) RETURNS void AS $$
+    BEGIN
+        INSERT INTO ticket_counters AS c (group_id, status, priority, is_siem, count)
+        VALUES (p_group, p_status, p_priority, p_siem, p_delta)
+        ON CONFLICT (group_id, status, priority, is_siem) DO UPDATE SET count = c.count + EXCLUDED.count;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION tickets_counters_update() RETURNS trigger AS $$
+    DECLARE
+        old_siem boolean;
+        new_siem boolean;
+    BEGIN
+        IF TG_OP <> 'INSERT' AND OLD.deleted_at IS NULL THEN
+            old_siem := ticket_is_siem(OLD.title, OLD.ticket_type_id, OLD.created_by_id);
+        END IF;
+        IF TG_OP <> 'DELETE' AND NEW.deleted_at IS NULL THEN
+            new_siem := ticket_is_siem(NEW.title, NEW.ticket_type_id, NEW.created_by_id);
+        END IF;
+        IF TG_OP = 'UPDATE' AND old_siem IS NOT NULL AND new_siem IS NOT NULL
+           AND OLD.group_id IS NOT DISTINCT FROM NEW.group_id AND OLD.status IS NOT DISTINCT FROM NEW.status
+           AND OLD.priority IS NOT DISTINCT FROM NEW.priority AND old_siem = new_siem THEN
+            RETURN NULL;
+        END IF;
+        IF old_siem IS NOT NULL THEN
+            PERFORM ticket_counters_add(OLD.group_id, OLD.status, OLD.priority, old_siem, -1);
+        END IF;
+        IF new_siem IS NOT NULL THEN
+            PERFORM ticket_counters_add(NEW.group_id, NEW.status, NEW.priority, new_siem, 1);
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION ticket_counters_rebuild() RETURNS void AS $$
+    BEGIN
+        LOCK TABLE tickets IN SHARE ROW EXCLUSIVE MODE;
+        DELETE FROM ticket_counters;
+        INSERT INTO ticket_counters (group_id, status, priority, is_siem, count)
+        SELECT group_id, status, priority, ticket_is_siem(title, ticket_type_id, created_by_id), count(*)
+        FROM tickets WHERE deleted_at IS NULL
+        GROUP BY 1, 2, 3, 4;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+)
+PREVIOUS_TRIGGER = """
+    CREATE TRIGGER tickets_counters_trigger
+    AFTER INSERT OR DELETE OR UPDATE OF group_id, status, priority, title, ticket_type_id, created_by_id, deleted_at
+    ON tickets FOR EACH ROW EXECUTE FUNCTION tickets_counters_update()
+"""
+
+
+def upgrade() -> None:
+    op.execute("LOCK TABLE tickets IN SHARE ROW EXCLUSIVE MODE")
+    op.execute("DROP TRIGGER IF EXISTS tickets_counters_trigger ON tickets")
+    op.execute("DROP FUNCTION IF EXISTS ticket_counters_add(uuid, text, text, boolean, integer)")
+    op.execute("DROP FUNCTION IF EXISTS ticket_is_siem(text, uuid, uuid)")
+    op.drop_index('ux_ticket_counters_key', table_name='ticket_counters')
+    op.drop_column('ticket_counters', 'is_siem')
+    op.add_column('ticket_counters', sa.Column('created_by_siem', sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.add_column('ticket_counters', sa.Column('title_or_type_siem', sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.create_index(
+        'ux_ticket_counters_key', 'ticket_counters',
+        ['group_id', 'status', 'priority', 'created_by_siem', 'title_or_type_siem'],
+        unique=True, postgresql_nulls_not_distinct=True
+    )
+    for statement in FUNCTIONS:
+        op.execute(statement)
+    for statement in TRIGGERS:
+        op.execute(statement)
+    op.execute("SELECT ticket_counters_rebuild()")
+
+
+def downgrade() -> None:
+    op.execute("LOCK TABLE tickets IN SHARE ROW EXCLUSIVE MODE")
+    op.execute("DROP TRIGGER IF EXISTS siem_configuration_counters_trigger ON siem_configuration")
+    op.execute("DROP TRIGGER IF EXISTS ticket_types_counters_trigger ON ticket_types")
+    op.execute("DROP TRIGGER IF EXISTS tickets_counters_trigger ON tickets")
+    op.execute("DROP FUNCTION IF EXISTS siem_configuration_counters_update()")
+    op.execute("DROP FUNCTION IF EXISTS ticket_types_counters_update()")
+    op.execute("DROP FUNCTION IF EXISTS ticket_counters_add(uuid, text, text, boolean, boolean, integer)")
+    op.execute("DROP FUNCTION IF EXISTS ticket_title_or_type_siem(text, uuid)")
+    op.execute("DROP FUNCTION IF EXISTS ticket_title_is_siem(text)")
+    op.execute("DROP FUNCTION IF EXISTS ticket_created_by_siem(uuid)")
+    op.drop_index('ux_ticket_counters_key', table_name='ticket_counters')
+    op.drop_column('ticket_counters', 'title_or_type_siem')
+    op.drop_column('ticket_counters', 'created_by_siem')
+    op.add_column('ticket_counters', sa.Column('is_siem', sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.create_index(
+        'ux_ticket_counters_key', 'ticket_counters', ['group_id', 'status', 'priority', 'is_siem'],
+        unique=True, postgresql_nulls_not_distinct=True
+    )
+    for statement in PREVIOUS_FUNCTIONS:
+        op.execute(statement)
+    op.execute(PREVIOUS_TRIGGER)
+    op.execute("SELECT ticket_counters_rebuild()")
@@ -0,0 +1,54 @@
+"""export_jobs
+
+Revision ID: d3b8f1e6a2c9
+Revises: a1d4c7e93f50
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3b8f1e6a2c9'
+down_revision: Union[str, None] = 'a1d4c7e93f50'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'export_jobs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('kind', sa.String(length=50), nullable=False),
+        sa.Column('format', sa.String(length=20), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('filters', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('progress_rows', sa.Integer(), nullable=False),
+        sa.Column('total_rows', sa.Integer(), nullable=True),
+        sa.Column('file_path', sa.String(length=500), nullable=True),
+        sa.Column('filename', sa.String(length=255), nullable=True),
+        sa.Column('media_type', sa.String(length=255), nullable=True),
+        sa.Column('size_bytes', sa.BigInteger(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_export_jobs_user_status', 'export_jobs', ['user_id', 'status', 'created_at'], unique=False)
+    op.create_index(op.f('ix_export_jobs_status'), 'export_jobs', ['status'], unique=False)
+    op.create_index(op.f('ix_export_jobs_expires_at'), 'export_jobs', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_export_jobs_expires_at'), table_name='export_jobs')
+    op.drop_index(op.f('ix_export_jobs_status'), table_name='export_jobs')
+    op.drop_index('ix_export_jobs_user_status', table_name='export_jobs')
+    op.drop_table('export_jobs')
@@ -0,0 +1,46 @@
+"""search_reindex_runs
+
+Revision ID: e7c2a9d4b1f6
+Revises: d3b8f1e6a2c9
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c2a9d4b1f6'
+down_revision: Union[str, None] = 'd3b8f1e6a2c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'search_reindex_runs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('index_name', sa.String(length=50), nullable=False),
+        sa.Column('shadow_index', sa.String(length=100), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('started_by_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('total_rows', sa.Integer(), nullable=True),
+        sa.Column('indexed_rows', sa.Integer(), nullable=False),
+        sa.Column('rows_per_second', sa.Float(), nullable=True),
+        sa.Column('checkpoint', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['started_by_id'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_search_reindex_runs_index_started', 'search_reindex_runs', ['index_name', 'started_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_search_reindex_runs_index_started', table_name='search_reindex_runs')
+    op.drop_table('search_reindex_runs')
@@ -0,0 +1,66 @@
+"""search_outbox
+
+Revision ID: f4a9c3e7d2b8
+Revises: e7c2a9d4b1f6
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a9c3e7d2b8'
+down_revision: Union[str, None] = 'e7c2a9d4b1f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FUNCTION = """
+    CREATE OR REPLACE FUNCTION search_outbox_enqueue() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            INSERT INTO search_outbox (index_name, document_id) VALUES (TG_ARGV[0], OLD.id::text);
+        ELSE
+            INSERT INTO search_outbox (index_name, document_id) VALUES (TG_ARGV[0], NEW.id::text);
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+"""
+TRIGGERS = (
+    """
+    CREATE TRIGGER tickets_search_outbox
+    AFTER INSERT OR DELETE OR UPDATE OF title, description, status, priority, group_id, assigned_to_id,
+        created_by_id, ticket_type_id, is_global, deleted_at
+    ON tickets FOR EACH ROW EXECUTE FUNCTION search_outbox_enqueue('tickets')
+    """,
+    """
+    CREATE TRIGGER assets_search_outbox
+    AFTER INSERT OR DELETE OR UPDATE OF hostname, ip_address, mac_address, serial, asset_tag, status, criticality,
+        location_node_id, dependencia, codigo_dependencia, device_type, last_seen, deleted_at
+    ON assets FOR EACH ROW EXECUTE FUNCTION search_outbox_enqueue('assets')
+    """,
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'search_outbox',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('index_name', sa.String(length=50), nullable=False),
+        sa.Column('document_id', sa.String(length=64), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.execute(FUNCTION)
+    for trigger in TRIGGERS:
+        op.execute(trigger)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS assets_search_outbox ON assets")
+    op.execute("DROP TRIGGER IF EXISTS tickets_search_outbox ON tickets")
+    op.execute("DROP FUNCTION IF EXISTS search_outbox_enqueue()")
+    op.drop_table('search_outbox')
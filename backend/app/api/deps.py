@@ -10,11 +10,12 @@ from app.db.session import AsyncSessionLocal
 from app.core.config import settings
 from app.db.models import User
 from app.db.models.iam import UserRole, Role, RolePermission, Permission
-from app.db.models.ticket import Ticket as TicketModel
+from app.db.models.ticket import Ticket as TicketModel, TicketWatcher
 from app.db.models.asset import Asset
 from app.db.models.endpoint import Endpoint as EndpointModel
 from app.db.models.notifications import Attachment as AttachmentModel
 from app.services.group_service import group_service
+from app.services.principal_cache import principal_cache
 # Custom Bearer scheme
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 logger = logging.getLogger(__name__)
@@ -72,6 +73,11 @@ async def get_current_user(
         is_security_token = any(s in token_scopes for s in ["password:change", "2fa:reset", "2fa:verify"])
         if is_session_token:
             if session_id is None: raise credentials_exception
+            # Hit en caché de principales: cero consultas a la base
+            cached_user = await principal_cache.get(db, UUID(session_id))
+            if cached_user is not None:
+                if str(cached_user.id) != user_id: raise credentials_exception
+                return cached_user
             session = await crud_session.session.get_session_by_id(db, session_id=UUID(session_id))
             if not session or not session.is_active: raise credentials_exception
             query = (
@@ -84,6 +90,7 @@ async def get_current_user(
             result = await db.execute(query)
             user = result.scalar_one_or_none()
             if user is None or user.id != session.user_id: raise credentials_exception
+            await principal_cache.set(user, session.id)
             return user
         elif is_security_token:
             query = (
@@ -154,6 +161,60 @@ async def get_current_superuser(
     if not current_user.is_superuser: raise HTTPException(status_code=403, detail="Solo superusuarios")
     return current_user
 # --- Object Level Dependencies (Ticket, Endpoint, Attachment) ---
+async def load_ticket_detail(db: AsyncSession, ticket_id: UUID) -> Optional[TicketModel]:
+    """Ticket con las relaciones que serializa el detalle (schemas.ticket.Ticket)."""
+    query = (
+        select(TicketModel)
+        .where(TicketModel.id == ticket_id)
+        .options(
+            selectinload(TicketModel.group),
+            selectinload(TicketModel.assigned_to),
+            selectinload(TicketModel.created_by),
+            selectinload(TicketModel.ticket_type),
+            selectinload(TicketModel.asset).selectinload(Asset.location),
+            selectinload(TicketModel.assets).selectinload(Asset.location),
+            selectinload(TicketModel.location),
+            selectinload(TicketModel.sla_metric),
+            selectinload(TicketModel.attachments),
+            selectinload(TicketModel.watchers).selectinload(TicketWatcher.user)
+        )
+    )
+    result = await db.execute(query)
+    return result.scalar_one_or_none()
+async def authorize_ticket(db: AsyncSession, current_user: User, ticket, action: str) -> None:
+    """
+    Chequeo de alcance sobre `ticket` (modelo o fila con group_id, owner_group_id,
+    assigned_to_id, created_by_id e is_global). Lanza 403 si no hay acceso.
+    """
+    if current_user.is_superuser: return
+    # Si el ticket es global, cualquier usuario activo puede leerlo
+    if action == "read" and ticket.is_global:
+        return
+    # Capability Mapping: alcances concedidos para ticket:<action>, resueltos una sola vez
+    # None = permiso MASTER (e.g. ticket:comment)
+    scopes = current_user.permission_index.scopes("ticket", action)
+    if None in scopes or "global" in scopes:
+        return
+    # GROUP capability
+    if "group" in scopes:
+        # Check if ticket is in user's group hierarchy
+        if ticket.group_id == current_user.group_id or ticket.owner_group_id == current_user.group_id:
+            return
+        # Check subgroups
+        child_ids = await group_service.get_all_child_group_ids(db, current_user.group_id)
+        if ticket.group_id in child_ids or ticket.owner_group_id in child_ids:
+            return
+    # ASSIGNED capability (Specific for Update/Read)
+    if "assigned" in scopes and ticket.assigned_to_id == current_user.id:
+        return
+    # OWN capability (Specific for Read/Update)
+    if "own" in scopes:
+        # 'own' usually means 'created by me' or 'assigned to me' for reading
+        if ticket.created_by_id == current_user.id:
+            return
+        if action == 'read' and ticket.assigned_to_id == current_user.id:
+            return
+    raise HTTPException(status_code=403, detail="No tienes acceso a este ticket (Scope Restriction)")
 def require_ticket_permission(action: str):
     """
     Validates granular permissions for a specific ticket.
@@ -164,67 +225,37 @@ def require_ticket_permission(action: str):
         db: Annotated[AsyncSession, Depends(get_db)],
         current_user: Annotated[User, Depends(get_current_active_user)],
     ) -> TicketModel:
-        from app.crud import crud_ticket # LOCAL IMPORT
         # 1. Cargar ticket con relaciones necesarias
-        query = (
-            select(TicketModel)
-            .where(TicketModel.id == ticket_id)
-            .options(
-                selectinload(TicketModel.group),
-                selectinload(TicketModel.assigned_to),
-                selectinload(TicketModel.created_by),
-                selectinload(TicketModel.ticket_type),
-                selectinload(TicketModel.asset).selectinload(Asset.location),
-                selectinload(TicketModel.assets).selectinload(Asset.location),
-                selectinload(TicketModel.location),
-                selectinload(TicketModel.sla_metric),
-                selectinload(TicketModel.attachments),
-                selectinload(TicketModel.watchers)
-            )
-        )
-        result = await db.execute(query)
-        ticket = result.scalar_one_or_none()
-        
+        ticket = await load_ticket_detail(db, ticket_id)
         # Si el ticket no existe, no lanzamos 404 aquí, dejamos que el router decida
         if not ticket:
             return None
-            
-        if current_user.is_superuser: return ticket
-
-        # Si el ticket es global, cualquier usuario activo puede leerlo
-        if action == "read" and ticket.is_global:
-            return ticket
-
-        # Capability Mapping
-        # We check for:
-        # 0. MASTER action permission (e.g. ticket:comment)
-        if current_user.has_permission(f"ticket:{action}"):
-            return ticket
-        # 1. Check GLOBAL capability
-        if current_user.has_permission(f"ticket:{action}:global"):
-            return ticket
-        # 2. Check GROUP capability
-        if current_user.has_permission(f"ticket:{action}:group"):
-            # Check if ticket is in user's group hierarchy
-            if ticket.group_id == current_user.group_id or ticket.owner_group_id == current_user.group_id:
-                return ticket
-            # Check subgroups
-            child_ids = await group_service.get_all_child_group_ids(db, current_user.group_id)
-            if ticket.group_id in child_ids or ticket.owner_group_id in child_ids:
-                return ticket
-        # 3. Check ASSIGNED capability (Specific for Update/Read)
-        if current_user.has_permission(f"ticket:{action}:assigned"):
-            if ticket.assigned_to_id == current_user.id:
-                return ticket
-        # 4. Check OWN capability (Specific for Read/Update)
-        if current_user.has_permission(f"ticket:{action}:own"):
-            # 'own' usually means 'created by me' or 'assigned to me' for reading
-            if ticket.created_by_id == current_user.id:
-                return ticket
-            if action == 'read' and ticket.assigned_to_id == current_user.id:
-                return ticket
-        raise HTTPException(status_code=403, detail="No tienes acceso a este ticket (Scope Restriction)")
+        await authorize_ticket(db, current_user, ticket, action)
+        return ticket
     return _ticket_permission_checker
+def require_ticket_access(action: str):
+    """
+    Como require_ticket_permission pero sin cargar el grafo del ticket: para endpoints
+    que sólo necesitan autorizar (paneles paginados, polling). Devuelve las columnas de
+    acceso y lanza 404 si el ticket no existe.
+    """
+    async def _ticket_access_checker(
+        ticket_id: UUID,
+        db: Annotated[AsyncSession, Depends(get_db)],
+        current_user: Annotated[User, Depends(get_current_active_user)],
+    ):
+        result = await db.execute(
+            select(
+                TicketModel.id, TicketModel.group_id, TicketModel.owner_group_id,
+                TicketModel.assigned_to_id, TicketModel.created_by_id, TicketModel.is_global
+            ).where(TicketModel.id == ticket_id)
+        )
+        ticket = result.first()
+        if not ticket:
+            raise HTTPException(status_code=404, detail="Ticket no encontrado")
+        await authorize_ticket(db, current_user, ticket, action)
+        return ticket
+    return _ticket_access_checker
 def require_endpoint_permission(level: str):
     async def _checker(
         endpoint_id: UUID,
@@ -1,6 +1,6 @@
 from typing import List, Optional, Dict, Any, Annotated
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Body, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Body, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from app.api.deps import get_db, require_permission, get_current_active_user
@@ -12,6 +12,8 @@ from app.crud.crud_asset import asset as crud_asset
 from app.crud import crud_audit
 from app.db.models.user import User
 from app.services.group_service import group_service
+from app.services.count_service import count_service
+from app.core.etag import child_version, etag_matches, make_etag, not_modified, set_etag
 from datetime import datetime
 import re
 router = APIRouter()
@@ -25,6 +27,19 @@ class BulkActionRequest(BaseModel):
     location_node_id: Optional[UUID] = None
     status: Optional[str] = None
     criticality: Optional[str] = None
+def _asset_substring_filter(term: str, asset_columns, location_match):
+    """
+    OR de ILIKE '%term%' resuelto sólo sobre columnas de assets: cada rama usa su
+    índice trigram (BitmapOr) y la coincidencia de ubicación entra como
+    location_node_id IN (subconsulta indexada) en lugar de filtrar sobre el JOIN.
+    """
+    from app.db.models.asset import Asset as AssetModel
+    from app.db.models.location import LocationNode
+    pattern = f"%{term}%"
+    return or_(
+        *[column.ilike(pattern) for column in asset_columns],
+        AssetModel.location_node_id.in_(sa_select(LocationNode.id).where(location_match(pattern))),
+    )
 @router.get(
     "/search", 
     response_model=Dict[str, List[Any]]
@@ -67,7 +82,7 @@ async def search_inventory(
                 "status": a.status
             })
     else:
-        # Fallback SQL
+        # Fallback SQL (todas las columnas con índice trigram ix_assets_*_trgm)
         search_filter = f"%{search}%"
         query_assets = sa_select(AssetModel, LocationNode.name.label("loc_name")).outerjoin(
             LocationNode, AssetModel.location_node_id == LocationNode.id
@@ -213,6 +228,7 @@ class AssetsPaginated(BaseModel):
     page: int
     size: int
     pages: int
+    total_exact: bool = True
 @router.get(
     "", 
     response_model=AssetsPaginated
@@ -230,6 +246,7 @@ async def read_assets(
     av_product: Optional[str] = Query(None),
     sort_by: str = Query("hostname"),
     order: str = Query("asc"),
+    count_mode: Optional[str] = Query(None, pattern="^(exact|estimated|auto)$"),
 ):
     from app.db.models.asset import Asset as AssetModel
     from app.db.models.location import LocationNode
@@ -263,8 +280,10 @@ async def read_assets(
             # Búsqueda específica por Código de Dependencia
             code_search = search[1:].strip()
             query = query.filter(
-                (AssetModel.codigo_dependencia.ilike(f"%{code_search}%")) |
-                (LocationNode.dependency_code.ilike(f"%{code_search}%"))
+                _asset_substring_filter(
+                    code_search, [AssetModel.codigo_dependencia],
+                    lambda pattern: LocationNode.dependency_code.ilike(pattern),
+                )
             )
         else:
             # Intentar búsqueda en Meilisearch para mayor precisión (Hostname, MAC, etc)
@@ -275,14 +294,13 @@ async def read_assets(
                 query = query.filter(AssetModel.id.in_(asset_ids))
             else:
                 # Fallback a búsqueda SQL si Meilisearch no devuelve nada o falla
-                search_filter = f"%{search}%"
                 query = query.filter(
-                    (AssetModel.hostname.ilike(search_filter)) |
-                    (AssetModel.ip_address.ilike(search_filter)) |
-                    (AssetModel.mac_address.ilike(search_filter)) |
-                    (AssetModel.dependencia.ilike(search_filter)) |
-                    (AssetModel.serial.ilike(search_filter)) |
-                    (LocationNode.name.ilike(search_filter))
+                    _asset_substring_filter(
+                        search,
+                        [AssetModel.hostname, AssetModel.ip_address, AssetModel.mac_address,
+                         AssetModel.dependencia, AssetModel.serial],
+                        lambda pattern: func.f_unaccent(LocationNode.name).ilike(func.f_unaccent(pattern)),
+                    )
                 )
 
     # Ordenamiento
@@ -299,10 +317,14 @@ async def read_assets(
     else:
         query = query.order_by(column.asc())
 
-    # Count total
-    total_query = sa_select(func.count()).select_from(query.subquery())
-    total_res = await db.execute(total_query)
-    total = total_res.scalar_one()
+    # Count total (exacto o estimado según count_mode / COUNT_MODE_ASSETS)
+    total, total_exact = await count_service.count(
+        db, query, endpoint="assets", tables=("assets", "location_nodes"), mode=count_mode,
+        filters={
+            "location_node_id": location_node_id, "show_decommissioned": show_decommissioned,
+            "search": search, "status": status, "device_type": device_type, "av_product": av_product,
+        },
+    )
     
     result = await db.execute(query.offset(skip).limit(size))
     rows = result.all()
@@ -330,7 +352,8 @@ async def read_assets(
         "total": total,
         "page": page,
         "size": size,
-        "pages": math.ceil(total / size) if total > 0 else 0
+        "pages": math.ceil(total / size) if total > 0 else 0,
+        "total_exact": total_exact,
     }
 @router.get(
     "/{asset_id}", 
@@ -338,14 +361,32 @@ async def read_assets(
 )
 async def read_asset(
     asset_id: UUID,
+    request: Request,
+    response: Response,
     db: Annotated[AsyncSession, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)]
 ):
-    from app.db.models.asset import Asset as AssetModel
+    from app.db.models.asset import Asset as AssetModel, asset_expedientes
     from app.db.models.user import User as UserModel
     from app.db.models.location import LocationNode
-    from app.db.models.asset_history import AssetEventLog
+    from app.db.models.asset_history import AssetEventLog, AssetInstallRecord, AssetIPHistory, AssetLocationHistory
     from sqlalchemy.orm import selectinload
+    # Consulta de versión (ETag): updated_at + count/max de cada historial, sin cargar el grafo
+    version_query = sa_select(
+        AssetModel.id, AssetModel.created_at, AssetModel.updated_at,
+        *child_version(AssetEventLog, AssetEventLog.created_at, AssetEventLog.asset_id == asset_id),
+        *child_version(AssetInstallRecord, AssetInstallRecord.created_at, AssetInstallRecord.asset_id == asset_id),
+        *child_version(AssetIPHistory, AssetIPHistory.assigned_at, AssetIPHistory.asset_id == asset_id),
+        *child_version(AssetLocationHistory, AssetLocationHistory.created_at, AssetLocationHistory.asset_id == asset_id),
+        sa_select(func.count()).select_from(asset_expedientes).where(asset_expedientes.c.asset_id == asset_id).scalar_subquery(),
+    ).where(AssetModel.id == asset_id)
+    version = (await db.execute(version_query)).first()
+    if not version:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    etag = make_etag("asset", *version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     # Cargar el activo con TODAS sus relaciones
     query = sa_select(AssetModel).options(
         selectinload(AssetModel.location),
@@ -42,8 +42,8 @@ async def read_audit_logs(
         group_ids = await group_service.get_all_child_group_ids(db, current_user.group_id)
         query = query.join(User, AuditLog.user_id == User.id).filter(User.group_id.in_(group_ids))
     if ticket_id:
-        # Filtrar logs donde el ticket_id esté dentro del campo JSONB details
-        query = query.filter(AuditLog.details["ticket_id"].astext == str(ticket_id))
+        # Columnas indexadas (ix_audit_logs_target), no el JSONB details
+        query = query.filter(AuditLog.target_type == "ticket", AuditLog.target_id == ticket_id)
     result = await db.execute(
         query.order_by(AuditLog.created_at.desc()).offset(skip).limit(limit)
     )
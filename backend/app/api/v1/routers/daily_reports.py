@@ -20,6 +20,7 @@ from app.db.models import User, Group
 from app.schemas.daily_report import DailyReportCreate, DailyReport as DailyReportSchema, DailyReportUpdate
 from app.utils.security import safe_join, sanitize_filename
 from app.services.report_generator import report_generator
+from app.services.count_service import count_service
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -35,6 +36,7 @@ class DailyReportList(BaseModel):
     page: int
     size: int
     pages: int
+    total_exact: bool = True
 
 @router.get("/", response_model=DailyReportList)
 async def read_daily_reports(
@@ -43,7 +45,8 @@ async def read_daily_reports(
     page: int = 1,
     size: int = 20,
     shift: Optional[str] = None,
-    group_id: Optional[UUID] = None
+    group_id: Optional[UUID] = None,
+    count_mode: Optional[str] = Query(None, pattern="^(exact|estimated|auto)$")
 ):
     skip = (page - 1) * size
     query = select(DailyReport).options(selectinload(DailyReport.group))
@@ -54,10 +57,11 @@ async def read_daily_reports(
     if shift:
         query = query.filter(DailyReport.shift == shift)
             
-    # Count total
-    total_query = select(func.count()).select_from(query.subquery())
-    total_res = await db.execute(total_query)
-    total = total_res.scalar_one()
+    # Count total (exacto o estimado según count_mode / COUNT_MODE_DAILY_REPORTS)
+    total, total_exact = await count_service.count(
+        db, query, endpoint="daily_reports", tables=("daily_reports",), mode=count_mode,
+        filters={"shift": shift, "group_id": group_id},
+    )
 
     result = await db.execute(
         query.order_by(DailyReport.date.desc(), DailyReport.shift.desc())
@@ -78,7 +82,8 @@ async def read_daily_reports(
         "total": total,
         "page": page,
         "size": size,
-        "pages": math.ceil(total / size) if total > 0 else 0
+        "pages": math.ceil(total / size) if total > 0 else 0,
+        "total_exact": total_exact,
     }
 
 @router.post("/", response_model=DailyReportSchema)
@@ -212,7 +217,7 @@ async def upload_legacy_report(
     
     extracted_text = ""
     try:
-        extracted_text = report_generator.extract_text(file_path)
+        extracted_text = await report_generator.extract_text_async(file_path)
     except Exception as e:
         logger.error(f"Error extrayendo texto legacy: {e}")
 
@@ -8,7 +8,7 @@ import json
 from app.api.deps import get_db, require_permission, require_role, get_current_active_user
 from app.db.models.user import User
 from app.db.models.group import Group
-from app.db.models.ticket import Ticket, TicketType
+from app.db.models.ticket import Ticket
 from app.db.models.alert import Alert
 from app.db.models.asset import Asset
 from app.db.models.asset_history import AssetEventLog
@@ -18,10 +18,6 @@ from app.schemas.dashboard import DashboardConfig, DashboardConfigCreate, Dashbo
 from app.services.group_service import group_service
 from app.services.ai_service import ai_service
 router = APIRouter()
-# --- Helpers ---
-async def get_siem_type_ids(db: AsyncSession):
-    res = await db.execute(select(TicketType.id).where(TicketType.name.ilike('%SIEM%')))
-    return res.scalars().all()
 @router.get("/stats")
 async def get_dashboard_stats(
     db: Annotated[AsyncSession, Depends(get_db)],
@@ -30,38 +26,31 @@ async def get_dashboard_stats(
     """
     Endpoint de estadísticas unificado para el Dashboard Principal.
     """
-    # 1. Obtener IDs de tipos de ticket SIEM
-    siem_type_ids = await get_siem_type_ids(db)
-    # 2. Filtros base
-    ticket_filters = [Ticket.deleted_at == None]
+    from app.crud.crud_ticket import ticket as crud_ticket
+    # Filtros base (tickets: grupos visibles; None = todos)
+    ticket_group_ids = None
     asset_filters = [Asset.deleted_at == None]
     # Silos de visibilidad
     if not current_user.is_superuser:
-        has_assets_global = current_user.has_permission("assets:read:global")
-        has_assets_group = current_user.has_permission("assets:read:group")
+        asset_scopes = current_user.permission_index.scopes("assets", "read")
+        has_assets_global = "global" in asset_scopes
+        has_assets_group = "group" in asset_scopes
         if current_user.group_id:
             group_ids = await group_service.get_all_child_group_ids(db, current_user.group_id)
-            ticket_filters.append(Ticket.group_id.in_(group_ids))
+            ticket_group_ids = group_ids
             if not has_assets_global:
                 # Si solo tiene permiso de grupo, ve activos de su grupo o sin grupo (visibilidad compartida por ubicación)
                 asset_filters.append(or_(Asset.owner_group_id.in_(group_ids), Asset.owner_group_id == None))
         else:
-            ticket_filters.append(Ticket.id == None)
+            ticket_group_ids = []
             if not has_assets_global:
                 asset_filters.append(Asset.id == None)
-    # --- SIEM CONDITION ---
-    siem_condition = or_(
-        Ticket.ticket_type_id.in_(siem_type_ids) if siem_type_ids else False,
-        Ticket.title.ilike("%SOC%"),
-        Ticket.title.ilike("%SIEM%"),
-        Ticket.title.ilike("%ALERTA%")
-    )
-    # --- TICKETS STATS ---
-    tickets_query = select(Ticket.status, func.count(Ticket.id)).where(
-        and_(*ticket_filters, ~siem_condition)
-    ).group_by(Ticket.status)
-    res_tickets = await db.execute(tickets_query)
-    t_data = {row.status: row.count for row in res_tickets}
+    # --- TICKETS STATS (sin SIEM por título o tipo, desde ticket_counters) ---
+    t_data = {}
+    if ticket_group_ids != []:
+        for row in await crud_ticket.get_counters(db, ticket_group_ids):
+            if not row.title_or_type_siem:
+                t_data[row.status] = t_data.get(row.status, 0) + row.count
     # --- SIEM STATS (ALERTAS REALES) ---
     siem_data = {"total": 0, "remediated": 0, "in_process": 0, "open": 0, "categories": [], "severity": {}, "latest": []}
     res_siem = await db.execute(select(Alert.status, func.count(Alert.id)).group_by(Alert.status))
@@ -0,0 +1,139 @@
+"""
+Exportaciones en segundo plano (ver export_job_service): POST crea el trabajo y
+responde 202; el progreso se consulta con GET o llega por WebSocket ("export_job");
+/download sirve el archivo con soporte de Range para reanudar descargas grandes.
+"""
+import asyncio
+import os
+import re
+from typing import Annotated, List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import get_db, get_current_active_user
+from app.core.etag import make_etag
+from app.db.models import User
+from app.db.models.export_job import ExportJob as ExportJobModel
+from app.schemas.export_job import ExportJob, ExportJobCreate
+from app.services.export_job_service import export_job_service, ExportJobLimit
+router = APIRouter()
+# Permisos por tipo de exportación (alcanza con uno de la lista)
+KIND_PERMISSIONS = {
+    "tickets": ("reports:export:tickets",),
+    "assets": ("assets:read:global", "assets:read:group"),
+    "audit": ("audit:read",),
+    "daily_report": ("report:view",),
+}
+CHUNK_SIZE = 1 << 16
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+async def _get_own_job(db: AsyncSession, job_id: UUID, current_user: User) -> ExportJobModel:
+    job = await db.get(ExportJobModel, job_id)
+    if not job or (job.user_id != current_user.id and not current_user.is_superuser):
+        raise HTTPException(status_code=404, detail="Exportación no encontrada")
+    return job
+def _byte_range(header: Optional[str], size: int) -> Optional[tuple]:
+    """(inicio, fin) inclusivos de un Range de un solo tramo; None = archivo completo."""
+    if not header:
+        return None
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        # Varios tramos o unidades desconocidas: se ignora el Range (RFC 9110)
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        # Sufijo: los últimos N bytes
+        length = int(end)
+        if length == 0:
+            raise HTTPException(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+        return max(size - length, 0), size - 1
+    first, last = int(start), min(int(end), size - 1) if end else size - 1
+    if first >= size or first > last:
+        raise HTTPException(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+    return first, last
+async def _file_chunks(path: str, start: int, length: int):
+    with open(path, "rb") as f:
+        f.seek(start)
+        while length > 0:
+            chunk = await asyncio.to_thread(f.read, min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+@router.post("", response_model=ExportJob, status_code=status.HTTP_202_ACCEPTED)
+async def create_export(
+    job_in: ExportJobCreate,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+):
+    """Encola una exportación (tickets, activos, auditoría o parte diario) con el alcance del usuario."""
+    if not any(current_user.has_permission(p) for p in KIND_PERMISSIONS[job_in.kind]):
+        raise HTTPException(status_code=403, detail=f"No tienes permiso para exportar {job_in.kind}")
+    try:
+        return await export_job_service.start(db, current_user, job_in.kind, job_in.format, job_in.filters)
+    except ExportJobLimit as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+@router.get("", response_model=List[ExportJob])
+async def read_exports(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    limit: int = 50,
+):
+    result = await db.execute(
+        select(ExportJobModel).where(ExportJobModel.user_id == current_user.id)
+        .order_by(ExportJobModel.created_at.desc()).limit(min(limit, 200))
+    )
+    return result.scalars().all()
+@router.get("/{job_id}", response_model=ExportJob)
+async def read_export(
+    job_id: UUID,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+):
+    return await _get_own_job(db, job_id, current_user)
+@router.get("/{job_id}/download")
+async def download_export(
+    job_id: UUID,
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+):
+    """Descarga el resultado; admite Range (un tramo) e If-Range para reanudar."""
+    job = await _get_own_job(db, job_id, current_user)
+    if job.status != "done" or not job.file_path or not os.path.exists(job.file_path):
+        raise HTTPException(status_code=409 if job.status in ("pending", "running") else 410, detail=f"Exportación no disponible ({job.status})")
+    size = os.path.getsize(job.file_path)
+    etag = make_etag(job.id, size, job.finished_at)
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+        "Content-Disposition": f"attachment; filename={job.filename}",
+    }
+    if_range = request.headers.get("if-range")
+    byte_range = _byte_range(request.headers.get("range"), size) if not if_range or if_range == etag else None
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(_file_chunks(job.file_path, 0, size), media_type=job.media_type, headers=headers)
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        _file_chunks(job.file_path, start, end - start + 1), status_code=206, media_type=job.media_type, headers=headers
+    )
+@router.delete("/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_export(
+    job_id: UUID,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+):
+    """Borra la exportación y su archivo (si sigue en curso, se cancela)."""
+    job = await _get_own_job(db, job_id, current_user)
+    await export_job_service.delete(db, job)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
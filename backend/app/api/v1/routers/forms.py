@@ -1,8 +1,9 @@
 from typing import Annotated, List, Any
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from app.api.deps import get_db, require_permission, require_role
+from app.core.etag import collection_version, etag_matches, make_etag, not_modified, set_etag
 from app.crud import crud_form, crud_audit, crud_ticket, crud_endpoint
 from app.db import models
 from app.schemas.form import Form, FormCreate, FormUpdate, FormSubmission, FormSubmissionCreate
@@ -16,19 +17,27 @@ router = APIRouter()
     dependencies=[Depends(require_role(['owner', 'admin', 'Administrator', 'analyst', 'tech', 'viewer']))]
 )
 async def read_forms(
+    request: Request,
+    response: Response,
     db: Annotated[AsyncSession, Depends(get_db)],
     current_user: Annotated[models.User, Depends(require_permission("forms:read:all"))],
 ):
     """
     Retorna solo las plantillas disponibles para el grupo del usuario.
     """
+    # Filtrar por grupo del usuario
+    scope = [] if current_user.is_superuser else [
+        (models.Form.group_id == current_user.group_id) | (models.Form.group_id == None)
+    ]
+    version = (await db.execute(collection_version(models.Form, *scope))).first()
+    etag = make_etag("forms", "all" if current_user.is_superuser else current_user.group_id, *version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     if current_user.is_superuser:
         return await crud_form.form.get_multi(db)
-    # Filtrar por grupo del usuario
     res = await db.execute(
-        select(models.Form).filter(
-            (models.Form.group_id == current_user.group_id) | (models.Form.group_id == None)
-        ).filter(models.Form.deleted_at == None)
+        select(models.Form).filter(*scope).filter(models.Form.deleted_at == None)
     )
     return res.scalars().all()
 @router.post(
@@ -1,13 +1,15 @@
 from typing import Annotated, List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 from uuid import UUID
 from app.api.deps import get_db, require_permission, get_current_active_user
+from app.core.etag import collection_version, etag_matches, make_etag, not_modified, set_etag
 from sqlalchemy import func, case
 from app.db.models import Group, User, Ticket, SLAMetric, WikiSpace
 from app.schemas.group import Group as GroupSchema, GroupCreate, GroupUpdate
+from app.services.group_service import group_service
 router = APIRouter()
 def build_tree(items: List[Any], stats_map: Dict[UUID, Dict[str, Any]], parent_id: Optional[UUID] = None) -> List[Dict[str, Any]]:
     """
@@ -79,6 +81,8 @@ async def read_groups_tree(
     response_model=List[GroupSchema]
 )
 async def read_groups(
+    request: Request,
+    response: Response,
     db: Annotated[AsyncSession, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
     skip: int = 0,
@@ -89,6 +93,12 @@ async def read_groups(
        not current_user.has_permission("admin:groups:read") and \
        not current_user.has_permission("ticket:create"):
         raise HTTPException(status_code=403, detail="Not enough permissions")
+    # Incluye los grupos dados de baja: el borrado lógico también mueve updated_at
+    version = (await db.execute(collection_version(Group))).first()
+    etag = make_etag("groups", skip, limit, *version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     query = (
         select(Group)
         .options(selectinload(Group.parent_group))
@@ -142,7 +152,13 @@ async def update_group(
     group = result.scalar_one_or_none()
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
-    for var, value in group_in.model_dump(exclude_unset=True).items():
+    update_data = group_in.model_dump(exclude_unset=True)
+    new_parent_id = update_data.get("parent_id")
+    if new_parent_id and new_parent_id != group.parent_id:
+        # Evitar ciclos: el nuevo padre no puede ser el grupo ni uno de sus descendientes
+        if new_parent_id in await group_service.get_all_child_group_ids(db, group.id):
+            raise HTTPException(status_code=400, detail="No se puede mover un grupo debajo de sí mismo o de un subgrupo.")
+    for var, value in update_data.items():
         setattr(group, var, value)
     db.add(group)
     await db.commit()
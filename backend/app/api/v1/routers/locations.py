@@ -7,6 +7,7 @@ from sqlalchemy import Integer
 from app.api.deps import get_db, require_permission, get_current_active_user
 from app.schemas.location import LocationNode as LocationSchema, LocationNodeCreate, LocationNodeUpdate, LocationPagination
 from app.crud.crud_location import location as crud_location
+from app.services.count_service import count_service
 from app.db.models.user import User
 from app.db.models.location import LocationNode as LocationModel
 router = APIRouter()
@@ -19,7 +20,8 @@ async def read_locations(
     current_user: Annotated[User, Depends(get_current_active_user)],
     q: Optional[str] = Query(None, description="Buscar por nombre o código de dependencia"),
     page: int = Query(1, ge=1),
-    size: int = Query(20, ge=1, le=100)
+    size: int = Query(20, ge=1, le=100),
+    count_mode: Optional[str] = Query(None, pattern="^(exact|estimated|auto)$")
 ):
     """
     Retorna la lista de dependencias con conteo de activos y paginación.
@@ -43,16 +45,24 @@ async def read_locations(
 
     if q:
         search_filter = f"%{q}%"
-        # Usamos unaccent directamente ya que lo hemos habilitado en la DB
+        # f_unaccent: envoltorio IMMUTABLE de unaccent, servido por índices trigram
         query = query.filter(
-            (func.unaccent(LocationModel.name).ilike(func.unaccent(search_filter))) | 
+            (func.f_unaccent(LocationModel.name).ilike(func.f_unaccent(search_filter))) | 
             (LocationModel.dependency_code.ilike(search_filter))
         )
 
-    # Total count (sin paginación)
-    total_query = select(func.count()).select_from(query.subquery())
-    total_res = await db.execute(total_query)
-    total = total_res.scalar() or 0
+    # Total count (sin paginación). El conteo de activos no altera las filas:
+    # se cuenta sólo sobre location_nodes con el mismo filtro.
+    count_query = select(LocationModel.id)
+    if q:
+        count_query = count_query.filter(
+            (func.f_unaccent(LocationModel.name).ilike(func.f_unaccent(search_filter))) |
+            (LocationModel.dependency_code.ilike(search_filter))
+        )
+    total, total_exact = await count_service.count(
+        db, count_query, endpoint="locations", tables=("location_nodes",), mode=count_mode,
+        filters={"q": q},
+    )
 
     # Paginación y Orden (Numérico si es posible)
     query = query.order_by(
@@ -74,7 +84,8 @@ async def read_locations(
             "total": total,
             "page": page,
             "size": size,
-            "pages": (total + size - 1) // size
+            "pages": (total + size - 1) // size,
+            "total_exact": total_exact,
         }
     except Exception as e:
         # Fallback si hay un error con unaccent o similar
@@ -100,7 +111,8 @@ async def read_locations(
             "total": total,
             "page": page,
             "size": size,
-            "pages": (total + size - 1) // size
+            "pages": (total + size - 1) // size,
+            "total_exact": total_exact,
         }
     # Sin búsqueda, usamos get_all paginado
     data = await crud_location.get_all(db, skip=skip, limit=size)
@@ -1,53 +1,66 @@
-from typing import Annotated, List
-from fastapi import APIRouter, Depends, HTTPException, Response
+from typing import Annotated
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.deps import get_db, require_permission
+from app.core.config import settings
 from app.crud import crud_ticket
 from app.db.models import User
-from app.services.export_service import export_service
-from app.services.group_service import group_service
+from app.schemas.export_job import ExportJob
+from app.services.export_service import export_service, FORMATS
+from app.services.export_job_service import export_job_service, ExportJobLimit
+from app.services.render_executor import RenderQueueFull, RenderTimeout
 router = APIRouter()
+async def _export_batches(bind, criteria: list):
+    # Sesión propia (mismo engine): el cuerpo se sigue emitiendo después de que el
+    # endpoint retornó y la sesión de la request puede estar cerrada
+    async with AsyncSession(bind) as db:
+        async for batch in crud_ticket.ticket.stream_export_rows(db, criteria, batch_size=settings.EXPORT_BATCH_SIZE):
+            yield [crud_ticket.ticket_export_row(t) for t in batch]
+async def _submit_job(db: AsyncSession, current_user: User, format: str) -> JSONResponse:
+    try:
+        job = await export_job_service.start(db, current_user, "tickets", format, {})
+    except ExportJobLimit as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    content = ExportJob.model_validate(job).model_dump(mode="json")
+    content["status_url"] = f"{settings.API_V1_STR}/exports/{job.id}"
+    return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=content)
 @router.get("/tickets/{format}")
 async def export_tickets(
     format: str,
     db: Annotated[AsyncSession, Depends(get_db)],
     current_user: Annotated[User, Depends(require_permission("reports:export:tickets"))],
+    background: bool = False,
 ):
     """
-    Export tickets to CSV, Excel or PDF.
+    Export tickets to CSV, Excel or PDF (sólo los tickets que el usuario puede ver).
+    CSV y Excel se emiten en streaming leyendo por lotes con un cursor del servidor,
+    sin tope de filas. El PDF (hasta EXPORT_PDF_MAX_ROWS filas) se genera en el pool de
+    renderizado. Con background=true (o un PDF de más de RENDER_ASYNC_MIN_ROWS filas)
+    se crea una exportación en segundo plano y se responde 202 (ver /exports/{id}).
     """
-    if current_user.is_superuser:
-        tickets = await crud_ticket.ticket.get_multi(db, limit=1000)
-    else:
-        group_ids = await group_service.get_all_child_group_ids(db, current_user.group_id)
-        tickets = await crud_ticket.ticket.get_multi_by_group_ids(db, group_ids=group_ids, limit=1000)
-    # Convert to dict for export
-    data = []
-    for t in tickets:
-        data.append({
-            "ID": str(t.id),
-            "Title": t.title,
-            "Status": t.status,
-            "Priority": t.priority,
-            "Created At": t.created_at.strftime("%Y-%m-%d %H:%M") if t.created_at else "",
-            "SLA Deadline": t.sla_deadline.strftime("%Y-%m-%d %H:%M") if t.sla_deadline else "N/A"
-        })
-    if format == "csv":
-        content = export_service.to_csv(data)
-        media_type = "text/csv"
-        filename = "tickets_export.csv"
-    elif format == "excel":
-        content = export_service.to_excel(data)
-        media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        filename = "tickets_export.xlsx"
-    elif format == "pdf":
-        content = export_service.to_pdf(data, title="SOC Ticket Report")
-        media_type = "application/pdf"
-        filename = "tickets_report.pdf"
-    else:
+    if format not in FORMATS:
         raise HTTPException(status_code=400, detail="Invalid format")
-    return Response(
-        content=content,
-        media_type=media_type,
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
\ No newline at end of file
+    if background:
+        return await _submit_job(db, current_user, format)
+    criteria = await crud_ticket.ticket.read_scope(db, current_user)
+    _, media_type, filename = FORMATS[format]
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    if format == "csv":
+        return StreamingResponse(export_service.stream_csv(crud_ticket.TICKET_EXPORT_HEADERS, _export_batches(db.bind, criteria)), media_type=media_type, headers=headers)
+    if format == "excel":
+        return StreamingResponse(export_service.stream_xlsx(crud_ticket.TICKET_EXPORT_HEADERS, _export_batches(db.bind, criteria)), media_type=media_type, headers=headers)
+    data = [
+        dict(zip(crud_ticket.TICKET_EXPORT_HEADERS, crud_ticket.ticket_export_row(t)))
+        async for batch in crud_ticket.ticket.stream_export_rows(db, criteria, limit=settings.EXPORT_PDF_MAX_ROWS)
+        for t in batch
+    ]
+    if len(data) > settings.RENDER_ASYNC_MIN_ROWS:
+        return await _submit_job(db, current_user, format)
+    try:
+        content = await export_service.render(format, data, title="SOC Ticket Report")
+    except RenderQueueFull:
+        raise HTTPException(status_code=503, detail="Hay demasiados reportes en proceso, reintente en unos minutos")
+    except RenderTimeout:
+        raise HTTPException(status_code=504, detail="La generación del reporte excedió el tiempo máximo")
+    return Response(content=content, media_type=media_type, headers=headers)
@@ -1,10 +1,12 @@
 from typing import List, Annotated, Optional
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.api.deps import get_db, get_current_active_user
+from app.api.deps import get_db, get_current_active_user, require_role
 from app.db.models import User
+from app.crud.crud_ticket import ticket as crud_ticket
 from app.services.search_service import search_service
-from app.schemas.search import SearchResponse, SearchHit
+from app.services.search_reindex_service import search_reindex_service, ReindexInProgress
+from app.schemas.search import SearchResponse, SearchHit, SearchReindexRequest, SearchReindexRun
 router = APIRouter()
 @router.get("/", response_model=SearchResponse)
 async def global_search(
@@ -16,8 +18,9 @@ async def global_search(
     """
     Realiza una búsqueda global en el sistema (Tickets, Activos, Usuarios).
     """
-    # 1. Búsqueda de Tickets
-    ticket_results = search_service.search_tickets(q, limit=limit)
+    # 1. Búsqueda de Tickets (filtrada por el alcance de lectura del usuario en Meilisearch)
+    scope = await crud_ticket.search_scope(db, current_user)
+    ticket_results = search_service.search_tickets(q, limit=limit, scope=scope)
     hits = []
     
     for h in ticket_results.get("hits", []):
@@ -56,3 +59,28 @@ async def global_search(
         processing_time_ms=ticket_results.get("processingTimeMs", 0) + asset_results.get("processingTimeMs", 0),
         query=q
     )
+@router.post("/reindex", response_model=List[SearchReindexRun], status_code=status.HTTP_202_ACCEPTED)
+async def reindex(
+    reindex_in: SearchReindexRequest,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(require_role(['owner', 'admin']))],
+):
+    """
+    Reconstruye los índices de Meilisearch desde Postgres en un índice sombra y lo
+    intercambia con el vivo al terminar. El avance se consulta con GET /search/reindex.
+    """
+    names = ["tickets", "assets"] if reindex_in.index == "all" else [reindex_in.index]
+    runs = []
+    for name in names:
+        try:
+            runs.append(await search_reindex_service.start(db, name, resume=reindex_in.resume, user_id=current_user.id))
+        except ReindexInProgress as e:
+            raise HTTPException(status_code=409, detail=str(e))
+    return runs
+@router.get("/reindex", response_model=List[SearchReindexRun])
+async def read_reindex_runs(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(require_role(['owner', 'admin']))],
+    limit: int = Query(20, le=100),
+):
+    return await search_reindex_service.runs(db, limit=limit)
@@ -1,10 +1,11 @@
 from typing import Annotated, Optional
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from pydantic import BaseModel
 import logging
 from app.api.deps import get_db, require_permission
+from app.core.etag import etag_matches, make_etag, not_modified, set_etag
 from app.db.models.settings import SystemSettings
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -23,7 +24,7 @@ class SettingsUpdate(BaseModel):
     smtp_use_tls: Optional[bool] = True
     smtp_use_ssl: Optional[bool] = False
 @router.get("")
-async def get_settings(db: Annotated[AsyncSession, Depends(get_db)]):
+async def get_settings(request: Request, response: Response, db: Annotated[AsyncSession, Depends(get_db)]):
     try:
         result = await db.execute(select(SystemSettings).limit(1))
         settings_obj = result.scalar_one_or_none()
@@ -50,6 +51,11 @@ async def get_settings(db: Annotated[AsyncSession, Depends(get_db)]):
             logger.error(f"Failed to save default settings: {e}")
             # Devolvemos un objeto temporal para no romper el frontend
             return settings_obj
+    # Una sola fila: la versión sale del mismo SELECT y el 304 evita serializarla
+    etag = make_etag("settings", settings_obj.id, settings_obj.updated_at)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return settings_obj
 @router.post("")
 async def update_settings(
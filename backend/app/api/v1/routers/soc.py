@@ -10,6 +10,7 @@ from app.schemas.ticket import TicketCreate
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 from app.services.expert_analysis_service import expert_analysis_service
+from app.services.count_service import count_service
 router = APIRouter()
 @router.post("/alerts/{alert_id}/reanalyze")
 async def reanalyze_alert(
@@ -58,6 +59,7 @@ class AlertListResponse(BaseModel):
     page: int
     size: int
     pages: int
+    total_exact: bool = True
 @router.get("/alerts", response_model=AlertListResponse)
 async def read_soc_events(
     db: Annotated[AsyncSession, Depends(get_db)],
@@ -65,7 +67,8 @@ async def read_soc_events(
     page: int = 1,
     size: int = 20,
     sort_by: str = Query("created_at"),
-    order: str = Query("desc")
+    order: str = Query("desc"),
+    count_mode: Optional[str] = Query(None, pattern="^(exact|estimated|auto)$")
 ):
     """Listado de alertas SOC puras con paginación."""
     skip = (page - 1) * size
@@ -87,10 +90,10 @@ async def read_soc_events(
     else:
         query = query.order_by(column.desc())
 
-    # Contar total
-    from sqlalchemy import func
-    total_res = await db.execute(select(func.count()).select_from(query.subquery()))
-    total = total_res.scalar_one()
+    # Contar total (exacto o estimado según count_mode / COUNT_MODE_SOC_ALERTS)
+    total, total_exact = await count_service.count(
+        db, query, endpoint="soc_alerts", tables=("alerts",), mode=count_mode
+    )
     
     # Obtener items
     result = await db.execute(query.offset(skip).limit(size))
@@ -101,7 +104,8 @@ async def read_soc_events(
         "total": total,
         "page": page,
         "size": size,
-        "pages": math.ceil(total / size) if total > 0 else 0
+        "pages": math.ceil(total / size) if total > 0 else 0,
+        "total_exact": total_exact,
     }
 @router.post("/alerts/{alert_id}/ack")
 async def acknowledge_event(
@@ -198,9 +202,6 @@ async def promote_to_ticket(
         created_by_id=current_user.id,
         owner_group_id=current_user.group_id
     )
-    # Aplicar SLA inmediatamente
-    from app.services.sla_service import sla_service
-    await sla_service.apply_policy_to_ticket(db, ticket)
     # Vincular alerta con ticket
     alert.ticket_id = ticket.id
     alert.status = "promoted"
@@ -1,10 +1,12 @@
 from typing import Annotated, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import func
 from uuid import UUID
 from pydantic import BaseModel, ConfigDict
 from app.api.deps import get_db, require_permission, get_current_active_user
+from app.core.etag import etag_matches, make_etag, not_modified, set_etag
 from app.db.models import TicketType, User
 router = APIRouter()
 class TicketTypeSchema(BaseModel):
@@ -24,9 +26,18 @@ class TicketTypeCreate(BaseModel):
     response_model=List[TicketTypeSchema]
 )
 async def read_ticket_types(
+    request: Request,
+    response: Response,
     db: Annotated[AsyncSession, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)], # Allow all authenticated users
 ):
+    version = (await db.execute(
+        select(func.count(), func.max(TicketType.updated_at)).select_from(TicketType)
+    )).first()
+    etag = make_etag("ticket_types", *version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     result = await db.execute(select(TicketType))
     return result.scalars().all()
 @router.post(
@@ -1,22 +1,31 @@
 import logging
-from typing import Annotated, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Request, BackgroundTasks, Query
+from datetime import datetime
+from typing import Annotated, Any, List, Literal, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from app.api.deps import get_db, require_permission, require_ticket_permission, get_current_active_user
+from app.api.deps import (
+    get_db, require_permission, require_ticket_permission, get_current_active_user,
+    authorize_ticket, load_ticket_detail, require_ticket_access
+)
 from app.crud import crud_ticket, crud_audit
 from app.db.models import User
 from app.schemas.ticket import (
-    Ticket, TicketCreate, TicketUpdate, 
-    TicketComment, TicketCommentCreate,
+    Ticket, TicketSummary, TicketCreate, TicketUpdate, 
+    TicketComment, TicketCommentCreate, TicketCommentPage, TicketTimelinePage,
     TicketRelation, TicketRelationCreate,
-    TicketBulkUpdate,
-    TicketSubtask, TicketSubtaskCreate, TicketSubtaskUpdate
+    TicketBulkUpdate, TicketBulkCreate, TicketBulkResult,
+    TicketSubtask, TicketSubtaskCreate, TicketSubtaskUpdate,
+    TicketFull, TICKET_PANELS
 )
 from app.services.workflow_service import workflow_service
 from app.services.group_service import group_service
 from app.services.search_service import search_service
 from app.services.sla_service import sla_service
+from app.services.count_service import count_service
+from app.services.ticket_import_service import ticket_import_service
+from app.services.ticket_timeline_service import ticket_timeline_service
+from app.core.config import settings
 from sqlalchemy import func, or_
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
@@ -25,6 +34,9 @@ from app.db.models.asset import Asset
 from fastapi.responses import FileResponse, StreamingResponse
 import io
 from app.services.pdf_service import pdf_service
+from app.services.render_executor import RenderQueueFull, RenderTimeout
+from app.core.pagination import encode_cursor, decode_cursor, keyset_predicate
+from app.core.etag import etag_matches, make_etag, not_modified, set_etag
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -35,11 +47,16 @@ async def export_ticket_pdf(
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """Genera y descarga un reporte PDF formal del ticket."""
-    # Obtener comentarios para el reporte
-    comments = await crud_ticket.ticket.get_comments(db, ticket_id=ticket.id, include_internal=False)
+    # Obtener comentarios para el reporte (el PDF muestra los primeros 200 caracteres de cada uno)
+    comments = await crud_ticket.ticket.get_comments(db, ticket_id=ticket.id, include_internal=False, content_chars=200)
     
-    # Generar el PDF
-    pdf_buffer = await pdf_service.generate_ticket_report(ticket, comments)
+    # Generar el PDF (en el pool de renderizado, fuera del event loop)
+    try:
+        pdf_buffer = await pdf_service.generate_ticket_report(ticket, comments)
+    except RenderQueueFull:
+        raise HTTPException(status_code=503, detail="Hay demasiados reportes en proceso, reintente en unos minutos")
+    except RenderTimeout:
+        raise HTTPException(status_code=504, detail="La generación del reporte excedió el tiempo máximo")
     
     filename = f"Reporte_Ticket_{ticket.id.hex[:8]}.pdf"
     return StreamingResponse(
@@ -47,27 +64,9 @@ async def export_ticket_pdf(
         media_type="application/pdf",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
-# Helper for Meilisearch indexing
-def index_ticket_task(ticket: TicketModel):
-    try:
-        data = {
-            "id": str(ticket.id),
-            "title": ticket.title,
-            "description": ticket.description,
-            "status": ticket.status,
-            "priority": ticket.priority,
-            "group_id": str(ticket.group_id) if ticket.group_id else None,
-            "assigned_to_id": str(ticket.assigned_to_id) if ticket.assigned_to_id else None,
-            "created_by_id": str(ticket.created_by_id) if ticket.created_by_id else None,
-            "ticket_type_id": str(ticket.ticket_type_id) if ticket.ticket_type_id else None,
-            "created_at": ticket.created_at.isoformat() if ticket.created_at else None,
-            "updated_at": ticket.updated_at.isoformat() if ticket.updated_at else None,
-        }
-        search_service.index_ticket(data)
-    except Exception as e:
-        logger.error(f"Error indexando ticket {ticket.id} en Meilisearch: {e}")
 @router.get("/search", response_model=dict)
 async def search_tickets_endpoint(
+    db: Annotated[AsyncSession, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
     q: str = Query(..., min_length=1),
     limit: int = 20,
@@ -75,9 +74,10 @@ async def search_tickets_endpoint(
     filter: Optional[str] = None,
 ):
     """
-    Search tickets using full-text search engine.
+    Search tickets using full-text search engine, restricted to the caller's read scope.
     """
-    return search_service.search_tickets(q, filters=filter, limit=limit, offset=offset)
+    scope = await crud_ticket.ticket.search_scope(db, current_user)
+    return search_service.search_tickets(q, filters=filter, limit=limit, offset=offset, scope=scope)
 @router.get("/stats")
 async def get_ticket_stats(
     db: Annotated[AsyncSession, Depends(get_db)],
@@ -86,52 +86,70 @@ async def get_ticket_stats(
     """
     Get summary statistics for tickets.
     """
-    if current_user.is_superuser or current_user.has_permission("ticket:read:global"):
-        base_query = select(TicketModel)
-    elif current_user.has_permission("ticket:read:group"):
+    read_scopes = current_user.permission_index.scopes("ticket", "read")
+    if current_user.is_superuser or "global" in read_scopes:
+        group_ids = None
+    elif "group" in read_scopes:
         if not current_user.group_id:
              return {"status": {}, "priority": {}, "overdue": 0}
         group_ids = await group_service.get_all_child_group_ids(db, current_user.group_id)
-        base_query = select(TicketModel).filter(TicketModel.group_id.in_(group_ids))
-    elif current_user.has_permission("ticket:read:own"):
-        base_query = select(TicketModel).filter(
-            or_(
-                TicketModel.created_by_id == current_user.id,
-                TicketModel.assigned_to_id == current_user.id
-            )
-        )
+    elif "own" in read_scopes:
+        return await _own_ticket_stats(db, current_user)
     else:
         return {"status": {}, "priority": {}, "overdue": 0}
-    # Count by status
+    # Estado / prioridad / SIEM (creados por el usuario FortiSIEM) desde ticket_counters
+    status_counts, priority_counts, siem_count = {}, {}, 0
+    for row in await crud_ticket.ticket.get_counters(db, group_ids):
+        status_counts[row.status] = status_counts.get(row.status, 0) + row.count
+        priority_counts[row.priority] = priority_counts.get(row.priority, 0) + row.count
+        if row.created_by_siem and row.status != 'closed':
+            siem_count += row.count
+    # Vencidos: depende de la hora, se cuenta sobre el índice parcial ix_tickets_open_sla_deadline
+    overdue_query = select(func.count(TicketModel.id)).where(
+        TicketModel.sla_deadline < func.now(), TicketModel.status != 'closed', TicketModel.deleted_at.is_(None)
+    )
+    if group_ids is not None:
+        overdue_query = overdue_query.where(TicketModel.group_id.in_(group_ids))
+    overdue_count = await db.execute(overdue_query)
+    return {
+        "status": status_counts,
+        "priority": priority_counts,
+        "overdue": overdue_count.scalar() or 0,
+        "siem_alerts": siem_count
+    }
+async def _own_ticket_stats(db: AsyncSession, current_user: User) -> dict:
+    """Alcance "own": no se agrupa por grupo, se cuenta sobre los tickets propios/asignados."""
+    base_query = select(TicketModel).filter(
+        TicketModel.deleted_at.is_(None),
+        or_(
+            TicketModel.created_by_id == current_user.id,
+            TicketModel.assigned_to_id == current_user.id
+        )
+    )
     status_counts = await db.execute(
         base_query.with_only_columns(TicketModel.status, func.count(TicketModel.id))
         .group_by(TicketModel.status)
     )
-    # Count by priority
     priority_counts = await db.execute(
         base_query.with_only_columns(TicketModel.priority, func.count(TicketModel.id))
         .group_by(TicketModel.priority)
     )
-    # Overdue count
     overdue_count = await db.execute(
         base_query.filter(TicketModel.sla_deadline < func.now(), TicketModel.status != 'closed')
         .with_only_columns(func.count(TicketModel.id))
     )
-    # SIEM Alerts count
-    from app.crud.crud_user import user as crud_user
-    siem_user = await crud_user.get_by_email(db, email="fortisiem@example.com")
-    siem_count = 0
-    if siem_user:
-        siem_alerts_res = await db.execute(
-            base_query.filter(TicketModel.created_by_id == siem_user.id, TicketModel.status != 'closed')
-            .with_only_columns(func.count(TicketModel.id))
-        )
-        siem_count = siem_alerts_res.scalar() or 0
+    from app.db.models.integrations import SIEMConfiguration
+    siem_alerts_res = await db.execute(
+        base_query.filter(
+            TicketModel.created_by_id.in_(select(SIEMConfiguration.siem_user_id)),
+            TicketModel.status != 'closed'
+        ).with_only_columns(func.count(TicketModel.id))
+    )
     return {
         "status": dict(status_counts.all()),
         "priority": dict(priority_counts.all()),
         "overdue": overdue_count.scalar() or 0,
-        "siem_alerts": siem_count
+        "siem_alerts": siem_alerts_res.scalar() or 0
     }
 @router.patch("/bulk-update")
 async def bulk_update_tickets(
@@ -139,34 +157,38 @@ async def bulk_update_tickets(
     update_in: TicketBulkUpdate,
     db: Annotated[AsyncSession, Depends(get_db)],
     current_user: Annotated[User, Depends(require_permission("ticket:update:bulk"))],
-    background_tasks: BackgroundTasks, 
 ):
     """
-    Update multiple tickets at once.
+    Update multiple tickets at once. Status/assignee side effects (closed_at, SLA,
+    audit, notifications, search index) are applied per batch, in one transaction.
     """
     count = await crud_ticket.ticket.bulk_update(
         db, 
         ticket_ids=update_in.ticket_ids,
+        current_user_id=current_user.id,
+        ip_address=request.client.host if request.client else None,
         status=update_in.status,
         priority=update_in.priority,
         assigned_to_id=update_in.assigned_to_id
     )
-    await crud_audit.audit_log.create_log(
-        db,
-        user_id=current_user.id,
-        event_type="tickets_bulk_updated",
-        ip_address=request.client.host,
-        details={"count": count, "ticket_ids": [str(tid) for tid in update_in.ticket_ids]}
-    )
     return {"updated": count}
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 class TicketListResponse(BaseModel):
+    view: Literal["full"] = "full"
     items: List[Ticket]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     size: int
-    pages: int
-@router.get("", response_model=TicketListResponse)
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+    total_exact: bool = True
+class TicketSummaryListResponse(TicketListResponse):
+    view: Literal["summary"] = "summary"
+    items: List[TicketSummary]
+@router.get(
+    "",
+    response_model=Annotated[Union[TicketListResponse, TicketSummaryListResponse], Field(discriminator="view")],
+)
 async def read_tickets(
     db: Annotated[AsyncSession, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
@@ -181,12 +203,22 @@ async def read_tickets(
     type_id: Optional[UUID] = None,
     created_by_me: bool = Query(False),
     assigned_to_me: bool = Query(False),
-    sort_by: str = Query("created_at"),
+    sort_by: Optional[str] = Query(None, description="Por defecto 'relevance' si hay q, si no 'created_at'"),
     order: str = Query("desc"),
+    pagination: str = Query("page", pattern="^(page|cursor)$", description="'page' (OFFSET) o 'cursor' (keyset)"),
+    cursor: Optional[str] = Query(None, description="next_cursor de la respuesta anterior; implica pagination=cursor"),
+    with_total: bool = Query(True, description="Si es false, omite el COUNT(*) del total"),
+    count_mode: Optional[str] = Query(None, pattern="^(exact|estimated|auto)$"),
+    view: str = Query("full", pattern="^(full|summary)$", description="'summary': sólo columnas de listado"),
 ):
     """
     Retrieve tickets with dynamic permissions (Scopes).
+    En modo cursor se pagina por (columna de orden, id) con predicados de búsqueda
+    en lugar de OFFSET, por lo que las páginas profundas cuestan lo mismo que la primera.
+    La vista summary proyecta columnas y nombres en una sola consulta, sin cargar
+    relaciones ni adjuntos (sólo su cantidad).
     """
+    use_cursor = pagination == "cursor" or cursor is not None
     skip = (page - 1) * size
     options = [
         selectinload(TicketModel.ticket_type),
@@ -197,15 +229,13 @@ async def read_tickets(
     ]
     # Join con Group para poder ordenar por nombre
     from app.db.models.group import Group as GroupModel
-    query = select(TicketModel).outerjoin(GroupModel, TicketModel.group_id == GroupModel.id).options(*options)
+    query = select(TicketModel).outerjoin(GroupModel, TicketModel.group_id == GroupModel.id)
     
+    rank = None
     if q:
-        query = query.filter(
-            or_(
-                TicketModel.title.ilike(f"%{q}%"),
-                TicketModel.description.ilike(f"%{q}%")
-            )
-        )
+        # Búsqueda full-text (índice GIN sobre search_vector) con ranking
+        matches, rank = crud_ticket.ticket_text_search(q)
+        query = query.filter(matches)
     
     if status:
         query = query.filter(TicketModel.status == status)
@@ -246,55 +276,82 @@ async def read_tickets(
         "created_at": TicketModel.created_at
     }
     
-    column = sort_map.get(sort_by.lower(), TicketModel.created_at)
-    if order.lower() == "asc":
-        query = query.order_by(column.asc())
-    else:
-        query = query.order_by(column.desc())
+    if rank is not None:
+        sort_map["relevance"] = rank
+    sort_key = (sort_by or ("relevance" if q else "created_at")).lower()
+    if sort_key not in sort_map:
+        sort_key = "created_at"
+    sort_order = "asc" if order.lower() == "asc" else "desc"
+    column = sort_map[sort_key]
 
-    # Permission Logic
-    if current_user.is_superuser:
-        pass # Full Access para admin
-    else:
-        # Filtros normales para usuarios no-admin
-        private_condition = or_(
-            TicketModel.is_private.isnot(True), 
-            TicketModel.created_by_id == current_user.id,
-            TicketModel.assigned_to_id == current_user.id
+    # Permission Logic (privados + scopes de ticket:read; sin filtro para admin)
+    query = query.filter(*await crud_ticket.ticket.read_scope(db, current_user))
+    # Total: exacto o estimado según count_mode / COUNT_MODE_TICKETS
+    total, total_exact = None, True
+    if with_total:
+        personal = not current_user.is_superuser or created_by_me or assigned_to_me
+        # El filtro por grupo se expande por la jerarquía (group_closure)
+        tables = ("tickets", "group_closure") if group_id else ("tickets",)
+        total, total_exact = await count_service.count(
+            db, query, endpoint="tickets", tables=tables, mode=count_mode,
+            scope=str(current_user.id) if personal else "all",
+            filters={
+                "q": q, "status": status, "priority": priority, "group_id": group_id,
+                "asset_id": asset_id, "platform": platform, "type_id": type_id,
+                "created_by_me": created_by_me, "assigned_to_me": assigned_to_me,
+            },
         )
-        query = query.filter(private_condition)
-        
-        has_global = current_user.has_permission("ticket:read:global")
-        has_group = current_user.has_permission("ticket:read:group")
-        has_own = current_user.has_permission("ticket:read:own")
-
-        if has_global:
-            pass # Access to all public tickets
-        else:
-            # Build Access Conditions
-            access_conditions = [TicketModel.is_global == True]
-            if has_group:
-                child_ids = await group_service.get_all_child_group_ids(db, current_user.group_id)
-                access_conditions.append(TicketModel.group_id.in_(child_ids))
-                access_conditions.append(TicketModel.owner_group_id.in_(child_ids))
-            if has_own:
-                access_conditions.append(TicketModel.created_by_id == current_user.id)
-                access_conditions.append(TicketModel.assigned_to_id == current_user.id)
-            
-            query = query.filter(or_(*access_conditions))
-    # Count total
-    total_query = select(func.count()).select_from(query.subquery())
-    total_res = await db.execute(total_query)
-    total = total_res.scalar_one()
-    result = await db.execute(query.offset(skip).limit(size))
-    items = result.scalars().all()
+    summary = view == "summary"
+    if summary:
+        query = crud_ticket.ticket_summary_projection(query)
+    else:
+        query = query.options(*options)
+    # id como desempate: orden total y estable, servible por índices compuestos (columna, id).
+    # NULLS explícitos (los de PostgreSQL por defecto), coherentes con keyset_predicate
+    if sort_order == "asc":
+        query = query.order_by(column.asc().nulls_last(), TicketModel.id.asc())
+    else:
+        query = query.order_by(column.desc().nulls_first(), TicketModel.id.desc())
+    if use_cursor:
+        if cursor:
+            try:
+                position = decode_cursor(cursor)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            if position["k"] != sort_key or position["o"] != sort_order:
+                raise HTTPException(status_code=400, detail="El cursor no corresponde al orden solicitado.")
+            query = query.filter(
+                keyset_predicate(column, TicketModel.id, position["v"], position["id"], descending=sort_order == "desc")
+            )
+        # El valor de orden viaja en la fila (puede ser calculado: grupo, relevancia);
+        # una fila extra indica si hay página siguiente
+        query = query.add_columns(column.label("sort_value")).limit(size + 1)
+    else:
+        query = query.offset(skip).limit(size)
+    result = await db.execute(query)
+    rows = result.all()
+    next_cursor = None
+    if use_cursor:
+        has_more = len(rows) > size
+        rows = rows[:size]
+        if has_more and rows:
+            last = rows[-1]
+            last_id = last.id if summary else last[0].id
+            next_cursor = encode_cursor(sort_key, sort_order, last.sort_value, last_id)
+    if summary:
+        items = [crud_ticket.ticket_summary_row(row) for row in rows]
+    else:
+        items = [row[0] for row in rows]
     import math
     return {
+        "view": view,
         "items": items,
         "total": total,
-        "page": page,
+        "page": None if use_cursor else page,
         "size": size,
-        "pages": math.ceil(total / size) if total > 0 else 0
+        "pages": math.ceil(total / size) if total else (0 if total == 0 else None),
+        "next_cursor": next_cursor,
+        "total_exact": total_exact,
     }
 @router.post("", response_model=Ticket, status_code=status.HTTP_201_CREATED)
 async def create_ticket(
@@ -302,7 +359,6 @@ async def create_ticket(
     ticket_in: TicketCreate,
     db: Annotated[AsyncSession, Depends(get_db)],
     current_user: Annotated[User, Depends(require_permission("ticket:create"))],
-    background_tasks: BackgroundTasks,
 ):
     """
     Create new ticket with safety validations.
@@ -338,48 +394,131 @@ async def create_ticket(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"No tiene permisos para crear tickets en este grupo. Su área responsable es: {current_user.group.name if current_user.group else 'Otra'}."
             )
-    ticket = await crud_ticket.ticket.create(db, obj_in=ticket_in, created_by_id=current_user.id, owner_group_id=current_user.group_id)
-    # Apply secondary tasks in a safe way to avoid 500 errors if they fail
-    try:
-        # Apply SLA Policy
-        await sla_service.apply_policy_to_ticket(db, ticket)
-        await crud_audit.audit_log.create_log(
-            db,
-            user_id=current_user.id,
-            event_type="ticket_created",
-            ip_address=request.client.host,
-            details={"ticket_id": str(ticket.id), "title": ticket.title}
+    # Una sola transacción (ticket, SLA, auditoría, vínculos, evento del activo); la
+    # indexación y el aviso al asignado corren tras el COMMIT
+    return await crud_ticket.ticket.create(
+        db, obj_in=ticket_in, created_by_id=current_user.id, owner_group_id=current_user.group_id,
+        creator=current_user, ip_address=request.client.host if request.client else None
+    )
+@router.post("/bulk", response_model=TicketBulkResult)
+async def bulk_create_tickets(
+    request: Request,
+    bulk_in: TicketBulkCreate,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(require_permission("ticket:import"))],
+):
+    """
+    Bulk ticket creation (migrations, SIEM backfills). Rows are validated up front
+    and reported one by one; valid rows are loaded in a single transaction.
+    With atomic=true nothing is inserted if any row is invalid.
+    """
+    if len(bulk_in.items) > settings.TICKET_BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Máximo {settings.TICKET_BULK_MAX_ROWS} tickets por lote. Use el script import_tickets para cargas mayores."
         )
-        # Index in Meilisearch
-        background_tasks.add_task(index_ticket_task, ticket)
-        # Log de Evento en el Activo (si aplica)
-        if ticket.asset_id:
-            from app.db.models.asset_history import AssetEventLog
-            asset_event = AssetEventLog(
-                asset_id=ticket.asset_id,
-                event_type="ticket_created",
-                description=f"Ticket creado: {ticket.ticket_id} - {ticket.title}",
-                user_id=current_user.id,
-                details={"ticket_id": str(ticket.id), "ticket_code": ticket.ticket_id}
-            )
-            db.add(asset_event)
-            await db.commit()
-    except Exception as e:
-        logger.warning(f"Error en tareas secundarias al crear ticket: {e}")
-    
-    # Return the created ticket using the correct CRUD call to avoid TypeError
-    return await crud_ticket.ticket.get(db, id=ticket.id, current_user=current_user, permission_key="read")
+    return await ticket_import_service.import_tickets(
+        db, bulk_in.items, current_user,
+        ip_address=request.client.host if request.client else None,
+        atomic=bulk_in.atomic
+    )
 
+# Primera página de comentarios: la misma en /full y en /{ticket_id}/comments
+COMMENTS_PAGE_SIZE = 50
+async def _comment_page(
+    db: AsyncSession, ticket_id: UUID, *, cursor: Optional[str] = None,
+    since: Optional[datetime] = None, limit: int = COMMENTS_PAGE_SIZE,
+) -> dict:
+    """Página de comentarios en orden cronológico con next_cursor / has_more."""
+    after = None
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if position["k"] != "created_at" or position["o"] != "asc":
+            raise HTTPException(status_code=400, detail="El cursor no corresponde a los comentarios.")
+        after = (position["v"], position["id"])
+    # Una fila extra indica si hay página siguiente
+    rows = await crud_ticket.ticket.get_comments(
+        db, ticket_id=ticket_id, include_internal=True, since=since, after=after, limit=limit + 1
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor("created_at", "asc", rows[-1].created_at, rows[-1].id) if rows else cursor
+    return {"items": rows, "next_cursor": next_cursor, "has_more": has_more}
+async def _ticket_etag(db: AsyncSession, current_user: User, ticket_id: UUID, *extra) -> Optional[str]:
+    """Autoriza con la consulta de versión (sin cargar el grafo) y devuelve el ETag; None si no existe."""
+    version = await crud_ticket.ticket.get_version(db, ticket_id)
+    if not version:
+        return None
+    await authorize_ticket(db, current_user, version, "read")
+    return make_etag("ticket", *version, *extra)
 @router.get("/{ticket_id}", response_model=Optional[Ticket])
 async def read_ticket(
-    ticket: Annotated[Optional[TicketModel], Depends(require_ticket_permission("read"))]
+    ticket_id: UUID,
+    request: Request,
+    response: Response,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)],
 ):
     """
     Get ticket by ID. Returns null if not found instead of 404 to avoid frontend crashes.
+    Honours If-None-Match: 304 without loading or serializing the ticket.
     """
-    if not ticket:
+    etag = await _ticket_etag(db, current_user, ticket_id)
+    if etag is None:
         return None
-    return ticket
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    return await load_ticket_detail(db, ticket_id)
+@router.get("/{ticket_id}/full", response_model=TicketFull)
+async def read_ticket_full(
+    ticket_id: UUID,
+    request: Request,
+    response: Response,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    fields: Optional[str] = Query(None, description=f"Paneles separados por coma: {','.join(TICKET_PANELS)} (por defecto todos)"),
+    comments_limit: int = Query(COMMENTS_PAGE_SIZE, ge=1, le=200),
+):
+    """
+    Detalle completo del ticket en una sola petición: se autoriza una vez (con la consulta
+    de versión, que también da el ETag) y se arman los paneles. Ticket, observadores y SLA
+    salen de una sola carga del grafo; comentarios, relaciones y subtareas cuestan una
+    consulta cada uno y sólo si se piden. Los comentarios vuelven paginados como en
+    /{ticket_id}/comments: el next_cursor sirve para las páginas siguientes y los nuevos.
+    """
+    panels = set(TICKET_PANELS)
+    if fields:
+        panels = {f.strip() for f in fields.split(",") if f.strip()}
+        unknown = panels - set(TICKET_PANELS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Paneles desconocidos: {', '.join(sorted(unknown))}")
+    etag = await _ticket_etag(db, current_user, ticket_id, "full", *sorted(panels), comments_limit)
+    if etag is None:
+        raise HTTPException(status_code=404, detail="Ticket no encontrado")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    full = {}
+    if panels & {"ticket", "watchers", "sla"}:
+        ticket = await load_ticket_detail(db, ticket_id)
+        if "ticket" in panels:
+            full["ticket"] = ticket
+        if "watchers" in panels:
+            full["watchers"] = ticket.watchers
+        if "sla" in panels:
+            full["sla"] = ticket.sla_metric
+    # Una AsyncSession no admite consultas concurrentes: van en serie sobre la misma conexión
+    if "comments" in panels:
+        full["comments"] = await _comment_page(db, ticket_id, limit=comments_limit)
+    if "relations" in panels:
+        full["relations"] = await crud_ticket.ticket.get_relations(db, ticket_id=ticket_id)
+    if "subtasks" in panels:
+        full["subtasks"] = await crud_ticket.ticket.get_subtasks(db, ticket_id=ticket_id)
+    return full
 @router.put("/{ticket_id}", response_model=Ticket)
 async def update_ticket(
     request: Request,
@@ -387,7 +526,6 @@ async def update_ticket(
     ticket: Annotated[TicketModel, Depends(require_ticket_permission("update"))],
     db: Annotated[AsyncSession, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)], 
-    background_tasks: BackgroundTasks,
 ):
     """
     Update a ticket.
@@ -444,21 +582,55 @@ async def update_ticket(
         user_id=current_user.id,
         event_type="ticket_updated",
         ip_address=request.client.host,
+        target_type="ticket",
+        target_id=ticket.id,
         details=audit_details
     )
-    # Update Index
-    background_tasks.add_task(index_ticket_task, updated_ticket)
     return await crud_ticket.ticket.get(db, id=updated_ticket.id, current_user=current_user, permission_key="read")
-@router.get("/{ticket_id}/comments", response_model=List[TicketComment])
+@router.get("/{ticket_id}/comments", response_model=TicketCommentPage)
 async def read_ticket_comments(
-    ticket: Annotated[TicketModel, Depends(require_ticket_permission("read"))],
+    ticket: Annotated[Any, Depends(require_ticket_access("read"))],
     db: Annotated[AsyncSession, Depends(get_db)],
+    cursor: Optional[str] = None,
+    since: Optional[datetime] = None,
+    limit: int = Query(COMMENTS_PAGE_SIZE, ge=1, le=200),
 ):
     """
-    Get ticket comments.
+    Get ticket comments in chronological order, paginated by cursor.
+    `since` returns only comments created after that instant; re-sending the last
+    `next_cursor` later returns only the comments added since that page.
     """
-    comments = await crud_ticket.ticket.get_comments(db, ticket_id=ticket.id, include_internal=True)
-    return comments
+    return await _comment_page(db, ticket.id, cursor=cursor, since=since, limit=limit)
+@router.get("/{ticket_id}/timeline", response_model=TicketTimelinePage)
+async def read_ticket_timeline(
+    ticket: Annotated[Any, Depends(require_ticket_access("read"))],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    cursor: Optional[str] = None,
+    order: Literal["asc", "desc"] = "desc",
+    limit: int = Query(50, ge=1, le=200),
+):
+    """
+    Actividad del ticket (auditoría, comentarios y transiciones de SLA) en un único
+    flujo ordenado por fecha, paginado por cursor.
+    """
+    after = None
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if position["k"] != "timeline" or position["o"] != order:
+            raise HTTPException(status_code=400, detail="El cursor no corresponde al orden solicitado.")
+        after = (position["v"], position["id"])
+    rows = await ticket_timeline_service.get_timeline(
+        db, ticket.id, after=after, limit=limit + 1, descending=order == "desc"
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor("timeline", order, rows[-1].occurred_at, rows[-1].id)
+    return {"items": rows, "next_cursor": next_cursor, "has_more": has_more}
 @router.post("/{ticket_id}/comments", response_model=TicketComment)
 async def create_ticket_comment(
     request: Request,
@@ -507,6 +679,8 @@ async def create_ticket_comment(
         user_id=current_user.id,
         event_type="comment_added",
         ip_address=request.client.host,
+        target_type="ticket",
+        target_id=ticket.id,
         details={"ticket_id": str(ticket.id), "comment_id": str(comment.id)}
     )
     return comment
@@ -536,6 +710,8 @@ async def create_ticket_relation(
         user_id=current_user.id,
         event_type="ticket_related",
         ip_address=request.client.host,
+        target_type="ticket",
+        target_id=ticket.id,
         details={"source": str(ticket.id), "target": str(relation.target_ticket_id), "type": relation.relation_type}
     )
     return relation
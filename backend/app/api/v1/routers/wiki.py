@@ -1,15 +1,17 @@
 from typing import List, Any, Annotated, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query, Body
+from fastapi import APIRouter, Depends, HTTPException, Query, Body, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, func, or_, delete, update
 from sqlalchemy.orm import selectinload
 from slugify import slugify
 
 from app.api.deps import get_db, get_current_active_user
+from app.core.etag import etag_matches, make_etag, not_modified, set_etag
 from app.db.models.user import User
 from app.db.models.wiki import WikiSpace, WikiPage, WikiPageHistory
-from app.db.models.group import Group
+from app.services.group_service import group_service
+from app.services.hierarchy_service import hierarchy_service
 from app.schemas.wiki import (
     WikiSpace as WikiSpaceSchema, WikiSpaceCreate, WikiSpaceUpdate, WikiSpaceWithPages,
     WikiPage as WikiPageSchema, WikiPageCreate, WikiPageUpdate,
@@ -18,18 +20,6 @@ from app.schemas.wiki import (
 
 router = APIRouter()
 
-# --- HELPER ---
-async def get_descendant_group_ids(db: AsyncSession, group_id: UUID) -> List[UUID]:
-    """
-    Obtiene recursivamente todos los IDs de los grupos hijos.
-    """
-    descendants = [group_id]
-    result = await db.execute(select(Group.id).where(Group.parent_id == group_id))
-    child_ids = result.scalars().all()
-    for cid in child_ids:
-        descendants.extend(await get_descendant_group_ids(db, cid))
-    return descendants
-
 # --- SPACES ---
 
 @router.get("/spaces", response_model=List[WikiSpaceSchema])
@@ -48,7 +38,7 @@ async def read_spaces(
         
         if current_user.group_id:
             # Obtener todos mis grupos (el mío y mis descendientes)
-            allowed_group_ids = await get_descendant_group_ids(db, current_user.group_id)
+            allowed_group_ids = await group_service.get_all_child_group_ids(db, current_user.group_id)
             conditions.append(WikiSpace.owner_group_id.in_(allowed_group_ids))
             
         query = query.filter(or_(*conditions))
@@ -484,20 +474,27 @@ async def convert_to_editable(
 @router.get("/pages/{page_id}")
 async def read_page(
     page_id: UUID,
+    request: Request,
+    response: Response,
     db: Annotated[AsyncSession, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)]
 ):
+    # Incrementar vistas y leer la versión en una sola sentencia. updated_at=updated_at evita
+    # que la vista dispare onupdate: el ETag sólo cambia al editar (view_count puede quedar viejo en un 304)
     result = await db.execute(
-        select(WikiPage)
+        update(WikiPage)
         .where(WikiPage.id == page_id)
+        .values(view_count=WikiPage.view_count + 1, updated_at=WikiPage.updated_at)
+        .returning(WikiPage.created_at, WikiPage.updated_at)
     )
-    page = result.scalar_one_or_none()
-    if not page: raise HTTPException(404, "Page not found")
-    
-    # Incrementar vistas de forma segura
-    page.view_count += 1
+    version = result.first()
+    if not version: raise HTTPException(404, "Page not found")
     await db.commit()
-    await db.refresh(page)
+    etag = make_etag("wiki_page", page_id, *version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    page = await db.get(WikiPage, page_id)
 
     # Devolvemos un dict plano para evitar errores de serialización/Greenlet
     return {
@@ -570,7 +567,10 @@ async def delete_page(
     page = await db.get(WikiPage, page_id)
     if not page: raise HTTPException(404, "Page not found")
     
-    await db.delete(page)
+    # Subárbol completo en una sola consulta recursiva y borrado por conjunto
+    page_ids = await hierarchy_service.get_descendant_ids(db, WikiPage, page_id)
+    await db.execute(delete(WikiPageHistory).where(WikiPageHistory.page_id.in_(page_ids)))
+    await db.execute(delete(WikiPage).where(WikiPage.id.in_(page_ids)))
     await db.commit()
     return {"status": "ok"}
 
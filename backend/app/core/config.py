@@ -24,6 +24,65 @@ class Settings(BaseSettings):
     IMAP_ENABLED: bool = False
     
     RECAPTCHA_SECRET_KEY: str = ""
+    # Caché de principales (auth). REDIS_URL vacío = sólo LRU en proceso
+    REDIS_URL: str = ""
+    PRINCIPAL_CACHE_TTL: int = 120
+    PRINCIPAL_CACHE_LOCAL_TTL: int = 15
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 4096
+    # TTL (s) de la caché de descendientes de grupos por proceso
+    GROUP_HIERARCHY_CACHE_TTL: int = 60
+    # Totales de listados paginados: exact | estimated | auto (ver count_service)
+    COUNT_CACHE_TTL: int = 30
+    COUNT_ESTIMATE_MIN_ROWS: int = 10000
+    COUNT_MODE_TICKETS: str = "auto"
+    COUNT_MODE_ASSETS: str = "auto"
+    COUNT_MODE_SOC_ALERTS: str = "auto"
+    COUNT_MODE_LOCATIONS: str = "exact"
+    COUNT_MODE_DAILY_REPORTS: str = "exact"
+    # Alta masiva de tickets: máximo de filas por request y umbral para usar COPY
+    TICKET_BULK_MAX_ROWS: int = 5000
+    BULK_COPY_MIN_ROWS: int = 500
+    # Renderizado de documentos en pool de procesos (por worker, ver render_executor)
+    RENDER_WORKERS: int = 2
+    RENDER_MAX_QUEUE: int = 20
+    RENDER_TIMEOUT: int = 120
+    RENDER_MAX_TASKS_PER_CHILD: int = 50
+    # PDFs con más filas se generan como exportación en segundo plano (202)
+    RENDER_ASYNC_MIN_ROWS: int = 500
+    # Exportación de tickets: filas por lote del cursor y tope del PDF (CSV / XLSX no tienen tope)
+    EXPORT_BATCH_SIZE: int = 1000
+    EXPORT_PDF_MAX_ROWS: int = 1000
+    # Exportaciones en segundo plano (ver export_job_service)
+    EXPORT_JOBS_DIR: str = "/app/uploads/exports"
+    EXPORT_JOB_CONCURRENCY: int = 2
+    EXPORT_JOB_MAX_PER_USER: int = 2
+    EXPORT_JOB_TTL_HOURS: int = 24
+    EXPORT_JOB_PROGRESS_INTERVAL: float = 1.0
+    EXPORT_JOB_STALE_MINUTES: int = 30
+    EXPORT_JOB_CLEANUP_INTERVAL: int = 600
+    # Escrituras en Meilisearch (ver search_indexer): reintentos con backoff y timeout por envío
+    SEARCH_INDEX_MAX_RETRIES: int = 4
+    SEARCH_INDEX_TIMEOUT: float = 10.0
+    # Outbox de búsqueda (ver search_outbox_dispatcher): avisos por lote y espera (s) con el outbox vacío
+    SEARCH_OUTBOX_BATCH_SIZE: int = 1000
+    SEARCH_OUTBOX_POLL_INTERVAL: float = 1.0
+    # Búsqueda de respaldo local (ver search_fallback): timeout (s) de cada búsqueda en Meilisearch,
+    # fallas seguidas que abren el circuito, segundos hasta una búsqueda de prueba, refresco (s)
+    # del índice local, segundos hasta reconstruirlo / liberarlo y largo máximo de cada texto copiado
+    SEARCH_FALLBACK_ENABLED: bool = True
+    SEARCH_QUERY_TIMEOUT: int = 5
+    SEARCH_FALLBACK_FAILURE_THRESHOLD: int = 3
+    SEARCH_FALLBACK_RESET_SECONDS: float = 30.0
+    SEARCH_FALLBACK_REFRESH_INTERVAL: float = 5.0
+    SEARCH_FALLBACK_MAX_AGE: int = 900
+    SEARCH_FALLBACK_TEXT_MAX_CHARS: int = 500
+    # Reindexado completo (ver search_reindex_service): tramos de ids, tramos en paralelo,
+    # documentos por envío, segundos entre puntos de control y minutos sin latido = abandonado
+    SEARCH_REINDEX_CHUNKS: int = 64
+    SEARCH_REINDEX_WORKERS: int = 4
+    SEARCH_REINDEX_BATCH_SIZE: int = 5000
+    SEARCH_REINDEX_PROGRESS_INTERVAL: float = 5.0
+    SEARCH_REINDEX_STALE_MINUTES: int = 10
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 settings = Settings()
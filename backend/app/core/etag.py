@@ -0,0 +1,40 @@
+"""
+GET condicionales (ETag / If-None-Match).
+El ETag es débil (W/): se deriva de updated_at / version y de agregados baratos
+(count, max) de las filas hijas, leídos con una consulta de versión ANTES de cargar
+el grafo completo. Si el cliente ya tiene esa versión se responde 304 sin serializar.
+"""
+import hashlib
+from typing import Any
+from fastapi import Request, Response
+from sqlalchemy import func, select
+# El navegador guarda la respuesta pero revalida siempre con If-None-Match
+CACHE_CONTROL = "private, no-cache"
+def make_etag(*parts: Any) -> str:
+    raw = "|".join("" if p is None else p.isoformat() if hasattr(p, "isoformat") else str(p) for p in parts)
+    return f'W/"{hashlib.sha1(raw.encode()).hexdigest()[:24]}"'
+def etag_matches(request: Request, etag: str) -> bool:
+    """Comparación débil (RFC 9110): se ignora el prefijo W/ en ambos lados."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+def child_version(table: Any, ts: Any, *criteria) -> list:
+    """count(*) y max(ts) de filas hijas, como subconsultas escalares para la consulta de versión."""
+    return [
+        select(func.count()).select_from(table).where(*criteria).scalar_subquery(),
+        select(func.max(ts)).select_from(table).where(*criteria).scalar_subquery(),
+    ]
+def collection_version(model: Any, *criteria):
+    """Versión de un listado: cantidad de filas y última modificación (las bajas cambian el count)."""
+    return select(
+        func.count(), func.max(func.coalesce(model.updated_at, model.created_at))
+    ).select_from(model).where(*criteria)
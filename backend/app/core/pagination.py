@@ -0,0 +1,44 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+from sqlalchemy import and_, or_, tuple_
+def encode_cursor(sort_key: str, order: str, value: Any, last_id: UUID) -> str:
+    """
+    Codifica la posición de la última fila entregada: valor de la columna de
+    orden activa + id como desempate.
+    """
+    if isinstance(value, datetime):
+        value = {"dt": value.isoformat()}
+    elif isinstance(value, UUID):
+        value = str(value)
+    payload = {"k": sort_key, "o": order, "v": value, "id": str(last_id)}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+def decode_cursor(cursor: str) -> dict:
+    """Decodifica un cursor; lanza ValueError si está mal formado."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value = payload.get("v")
+        if isinstance(value, dict) and "dt" in value:
+            value = datetime.fromisoformat(value["dt"])
+        return {"k": payload["k"], "o": payload["o"], "v": value, "id": UUID(payload["id"])}
+    except Exception as e:
+        raise ValueError(f"Cursor inválido: {e}") from e
+def keyset_predicate(column: Any, id_column: Any, value: Any, last_id: UUID, descending: bool):
+    """
+    Predicado de búsqueda (seek) para ORDER BY column, id en la misma dirección.
+    Sigue el orden de NULLs por defecto de PostgreSQL: NULLS FIRST en DESC y
+    NULLS LAST en ASC.
+    """
+    if column is id_column:
+        return id_column < last_id if descending else id_column > last_id
+    if descending:
+        if value is None:
+            return or_(and_(column.is_(None), id_column < last_id), column.isnot(None))
+        return tuple_(column, id_column) < tuple_(value, last_id)
+    if value is None:
+        return and_(column.is_(None), id_column > last_id)
+    return or_(tuple_(column, id_column) > tuple_(value, last_id), column.is_(None))
@@ -5,6 +5,7 @@ class PermissionEnum(str, Enum):
     TICKET_READ_GROUP = "ticket:read:group"
     TICKET_READ_OWN = "ticket:read:own"
     TICKET_CREATE = "ticket:create"
+    TICKET_IMPORT = "ticket:import"
     TICKET_UPDATE_OWN = "ticket:update:own"
     TICKET_UPDATE_ASSIGNED = "ticket:update:assigned"
     TICKET_ASSIGN_GROUP = "ticket:assign:group"
@@ -72,3 +73,37 @@ class PermissionEnum(str, Enum):
     # --- PARTES (Gestión Avanzada) ---
     PARTES_MANAGE = "partes:manage" # Eliminar, editar cualquiera, etc.
 ALL_PERMISSIONS = [p.value for p in PermissionEnum]
+# Sufijos de alcance reconocidos en las claves "recurso:acción:alcance"
+PERMISSION_SCOPES = frozenset({"own", "assigned", "group", "global", "all"})
+class PermissionIndex:
+    """
+    Índice compilado de permisos de un principal.
+    Se construye una sola vez por carga del usuario y permite consultar en O(1)
+    tanto claves exactas como los alcances concedidos para (recurso, acción).
+    Una clave sin alcance ("ticket:comment") se indexa con alcance None (maestra).
+    """
+    __slots__ = ("keys", "_scopes")
+    def __init__(self, keys):
+        self.keys = frozenset(keys)
+        scopes = {}
+        for key in self.keys:
+            resource, action, scope = self.split(key)
+            scopes.setdefault((resource, action), set()).add(scope)
+        self._scopes = {k: frozenset(v) for k, v in scopes.items()}
+    @staticmethod
+    def split(key: str):
+        parts = key.split(":")
+        if len(parts) >= 3 and parts[-1] in PERMISSION_SCOPES:
+            return ":".join(parts[:-2]), parts[-2], parts[-1]
+        return ":".join(parts[:-1]), parts[-1], None
+    def has(self, key: str) -> bool:
+        return key in self.keys
+    def scopes(self, resource: str, action: str) -> frozenset:
+        """Alcances concedidos para (recurso, acción); None representa el permiso maestro."""
+        return self._scopes.get((resource, action), frozenset())
+    def __contains__(self, key: str) -> bool:
+        return key in self.keys
+    def __iter__(self):
+        return iter(self.keys)
+    def __len__(self):
+        return len(self.keys)
@@ -8,7 +8,28 @@ from app.db.models.asset import Asset
 from app.db.models.asset_history import AssetLocationHistory, AssetIPHistory, AssetInstallRecord, AssetEventLog
 from app.schemas.asset import AssetCreate, AssetUpdate, AssetInstallRecordCreate
 from sqlalchemy.sql import func
-from app.services.search_service import search_service
+# Columnas de Asset que van al documento de Meilisearch (outbox de búsqueda y reindex completo)
+ASSET_SEARCH_COLUMNS = (
+    "id", "hostname", "ip_address", "mac_address", "serial", "asset_tag", "status", "criticality",
+    "location_node_id", "dependencia", "codigo_dependencia", "device_type", "last_seen",
+)
+def asset_search_document(asset) -> dict:
+    """Documento de Meilisearch para un activo (objeto ORM o fila con ASSET_SEARCH_COLUMNS)."""
+    return {
+        "id": str(asset.id),
+        "hostname": asset.hostname,
+        "ip_address": asset.ip_address,
+        "mac_address": asset.mac_address,
+        "serial": asset.serial,
+        "asset_tag": asset.asset_tag,
+        "status": asset.status,
+        "criticality": asset.criticality,
+        "location_node_id": str(asset.location_node_id) if asset.location_node_id else None,
+        "dependencia": asset.dependencia,
+        "codigo_dependencia": asset.codigo_dependencia,
+        "device_type": asset.device_type,
+        "last_seen": asset.last_seen.isoformat() if asset.last_seen else None
+    }
 
 class CRUDAsset:
     async def get(self, db: AsyncSession, id: UUID) -> Optional[Asset]:
@@ -42,10 +63,6 @@ class CRUDAsset:
                 "status", "criticality", "av_product", "device_type", "os_name", "os_version", "observations", "last_seen",
                 "created_at", "updated_at", "deleted_at"
             ])
-            try:
-                search_service.delete_asset(str(db_obj.id))
-            except Exception as e:
-                logger.warning(f"Failed to delete asset from search: {e}")
         return db_obj
 
     async def hard_delete(self, db: AsyncSession, id: UUID) -> bool:
@@ -57,10 +74,6 @@ class CRUDAsset:
         if db_obj:
             await db.delete(db_obj)
             await db.commit()
-            try:
-                search_service.delete_asset(str(id))
-            except Exception as e:
-                logger.warning(f"Failed to hard delete asset from search: {e}")
             return True
         return False
 
@@ -74,27 +87,6 @@ class CRUDAsset:
             "status", "criticality", "av_product", "device_type", "os_name", "os_version", "observations", "last_seen",
             "created_at", "updated_at"
         ])
-        
-        # Indexar en Meilisearch
-        try:
-            asset_data = {
-                "id": str(db_obj.id),
-                "hostname": db_obj.hostname,
-                "ip_address": db_obj.ip_address,
-                "mac_address": db_obj.mac_address,
-                "serial": db_obj.serial,
-                "asset_tag": db_obj.asset_tag,
-                "status": db_obj.status,
-                "criticality": db_obj.criticality,
-                "location_node_id": str(db_obj.location_node_id) if db_obj.location_node_id else None,
-                "dependencia": db_obj.dependencia,
-                "codigo_dependencia": db_obj.codigo_dependencia,
-                "device_type": db_obj.device_type,
-                "last_seen": db_obj.last_seen.isoformat() if db_obj.last_seen else None
-            }
-            search_service.index_asset(asset_data)
-        except Exception as e:
-            logger.warning(f"Failed to index asset: {e}")
 
         if db_obj.location_node_id:
             loc_history = AssetLocationHistory(
@@ -172,28 +164,6 @@ class CRUDAsset:
             "status", "criticality", "av_product", "device_type", "os_name", "os_version", "observations", "last_seen",
             "created_at", "updated_at"
         ])
-
-        # Actualizar en Meilisearch
-        try:
-            asset_data = {
-                "id": str(db_obj.id),
-                "hostname": db_obj.hostname,
-                "ip_address": db_obj.ip_address,
-                "mac_address": db_obj.mac_address,
-                "serial": db_obj.serial,
-                "asset_tag": db_obj.asset_tag,
-                "status": db_obj.status,
-                "criticality": db_obj.criticality,
-                "location_node_id": str(db_obj.location_node_id) if db_obj.location_node_id else None,
-                "dependencia": db_obj.dependencia,
-                "codigo_dependencia": db_obj.codigo_dependencia,
-                "device_type": db_obj.device_type,
-                "last_seen": db_obj.last_seen.isoformat() if db_obj.last_seen else None
-            }
-            search_service.index_asset(asset_data)
-        except Exception as e:
-            logger.warning(f"Failed to index asset: {e}")
-
         return db_obj
     async def find_existing_asset(self, db: AsyncSession, serial: str = None, mac: str = None, hostname: str = None, ip: str = None) -> Optional[Asset]:
         # 1. Prioridad absoluta: Dirección MAC (Es lo más único en una red)
@@ -2,8 +2,17 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.models.audit_log import AuditLog
 from app.schemas.auth import AuditLogCreate # I will create this schema
 from uuid import UUID
-from typing import Optional
+from typing import Iterable, Optional, Tuple
 class CRUDAuditLog:
+    @staticmethod
+    def _target(details: dict, target_type: Optional[str], target_id: Optional[UUID]) -> Tuple[Optional[str], Optional[UUID]]:
+        """Entidad afectada; los eventos que sólo traen details["ticket_id"] se asocian al ticket."""
+        if target_id is None and details.get("ticket_id"):
+            try:
+                return target_type or "ticket", UUID(str(details["ticket_id"]))
+            except ValueError:
+                pass
+        return target_type, target_id
     def _clean_details(self, details: Optional[dict]) -> Optional[dict]:
         if not details:
             return details
@@ -34,9 +43,12 @@ class CRUDAuditLog:
         ip_address: Optional[str] = None,
         details: Optional[dict] = None,
         target_type: Optional[str] = None,
-        target_id: Optional[UUID] = None
+        target_id: Optional[UUID] = None,
+        commit: bool = True
     ) -> AuditLog:
+        """commit=False: sólo agrega la fila a la unidad de trabajo en curso."""
         log_details = details or {}
+        target_type, target_id = self._target(log_details, target_type, target_id)
         if target_type:
             log_details["target_type"] = target_type
         if target_id:
@@ -45,10 +57,43 @@ class CRUDAuditLog:
             user_id=user_id,
             event_type=event_type,
             ip_address=ip_address,
-            details=self._clean_details(log_details)
+            details=self._clean_details(log_details),
+            target_type=target_type,
+            target_id=target_id,
         )
         db.add(log_entry)
+        if not commit:
+            return log_entry
         await db.commit()
         await db.refresh(log_entry)
         return log_entry
+    async def create_logs(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: Optional[UUID],
+        event_type: str,
+        entries: Iterable[Tuple[Optional[UUID], Optional[dict]]],
+        target_type: Optional[str] = None,
+        ip_address: Optional[str] = None,
+    ) -> int:
+        """Un evento por (target_id, details) con un solo INSERT multi-fila / COPY; no confirma."""
+        from app.db.bulk import bulk_insert
+        rows = []
+        for entry_id, details in entries:
+            log_details = dict(details or {})
+            entry_type, entry_id = self._target(log_details, target_type, entry_id)
+            if entry_type:
+                log_details["target_type"] = entry_type
+            if entry_id:
+                log_details["target_id"] = str(entry_id)
+            rows.append({
+                "user_id": user_id,
+                "event_type": event_type,
+                "ip_address": ip_address,
+                "details": self._clean_details(log_details),
+                "target_type": entry_type,
+                "target_id": entry_id,
+            })
+        return await bulk_insert(db, AuditLog.__table__, rows)
 audit_log = CRUDAuditLog()
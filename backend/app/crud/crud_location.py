@@ -9,6 +9,7 @@ from app.db.models.location import LocationNode
 from app.db.models.asset import Asset
 from app.db.models.asset_history import AssetLocationHistory
 from app.schemas.location import LocationNodeCreate, LocationNodeUpdate
+from app.services.hierarchy_service import hierarchy_service
 logger = logging.getLogger(__name__)
 class CRUDLocation:
     async def get(self, db: AsyncSession, id: UUID) -> Optional[LocationNode]:
@@ -84,14 +85,6 @@ class CRUDLocation:
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
-    async def _get_all_descendants(self, db: AsyncSession, parent_id: UUID) -> List[UUID]:
-        result = await db.execute(select(LocationNode.id).where(LocationNode.parent_id == parent_id))
-        child_ids = [row[0] for row in result.fetchall()]
-        all_descendants = []
-        for cid in child_ids:
-            all_descendants.append(cid)
-            all_descendants.extend(await self._get_all_descendants(db, cid))
-        return all_descendants
     async def delete(self, db: AsyncSession, id: UUID) -> Optional[LocationNode]:
         obj = await self.get(db, id)
         if not obj:
@@ -107,7 +100,8 @@ class CRUDLocation:
         if lf_node.id == id:
             from fastapi import HTTPException
             raise HTTPException(status_code=400, detail="No se puede eliminar la carpeta de rescate Lost and Found (0000).")
-        all_ids_to_remove = [id] + await self._get_all_descendants(db, id)
+        # Subárbol completo en una sola consulta recursiva
+        all_ids_to_remove = await hierarchy_service.get_descendant_ids(db, LocationNode, id)
         await db.execute(sa_update(Asset).where(Asset.location_node_id.in_(all_ids_to_remove)).values(location_node_id=lf_node.id))
         await db.execute(sa_update(AssetLocationHistory).where(AssetLocationHistory.new_location_id.in_(all_ids_to_remove)).values(new_location_id=lf_node.id))
         await db.execute(sa_update(AssetLocationHistory).where(AssetLocationHistory.previous_location_id.in_(all_ids_to_remove)).values(previous_location_id=lf_node.id))
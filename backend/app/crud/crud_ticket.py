@@ -1,21 +1,103 @@
 from typing import Optional, List, Any, Dict, Annotated
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from uuid import UUID
+from uuid import UUID, uuid4
 from datetime import datetime
 import logging
-from app.db.models.ticket import Ticket, TicketComment, TicketSubtask, TicketWatcher
+from app.db.models.ticket import Ticket, TicketComment, TicketSubtask, TicketWatcher, TICKET_TS_CONFIG
 from app.db.models.user import User # Importar User para type hinting
 from app.schemas.ticket import (
     TicketCreate, TicketUpdate, TicketCommentCreate, TicketSubtaskCreate, 
     TicketSubtaskUpdate, TicketRelation, TicketSubtask, TicketRelationCreate
 )
 from app.services.sla_service import sla_service
-from app.services.search_service import search_service
 from app.crud.crud_audit import audit_log
 from app.services.group_service import group_service # Importar group_service
 from app.core.scopes import apply_scope_to_query # Importar funciones de scopes
 logger = logging.getLogger(__name__)
+def ticket_text_search(q: str):
+    """
+    Retorna (condición, ranking) de búsqueda full-text sobre tickets.search_vector.
+    websearch_to_tsquery acepta la sintaxis de buscador ("frase", -excluir, OR).
+    """
+    from sqlalchemy import func, literal_column
+    tsquery = func.websearch_to_tsquery(literal_column(f"'{TICKET_TS_CONFIG}'::regconfig"), q)
+    return Ticket.search_vector.op("@@")(tsquery), func.ts_rank(Ticket.search_vector, tsquery)
+def ticket_summary_projection(query):
+    """
+    Reemplaza las columnas de una consulta select(Ticket) (ya filtrada, con el JOIN
+    a groups) por la proyección de listado: columnas del ticket, nombres de tipo,
+    grupo y usuarios vía JOIN, y la cantidad de adjuntos como subconsulta.
+    """
+    from sqlalchemy import func, literal
+    from sqlalchemy.orm import aliased
+    from app.db.models.group import Group
+    from app.db.models.ticket import TicketType
+    from app.db.models.notifications import Attachment
+    owner_group = aliased(Group)
+    creator = aliased(User)
+    assignee = aliased(User)
+    attachment_count = (
+        select(func.count(Attachment.id))
+        .where(Attachment.ticket_id == Ticket.id)
+        .correlate(Ticket)
+        .scalar_subquery()
+    )
+    return (
+        query.with_only_columns(
+            Ticket.id, Ticket.title, Ticket.status, Ticket.priority, Ticket.platform,
+            Ticket.ticket_type_id,
+            func.coalesce(TicketType.name, literal("General")).label("ticket_type_name"),
+            TicketType.color.label("ticket_type_color"),
+            func.coalesce(Ticket.group_id, Ticket.owner_group_id).label("group_id"),
+            func.coalesce(Group.name, owner_group.name, literal("SOPORTE")).label("group_name"),
+            Ticket.assigned_to_id, assignee.username.label("assigned_to_name"),
+            Ticket.created_by_id, func.coalesce(creator.username, literal("Sistema")).label("created_by_name"),
+            Ticket.asset_id, Ticket.is_private, Ticket.is_global,
+            Ticket.sla_deadline, Ticket.created_at, Ticket.updated_at, Ticket.closed_at,
+            attachment_count.label("attachment_count"),
+            maintain_column_froms=True,
+        )
+        .outerjoin(TicketType, Ticket.ticket_type_id == TicketType.id)
+        .outerjoin(owner_group, Ticket.owner_group_id == owner_group.id)
+        .outerjoin(creator, Ticket.created_by_id == creator.id)
+        .outerjoin(assignee, Ticket.assigned_to_id == assignee.id)
+    )
+def ticket_summary_row(row) -> Dict[str, Any]:
+    data = {k: v for k, v in row._mapping.items() if k != "sort_value"}
+    data["has_attachments"] = bool(data["attachment_count"])
+    return data
+# Columnas de Ticket que van al documento de Meilisearch (outbox de búsqueda y reindex completo)
+TICKET_SEARCH_COLUMNS = (
+    "id", "title", "description", "status", "priority", "group_id", "owner_group_id", "assigned_to_id",
+    "created_by_id", "ticket_type_id", "is_global", "is_private", "created_at", "updated_at",
+)
+def ticket_search_document(ticket: Ticket) -> Dict[str, Any]:
+    """Documento de Meilisearch para un ticket (objeto ORM o fila con TICKET_SEARCH_COLUMNS)."""
+    return {
+        "id": str(ticket.id),
+        "title": ticket.title,
+        "description": ticket.description,
+        "status": ticket.status,
+        "priority": ticket.priority,
+        "group_id": str(ticket.group_id) if ticket.group_id else None,
+        "owner_group_id": str(ticket.owner_group_id) if ticket.owner_group_id else None,
+        "assigned_to_id": str(ticket.assigned_to_id) if ticket.assigned_to_id else None,
+        "created_by_id": str(ticket.created_by_id) if ticket.created_by_id else None,
+        "ticket_type_id": str(ticket.ticket_type_id) if ticket.ticket_type_id else None,
+        "is_global": ticket.is_global,
+        "is_private": ticket.is_private,
+        "created_at": ticket.created_at.isoformat() if ticket.created_at else None,
+        "updated_at": ticket.updated_at.isoformat() if ticket.updated_at else None,
+    }
+TICKET_EXPORT_HEADERS = ("ID", "Title", "Status", "Priority", "Created At", "SLA Deadline")
+def ticket_export_row(row) -> List[Any]:
+    """Fila de exportación (CSV / XLSX / PDF) a partir de stream_export_rows."""
+    return [
+        str(row.id), row.title, row.status, row.priority,
+        row.created_at.strftime("%Y-%m-%d %H:%M") if row.created_at else "",
+        row.sla_deadline.strftime("%Y-%m-%d %H:%M") if row.sla_deadline else "N/A",
+    ]
 class CRUDTicket:
     async def get(self, db: AsyncSession, id: UUID, current_user: User, permission_key: str) -> Optional[Ticket]:
         from sqlalchemy.orm import selectinload
@@ -47,6 +129,100 @@ class CRUDTicket:
             )
         result = await db.execute(query)
         return result.scalar_one_or_none()
+    async def get_version(self, db: AsyncSession, ticket_id: UUID):
+        """
+        Consulta de versión para el ETag del detalle: columnas de acceso (para autorizar
+        sin cargar el grafo), updated_at y count/max de cada panel en un solo round-trip.
+        """
+        from sqlalchemy import func
+        from app.core.etag import child_version
+        from app.db.models.notifications import Attachment
+        from app.db.models.sla import SLAMetric
+        from app.db.models.ticket import TicketRelation, TicketSubtask as TicketSubtaskModel
+        comment_ts = func.coalesce(TicketComment.updated_at, TicketComment.created_at)
+        query = select(
+            Ticket.id, Ticket.group_id, Ticket.owner_group_id, Ticket.assigned_to_id,
+            Ticket.created_by_id, Ticket.is_global, Ticket.created_at, Ticket.updated_at,
+            *child_version(SLAMetric, SLAMetric.updated_at, SLAMetric.ticket_id == ticket_id),
+            *child_version(Attachment, Attachment.created_at, Attachment.ticket_id == ticket_id),
+            *child_version(TicketWatcher, TicketWatcher.created_at, TicketWatcher.ticket_id == ticket_id),
+            *child_version(TicketComment, comment_ts, TicketComment.ticket_id == ticket_id),
+            *child_version(TicketSubtaskModel, TicketSubtaskModel.updated_at, TicketSubtaskModel.ticket_id == ticket_id),
+            *child_version(
+                TicketRelation, TicketRelation.created_at,
+                (TicketRelation.source_ticket_id == ticket_id) | (TicketRelation.target_ticket_id == ticket_id)
+            ),
+        ).where(Ticket.id == ticket_id)
+        result = await db.execute(query)
+        return result.first()
+    async def read_scope(self, db: AsyncSession, current_user: User) -> List[Any]:
+        """
+        Condiciones de visibilidad de tickets (permiso ticket:read) para el listado y
+        las exportaciones: privados, global / grupo (con descendientes) / propios.
+        Vacía para superusuarios.
+        """
+        from sqlalchemy import or_
+        if current_user.is_superuser:
+            return []
+        criteria = [or_(
+            Ticket.is_private.isnot(True),
+            Ticket.created_by_id == current_user.id,
+            Ticket.assigned_to_id == current_user.id
+        )]
+        read_scopes = current_user.permission_index.scopes("ticket", "read")
+        if "global" not in read_scopes:
+            access_conditions = [Ticket.is_global == True]
+            if "group" in read_scopes:
+                child_ids = await group_service.get_all_child_group_ids(db, current_user.group_id)
+                access_conditions.append(Ticket.group_id.in_(child_ids))
+                access_conditions.append(Ticket.owner_group_id.in_(child_ids))
+            if "own" in read_scopes:
+                access_conditions.append(Ticket.created_by_id == current_user.id)
+                access_conditions.append(Ticket.assigned_to_id == current_user.id)
+            criteria.append(or_(*access_conditions))
+        return criteria
+    async def search_scope(self, db: AsyncSession, current_user: User) -> Optional[str]:
+        """
+        Las condiciones de read_scope como filtro de Meilisearch: la búsqueda devuelve
+        sólo hits autorizados y la paginación del motor queda correcta. None para superusuarios.
+        """
+        from app.services.search_service import filter_value
+        if current_user.is_superuser:
+            return None
+        me = filter_value(current_user.id)
+        criteria = [f"(is_private != true OR created_by_id = {me} OR assigned_to_id = {me})"]
+        read_scopes = current_user.permission_index.scopes("ticket", "read")
+        if "global" not in read_scopes:
+            access_conditions = ["is_global = true"]
+            if "group" in read_scopes:
+                child_ids = await group_service.get_all_child_group_ids(db, current_user.group_id)
+                if child_ids:
+                    groups = ", ".join(filter_value(group_id) for group_id in child_ids)
+                    access_conditions.append(f"group_id IN [{groups}]")
+                    access_conditions.append(f"owner_group_id IN [{groups}]")
+            if "own" in read_scopes:
+                access_conditions.append(f"created_by_id = {me}")
+                access_conditions.append(f"assigned_to_id = {me}")
+            criteria.append(f"({' OR '.join(access_conditions)})")
+        return " AND ".join(criteria)
+    async def stream_export_rows(
+        self, db: AsyncSession, criteria: List[Any], batch_size: int = 1000, limit: Optional[int] = None
+    ):
+        """
+        Filas de exportación en lotes de batch_size leídas con un cursor del servidor
+        (yield_per): la memoria no depende de la cantidad total de tickets.
+        """
+        query = (
+            select(Ticket.id, Ticket.title, Ticket.status, Ticket.priority, Ticket.created_at, Ticket.sla_deadline)
+            .where(Ticket.deleted_at.is_(None), *criteria)
+            .order_by(Ticket.created_at.desc(), Ticket.id.desc())
+            .execution_options(yield_per=batch_size)
+        )
+        if limit:
+            query = query.limit(limit)
+        result = await db.stream(query)
+        async for partition in result.partitions():
+            yield partition
     async def get_multi(
         self, 
         db: AsyncSession, 
@@ -61,15 +237,11 @@ class CRUDTicket:
         asset_id: Optional[UUID] = None,
     ) -> List[Ticket]:
         from sqlalchemy.orm import selectinload
-        from sqlalchemy import or_
         query = select(Ticket).filter(Ticket.deleted_at == None)
+        rank = None
         if q:
-            query = query.filter(
-                or_(
-                    Ticket.title.ilike(f"%{q}%"),
-                    Ticket.description.ilike(f"%{q}%")
-                )
-            )
+            matches, rank = ticket_text_search(q)
+            query = query.filter(matches)
         if status:
             query = query.filter(Ticket.status == status)
         if priority:
@@ -104,62 +276,109 @@ class CRUDTicket:
                 selectinload(Ticket.asset),
                 selectinload(Ticket.attachments)
             )
-            .order_by(Ticket.created_at.desc())
+            .order_by(*([rank.desc()] if rank is not None else []), Ticket.created_at.desc())
             .offset(skip)
             .limit(limit)
         )
         return result.scalars().all()
-    async def create(self, db: AsyncSession, obj_in: TicketCreate, created_by_id: UUID, owner_group_id: UUID) -> Ticket:
+    async def create(
+        self,
+        db: AsyncSession,
+        obj_in: TicketCreate,
+        created_by_id: UUID,
+        owner_group_id: UUID,
+        *,
+        creator: Optional[User] = None,
+        ip_address: Optional[str] = None,
+    ) -> Ticket:
+        """
+        Unidad de trabajo de creación: ticket, métrica SLA, auditoría, evento del activo
+        y notificación al asignado se escriben en un único flush; los vínculos M2M con
+        un INSERT multi-fila cada uno, y todo se confirma en un solo COMMIT. La
+        respuesta se arma con los objetos ya en memoria (sin releer el ticket) y la
+        indexación / aviso por WebSocket corren como hooks post-commit.
+        """
+        from sqlalchemy import insert, update as sa_update
+        from sqlalchemy.orm import selectinload
+        from sqlalchemy.orm.attributes import set_committed_value
+        from app.db.models.ticket import TicketType, ticket_assets, ticket_locations
+        from app.db.models.group import Group
+        from app.db.models.asset import Asset
+        from app.db.models.location import LocationNode
+        from app.db.models.notifications import Attachment
+        from app.db.models.asset_history import AssetEventLog
+        from app.services.notification_service import notification_service
         data = obj_in.model_dump()
-        attachment_ids = data.pop("attachment_ids", [])
-        asset_ids = data.pop("asset_ids", [])
-        location_ids = data.pop("location_ids", [])
-        
-        db_obj = Ticket(**data, created_by_id=created_by_id, owner_group_id=owner_group_id)
+        attachment_ids = data.pop("attachment_ids", None) or []
+        asset_ids = list(dict.fromkeys(data.pop("asset_ids", None) or []))
+        location_ids = list(dict.fromkeys(data.pop("location_ids", None) or []))
+        db_obj = Ticket(id=uuid4(), **data, created_by_id=created_by_id, owner_group_id=owner_group_id)
         if not db_obj.sla_deadline:
             db_obj.sla_deadline = await sla_service.calculate_deadline(db, db_obj.priority)
+        # Lecturas antes de agregar nada a la sesión: ningún autoflush parte el flush único.
+        # db.get resuelve desde el identity map lo ya cargado (creador, tipo validado, grupo).
+        ticket_type = await db.get(TicketType, db_obj.ticket_type_id) if db_obj.ticket_type_id else None
+        group = await db.get(Group, db_obj.group_id) if db_obj.group_id else None
+        owner_group = group if owner_group_id == db_obj.group_id else (await db.get(Group, owner_group_id) if owner_group_id else None)
+        creator = creator or await db.get(User, created_by_id)
+        assignee = await db.get(User, db_obj.assigned_to_id) if db_obj.assigned_to_id else None
+        location = await db.get(LocationNode, db_obj.location_id) if db_obj.location_id else None
+        assets_by_id = {}
+        if asset_ids or db_obj.asset_id:
+            res_assets = await db.execute(
+                select(Asset).options(selectinload(Asset.location))
+                .where(Asset.id.in_({*asset_ids, *([db_obj.asset_id] if db_obj.asset_id else [])}))
+            )
+            assets_by_id = {a.id: a for a in res_assets.scalars().all()}
+        locations = []
+        if location_ids:
+            res_locations = await db.execute(select(LocationNode).where(LocationNode.id.in_(location_ids)))
+            locations = res_locations.scalars().all()
+        sla_metric = await sla_service.apply_policy_to_ticket(db, db_obj, commit=False)
         db.add(db_obj)
+        await audit_log.create_log(
+            db, user_id=created_by_id, event_type="ticket_created", ip_address=ip_address,
+            target_type="ticket", target_id=db_obj.id, details={"title": db_obj.title}, commit=False
+        )
+        if db_obj.asset_id:
+            db.add(AssetEventLog(
+                asset_id=db_obj.asset_id,
+                event_type="ticket_created",
+                description=f"Ticket creado: {db_obj.title}",
+                user_id=created_by_id,
+                details={"ticket_id": str(db_obj.id)}
+            ))
+        if db_obj.assigned_to_id and db_obj.assigned_to_id != created_by_id:
+            notification_service.queue_user_notification(
+                db, user_id=db_obj.assigned_to_id,
+                title="🎟️ Ticket Asignado",
+                message=f"Se te ha asignado el ticket: {db_obj.title}",
+                link=f"/tickets/{db_obj.id}"
+            )
         await db.flush()
-        
-        # Auditoría inicial
-        await audit_log.create_log(db, user_id=created_by_id, event_type="ticket_created", target_type="ticket", target_id=db_obj.id, details={"title": db_obj.title})
-        
-        # 1. Vincular Adjuntos
-        if attachment_ids:
-            from app.db.models.notifications import Attachment
-            from sqlalchemy import update as sa_update
-            await db.execute(sa_update(Attachment).where(Attachment.id.in_(attachment_ids)).values(ticket_id=db_obj.id))
-            
-        # 2. Vincular Múltiples Activos
+        # Vínculos: un INSERT multi-fila por tabla y un UPDATE ... RETURNING para adjuntos
         if asset_ids:
-            from app.db.models.asset import Asset
-            from sqlalchemy import insert
-            from app.db.models.ticket import ticket_assets
-            for a_id in asset_ids:
-                await db.execute(insert(ticket_assets).values(ticket_id=db_obj.id, asset_id=a_id))
-
-        # 3. Vincular Múltiples Ubicaciones
+            await db.execute(insert(ticket_assets).values([{"ticket_id": db_obj.id, "asset_id": a_id} for a_id in asset_ids]))
         if location_ids:
-            from sqlalchemy import insert
-            from app.db.models.ticket import ticket_locations
-            for l_id in location_ids:
-                await db.execute(insert(ticket_locations).values(ticket_id=db_obj.id, location_id=l_id))
-
+            await db.execute(insert(ticket_locations).values([{"ticket_id": db_obj.id, "location_id": l_id} for l_id in location_ids]))
+        attachments = []
+        if attachment_ids:
+            res_att = await db.execute(
+                sa_update(Attachment).where(Attachment.id.in_(attachment_ids))
+                .values(ticket_id=db_obj.id).returning(Attachment)
+            )
+            attachments = res_att.scalars().all()
         await db.commit()
-        await db.refresh(db_obj)
-        # Indexar en Meilisearch
-        try:
-            search_service.index_ticket({
-                "id": str(db_obj.id),
-                "title": db_obj.title,
-                "description": db_obj.description,
-                "status": db_obj.status,
-                "priority": db_obj.priority,
-                "created_at": db_obj.created_at,
-                "is_global": db_obj.is_global
-            })
-        except Exception as e:
-            logger.error(f"Meilisearch Indexing Error: {e}")
+        # Relaciones desde memoria, marcadas como cargadas (sin lazy loads al serializar)
+        for key, value in (
+            ("ticket_type", ticket_type), ("group", group), ("owner_group", owner_group),
+            ("created_by", creator), ("assigned_to", assignee), ("location", location),
+            ("asset", assets_by_id.get(db_obj.asset_id)),
+            ("assets", [assets_by_id[a_id] for a_id in asset_ids if a_id in assets_by_id]),
+            ("locations", list(locations)), ("attachments", list(attachments)),
+            ("sla_metric", sla_metric), ("watchers", []), ("comments", []), ("subtickets", []),
+        ):
+            set_committed_value(db_obj, key, value)
         return db_obj
 
     async def update(self, db: AsyncSession, db_obj: Ticket, obj_in: TicketUpdate, current_user_id: Optional[UUID] = None) -> Ticket:
@@ -214,25 +433,17 @@ class CRUDTicket:
             for l_id in location_ids:
                 await db.execute(insert(ticket_locations).values(ticket_id=db_obj.id, location_id=l_id))
 
+        if asset_ids is not None or location_ids is not None:
+            # Los vínculos M2M no tocan la fila del ticket: se marca la versión (ETag del detalle)
+            from sqlalchemy import func
+            db_obj.updated_at = func.now()
+
         if audit_details and current_user_id:
             await audit_log.create_log(db, user_id=current_user_id, event_type="ticket_updated", target_type="ticket", target_id=db_obj.id, details=audit_details)
         
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
-        # Actualizar índice en Meilisearch
-        try:
-            search_service.index_ticket({
-                "id": str(db_obj.id),
-                "title": db_obj.title,
-                "description": db_obj.description,
-                "status": db_obj.status,
-                "priority": db_obj.priority,
-                "updated_at": db_obj.updated_at,
-                "is_global": db_obj.is_global
-            })
-        except Exception as e:
-            logger.error(f"Meilisearch Update Indexing Error: {e}")
         return db_obj
     async def create_comment(self, db: AsyncSession, ticket_id: UUID, user_id: UUID, obj_in: TicketCommentCreate) -> TicketComment:
         db_obj = TicketComment(**obj_in.model_dump(), ticket_id=ticket_id, user_id=user_id)
@@ -265,17 +476,49 @@ class CRUDTicket:
                 link=f"/tickets/{ticket_id}"
             )
         return comment
-    async def get_comments(self, db: AsyncSession, ticket_id: UUID, include_internal: bool = False) -> List[TicketComment]:
-        from sqlalchemy.orm import selectinload
-        query = select(TicketComment).filter(TicketComment.ticket_id == ticket_id).options(selectinload(TicketComment.user))
+    async def get_comments(
+        self,
+        db: AsyncSession,
+        ticket_id: UUID,
+        include_internal: bool = False,
+        *,
+        since: Optional[datetime] = None,
+        after: Optional[tuple] = None,
+        limit: Optional[int] = None,
+        content_chars: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        Comentarios en orden cronológico (created_at, id) como filas proyectadas: el autor
+        (user_name, user_avatar) sale del JOIN, sin hidratar User. `after` es la posición
+        (created_at, id) del último comentario visto (cursor), `since` filtra por fecha de
+        alta y `content_chars` recorta el texto en SQL (reportes).
+        """
+        from sqlalchemy import func, literal
+        from app.core.pagination import keyset_predicate
+        content = TicketComment.content
+        if content_chars:
+            content = func.substr(TicketComment.content, 1, content_chars).label("content")
+        query = (
+            select(
+                TicketComment.id, TicketComment.ticket_id, TicketComment.user_id, content,
+                TicketComment.is_internal, TicketComment.created_at, TicketComment.updated_at,
+                func.coalesce(User.username, literal("System")).label("user_name"),
+                User.avatar_url.label("user_avatar"),
+            )
+            .outerjoin(User, User.id == TicketComment.user_id)
+            .filter(TicketComment.ticket_id == ticket_id)
+        )
         if not include_internal:
             query = query.filter(TicketComment.is_internal == False)
-        result = await db.execute(query.order_by(TicketComment.created_at.asc()))
-        comments = result.scalars().all()
-        for c in comments:
-            c.user_name = f"{c.user.username}" if c.user else "System"
-            c.user_avatar = c.user.avatar_url if c.user else None
-        return comments
+        if since:
+            query = query.filter(TicketComment.created_at > since)
+        if after:
+            query = query.filter(keyset_predicate(TicketComment.created_at, TicketComment.id, after[0], after[1], descending=False))
+        query = query.order_by(TicketComment.created_at.asc().nulls_last(), TicketComment.id.asc())
+        if limit:
+            query = query.limit(limit)
+        result = await db.execute(query)
+        return result.all()
     async def get_watchers(self, db: AsyncSession, ticket_id: UUID) -> List[dict]:
         from app.db.models.user import User
         result = await db.execute(
@@ -350,16 +593,118 @@ class CRUDTicket:
         result = await db.execute(delete(TicketSubtaskModel).where(TicketSubtaskModel.id == subtask_id))
         await db.commit()
         return result.rowcount > 0
-    async def bulk_update(self, db: AsyncSession, ticket_ids: List[UUID], **kwargs) -> int:
-        from sqlalchemy import update as sa_update
+    async def get_counters(self, db: AsyncSession, group_ids: Optional[List[UUID]] = None) -> List[Any]:
+        """
+        Filas (status, priority, created_by_siem, title_or_type_siem, count) sumadas desde ticket_counters.
+        group_ids=None: todos los grupos (incluye tickets privados, sin grupo).
+        """
+        from sqlalchemy import func
+        from app.db.models.ticket import TicketCounter
+        query = select(
+            TicketCounter.status, TicketCounter.priority, TicketCounter.created_by_siem, TicketCounter.title_or_type_siem,
+            func.sum(TicketCounter.count).label("count")
+        ).group_by(
+            TicketCounter.status, TicketCounter.priority, TicketCounter.created_by_siem, TicketCounter.title_or_type_siem
+        )
+        if group_ids is not None:
+            query = query.where(TicketCounter.group_id.in_(group_ids))
+        res = await db.execute(query)
+        return [row for row in res.all() if row.count]
+    async def bulk_update(
+        self,
+        db: AsyncSession,
+        ticket_ids: List[UUID],
+        *,
+        current_user_id: Optional[UUID] = None,
+        ip_address: Optional[str] = None,
+        **kwargs
+    ) -> int:
+        """
+        Versión por lotes de update() con las mismas reglas de estado y asignación:
+        - un SELECT ... FOR UPDATE del estado previo y un UPDATE ... RETURNING para
+          todos los tickets (closed_at incluido);
+        - SLA (pausa/reanudación, respuesta, resolución) con un UPDATE de sla_metrics;
+        - auditoría en un INSERT multi-fila;
+        - una notificación por destinatario (la indexación la hace el outbox de búsqueda).
+        """
+        from sqlalchemy import case, func, update as sa_update
+        from app.services.count_service import mark_tables_changed
+        from app.services.notification_service import notification_service
         update_data = {k: v for k, v in kwargs.items() if v is not None}
-        if not update_data:
+        if not update_data or not ticket_ids:
             return 0
-        result = await db.execute(
-            sa_update(Ticket)
+        res_prev = await db.execute(
+            select(Ticket.id, Ticket.status, Ticket.assigned_to_id, Ticket.created_by_id, Ticket.title)
             .where(Ticket.id.in_(ticket_ids))
-            .values(**update_data)
+            .with_for_update()
         )
+        previous = {row.id: row for row in res_prev.all()}
+        if not previous:
+            return 0
+        table = Ticket.__table__
+        new_status = update_data.get("status")
+        new_assignee = update_data.get("assigned_to_id")
+        values = dict(update_data, updated_at=func.now())
+        if new_status:
+            # closed_at sólo cambia en los tickets cuyo estado cambia (como en update())
+            closed_at = func.now() if new_status in ["resolved", "closed"] else None
+            values["closed_at"] = case((table.c.status == new_status, table.c.closed_at), else_=closed_at)
+        res_upd = await db.execute(
+            sa_update(table).where(table.c.id.in_(list(previous))).values(values)
+            .returning(table.c.id)
+        )
+        updated = res_upd.all()
+        mark_tables_changed(db, ["tickets"])
+        audit_entries, status_changed, assigned, authors = [], {}, [], {}
+        for row in previous.values():
+            details = {}
+            if new_status and row.status != new_status:
+                details["old_status"] = row.status
+                details["new_status"] = new_status
+                status_changed[row.id] = row.status
+                authors.setdefault(row.created_by_id, []).append(row)
+            if new_assignee and row.assigned_to_id != new_assignee:
+                details["old_assignee"] = str(row.assigned_to_id) if row.assigned_to_id else None
+                details["new_assignee"] = str(new_assignee)
+                assigned.append(row)
+            if details:
+                audit_entries.append((row.id, details))
+        if status_changed:
+            await sla_service.handle_bulk_status_change(db, status_changed, new_status)
+        if current_user_id:
+            await audit_log.create_logs(
+                db, user_id=current_user_id, event_type="ticket_updated", target_type="ticket",
+                ip_address=ip_address, entries=audit_entries
+            )
+            await audit_log.create_log(
+                db, user_id=current_user_id, event_type="tickets_bulk_updated", ip_address=ip_address,
+                details={"count": len(updated), "ticket_ids": [str(row.id) for row in updated]}, commit=False
+            )
+        # Una notificación por destinatario
+        if assigned:
+            notification_service.queue_user_notification(
+                db, user_id=new_assignee,
+                title="🎟️ Ticket Asignado",
+                message=(
+                    f"Se te ha asignado el ticket: {assigned[0].title}" if len(assigned) == 1
+                    else f"Se te asignaron {len(assigned)} tickets: {self._titles(assigned)}"
+                ),
+                link=f"/tickets/{assigned[0].id}" if len(assigned) == 1 else "/tickets"
+            )
+        for author_id, rows in authors.items():
+            notification_service.queue_user_notification(
+                db, user_id=author_id,
+                title="🔄 Estado Actualizado",
+                message=(
+                    f"Tu ticket '{rows[0].title}' cambió a {new_status}" if len(rows) == 1
+                    else f"{len(rows)} de tus tickets cambiaron a {new_status}: {self._titles(rows)}"
+                ),
+                link=f"/tickets/{rows[0].id}" if len(rows) == 1 else "/tickets"
+            )
         await db.commit()
-        return result.rowcount
+        return len(updated)
+    @staticmethod
+    def _titles(rows: List[Any], limit: int = 5) -> str:
+        titles = ", ".join(row.title for row in rows[:limit])
+        return titles + (f" y {len(rows) - limit} más" if len(rows) > limit else "")
 ticket = CRUDTicket()
@@ -3,7 +3,7 @@
 from app.db.base_class import Base  # noqa
 from app.db.models.user import User  # noqa
 from app.db.models.ticket import Ticket, TicketType, TicketComment, TicketRelation, TicketSubtask, TicketWatcher  # noqa
-from app.db.models.group import Group  # noqa
+from app.db.models.group import Group, GroupClosure  # noqa
 from app.db.models.sla import SLAPolicy, SLAMetric  # noqa
 from app.db.models.workflow import Workflow, WorkflowState, WorkflowTransition  # noqa
 from app.db.models.daily_report import DailyReport, GroupTemplate  # noqa
@@ -23,5 +23,8 @@ from app.db.models.password_policy import PasswordPolicy  # noqa
 from app.db.models.iam import Role, Permission, UserRole, RolePermission  # noqa
 from app.db.models.dashboard import DashboardConfig  # noqa
 from app.db.models.views import SavedView  # noqa
+from app.db.models.export_job import ExportJob  # noqa
+from app.db.models.search_reindex_run import SearchReindexRun  # noqa
+from app.db.models.search_outbox import SearchOutbox  # noqa
 from app.db.models.settings import SystemSettings  # noqa
 from app.db.models.wiki import WikiSpace, WikiPage  # noqa
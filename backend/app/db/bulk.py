@@ -0,0 +1,56 @@
+"""
+Carga masiva por Core: COPY (asyncpg) desde BULK_COPY_MIN_ROWS filas, INSERT
+multi-fila por debajo o fuera de PostgreSQL. Corre en la transacción de la sesión.
+"""
+import json
+from typing import Any, Dict, List, Optional
+from sqlalchemy import JSON, Table, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.services.count_service import mark_tables_changed
+def _with_defaults(table: Table, row: Dict[str, Any]) -> Dict[str, Any]:
+    """Completa los defaults del lado Python (COPY no los conoce)."""
+    row = dict(row)
+    for column in table.columns:
+        if column.key in row or column.default is None:
+            continue
+        if column.default.is_scalar:
+            row[column.key] = column.default.arg
+        elif column.default.is_callable:
+            row[column.key] = column.default.arg(None)
+    return row
+def _copy_value(column, value: Any) -> Any:
+    # El codec de asyncpg para json/jsonb espera texto
+    if value is not None and isinstance(column.type, JSON):
+        return json.dumps(value, default=str)
+    return value
+async def bulk_insert(
+    db: AsyncSession,
+    table: Table,
+    rows: List[Dict[str, Any]],
+    *,
+    copy_min_rows: Optional[int] = None,
+) -> int:
+    """
+    Inserta `rows` (mismas claves en todas) en `table`. Las columnas con sólo
+    server_default (p.ej. created_at) que no vengan en las filas toman su default.
+    """
+    if not rows:
+        return 0
+    rows = [_with_defaults(table, row) for row in rows]
+    columns = list(rows[0].keys())
+    threshold = settings.BULK_COPY_MIN_ROWS if copy_min_rows is None else copy_min_rows
+    # Lo pendiente en la sesión va antes (FKs) y la transacción queda iniciada
+    await db.flush()
+    conn = await db.connection()
+    if conn.dialect.name == "postgresql" and conn.dialect.driver == "asyncpg" and len(rows) >= threshold:
+        raw = await conn.get_raw_connection()
+        records = [tuple(_copy_value(table.c[c], row[c]) for c in columns) for row in rows]
+        await raw.driver_connection.copy_records_to_table(
+            table.name, records=records, columns=[table.c[c].name for c in columns], schema_name=table.schema
+        )
+    else:
+        # executemany: SQLAlchemy lo agrupa en INSERT ... VALUES (...), (...) (insertmanyvalues)
+        await conn.execute(insert(table), rows)
+    mark_tables_changed(db, [table.name])
+    return len(rows)
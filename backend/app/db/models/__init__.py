@@ -1,5 +1,5 @@
 from .user import User  # noqa
-from .group import Group  # noqa
+from .group import Group, GroupClosure  # noqa
 from .iam import Role, Permission, RolePermission, UserRole  # noqa
 from .session import Session  # noqa
 from .audit_log import AuditLog  # noqa
@@ -11,7 +11,7 @@ from .endpoint import Endpoint  # noqa
 from .expediente import Expediente # noqa
 from .asset import Asset  # noqa
 from .asset_history import AssetLocationHistory, AssetIPHistory, AssetInstallRecord  # noqa
-from .ticket import Ticket, TicketType, TicketComment, TicketRelation, TicketSubtask, TicketWatcher  # noqa
+from .ticket import Ticket, TicketType, TicketComment, TicketRelation, TicketSubtask, TicketWatcher, TicketCounter  # noqa
 from .notifications import Notification, Attachment  # noqa
 from .daily_report import DailyReport  # noqa
 from .settings import SystemSettings # noqa
@@ -22,3 +22,6 @@ from .wiki import WikiSpace, WikiPage, WikiPageHistory  # noqa
 from .dashboard import DashboardConfig  # noqa
 from .plugin import Plugin  # noqa
 from .views import SavedView  # noqa
+from .export_job import ExportJob  # noqa
+from .search_reindex_run import SearchReindexRun  # noqa
+from .search_outbox import SearchOutbox  # noqa
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, JSON, Table
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, JSON, Table, Index, DDL, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -11,15 +11,21 @@ asset_expedientes = Table(
     Column("asset_id", UUID(as_uuid=True), ForeignKey("assets.id"), primary_key=True),
     Column("expediente_id", UUID(as_uuid=True), ForeignKey("expedientes.id"), primary_key=True),
 )
+# Columnas buscadas por subcadena en los fallbacks SQL (índices GIN pg_trgm)
+TRGM_SEARCH_COLUMNS = ("hostname", "ip_address", "mac_address", "serial", "dependencia", "codigo_dependencia")
 class Asset(Base):
     __tablename__ = "assets"
+    __table_args__ = tuple(
+        Index(f"ix_assets_{col}_trgm", col, postgresql_using="gin", postgresql_ops={col: "gin_trgm_ops"})
+        for col in TRGM_SEARCH_COLUMNS
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     hostname = Column(String(255), nullable=False, index=True)
     serial = Column(String(100), nullable=True, index=True)
     asset_tag = Column(String(100), nullable=True, index=True)
     mac_address = Column(String(50), nullable=True, index=True)
     ip_address = Column(String(50), nullable=True)
-    location_node_id = Column(UUID(as_uuid=True), ForeignKey("location_nodes.id"), nullable=True)
+    location_node_id = Column(UUID(as_uuid=True), ForeignKey("location_nodes.id"), nullable=True, index=True)
     dependencia = Column(String(255), nullable=True)
     codigo_dependencia = Column(String(50), nullable=True)
     owner_group_id = Column(UUID(as_uuid=True), ForeignKey("groups.id"), nullable=True)
@@ -45,3 +51,7 @@ class Asset(Base):
     event_logs = relationship("AssetEventLog", back_populates="asset")
     def __repr__(self):
         return f"<Asset(hostname='{self.hostname}')>"
+event.listen(
+    Asset.__table__, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
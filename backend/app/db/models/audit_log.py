@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -6,11 +6,16 @@ import uuid
 from app.db.base_class import Base
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    # Historial de una entidad (p.ej. timeline del ticket) por cursor (created_at, id)
+    __table_args__ = (Index("ix_audit_logs_target", "target_type", "target_id", "created_at", "id"),)
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     # Can be null for system-level events not tied to a specific user
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True)
     event_type = Column(String(100), nullable=False, index=True)
     details = Column(JSONB, nullable=True)
+    # Entidad afectada (antes sólo dentro de details como target_id / ticket_id)
+    target_type = Column(String(50), nullable=True)
+    target_id = Column(UUID(as_uuid=True), nullable=True)
     ip_address = Column(String(100), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     user = relationship("User", back_populates="audit_logs")
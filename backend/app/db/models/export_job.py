@@ -0,0 +1,30 @@
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, ForeignKey, Text, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+import uuid
+from app.db.base_class import Base
+class ExportJob(Base):
+    """Exportación en segundo plano (ver export_job_service). El archivo vive en EXPORT_JOBS_DIR."""
+    __tablename__ = "export_jobs"
+    # "Mis exportaciones" y el límite de trabajos activos por usuario
+    __table_args__ = (Index("ix_export_jobs_user_status", "user_id", "status", "created_at"),)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String(50), nullable=False)  # tickets | assets | audit | daily_report
+    format = Column(String(20), nullable=False)  # csv | excel | pdf | docx
+    # pending -> running -> done | failed; done -> expired al vencer expires_at
+    status = Column(String(20), nullable=False, default="pending", index=True)
+    filters = Column(JSONB, nullable=True)
+    progress_rows = Column(Integer, nullable=False, default=0)
+    total_rows = Column(Integer, nullable=True)
+    file_path = Column(String(500), nullable=True)
+    filename = Column(String(255), nullable=True)
+    media_type = Column(String(255), nullable=True)
+    size_bytes = Column(BigInteger, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    def __repr__(self):
+        return f"<ExportJob(kind='{self.kind}', status='{self.status}')>"
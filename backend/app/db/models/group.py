@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Integer
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -28,3 +28,13 @@ class Group(Base):
     owned_tickets = relationship("Ticket", foreign_keys="[Ticket.owner_group_id]", back_populates="owner_group")
     def __repr__(self):
         return f"<Group(name='{self.name}')>"
+class GroupClosure(Base):
+    """
+    Tabla de clausura de la jerarquía de grupos: una fila por cada par
+    (ancestro, descendiente), incluida la fila reflexiva con depth=0.
+    Se mantiene desde GroupService al crear, mover o borrar grupos.
+    """
+    __tablename__ = "group_closure"
+    ancestor_id = Column(UUID(as_uuid=True), ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True)
+    descendant_id = Column(UUID(as_uuid=True), ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True, index=True)
+    depth = Column(Integer, nullable=False, default=0)
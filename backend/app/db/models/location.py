@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Text, Boolean
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Text, Boolean, Index, DDL, event, func as sa_func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -24,3 +24,27 @@ class LocationNode(Base):
     assets = relationship("Asset", back_populates="location")
     def __repr__(self):
         return f"<LocationNode(path='{self.path}')>"
+# Búsquedas por subcadena (ILIKE '%x%'): índices trigram. unaccent() no es IMMUTABLE,
+# por eso el índice de nombre usa el envoltorio f_unaccent (migración 2e8f5a1c7b93).
+Index(
+    "ix_location_nodes_name_unaccent_trgm",
+    sa_func.f_unaccent(LocationNode.name).label("name_unaccent"),
+    postgresql_using="gin",
+    postgresql_ops={"name_unaccent": "gin_trgm_ops"},
+)
+Index(
+    "ix_location_nodes_dependency_code_trgm",
+    LocationNode.dependency_code,
+    postgresql_using="gin",
+    postgresql_ops={"dependency_code": "gin_trgm_ops"},
+)
+for _ddl in (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    """
+    CREATE OR REPLACE FUNCTION public.f_unaccent(text) RETURNS text AS $$
+        SELECT public.unaccent('public.unaccent'::regdictionary, $1)
+    $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    """,
+):
+    event.listen(LocationNode.__table__, "before_create", DDL(_ddl).execute_if(dialect="postgresql"))
@@ -17,7 +17,7 @@ class Notification(Base):
 class Attachment(Base):
     __tablename__ = "attachments"
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    ticket_id = Column(UUID(as_uuid=True), ForeignKey("tickets.id"), nullable=True)
+    ticket_id = Column(UUID(as_uuid=True), ForeignKey("tickets.id"), nullable=True, index=True)
     comment_id = Column(UUID(as_uuid=True), ForeignKey("ticket_comments.id"), nullable=True)
     uploaded_by_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     filename = Column(String(255), nullable=False)
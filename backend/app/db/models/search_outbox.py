@@ -0,0 +1,65 @@
+from sqlalchemy import Column, BigInteger, String, DateTime, DDL, event
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+from app.db.models.asset import Asset
+from app.db.models.ticket import Ticket
+class SearchOutbox(Base):
+    """
+    Documento de Meilisearch a sincronizar (ver search_outbox_dispatcher). Lo escriben
+    los triggers de tickets / assets en la misma transacción que el cambio.
+    """
+    __tablename__ = "search_outbox"
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    index_name = Column(String(50), nullable=False)  # tickets | assets
+    document_id = Column(String(64), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    def __repr__(self):
+        return f"<SearchOutbox(index='{self.index_name}', document='{self.document_id}')>"
+# Sólo el id: el despachador lee el estado vigente al enviar (alta, o baja si ya no existe)
+SEARCH_OUTBOX_FUNCTION = """
+    CREATE OR REPLACE FUNCTION search_outbox_enqueue() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            INSERT INTO search_outbox (index_name, document_id) VALUES (TG_ARGV[0], OLD.id::text);
+        ELSE
+            INSERT INTO search_outbox (index_name, document_id) VALUES (TG_ARGV[0], NEW.id::text);
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+"""
+# Columnas de assets que disparan el aviso: buscables / filtrables (INDEX_SETTINGS) y deleted_at.
+# last_seen no: cada latido del agente lo actualiza; en el índice se refresca con el resto del documento
+ASSET_OUTBOX_COLUMNS = (
+    "hostname, ip_address, mac_address, serial, asset_tag, codigo_dependencia, dependencia, "
+    "status, criticality, location_node_id, device_type, deleted_at"
+)
+ASSET_OUTBOX_VALUES = ", ".join(f"{{row}}.{c}" for c in ASSET_OUTBOX_COLUMNS.split(", "))
+# Tickets: UPDATE OF las columnas de TICKET_SEARCH_COLUMNS y deleted_at; assets: ASSET_OUTBOX_COLUMNS
+SEARCH_OUTBOX_TRIGGERS = {
+    Ticket.__table__: (
+        """
+    CREATE TRIGGER tickets_search_outbox
+    AFTER INSERT OR DELETE OR UPDATE OF title, description, status, priority, group_id, owner_group_id,
+        assigned_to_id, created_by_id, ticket_type_id, is_global, is_private, deleted_at
+    ON tickets FOR EACH ROW EXECUTE FUNCTION search_outbox_enqueue('tickets')
+    """,
+    ),
+    Asset.__table__: (
+        """
+    CREATE TRIGGER assets_search_outbox
+    AFTER INSERT OR DELETE ON assets FOR EACH ROW EXECUTE FUNCTION search_outbox_enqueue('assets')
+    """,
+        # WHEN: un UPDATE que reescribe las columnas con el mismo valor (importaciones) no genera aviso
+        f"""
+    CREATE TRIGGER assets_search_outbox_update
+    AFTER UPDATE OF {ASSET_OUTBOX_COLUMNS} ON assets FOR EACH ROW
+    WHEN (({ASSET_OUTBOX_VALUES.format(row="OLD")}) IS DISTINCT FROM ({ASSET_OUTBOX_VALUES.format(row="NEW")}))
+    EXECUTE FUNCTION search_outbox_enqueue('assets')
+    """,
+    ),
+}
+for _table, _triggers in SEARCH_OUTBOX_TRIGGERS.items():
+    event.listen(_table, "after_create", DDL(SEARCH_OUTBOX_FUNCTION).execute_if(dialect="postgresql"))
+    for _trigger in _triggers:
+        event.listen(_table, "after_create", DDL(_trigger).execute_if(dialect="postgresql"))
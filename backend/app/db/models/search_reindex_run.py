@@ -0,0 +1,27 @@
+from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Text, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+import uuid
+from app.db.base_class import Base
+class SearchReindexRun(Base):
+    """Reindexado completo de un índice de Meilisearch (ver search_reindex_service)."""
+    __tablename__ = "search_reindex_runs"
+    # Última ejecución por índice (estado, reanudación)
+    __table_args__ = (Index("ix_search_reindex_runs_index_started", "index_name", "started_at"),)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    index_name = Column(String(50), nullable=False)  # tickets | assets
+    shadow_index = Column(String(100), nullable=False)
+    # running -> done | failed (un running sin latido se puede reanudar)
+    status = Column(String(20), nullable=False, default="running")
+    started_by_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    total_rows = Column(Integer, nullable=True)
+    indexed_rows = Column(Integer, nullable=False, default=0)
+    rows_per_second = Column(Float, nullable=True)
+    # Punto de control: {"chunks": N, "positions": {"<tramo>": "<último id enviado>" | "done"}}
+    checkpoint = Column(JSONB, nullable=False, default=dict)
+    error = Column(Text, nullable=True)
+    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    def __repr__(self):
+        return f"<SearchReindexRun(index='{self.index_name}', status='{self.status}')>"
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, String, JSON, Boolean, Integer
+from sqlalchemy import Column, String, JSON, Boolean, Integer, DateTime
+from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from app.db.base_class import Base
@@ -24,3 +25,4 @@ class SystemSettings(Base):
     smtp_from_email = Column(String(255), nullable=True)
     smtp_use_tls = Column(Boolean, default=True)
     smtp_use_ssl = Column(Boolean, default=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,6 +1,7 @@
 from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, JSON, DateTime
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 import uuid
 from app.db.base_class import Base
 class SLAPolicy(Base):
@@ -35,5 +36,9 @@ class SLAMetric(Base):
     resolved_at = Column(DateTime(timezone=True))
     is_response_breached = Column(Boolean, default=False)
     is_resolution_breached = Column(Boolean, default=False)
+    # Pausa (pending / waiting_info / on_hold): al reanudar se corren los vencimientos
+    last_paused_at = Column(DateTime(timezone=True), nullable=True)
+    total_paused_seconds = Column(Integer, default=0, server_default="0", nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     ticket = relationship("Ticket", back_populates="sla_metric")
     policy = relationship("SLAPolicy")
\ No newline at end of file
@@ -1,9 +1,10 @@
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, JSON, Integer, Table, Boolean
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, JSON, Integer, Table, Boolean, Index, DDL, event, text
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 import uuid
 from app.db.base_class import Base
+from app.db.models.integrations import SIEMConfiguration
 # Association table for tickets and endpoints (M2M)
 ticket_endpoints = Table(
     "ticket_endpoints",
@@ -54,9 +55,27 @@ class TicketType(Base):
     requires_sla = Column(Boolean, default=True)
     has_severity = Column(Boolean, default=True)
     workflow_id = Column(UUID(as_uuid=True), ForeignKey("workflows.id"), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     workflow = relationship("Workflow")
 class Ticket(Base):
     __tablename__ = "tickets"
+    # Índices compuestos (columna de orden, id) para la paginación por cursor
+    __table_args__ = (
+        Index("ix_tickets_created_at_id", "created_at", "id"),
+        Index("ix_tickets_status_id", "status", "id"),
+        Index("ix_tickets_priority_id", "priority", "id"),
+        Index("ix_tickets_title_id", "title", "id"),
+        Index("ix_tickets_platform_id", "platform", "id"),
+        Index("ix_tickets_search_vector", "search_vector", postgresql_using="gin"),
+        # Conteo de vencidos en /tickets/stats (el resto sale de ticket_counters)
+        Index(
+            "ix_tickets_open_sla_deadline", "sla_deadline",
+            postgresql_where=text("status <> 'closed' AND deleted_at IS NULL")
+        ),
+    )
+    # created_at (server_default) vuelve en el RETURNING del INSERT: la respuesta de
+    # creación se arma sin releer la fila
+    __mapper_args__ = {"eager_defaults": True}
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
@@ -81,6 +100,9 @@ class Ticket(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     closed_at = Column(DateTime(timezone=True), nullable=True)
     deleted_at = Column(DateTime(timezone=True), nullable=True)
+    # Texto indexado (título peso A, descripción peso B), mantenido por el trigger
+    # tickets_search_vector_trigger. Diferido: no se carga en los listados.
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
     # Relaciones
     ticket_type = relationship("TicketType")
     group = relationship("Group", foreign_keys=[group_id], back_populates="tickets")
@@ -101,8 +123,207 @@ class Ticket(Base):
     attachments = relationship("Attachment", back_populates="ticket")
     def __repr__(self):
         return f"<Ticket(title='{self.title}', status='{self.status}')>"
+# Configuración FTS y trigger de search_vector para bases creadas con create_all
+# (tests); en producción los crea la migración 9c41e8b27d05.
+TICKET_TS_CONFIG = "public.spanish_unaccent"
+for _ddl in (
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'spanish_unaccent') THEN
+            CREATE TEXT SEARCH CONFIGURATION public.spanish_unaccent (COPY = pg_catalog.spanish);
+            ALTER TEXT SEARCH CONFIGURATION public.spanish_unaccent
+                ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem;
+        END IF;
+    END
+    $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION tickets_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('public.spanish_unaccent', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('public.spanish_unaccent', left(coalesce(NEW.description, ''), 100000)), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER tickets_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description ON tickets
+    FOR EACH ROW EXECUTE FUNCTION tickets_search_vector_update()
+    """,
+):
+    event.listen(Ticket.__table__, "after_create", DDL(_ddl).execute_if(dialect="postgresql"))
+class TicketCounter(Base):
+    """
+    Cantidad de tickets no borrados por (grupo, estado, prioridad, flags SIEM). La mantiene
+    el trigger tickets_counters_trigger en la misma transacción que la escritura
+    (ORM, UPDATE masivo o COPY); /tickets/stats y el dashboard suman estas filas.
+    Dos definiciones de SIEM, una por endpoint:
+    - created_by_siem: creado por el usuario de siem_configuration (siem_alerts de /tickets/stats).
+    - title_or_type_siem: título con SOC / SIEM / ALERTA o tipo "SIEM" (excluidos en el dashboard).
+    Renombrar un tipo o cambiar el usuario SIEM recalcula las filas afectadas por trigger.
+    """
+    __tablename__ = "ticket_counters"
+    __table_args__ = (
+        Index(
+            "ux_ticket_counters_key", "group_id", "status", "priority", "created_by_siem", "title_or_type_siem",
+            unique=True, postgresql_nulls_not_distinct=True
+        ),
+    )
+    id = Column(Integer, primary_key=True)
+    group_id = Column(UUID(as_uuid=True), nullable=True)
+    status = Column(String(50), nullable=True)
+    priority = Column(String(50), nullable=True)
+    created_by_siem = Column(Boolean, nullable=False, default=False)
+    title_or_type_siem = Column(Boolean, nullable=False, default=False)
+    count = Column(Integer, nullable=False, default=0, server_default="0")
+# Mismas funciones y triggers que la migración c8d2f6a1e9b4, para bases creadas con create_all
+# (DDL() aplica formato con %: los comodines de ILIKE van duplicados)
+TICKET_COUNTER_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION ticket_created_by_siem(p_created_by uuid) RETURNS boolean AS $$
+    BEGIN
+        RETURN EXISTS (SELECT 1 FROM siem_configuration WHERE siem_user_id = p_created_by);
+    END
+    $$ LANGUAGE plpgsql STABLE
+    """,
+    """
+    CREATE OR REPLACE FUNCTION ticket_title_is_siem(p_title text) RETURNS boolean AS $$
+    BEGIN
+        RETURN COALESCE(p_title ILIKE '%%SOC%%' OR p_title ILIKE '%%SIEM%%' OR p_title ILIKE '%%ALERTA%%', false);
+    END
+    $$ LANGUAGE plpgsql IMMUTABLE
+    """,
+    """
+    CREATE OR REPLACE FUNCTION ticket_title_or_type_siem(p_title text, p_type_id uuid) RETURNS boolean AS $$
+    BEGIN
+        RETURN ticket_title_is_siem(p_title)
+            OR EXISTS (SELECT 1 FROM ticket_types WHERE id = p_type_id AND name ILIKE '%%SIEM%%');
+    END
+    $$ LANGUAGE plpgsql STABLE
+    """,
+    """
+    CREATE OR REPLACE FUNCTION ticket_counters_add(
+        p_group uuid, p_status text, p_priority text, p_by_siem boolean, p_title_siem boolean, p_delta integer
+    ) RETURNS void AS $$
+    BEGIN
+        INSERT INTO ticket_counters AS c (group_id, status, priority, created_by_siem, title_or_type_siem, count)
+        VALUES (p_group, p_status, p_priority, p_by_siem, p_title_siem, p_delta)
+        ON CONFLICT (group_id, status, priority, created_by_siem, title_or_type_siem)
+        DO UPDATE SET count = c.count + EXCLUDED.count;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION tickets_counters_update() RETURNS trigger AS $$
+    DECLARE
+        old_by boolean;
+        old_title boolean;
+        new_by boolean;
+        new_title boolean;
+    BEGIN
+        IF TG_OP <> 'INSERT' AND OLD.deleted_at IS NULL THEN
+            old_by := ticket_created_by_siem(OLD.created_by_id);
+            old_title := ticket_title_or_type_siem(OLD.title, OLD.ticket_type_id);
+        END IF;
+        IF TG_OP <> 'DELETE' AND NEW.deleted_at IS NULL THEN
+            new_by := ticket_created_by_siem(NEW.created_by_id);
+            new_title := ticket_title_or_type_siem(NEW.title, NEW.ticket_type_id);
+        END IF;
+        IF TG_OP = 'UPDATE' AND old_by IS NOT NULL AND new_by IS NOT NULL
+           AND OLD.group_id IS NOT DISTINCT FROM NEW.group_id AND OLD.status IS NOT DISTINCT FROM NEW.status
+           AND OLD.priority IS NOT DISTINCT FROM NEW.priority AND old_by = new_by AND old_title = new_title THEN
+            RETURN NULL;
+        END IF;
+        IF old_by IS NOT NULL THEN
+            PERFORM ticket_counters_add(OLD.group_id, OLD.status, OLD.priority, old_by, old_title, -1);
+        END IF;
+        IF new_by IS NOT NULL THEN
+            PERFORM ticket_counters_add(NEW.group_id, NEW.status, NEW.priority, new_by, new_title, 1);
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION ticket_counters_rebuild() RETURNS void AS $$
+    BEGIN
+        LOCK TABLE tickets IN SHARE ROW EXCLUSIVE MODE;
+        DELETE FROM ticket_counters;
+        INSERT INTO ticket_counters (group_id, status, priority, created_by_siem, title_or_type_siem, count)
+        SELECT group_id, status, priority, ticket_created_by_siem(created_by_id),
+            ticket_title_or_type_siem(title, ticket_type_id), count(*)
+        FROM tickets WHERE deleted_at IS NULL
+        GROUP BY 1, 2, 3, 4, 5;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    # Renombrar un tipo hacia / desde "SIEM": mueve los tickets del tipo (salvo los que ya
+    # son SIEM por título) entre title_or_type_siem false / true
+    """
+    CREATE OR REPLACE FUNCTION ticket_types_counters_update() RETURNS trigger AS $$
+    DECLARE
+        old_siem boolean;
+        new_siem boolean;
+        r record;
+    BEGIN
+        old_siem := COALESCE(OLD.name ILIKE '%%SIEM%%', false);
+        new_siem := COALESCE(NEW.name ILIKE '%%SIEM%%', false);
+        IF old_siem = new_siem THEN
+            RETURN NULL;
+        END IF;
+        LOCK TABLE tickets IN SHARE ROW EXCLUSIVE MODE;
+        FOR r IN
+            SELECT group_id, status, priority, ticket_created_by_siem(created_by_id) AS by_siem, count(*)::integer AS n
+            FROM tickets
+            WHERE ticket_type_id = NEW.id AND deleted_at IS NULL AND NOT ticket_title_is_siem(title)
+            GROUP BY 1, 2, 3, 4
+        LOOP
+            PERFORM ticket_counters_add(r.group_id, r.status, r.priority, r.by_siem, old_siem, -r.n);
+            PERFORM ticket_counters_add(r.group_id, r.status, r.priority, r.by_siem, new_siem, r.n);
+        END LOOP;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER tickets_counters_trigger
+    AFTER INSERT OR DELETE OR UPDATE OF group_id, status, priority, title, ticket_type_id, created_by_id, deleted_at
+    ON tickets FOR EACH ROW EXECUTE FUNCTION tickets_counters_update()
+    """,
+    """
+    CREATE TRIGGER ticket_types_counters_trigger
+    AFTER UPDATE OF name ON ticket_types
+    FOR EACH ROW EXECUTE FUNCTION ticket_types_counters_update()
+    """,
+)
+# Cambio del usuario SIEM (poco frecuente): se recalculan los contadores completos
+SIEM_CONFIGURATION_COUNTER_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION siem_configuration_counters_update() RETURNS trigger AS $$
+    BEGIN
+        PERFORM ticket_counters_rebuild();
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER siem_configuration_counters_trigger
+    AFTER INSERT OR DELETE OR UPDATE OF siem_user_id ON siem_configuration
+    FOR EACH STATEMENT EXECUTE FUNCTION siem_configuration_counters_update()
+    """,
+)
+for _ddl in TICKET_COUNTER_DDL:
+    event.listen(Ticket.__table__, "after_create", DDL(_ddl).execute_if(dialect="postgresql"))
+for _ddl in SIEM_CONFIGURATION_COUNTER_DDL:
+    event.listen(SIEMConfiguration.__table__, "after_create", DDL(_ddl).execute_if(dialect="postgresql"))
 class TicketComment(Base):
     __tablename__ = "ticket_comments"
+    # Paginación por cursor (created_at, id) dentro de cada ticket
+    __table_args__ = (Index("ix_ticket_comments_ticket_created_id", "ticket_id", "created_at", "id"),)
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     ticket_id = Column(UUID(as_uuid=True), ForeignKey("tickets.id"), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -128,6 +349,7 @@ class TicketSubtask(Base):
     title = Column(String(255), nullable=False)
     is_completed = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     ticket = relationship("Ticket", backref="subtasks_list")
 class TicketWatcher(Base):
     __tablename__ = "ticket_watchers"
@@ -137,3 +359,7 @@ class TicketWatcher(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     ticket = relationship("Ticket", back_populates="watchers")
     user = relationship("User")
+    @property
+    def username(self):
+        # Requiere `user` precargado (selectinload) para serializar con WatcherSchema
+        return self.user.username if self.user else None
@@ -1,9 +1,10 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Text, ARRAY, ForeignKey, Integer
+from sqlalchemy import Column, String, Boolean, DateTime, Text, ARRAY, ForeignKey, Integer, event
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
 from app.db.base_class import Base
+from app.core.permissions import PermissionIndex
 class User(Base):
     __tablename__ = "users"
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -49,16 +50,31 @@ class User(Base):
     # fortisiem_rules = relationship("FortiSIEMRule", back_populates="created_by")
     def __repr__(self):
         return f"<User(username='{self.username}', email='{self.email}')>"
-    def get_permissions(self) -> set:
-        perms = set()
-        # Ensure roles are loaded
-        if self.roles:
-            for user_role in self.roles:
-                if user_role.role and user_role.role.permissions:
-                    for role_perm in user_role.role.permissions:
-                        if role_perm.permission:
-                            perms.add(role_perm.permission.key)
-        return perms
+    def attach_permissions(self, keys) -> None:
+        """Fija el índice de permisos a partir de claves ya resueltas (p.ej. caché de principales)."""
+        self._permission_index = PermissionIndex(keys)
+    @property
+    def permission_index(self) -> PermissionIndex:
+        # Se compila una sola vez por carga del principal
+        index = getattr(self, "_permission_index", None)
+        if index is None:
+            keys = set()
+            # Ensure roles are loaded
+            if self.roles:
+                for user_role in self.roles:
+                    if user_role.role and user_role.role.permissions:
+                        for role_perm in user_role.role.permissions:
+                            if role_perm.permission:
+                                keys.add(role_perm.permission.key)
+            index = PermissionIndex(keys)
+            self._permission_index = index
+        return index
+    def get_permissions(self) -> frozenset:
+        return self.permission_index.keys
     def has_permission(self, perm_key: str) -> bool:
         if self.is_superuser: return True
-        return perm_key in self.get_permissions()
+        return self.permission_index.has(perm_key)
+def _reset_permission_index(target, *args):
+    target.__dict__.pop("_permission_index", None)
+for _event_name in ("append", "remove", "set"):
+    event.listen(User.roles, _event_name, _reset_permission_index)
@@ -0,0 +1,58 @@
+"""
+Hooks post-commit: trabajo que sólo debe ocurrir si la transacción se confirma
+(indexación en Meilisearch, avisos por WebSocket). Se descartan en rollback.
+"""
+import asyncio
+import functools
+import inspect
+import logging
+from typing import Any, Callable, Set
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession
+logger = logging.getLogger(__name__)
+_HOOKS_KEY = "post_commit_hooks"
+# Referencias fuertes a las tareas en curso (asyncio sólo guarda referencias débiles)
+_running: Set[asyncio.Future] = set()
+def on_commit(session: Any, fn: Callable, *args, **kwargs) -> None:
+    """
+    Registra `fn(*args, **kwargs)` para ejecutarse tras el próximo COMMIT de la sesión
+    (AsyncSession o Session). Las corutinas se programan en el loop; las funciones
+    síncronas (p.ej. el cliente de Meilisearch) van al executor por defecto.
+    """
+    sync_session = getattr(session, "sync_session", session)
+    sync_session.info.setdefault(_HOOKS_KEY, []).append((fn, args, kwargs))
+async def _guarded(fn: Callable, args, kwargs):
+    try:
+        await fn(*args, **kwargs)
+    except Exception as e:
+        logger.error(f"Error en hook post-commit {getattr(fn, '__name__', fn)}: {e}")
+def _call_guarded(fn: Callable, args, kwargs):
+    try:
+        fn(*args, **kwargs)
+    except Exception as e:
+        logger.error(f"Error en hook post-commit {getattr(fn, '__name__', fn)}: {e}")
+@event.listens_for(OrmSession, "after_commit")
+def _run_post_commit_hooks(session):
+    hooks = session.info.pop(_HOOKS_KEY, None)
+    if not hooks:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    for fn, args, kwargs in hooks:
+        if inspect.iscoroutinefunction(fn):
+            if loop is None:
+                asyncio.run(_guarded(fn, args, kwargs))
+                continue
+            future = loop.create_task(_guarded(fn, args, kwargs))
+        elif loop is not None:
+            future = loop.run_in_executor(None, functools.partial(_call_guarded, fn, args, kwargs))
+        else:
+            _call_guarded(fn, args, kwargs)
+            continue
+        _running.add(future)
+        future.add_done_callback(_running.discard)
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_post_commit_hooks(session):
+    session.info.pop(_HOOKS_KEY, None)
@@ -6,6 +6,7 @@ import asyncio
 import os
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from app.core.config import settings
@@ -17,7 +18,19 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     app.state.db_engine = engine
     app.state.async_session_local = AsyncSessionLocal
+    from app.services.export_job_service import export_job_service
+    cleanup_task = asyncio.create_task(export_job_service.cleanup_loop(AsyncSessionLocal))
+    from app.services.search_outbox_dispatcher import search_outbox_dispatcher
+    outbox_task = asyncio.create_task(search_outbox_dispatcher.run_loop(AsyncSessionLocal))
+    from app.services.search_service import search_service
+    fallback_task = asyncio.create_task(search_service.fallback.run_loop(AsyncSessionLocal, search_service.indexer))
     yield
+    cleanup_task.cancel()
+    outbox_task.cancel()
+    fallback_task.cancel()
+    await search_service.indexer.close()
+    from app.services.render_executor import render_executor
+    render_executor.shutdown()
     await engine.dispose()
 app = FastAPI(title=settings.PROJECT_NAME, version="v2.0.0", lifespan=lifespan)
 # Configuración de CORS
@@ -41,7 +54,13 @@ app.add_middleware(
 # Servir archivos estáticos
 if not os.path.exists("/app/uploads"):
     os.makedirs("/app/uploads", exist_ok=True)
-app.mount("/uploads", StaticFiles(directory="/app/uploads"), name="uploads")
+class UploadsStaticFiles(StaticFiles):
+    # Las exportaciones se descargan sólo por /exports/{id}/download (con dueño y permisos)
+    async def get_response(self, path: str, scope):
+        if path.replace("\\", "/").lstrip("/").split("/", 1)[0] == "exports":
+            raise StarletteHTTPException(status_code=404)
+        return await super().get_response(path, scope)
+app.mount("/uploads", UploadsStaticFiles(directory="/app/uploads"), name="uploads")
 # Observabilidad y Limites
 setup_observability(app)
 app.state.limiter = limiter
@@ -52,7 +71,7 @@ from app.api.v1.routers import (
     notifications, ai_assistant, workflows, settings as sys_settings, 
     sla, iam, dashboard, system, forms, assets, ticket_types, 
     locations, expedientes, admin_configs, daily_reports, soc, soc_ws,
-    attachments, endpoints, forensics, plugins, search, oidc, health, wiki
+    attachments, endpoints, forensics, plugins, search, oidc, health, wiki, reports, exports
 )
 v1 = settings.API_V1_STR # /api/v1
 # Registro de Rutas
@@ -75,6 +94,8 @@ app.include_router(system.router, prefix=f"{v1}/admin/system", tags=["system"])
 app.include_router(forms.router, prefix=f"{v1}/forms", tags=["forms"])
 app.include_router(dashboard.router, prefix=f"{v1}/dashboard", tags=["dashboard"])
 app.include_router(daily_reports.router, prefix=f"{v1}/reports/daily", tags=["reports"])
+app.include_router(reports.router, prefix=f"{v1}/reports", tags=["reports"])
+app.include_router(exports.router, prefix=f"{v1}/exports", tags=["exports"])
 app.include_router(audit.router, prefix=f"{v1}/audit", tags=["audit"])
 app.include_router(notifications.router, prefix=f"{v1}/notifications", tags=["notifications"])
 app.include_router(attachments.router, prefix=f"{v1}/attachments", tags=["attachments"])
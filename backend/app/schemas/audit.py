@@ -10,6 +10,8 @@ class AuditLogSchema(AuditLogBase):
     id: UUID
     user_id: Optional[UUID] = None
     username: Optional[str] = None
+    target_type: Optional[str] = None
+    target_id: Optional[UUID] = None
     created_at: datetime
     diff: Optional[Dict[str, Any]] = None
     model_config = ConfigDict(from_attributes=True)
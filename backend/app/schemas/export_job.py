@@ -0,0 +1,24 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, Any, Dict, Literal
+from uuid import UUID
+from datetime import datetime
+class ExportJobCreate(BaseModel):
+    kind: Literal["tickets", "assets", "audit", "daily_report"]
+    format: Literal["csv", "excel", "pdf", "docx"] = "csv"
+    # Filtros propios de cada tipo (ver routers/exports.py)
+    filters: Dict[str, Any] = Field(default_factory=dict)
+class ExportJob(BaseModel):
+    id: UUID
+    kind: str
+    format: str
+    status: str
+    filters: Optional[Dict[str, Any]] = None
+    progress_rows: int = 0
+    total_rows: Optional[int] = None
+    filename: Optional[str] = None
+    size_bytes: Optional[int] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+    model_config = ConfigDict(from_attributes=True)
@@ -35,4 +35,5 @@ class LocationPagination(BaseModel):
     total: int
     page: int
     size: int
-    pages: int
\ No newline at end of file
+    pages: int
+    total_exact: bool = True
\ No newline at end of file
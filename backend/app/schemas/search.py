@@ -1,5 +1,7 @@
-from pydantic import BaseModel
-from typing import List, Any, Dict, Optional
+from pydantic import BaseModel, ConfigDict
+from typing import List, Any, Dict, Literal, Optional
+from uuid import UUID
+from datetime import datetime
 class SearchHit(BaseModel):
     id: str
     title: str
@@ -12,3 +14,20 @@ class SearchResponse(BaseModel):
     total: int
     processing_time_ms: int
     query: str
+class SearchReindexRequest(BaseModel):
+    index: Literal["tickets", "assets", "all"] = "all"
+    # Retomar la última ejecución incompleta desde su punto de control
+    resume: bool = False
+class SearchReindexRun(BaseModel):
+    id: UUID
+    index_name: str
+    shadow_index: str
+    status: str
+    total_rows: Optional[int] = None
+    indexed_rows: int = 0
+    rows_per_second: Optional[float] = None
+    error: Optional[str] = None
+    started_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    model_config = ConfigDict(from_attributes=True)
@@ -43,6 +43,31 @@ class TicketInDBBase(TicketBase):
     closed_at: Optional[datetime] = None
     deleted_at: Optional[datetime] = None
     model_config = ConfigDict(from_attributes=True)
+class TicketSummary(BaseModel):
+    """Fila de listado (view=summary): columnas planas, sin relaciones anidadas."""
+    id: UUID
+    title: str
+    status: Optional[str] = None
+    priority: Optional[str] = None
+    platform: Optional[str] = None
+    ticket_type_id: UUID
+    ticket_type_name: Optional[str] = None
+    ticket_type_color: Optional[str] = None
+    group_id: Optional[UUID] = None
+    group_name: Optional[str] = None
+    assigned_to_id: Optional[UUID] = None
+    assigned_to_name: Optional[str] = None
+    created_by_id: UUID
+    created_by_name: Optional[str] = None
+    asset_id: Optional[UUID] = None
+    is_private: Optional[bool] = False
+    is_global: Optional[bool] = False
+    sla_deadline: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    closed_at: Optional[datetime] = None
+    attachment_count: int = 0
+    has_attachments: bool = False
 class TicketTypeSchema(BaseModel):
     id: UUID
     name: str
@@ -264,6 +289,25 @@ class TicketComment(TicketCommentBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     model_config = ConfigDict(from_attributes=True)
+class TicketCommentPage(BaseModel):
+    items: List[TicketComment]
+    # Posición del último comentario entregado: sirve para la página siguiente y para
+    # volver a consultar más tarde sólo los comentarios nuevos
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+class TicketTimelineEntry(BaseModel):
+    id: UUID
+    kind: str # audit | comment | sla
+    event_type: str
+    occurred_at: datetime
+    user_id: Optional[UUID] = None
+    user_name: Optional[str] = None
+    details: Optional[Dict[str, Any]] = None
+    model_config = ConfigDict(from_attributes=True)
+class TicketTimelinePage(BaseModel):
+    items: List[TicketTimelineEntry]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
 class TicketRelationCreate(BaseModel):
     target_ticket_id: UUID
     relation_type: str # relates_to, blocks, blocked_by, duplicate_of
@@ -277,6 +321,20 @@ class TicketBulkUpdate(BaseModel):
     status: Optional[str] = None
     priority: Optional[str] = None
     assigned_to_id: Optional[UUID] = None
+class TicketBulkCreate(BaseModel):
+    # Filas crudas: cada una se valida como TicketCreate y se informa por separado
+    items: List[Dict[str, Any]]
+    # Si alguna fila es inválida no se inserta ninguna
+    atomic: bool = False
+class TicketBulkRowResult(BaseModel):
+    index: int
+    status: str # created | invalid | skipped
+    id: Optional[UUID] = None
+    errors: List[str] = []
+class TicketBulkResult(BaseModel):
+    created_count: int
+    error_count: int
+    results: List[TicketBulkRowResult]
 class TicketSubtaskBase(BaseModel):
     title: str
     is_completed: bool = False
@@ -289,4 +347,14 @@ class TicketSubtask(TicketSubtaskBase):
     id: UUID
     ticket_id: UUID
     created_at: datetime
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+TICKET_PANELS = ("ticket", "comments", "watchers", "relations", "subtasks", "sla")
+class TicketFull(BaseModel):
+    # Vista de detalle en una sola petición; los paneles no pedidos vuelven en null
+    ticket: Optional[Ticket] = None
+    # Primera página, como GET /tickets/{id}/comments
+    comments: Optional[TicketCommentPage] = None
+    watchers: Optional[List[WatcherSchema]] = None
+    relations: Optional[List[TicketRelation]] = None
+    subtasks: Optional[List[TicketSubtask]] = None
+    sla: Optional[SLAMetricSchema] = None
@@ -0,0 +1,101 @@
+"""
+Alta masiva de tickets desde un archivo JSON (lista u objeto {"items": [...]}), JSONL o CSV.
+Cada lote se valida y se carga en una transacción con ticket_import_service (mismo
+camino que POST /tickets/bulk, sin el límite de filas por request).
+Uso: python -m app.scripts.import_tickets tickets.jsonl --user admin [--batch-size 1000]
+     [--atomic] [--allow-reserved-types] [--report reporte.json]
+En CSV, asset_ids / location_ids / attachment_ids van separados por ";" y extra_data como JSON.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import sys
+from typing import Any, Dict, Iterator, List
+sys.path.append("/app")
+
+from sqlalchemy.future import select
+from app.db.session import AsyncSessionLocal
+from app.db.models.user import User
+from app.services.ticket_import_service import ticket_import_service
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+LIST_FIELDS = ("asset_ids", "location_ids", "attachment_ids")
+
+def _csv_row(row: Dict[str, str]) -> Dict[str, Any]:
+    item: Dict[str, Any] = {k: v for k, v in row.items() if k and v not in (None, "")}
+    for field in LIST_FIELDS:
+        if field in item:
+            item[field] = [v.strip() for v in item[field].split(";") if v.strip()]
+    if "extra_data" in item:
+        item["extra_data"] = json.loads(item["extra_data"])
+    return item
+
+def read_rows(path: str) -> Iterator[Dict[str, Any]]:
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for row in csv.DictReader(f):
+                yield _csv_row(row)
+    elif path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        yield from (data["items"] if isinstance(data, dict) else data)
+
+def batches(rows: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+async def main(args):
+    async with AsyncSessionLocal() as session:
+        res_user = await session.execute(select(User).filter(User.username == args.user))
+        creator = res_user.scalar_one_or_none()
+        if not creator:
+            logger.error(f"No existe el usuario {args.user}")
+            return 1
+    report, created, invalid, offset = [], 0, 0, 0
+    for batch in batches(read_rows(args.file), args.batch_size):
+        # Una sesión por lote: cada lote es su propia transacción
+        async with AsyncSessionLocal() as session:
+            result = await ticket_import_service.import_tickets(
+                session, batch, creator,
+                atomic=args.atomic, allow_reserved_types=args.allow_reserved_types
+            )
+        for row in result.results:
+            row.index += offset
+            if row.status != "created":
+                report.append(row.model_dump(mode="json"))
+        created += result.created_count
+        invalid += result.error_count
+        offset += len(batch)
+        logger.info(f"Filas procesadas: {offset} (creadas: {created}, inválidas: {invalid})")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    for row in report[:20]:
+        logger.warning(f"Fila {row['index']}: {row['status']} - {'; '.join(row['errors'])}")
+    logger.info(f"Importación finalizada: {created} tickets creados, {invalid} filas inválidas de {offset}.")
+    return 0 if not invalid else 2
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("file", help="Archivo .json, .jsonl o .csv")
+    parser.add_argument("--user", required=True, help="Usuario creador (username)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--atomic", action="store_true", help="Por lote: no insertar nada si alguna fila es inválida")
+    parser.add_argument("--allow-reserved-types", action="store_true", help="Permitir el tipo ALERTA SIEM (backfills del SIEM)")
+    parser.add_argument("--report", help="Guardar en JSON las filas no creadas")
+    sys.exit(asyncio.run(main(parser.parse_args())))
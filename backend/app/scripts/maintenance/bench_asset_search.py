@@ -0,0 +1,155 @@
+"""
+Benchmark de las búsquedas por subcadena de activos/ubicaciones (fallback SQL).
+Genera N activos sintéticos en un esquema aislado (bench_trgm), mide las consultas
+antes y después de crear los índices trigram y elimina el esquema al terminar.
+Uso: python -m app.scripts.maintenance.bench_asset_search [--assets 100000] [--runs 7]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+sys.path.append("/app")
+
+from sqlalchemy import text
+from app.db.session import engine
+
+SCHEMA = "bench_trgm"
+# Los tamaños se interpolan (enteros): CREATE TABLE AS no admite parámetros ligados
+SETUP = [
+    f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE",
+    f"CREATE SCHEMA {SCHEMA}",
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    """
+    CREATE OR REPLACE FUNCTION public.f_unaccent(text) RETURNS text AS $$
+        SELECT public.unaccent('public.unaccent'::regdictionary, $1)
+    $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    """,
+    f"""
+    CREATE TABLE {SCHEMA}.location_nodes AS
+    SELECT gen_random_uuid() AS id,
+           (ARRAY['Comisaría', 'División', 'Dirección', 'Departamento', 'Sección'])[1 + i % 5]
+               || ' ' || (ARRAY['Tránsito', 'Investigación', 'Logística', 'Comunicaciones', 'Región Norte'])[1 + (i / 5) % 5]
+               || ' ' || i AS name,
+           lpad(i::text, 5, '0') AS dependency_code
+    FROM generate_series(1, {{locations}}) AS i
+    """,
+    f"""
+    CREATE TABLE {SCHEMA}.assets AS
+    SELECT gen_random_uuid() AS id,
+           'PC-' || upper(substr(md5(i::text), 1, 6)) AS hostname,
+           '10.' || (i / 65536) % 256 || '.' || (i / 256) % 256 || '.' || i % 256 AS ip_address,
+           upper(regexp_replace(substr(md5('mac' || i), 1, 12), '(..)(?!$)', '\\1:', 'g')) AS mac_address,
+           upper(substr(md5('sn' || i), 1, 10)) AS serial,
+           'Dependencia ' || (i % {{locations}}) AS dependencia,
+           lpad((i % {{locations}})::text, 5, '0') AS codigo_dependencia,
+           l.id AS location_node_id,
+           NULL::timestamptz AS deleted_at
+    FROM generate_series(1, {{assets}}) AS i
+    JOIN {SCHEMA}.location_nodes l ON l.dependency_code = lpad((1 + i % {{locations}})::text, 5, '0')
+    """,
+    f"ALTER TABLE {SCHEMA}.location_nodes ADD PRIMARY KEY (id)",
+    f"ALTER TABLE {SCHEMA}.assets ADD PRIMARY KEY (id)",
+]
+INDEXES = [
+    *[
+        f"CREATE INDEX ON {SCHEMA}.assets USING gin ({col} gin_trgm_ops)"
+        for col in ("hostname", "ip_address", "mac_address", "serial", "dependencia", "codigo_dependencia")
+    ],
+    f"CREATE INDEX ON {SCHEMA}.assets (location_node_id)",
+    f"CREATE INDEX ON {SCHEMA}.location_nodes USING gin (f_unaccent(name) gin_trgm_ops)",
+    f"CREATE INDEX ON {SCHEMA}.location_nodes USING gin (dependency_code gin_trgm_ops)",
+]
+# (nombre, SQL anterior, SQL nuevo). :p = '%término%'
+QUERIES = [
+    (
+        "read_assets (texto)",
+        f"""SELECT a.id FROM {SCHEMA}.assets a LEFT JOIN {SCHEMA}.location_nodes l ON a.location_node_id = l.id
+            WHERE a.hostname ILIKE :p OR a.ip_address ILIKE :p OR a.mac_address ILIKE :p
+               OR a.dependencia ILIKE :p OR a.serial ILIKE :p OR l.name ILIKE :p
+            ORDER BY a.hostname LIMIT 20""",
+        f"""SELECT a.id FROM {SCHEMA}.assets a LEFT JOIN {SCHEMA}.location_nodes l ON a.location_node_id = l.id
+            WHERE a.hostname ILIKE :p OR a.ip_address ILIKE :p OR a.mac_address ILIKE :p
+               OR a.dependencia ILIKE :p OR a.serial ILIKE :p
+               OR a.location_node_id IN (SELECT id FROM {SCHEMA}.location_nodes WHERE f_unaccent(name) ILIKE f_unaccent(:p))
+            ORDER BY a.hostname LIMIT 20""",
+    ),
+    (
+        "read_assets (#código)",
+        f"""SELECT a.id FROM {SCHEMA}.assets a LEFT JOIN {SCHEMA}.location_nodes l ON a.location_node_id = l.id
+            WHERE a.codigo_dependencia ILIKE :p OR l.dependency_code ILIKE :p
+            ORDER BY a.hostname LIMIT 20""",
+        f"""SELECT a.id FROM {SCHEMA}.assets a
+            WHERE a.codigo_dependencia ILIKE :p
+               OR a.location_node_id IN (SELECT id FROM {SCHEMA}.location_nodes WHERE dependency_code ILIKE :p)
+            ORDER BY a.hostname LIMIT 20""",
+    ),
+    (
+        "search_inventory",
+        f"""SELECT a.id FROM {SCHEMA}.assets a
+            WHERE a.deleted_at IS NULL AND (a.hostname ILIKE :p OR a.ip_address ILIKE :p
+               OR a.mac_address ILIKE :p OR a.codigo_dependencia ILIKE :p) LIMIT 15""",
+        None,
+    ),
+    (
+        "read_locations",
+        f"""SELECT id FROM {SCHEMA}.location_nodes
+            WHERE unaccent(name) ILIKE unaccent(:p) OR dependency_code ILIKE :p LIMIT 20""",
+        f"""SELECT id FROM {SCHEMA}.location_nodes
+            WHERE f_unaccent(name) ILIKE f_unaccent(:p) OR dependency_code ILIKE :p LIMIT 20""",
+    ),
+]
+TERMS = {
+    "read_assets (texto)": "transito 12",
+    "read_assets (#código)": "0042",
+    "search_inventory": "A3F",
+    "read_locations": "investigacion",
+}
+async def _measure(conn, sql: str, term: str, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        res = await conn.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}"), {"p": f"%{term}%"})
+        plan = res.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        timings.append(plan[0]["Execution Time"])
+    return statistics.median(timings)
+async def _run_all(conn, runs: int, label: str) -> dict:
+    results = {}
+    for name, old_sql, new_sql in QUERIES:
+        term = TERMS[name]
+        results[(name, "anterior")] = await _measure(conn, old_sql, term, runs)
+        if new_sql:
+            results[(name, "nueva")] = await _measure(conn, new_sql, term, runs)
+    print(f"  {label}: listo")
+    return results
+async def main(assets: int, locations: int, runs: int, keep: bool):
+    async with engine.connect() as conn:
+        print(f"Generando {assets} activos y {locations} ubicaciones en {SCHEMA}...")
+        for sql in SETUP:
+            await conn.execute(text(sql.replace("{assets}", str(assets)).replace("{locations}", str(locations))))
+        await conn.execute(text(f"ANALYZE {SCHEMA}.assets"))
+        await conn.execute(text(f"ANALYZE {SCHEMA}.location_nodes"))
+        await conn.commit()
+        before = await _run_all(conn, runs, "sin índices")
+        for sql in INDEXES:
+            await conn.execute(text(sql))
+        await conn.execute(text(f"ANALYZE {SCHEMA}.assets"))
+        await conn.execute(text(f"ANALYZE {SCHEMA}.location_nodes"))
+        await conn.commit()
+        after = await _run_all(conn, runs, "con índices trigram")
+        print(f"\n{'consulta':<26}{'variante':<10}{'sin índices (ms)':>18}{'con índices (ms)':>18}")
+        for (name, variant), ms in before.items():
+            print(f"{name:<26}{variant:<10}{ms:>18.2f}{after[(name, variant)]:>18.2f}")
+        if not keep:
+            await conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+            await conn.commit()
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--assets", type=int, default=100_000)
+    parser.add_argument("--locations", type=int, default=2_000)
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--keep", action="store_true", help="No eliminar el esquema al terminar")
+    args = parser.parse_args()
+    asyncio.run(main(args.assets, args.locations, args.runs, args.keep))
@@ -0,0 +1,65 @@
+"""
+Reindexado completo de Meilisearch (tickets / activos) desde Postgres.
+Lee tramos de ids en paralelo, carga un índice sombra y lo intercambia con el vivo al
+terminar (ver search_reindex_service). Con --resume retoma la última ejecución
+incompleta desde su punto de control.
+Uso: python -m app.scripts.maintenance.reindex_search [tickets|assets|all] [--resume]
+     [--workers 4] [--chunks 64] [--batch-size 5000]
+"""
+import argparse
+import asyncio
+import logging
+import sys
+sys.path.append("/app")
+
+from app.db.session import AsyncSessionLocal, engine
+from app.services.search_reindex_service import search_reindex_service, ReindexInProgress
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def _report(run, progress):
+    total = progress.total or 0
+    percent = f" ({100 * progress.indexed / total:.1f}%)" if total else ""
+    logger.info(
+        f"{run.index_name}: {progress.indexed}/{total} documentos{percent} - {progress.rate:.0f} docs/s - "
+        f"tramos {progress.chunks_done}/{progress.chunks}"
+    )
+
+async def main(args) -> int:
+    if args.workers:
+        search_reindex_service.workers = args.workers
+    if args.chunks:
+        search_reindex_service.chunks = args.chunks
+    if args.batch_size:
+        search_reindex_service.batch_size = args.batch_size
+    names = ["tickets", "assets"] if args.index == "all" else [args.index]
+    failed = 0
+    try:
+        for name in names:
+            async with AsyncSessionLocal() as db:
+                try:
+                    run = await search_reindex_service.acquire(db, name, resume=args.resume)
+                except ReindexInProgress as e:
+                    logger.error(str(e))
+                    failed += 1
+                    continue
+            if run.indexed_rows:
+                logger.info(f"{name}: se retoma la ejecución {run.id} ({run.indexed_rows} documentos ya enviados)")
+            try:
+                await search_reindex_service.execute(engine, run.id, on_progress=_report)
+            except Exception as e:
+                logger.error(f"{name}: el reindexado falló ({e}); se puede retomar con --resume")
+                failed += 1
+    finally:
+        await engine.dispose()
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("index", nargs="?", default="all", choices=["tickets", "assets", "all"])
+    parser.add_argument("--resume", action="store_true", help="Retomar la última ejecución incompleta")
+    parser.add_argument("--workers", type=int, help="Tramos leídos en paralelo")
+    parser.add_argument("--chunks", type=int, help="Cantidad de tramos de ids (al retomar se usa la de la ejecución)")
+    parser.add_argument("--batch-size", type=int, help="Documentos por envío a Meilisearch")
+    sys.exit(asyncio.run(main(parser.parse_args())))
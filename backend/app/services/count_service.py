@@ -0,0 +1,123 @@
+import json
+import logging
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from app.core.config import settings
+logger = logging.getLogger(__name__)
+COUNT_MODES = ("exact", "estimated", "auto")
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) <stmt> conservando los parámetros ligados."""
+    inherit_cache = False
+    def __init__(self, statement):
+        self.statement = statement
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+class CountService:
+    """
+    Estrategia compartida para el total de los listados paginados.
+    - exact: COUNT(*) sobre la consulta filtrada.
+    - estimated: estimación del planificador (EXPLAIN), sin recorrer filas.
+    - auto: estimación; si queda por debajo de COUNT_ESTIMATE_MIN_ROWS se cuenta
+      exacto, porque en conjuntos chicos el COUNT es barato y la estimación imprecisa.
+    Los resultados se memorizan unos segundos por (endpoint, alcance del usuario,
+    filtros normalizados); un commit que toca las tablas del listado los invalida.
+    """
+    def __init__(self):
+        self.ttl = settings.COUNT_CACHE_TTL
+        self.min_rows = settings.COUNT_ESTIMATE_MIN_ROWS
+        self.max_entries = 2048
+        self._memo: Dict[Tuple, Tuple[float, int, bool]] = {}
+        self._table_versions: Dict[str, int] = {}
+    def default_mode(self, endpoint: str) -> str:
+        mode = getattr(settings, f"COUNT_MODE_{endpoint.upper()}", "exact")
+        return mode if mode in COUNT_MODES else "exact"
+    @staticmethod
+    def normalize_filters(filters: Dict[str, Any]) -> Tuple:
+        return tuple(sorted((k, str(v)) for k, v in filters.items() if v not in (None, "", False)))
+    def bump(self, tables: Iterable[str]):
+        for table in tables:
+            self._table_versions[table] = self._table_versions.get(table, 0) + 1
+    def clear(self):
+        self._memo.clear()
+    async def count(
+        self,
+        db: AsyncSession,
+        query,
+        *,
+        endpoint: str,
+        tables: Iterable[str],
+        scope: str = "all",
+        filters: Optional[Dict[str, Any]] = None,
+        mode: Optional[str] = None,
+    ) -> Tuple[int, bool]:
+        """Retorna (total, exact)."""
+        mode = mode or self.default_mode(endpoint)
+        tables = tuple(tables)
+        key = (
+            endpoint, scope, mode,
+            self.normalize_filters(filters or {}),
+            tuple(self._table_versions.get(t, 0) for t in tables),
+        )
+        now = time.monotonic()
+        cached = self._memo.get(key)
+        if cached and cached[0] > now:
+            return cached[1], cached[2]
+        query = query.order_by(None)
+        total, exact = None, True
+        if mode != "exact":
+            total = await self._estimate(db, query)
+            if total is not None:
+                exact = False
+                if mode == "auto" and total < self.min_rows:
+                    total = None
+        if total is None:
+            exact = True
+            total_res = await db.execute(select(func.count()).select_from(query.subquery()))
+            total = total_res.scalar_one()
+        if len(self._memo) >= self.max_entries:
+            self._memo = {k: v for k, v in self._memo.items() if v[0] > now}
+            if len(self._memo) >= self.max_entries:
+                self._memo.clear()
+        self._memo[key] = (now + self.ttl, total, exact)
+        return total, exact
+    async def _estimate(self, db: AsyncSession, query) -> Optional[int]:
+        if db.get_bind().dialect.name != "postgresql":
+            return None
+        try:
+            # Savepoint: un fallo del EXPLAIN no debe abortar la transacción del request
+            async with db.begin_nested():
+                result = await db.execute(_Explain(query))
+                plan = result.scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"])
+        except Exception as e:
+            logger.warning(f"No se pudo estimar el total: {e}")
+            return None
+count_service = CountService()
+_PENDING_KEY = "count_tables_changed"
+def mark_tables_changed(session: Any, tables: Iterable[str]):
+    """Para escrituras Core (INSERT/COPY masivos) que el after_flush del ORM no ve."""
+    sync_session = getattr(session, "sync_session", session)
+    sync_session.info.setdefault(_PENDING_KEY, set()).update(tables)
+@event.listens_for(OrmSession, "after_flush")
+def _collect_changed_tables(session, flush_context):
+    changed = session.info.setdefault(_PENDING_KEY, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table:
+            changed.add(table)
+@event.listens_for(OrmSession, "after_commit")
+def _bump_changed_tables(session):
+    changed = session.info.pop(_PENDING_KEY, None)
+    if changed:
+        count_service.bump(changed)
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_changed_tables(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,357 @@
+"""
+Exportaciones en segundo plano (tickets, activos, auditoría, partes diarios).
+El trabajo se registra en export_jobs (visible desde cualquier worker) y corre como
+tarea del worker que lo recibió:
+- concurrencia acotada: EXPORT_JOB_CONCURRENCY por worker (el resto espera en
+  "pending") y EXPORT_JOB_MAX_PER_USER trabajos activos por usuario;
+- lee por lotes con cursor del servidor en su propia sesión y escribe en
+  EXPORT_JOBS_DIR/<id>.<ext>.part, que se renombra al terminar;
+- el progreso se guarda cada EXPORT_JOB_PROGRESS_INTERVAL segundos y se envía por
+  WebSocket (manager.send_to_user, mensaje "export_job"). Si la fila desaparece
+  (DELETE /exports/{id}) el trabajo se detiene en la siguiente actualización;
+- cleanup() borra los archivos vencidos (EXPORT_JOB_TTL_HOURS) y da por fallidos
+  los trabajos sin avance en EXPORT_JOB_STALE_MINUTES (worker reiniciado o
+  demasiado tiempo en cola).
+"""
+import asyncio
+import json
+import logging
+import os
+import shutil
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Set
+from uuid import UUID
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.ws_manager import manager
+from app.db.models.export_job import ExportJob
+from app.schemas.export_job import ExportJob as ExportJobSchema
+from app.services.export_service import export_service, FORMATS
+logger = logging.getLogger(__name__)
+ACTIVE_STATUSES = ("pending", "running")
+EXTENSIONS = {"csv": "csv", "excel": "xlsx", "pdf": "pdf", "docx": "docx"}
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+ASSET_EXPORT_HEADERS = (
+    "Hostname", "IP", "MAC", "Serial", "Asset Tag", "Status", "Device Type", "OS", "Antivirus",
+    "Location", "Dependency Code", "Last Seen",
+)
+AUDIT_EXPORT_HEADERS = ("Date", "User", "Event", "Target Type", "Target ID", "IP", "Details")
+# (sesión, ruta destino, progress(n_filas)) -> escribe el archivo del trabajo
+JobWriter = Callable[[AsyncSession, str, Callable[[int], Awaitable[None]]], Awaitable[None]]
+# sesión -> lotes de filas (listas, en el orden de headers)
+BatchSource = Callable[[AsyncSession], AsyncIterator[List[Sequence[Any]]]]
+class ExportJobLimit(RuntimeError):
+    pass
+class _JobCancelled(Exception):
+    pass
+async def stream_query(db: AsyncSession, query, row: Callable[[Any], Sequence[Any]]) -> AsyncIterator[List[Sequence[Any]]]:
+    """Lotes de EXPORT_BATCH_SIZE filas con cursor del servidor (yield_per)."""
+    result = await db.stream(query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+    async for partition in result.partitions():
+        yield [row(r) for r in partition]
+class ExportJobService:
+    def __init__(self):
+        self.directory = settings.EXPORT_JOBS_DIR
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop = None
+        self._tasks: Set[asyncio.Task] = set()
+    def _get_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots, self._slots_loop = asyncio.Semaphore(settings.EXPORT_JOB_CONCURRENCY), loop
+        return self._slots
+    def path_for(self, job_id: UUID, ext: str) -> str:
+        return os.path.join(self.directory, f"{job_id.hex}.{ext}")
+    @staticmethod
+    def tabular_writer(format: str, headers: Sequence[str], batches: BatchSource, title: str = "Reporte") -> JobWriter:
+        """Writer para fuentes tabulares: CSV / XLSX en streaming, PDF en el pool de renderizado."""
+        async def write(db: AsyncSession, path: str, progress: Callable[[int], Awaitable[None]]):
+            async def counted():
+                async for batch in batches(db):
+                    yield batch
+                    await progress(len(batch))
+            if format == "csv":
+                await export_service.write_csv(path, headers, counted())
+            elif format == "excel":
+                await export_service.write_xlsx(path, headers, counted())
+            else:
+                # La fuente del PDF ya viene acotada a EXPORT_PDF_MAX_ROWS
+                rows = [dict(zip(headers, r)) async for batch in counted() for r in batch]
+                content = await export_service.render("pdf", rows, title=title)
+                await asyncio.to_thread(_write_bytes, path, content)
+        return write
+    # --- Fuentes por tipo: (writer, count, filename, media_type) ---
+    async def start(self, db: AsyncSession, user: Any, kind: str, format: str, filters: Dict[str, Any]) -> ExportJob:
+        """
+        Arma la fuente de `kind` con el alcance del usuario y encola el trabajo.
+        ValueError: filtros o formato inválidos; LookupError: el objeto no existe.
+        """
+        if kind == "daily_report":
+            if format != "docx":
+                raise ValueError("Los partes diarios se exportan sólo en formato docx")
+        elif format not in FORMATS:
+            raise ValueError(f"Formato inválido para {kind}: {format}")
+        build = getattr(self, f"_{kind}_source")
+        writer, count, filename = await build(db, user, format, filters)
+        media_type = DOCX_MEDIA_TYPE if format == "docx" else FORMATS[format][1]
+        stamp = datetime.now().strftime("%Y%m%d_%H%M")
+        return await self.submit(
+            db, user.id, kind=kind, format=format, filters=filters, filename=f"{filename}_{stamp}.{EXTENSIONS[format]}",
+            media_type=media_type, writer=writer, count=count,
+        )
+    @staticmethod
+    def _limit(format: str) -> Optional[int]:
+        return settings.EXPORT_PDF_MAX_ROWS if format == "pdf" else None
+    async def _tickets_source(self, db: AsyncSession, user: Any, format: str, filters: Dict[str, Any]):
+        from app.crud import crud_ticket
+        from app.db.models.ticket import Ticket
+        criteria = await crud_ticket.ticket.read_scope(db, user)
+        for field in ("status", "priority"):
+            if filters.get(field):
+                criteria.append(getattr(Ticket, field) == filters[field])
+        if filters.get("group_id"):
+            group_id = _uuid(filters, "group_id")
+            criteria.append((Ticket.group_id == group_id) | (Ticket.owner_group_id == group_id))
+        limit = self._limit(format)
+        async def batches(session: AsyncSession):
+            async for batch in crud_ticket.ticket.stream_export_rows(
+                session, criteria, batch_size=settings.EXPORT_BATCH_SIZE, limit=limit
+            ):
+                yield [crud_ticket.ticket_export_row(r) for r in batch]
+        async def count(session: AsyncSession) -> int:
+            total = await session.scalar(select(func.count(Ticket.id)).where(Ticket.deleted_at.is_(None), *criteria))
+            return min(total, limit) if limit else total
+        writer = self.tabular_writer(format, crud_ticket.TICKET_EXPORT_HEADERS, batches, title="SOC Ticket Report")
+        return writer, count, "tickets"
+    async def _assets_source(self, db: AsyncSession, user: Any, format: str, filters: Dict[str, Any]):
+        from app.db.models.asset import Asset
+        from app.db.models.location import LocationNode
+        criteria = [Asset.deleted_at.is_(None)]
+        if not filters.get("include_decommissioned"):
+            criteria.append(Asset.status != "decommissioned")
+        for field in ("status", "device_type", "av_product"):
+            if filters.get(field):
+                criteria.append(getattr(Asset, field) == filters[field])
+        if filters.get("location_node_id"):
+            criteria.append(Asset.location_node_id == _uuid(filters, "location_node_id"))
+        query = (
+            select(
+                Asset.hostname, Asset.ip_address, Asset.mac_address, Asset.serial, Asset.asset_tag,
+                Asset.status, Asset.device_type, Asset.os_name, Asset.av_product,
+                LocationNode.name, Asset.codigo_dependencia, Asset.last_seen,
+            )
+            .outerjoin(LocationNode, Asset.location_node_id == LocationNode.id)
+            .where(*criteria)
+            .order_by(Asset.hostname, Asset.id)
+            .limit(self._limit(format))
+        )
+        def row(r) -> list:
+            return [*(v or "" for v in r[:11]), r.last_seen.strftime("%Y-%m-%d %H:%M") if r.last_seen else ""]
+        async def count(session: AsyncSession) -> int:
+            return await session.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+        writer = self.tabular_writer(
+            format, ASSET_EXPORT_HEADERS, lambda session: stream_query(session, query, row), title="Inventario de Activos"
+        )
+        return writer, count, "activos"
+    async def _audit_source(self, db: AsyncSession, user: Any, format: str, filters: Dict[str, Any]):
+        from app.db.models.audit_log import AuditLog
+        from app.db.models.user import User
+        from app.services.group_service import group_service
+        criteria = []
+        if not user.is_superuser:
+            # Misma jerarquía que GET /audit: eventos de usuarios de sus grupos
+            group_ids = await group_service.get_all_child_group_ids(db, user.group_id) if user.group_id else []
+            criteria.append(User.group_id.in_(group_ids))
+        if filters.get("ticket_id"):
+            criteria += [AuditLog.target_type == "ticket", AuditLog.target_id == _uuid(filters, "ticket_id")]
+        if filters.get("user_id"):
+            criteria.append(AuditLog.user_id == _uuid(filters, "user_id"))
+        if filters.get("event_type"):
+            criteria.append(AuditLog.event_type == filters["event_type"])
+        if filters.get("date_from"):
+            criteria.append(AuditLog.created_at >= _datetime(filters, "date_from"))
+        if filters.get("date_to"):
+            criteria.append(AuditLog.created_at <= _datetime(filters, "date_to"))
+        query = (
+            select(
+                AuditLog.created_at, User.username, AuditLog.event_type, AuditLog.target_type,
+                AuditLog.target_id, AuditLog.ip_address, AuditLog.details,
+            )
+            .outerjoin(User, AuditLog.user_id == User.id)
+            .where(*criteria)
+            .order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+            .limit(self._limit(format))
+        )
+        def row(r) -> list:
+            return [
+                r.created_at.strftime("%Y-%m-%d %H:%M:%S") if r.created_at else "", r.username or "System",
+                r.event_type, r.target_type or "", str(r.target_id) if r.target_id else "", r.ip_address or "",
+                json.dumps(r.details, ensure_ascii=False, default=str) if r.details else "",
+            ]
+        async def count(session: AsyncSession) -> int:
+            return await session.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+        writer = self.tabular_writer(
+            format, AUDIT_EXPORT_HEADERS, lambda session: stream_query(session, query, row), title="Auditoría"
+        )
+        return writer, count, "auditoria"
+    async def _daily_report_source(self, db: AsyncSession, user: Any, format: str, filters: Dict[str, Any]):
+        from app.db.models.daily_report import DailyReport
+        from app.services.report_generator import report_generator
+        report = await db.get(DailyReport, _uuid(filters, "report_id"))
+        if not report:
+            raise LookupError("Informe no encontrado")
+        data = dict(report.report_data or {})
+        legacy_path = report.file_path if data.get("legacy") else None
+        async def write(session: AsyncSession, path: str, progress: Callable[[int], Awaitable[None]]):
+            if legacy_path:
+                # Los partes legacy ya son un DOCX subido: se copia tal cual
+                await asyncio.to_thread(shutil.copyfile, legacy_path, path)
+            else:
+                await report_generator.generate_async({**data, "date_obj": report.date}, path)
+            await progress(1)
+        return write, None, f"parte_{report.date}_{report.shift}"
+    async def submit(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        *,
+        kind: str,
+        format: str,
+        filters: Dict[str, Any],
+        filename: str,
+        media_type: str,
+        writer: JobWriter,
+        count: Optional[Callable[[AsyncSession], Awaitable[int]]] = None,
+    ) -> ExportJob:
+        active = await db.scalar(
+            select(func.count()).select_from(ExportJob)
+            .where(ExportJob.user_id == user_id, ExportJob.status.in_(ACTIVE_STATUSES))
+        )
+        if active >= settings.EXPORT_JOB_MAX_PER_USER:
+            raise ExportJobLimit(f"Ya tiene {active} exportaciones en curso")
+        job = ExportJob(
+            user_id=user_id, kind=kind, format=format, status="pending", filters=filters,
+            filename=filename, media_type=media_type, progress_rows=0,
+        )
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+        ext = os.path.splitext(filename)[1].lstrip(".") or "bin"
+        task = asyncio.create_task(self._run(db.bind, job.id, user_id, self.path_for(job.id, ext), writer, count))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+    async def _update(self, bind, job_id: UUID, user_id: UUID, *criteria, **values) -> bool:
+        """Actualiza la fila (si cumple criteria) y notifica al dueño; False si no existe o cambió de estado."""
+        async with AsyncSession(bind) as db:
+            job = await db.scalar(
+                update(ExportJob).where(ExportJob.id == job_id, *criteria)
+                .values(updated_at=func.now(), **values).returning(ExportJob)
+            )
+            payload = ExportJobSchema.model_validate(job).model_dump(mode="json") if job else None
+            await db.commit()
+        if payload:
+            await manager.send_to_user({"type": "export_job", "job": payload}, str(user_id))
+        return payload is not None
+    async def _run(self, bind, job_id: UUID, user_id: UUID, path: str, writer: JobWriter, count):
+        part = path + ".part"
+        state = {"rows": 0, "flushed": time.monotonic()}
+        async def progress(rows: int):
+            state["rows"] += rows
+            if time.monotonic() - state["flushed"] >= settings.EXPORT_JOB_PROGRESS_INTERVAL:
+                state["flushed"] = time.monotonic()
+                if not await self._update(bind, job_id, user_id, ExportJob.status == "running", progress_rows=state["rows"]):
+                    raise _JobCancelled()
+        async with self._get_slots():
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                async with AsyncSession(bind) as db:
+                    total = await count(db) if count else None
+                    # Sólo si sigue pendiente: cleanup() pudo darla por abandonada mientras esperaba turno
+                    if not await self._update(bind, job_id, user_id, ExportJob.status == "pending", status="running", total_rows=total):
+                        return
+                    await writer(db, part, progress)
+                os.replace(part, path)
+                now = datetime.now(timezone.utc)
+                done = await self._update(
+                    bind, job_id, user_id, ExportJob.status == "running", status="done", progress_rows=state["rows"], file_path=path,
+                    size_bytes=os.path.getsize(path), finished_at=now,
+                    expires_at=now + timedelta(hours=settings.EXPORT_JOB_TTL_HOURS),
+                )
+                if not done:
+                    os.remove(path)
+            except _JobCancelled:
+                logger.info(f"Exportación {job_id} cancelada")
+                _remove(part)
+            except Exception as e:
+                logger.error(f"Exportación {job_id} falló: {e}")
+                _remove(part)
+                try:
+                    await self._update(
+                        bind, job_id, user_id, status="failed", error=(str(e) or type(e).__name__)[:500],
+                        finished_at=datetime.now(timezone.utc),
+                    )
+                except Exception as update_error:
+                    logger.error(f"No se pudo marcar la exportación {job_id} como fallida: {update_error}")
+    async def delete(self, db: AsyncSession, job: ExportJob) -> None:
+        """Borra el trabajo y su archivo; si sigue corriendo se detiene en su próximo avance."""
+        await db.execute(delete(ExportJob).where(ExportJob.id == job.id))
+        await db.commit()
+        if job.file_path:
+            _remove(job.file_path)
+    async def cleanup(self, db: AsyncSession) -> int:
+        now = datetime.now(timezone.utc)
+        res_expired = await db.execute(
+            select(ExportJob.id, ExportJob.file_path).where(ExportJob.status == "done", ExportJob.expires_at < now)
+        )
+        expired = res_expired.all()
+        if expired:
+            await db.execute(
+                update(ExportJob).where(ExportJob.id.in_([row.id for row in expired]))
+                .values(status="expired", file_path=None, updated_at=func.now())
+            )
+        await db.execute(
+            update(ExportJob)
+            .where(
+                ExportJob.status.in_(ACTIVE_STATUSES),
+                ExportJob.updated_at < now - timedelta(minutes=settings.EXPORT_JOB_STALE_MINUTES),
+            )
+            .values(status="failed", error="Interrumpida (reinicio del servidor)", finished_at=now)
+        )
+        await db.commit()
+        for row in expired:
+            if row.file_path:
+                _remove(row.file_path)
+        return len(expired)
+    async def cleanup_loop(self, session_factory):
+        """Tarea de fondo del worker (lifespan): limpieza periódica de exportaciones."""
+        while True:
+            try:
+                async with session_factory() as db:
+                    expired = await self.cleanup(db)
+                if expired:
+                    logger.info(f"Exportaciones vencidas eliminadas: {expired}")
+            except Exception as e:
+                logger.error(f"Error limpiando exportaciones: {e}")
+            await asyncio.sleep(settings.EXPORT_JOB_CLEANUP_INTERVAL)
+def _uuid(filters: Dict[str, Any], key: str) -> UUID:
+    try:
+        return UUID(str(filters[key]))
+    except (KeyError, ValueError):
+        raise ValueError(f"Filtro {key} inválido")
+def _datetime(filters: Dict[str, Any], key: str) -> datetime:
+    try:
+        return datetime.fromisoformat(str(filters[key]))
+    except ValueError:
+        raise ValueError(f"Filtro {key} inválido (se espera fecha ISO 8601)")
+def _write_bytes(path: str, content: bytes):
+    with open(path, "wb") as f:
+        f.write(content)
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+export_job_service = ExportJobService()
@@ -1,12 +1,32 @@
+import asyncio
+import csv
+import io
+import os
+import tempfile
 import pandas as pd
+import xlsxwriter
 from io import BytesIO
 from reportlab.lib.pagesizes import letter, landscape
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib import colors
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Sequence
+from app.services.render_executor import render_executor
+# formato -> (método de render, media type, nombre del archivo)
+FORMATS = {
+    "csv": ("to_csv", "text/csv", "tickets_export.csv"),
+    "excel": ("to_excel", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "tickets_export.xlsx"),
+    "pdf": ("to_pdf", "application/pdf", "tickets_report.pdf"),
+}
 class ExportService:
+    def _job(self, format: str, data: List[Dict[str, Any]], title: str) -> tuple:
+        method = getattr(self, FORMATS[format][0])
+        return (method, data, title) if format == "pdf" else (method, data)
+    async def render(self, format: str, data: List[Dict[str, Any]], title: str = "Ticket Report") -> bytes:
+        """Renderiza en el pool de procesos (pandas / ReportLab no corren en el event loop)."""
+        fn, *args = self._job(format, data, title)
+        return await render_executor.run(fn, *args, kind=f"export_{format}")
     def to_csv(self, data: List[Dict[str, Any]]) -> bytes:
         df = pd.DataFrame(data)
         return df.to_csv(index=False).encode('utf-8')
@@ -50,4 +70,55 @@ class ExportService:
             elements.append(t)
         doc.build(elements)
         return output.getvalue()
+    # --- Exportación en streaming (sin tope de filas) ---
+    async def stream_csv(self, headers: Sequence[str], batches: AsyncIterator[List[Sequence[Any]]]) -> AsyncIterator[bytes]:
+        """CSV incremental: un chunk por lote leído, nunca el archivo completo en memoria."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(headers)
+        async for batch in batches:
+            writer.writerows(batch)
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+    async def write_csv(self, path: str, headers: Sequence[str], batches: AsyncIterator[List[Sequence[Any]]]) -> None:
+        """CSV a disco lote por lote (trabajos de exportación); la escritura corre en un hilo."""
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(headers)
+            async for batch in batches:
+                await asyncio.to_thread(writer.writerows, batch)
+    async def write_xlsx(
+        self, path: str, headers: Sequence[str], batches: AsyncIterator[List[Sequence[Any]]], sheet_name: str = "Tickets"
+    ) -> None:
+        """
+        XLSX con xlsxwriter en modo constant_memory: cada fila se vuelca a disco al
+        escribir la siguiente. Las escrituras y el zip final corren en un hilo.
+        """
+        workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+        sheet = workbook.add_worksheet(sheet_name)
+        sheet.write_row(0, 0, headers)
+        def write_batch(start: int, batch: List[Sequence[Any]]):
+            for offset, row in enumerate(batch):
+                sheet.write_row(start + offset, 0, row)
+        row_num = 1
+        try:
+            async for batch in batches:
+                await asyncio.to_thread(write_batch, row_num, batch)
+                row_num += len(batch)
+        finally:
+            await asyncio.to_thread(workbook.close)
+    async def stream_xlsx(self, headers: Sequence[str], batches: AsyncIterator[List[Sequence[Any]]]) -> AsyncIterator[bytes]:
+        """Escribe el XLSX en un archivo temporal (el zip necesita el final) y lo emite por chunks."""
+        fd, path = tempfile.mkstemp(suffix=".xlsx")
+        os.close(fd)
+        try:
+            await self.write_xlsx(path, headers, batches)
+            with open(path, "rb") as f:
+                while chunk := await asyncio.to_thread(f.read, 1 << 16):
+                    yield chunk
+        finally:
+            os.remove(path)
 export_service = ExportService()
@@ -1,24 +1,116 @@
+import time
+from sqlalchemy import event, inspect, insert, delete, literal, true
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from app.db.models.group import Group
+from sqlalchemy.orm import Session as OrmSession
+from app.core.config import settings
+from app.db.models.group import Group, GroupClosure
 from uuid import UUID
-from typing import List
+from typing import Dict, List, Optional, Tuple
+closure = GroupClosure.__table__
 class GroupService:
+    def __init__(self):
+        # Caché de descendientes por proceso. Cada commit que toca grupos
+        # incrementa `version`; el TTL acota la desactualización entre workers.
+        self.version = 0
+        self.ttl = settings.GROUP_HIERARCHY_CACHE_TTL
+        self._descendants: Dict[UUID, Tuple[int, float, Tuple[UUID, ...]]] = {}
+    def invalidate(self):
+        self.version += 1
+        self._descendants.clear()
     async def get_all_child_group_ids(self, db: AsyncSession, group_id: UUID) -> List[UUID]:
         """
         Retorna una lista de IDs que incluye al grupo actual y a todos sus descendientes.
         """
         if not group_id:
             return []
-        result = await db.execute(select(Group))
-        all_groups = result.scalars().all()
-        descendants = [group_id]
-        def find_children(parent_id):
-            for g in all_groups:
-                if g.parent_id == parent_id:
-                    if g.id not in descendants:
-                        descendants.append(g.id)
-                        find_children(g.id)
-        find_children(group_id)
-        return descendants
-group_service = GroupService()
\ No newline at end of file
+        now = time.monotonic()
+        cached = self._descendants.get(group_id)
+        if cached and cached[0] == self.version and cached[1] > now:
+            return list(cached[2])
+        version = self.version
+        result = await db.execute(
+            select(GroupClosure.descendant_id)
+            .where(GroupClosure.ancestor_id == group_id, GroupClosure.descendant_id != group_id)
+            .order_by(GroupClosure.depth)
+        )
+        descendants = (group_id, *result.scalars().all())
+        if version == self.version:
+            self._descendants[group_id] = (version, now + self.ttl, descendants)
+        return list(descendants)
+    # --- Mantenimiento de la tabla de clausura (SQL síncrono dentro del flush) ---
+    @staticmethod
+    def _closure_insert(conn, group_id: UUID, parent_id: Optional[UUID]):
+        conn.execute(insert(closure).values(ancestor_id=group_id, descendant_id=group_id, depth=0))
+        if parent_id:
+            conn.execute(
+                insert(closure).from_select(
+                    ["ancestor_id", "descendant_id", "depth"],
+                    select(
+                        closure.c.ancestor_id,
+                        literal(group_id, closure.c.descendant_id.type),
+                        closure.c.depth + 1,
+                    ).where(closure.c.descendant_id == parent_id),
+                )
+            )
+    @staticmethod
+    def _closure_move(conn, group_id: UUID, new_parent_id: Optional[UUID]):
+        subtree = select(closure.c.descendant_id).where(closure.c.ancestor_id == group_id)
+        old_ancestors = select(closure.c.ancestor_id).where(
+            closure.c.descendant_id == group_id, closure.c.ancestor_id != group_id
+        )
+        conn.execute(
+            delete(closure).where(
+                closure.c.descendant_id.in_(subtree),
+                closure.c.ancestor_id.in_(old_ancestors),
+            )
+        )
+        if new_parent_id:
+            sup = closure.alias("sup")
+            sub = closure.alias("sub")
+            conn.execute(
+                insert(closure).from_select(
+                    ["ancestor_id", "descendant_id", "depth"],
+                    select(sup.c.ancestor_id, sub.c.descendant_id, sup.c.depth + sub.c.depth + 1)
+                    .select_from(sup.join(sub, true()))
+                    .where(sup.c.descendant_id == new_parent_id, sub.c.ancestor_id == group_id),
+                )
+            )
+group_service = GroupService()
+_PENDING_KEY = "group_hierarchy_changed"
+@event.listens_for(OrmSession, "after_flush")
+def _maintain_group_closure(session, flush_context):
+    new_groups = [obj for obj in session.new if isinstance(obj, Group)]
+    moved = []
+    for obj in session.dirty:
+        if isinstance(obj, Group):
+            history = inspect(obj).attrs.parent_id.history
+            if history.has_changes():
+                moved.append(obj)
+    deleted = any(isinstance(obj, Group) for obj in session.deleted)
+    if not (new_groups or moved or deleted):
+        return
+    conn = session.connection()
+    # Padres antes que hijos cuando se crean varios niveles en el mismo flush
+    pending = {g.id: g for g in new_groups}
+    while pending:
+        ready = [g for g in pending.values() if g.parent_id not in pending]
+        if not ready:
+            ready = list(pending.values())
+        for g in ready:
+            group_service._closure_insert(conn, g.id, g.parent_id)
+            pending.pop(g.id)
+    for g in moved:
+        group_service._closure_move(conn, g.id, g.parent_id)
+    # Las filas de grupos borrados caen por ON DELETE CASCADE
+    session.info[_PENDING_KEY] = True
+    # Escritura Core: el after_flush de count_service no la ve
+    from app.services.count_service import mark_tables_changed
+    mark_tables_changed(session, [closure.name])
+@event.listens_for(OrmSession, "after_commit")
+def _invalidate_group_cache(session):
+    if session.info.pop(_PENDING_KEY, False):
+        group_service.invalidate()
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_group_changes(session):
+    session.info.pop(_PENDING_KEY, None)
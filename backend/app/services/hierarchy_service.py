@@ -0,0 +1,38 @@
+from typing import Any, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import literal
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+# Límite de profundidad de la recursión: protege contra ciclos en datos corruptos
+MAX_DEPTH = 64
+class HierarchyService:
+    """
+    Resolución de árboles auto-referenciados (id / parent_id) con una única
+    consulta WITH RECURSIVE: grupos, ubicaciones y páginas de la wiki.
+    Para los grupos en rutas de autorización usar group_service, que además
+    cachea el resultado sobre la tabla de clausura.
+    """
+    def _subtree_cte(self, model: Any, root_id: UUID):
+        table = model.__table__
+        base = (
+            select(table.c.id, table.c.parent_id, literal(0).label("depth"))
+            .where(table.c.id == root_id)
+            .cte("subtree", recursive=True)
+        )
+        return base.union_all(
+            select(table.c.id, table.c.parent_id, base.c.depth + 1)
+            .where(table.c.parent_id == base.c.id, base.c.depth < MAX_DEPTH)
+        )
+    async def get_subtree(self, db: AsyncSession, model: Any, root_id: UUID) -> List[Tuple[UUID, Optional[UUID], int]]:
+        """Retorna (id, parent_id, depth) del nodo y todos sus descendientes, por nivel."""
+        tree = self._subtree_cte(model, root_id)
+        result = await db.execute(select(tree.c.id, tree.c.parent_id, tree.c.depth).order_by(tree.c.depth))
+        return [tuple(row) for row in result.all()]
+    async def get_descendant_ids(self, db: AsyncSession, model: Any, root_id: UUID, include_self: bool = True) -> List[UUID]:
+        if not root_id:
+            return []
+        ids = [row[0] for row in await self.get_subtree(db, model, root_id)]
+        if not ids and include_self:
+            return [root_id]
+        return ids if include_self else [i for i in ids if i != root_id]
+hierarchy_service = HierarchyService()
@@ -1,7 +1,7 @@
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from uuid import UUID
+from uuid import UUID, uuid4
 from datetime import datetime
 from app.db.models.notifications import Notification
 from app.core.ws_manager import manager
@@ -39,6 +39,39 @@ class NotificationService:
             }
         }, str(user_id))
         return notification
+    def queue_user_notification(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        title: str,
+        message: str,
+        link: Optional[str] = None
+    ) -> Notification:
+        """
+        Variante transaccional de notify_user: agrega la fila a la unidad de trabajo
+        en curso (sin flush) y envía el WebSocket recién después del COMMIT.
+        """
+        from app.db.post_commit import on_commit
+        notification = Notification(
+            id=uuid4(),
+            user_id=user_id,
+            title=title,
+            message=message,
+            link=link,
+            created_at=datetime.utcnow()
+        )
+        db.add(notification)
+        on_commit(db, manager.send_to_user, {
+            "type": "notification",
+            "data": {
+                "id": str(notification.id),
+                "title": title,
+                "message": message,
+                "link": link,
+                "created_at": notification.created_at.isoformat()
+            }
+        }, str(user_id))
+        return notification
     async def get_unread(self, db: AsyncSession, user_id: UUID):
         result = await db.execute(
             select(Notification)
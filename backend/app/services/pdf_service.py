@@ -5,9 +5,37 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.lib.units import inch
 import io
 from datetime import datetime
+from typing import Any, Dict, List
+from app.services.render_executor import render_executor
 
 class PDFService:
+    @staticmethod
+    def _ticket_payload(ticket) -> Dict[str, Any]:
+        """Datos planos del ticket para el proceso de renderizado (los objetos ORM no son picklables)."""
+        linked = list(ticket.assets or [])
+        if ticket.asset and ticket.asset not in linked:
+            linked.insert(0, ticket.asset)
+        return {
+            "id": str(ticket.id), "title": ticket.title, "status": ticket.status, "priority": ticket.priority,
+            "created_by_name": ticket.created_by_name, "created_at": ticket.created_at,
+            "description": ticket.description,
+            "assets": [
+                {
+                    "hostname": a.hostname, "ip_address": a.ip_address, "mac_address": a.mac_address,
+                    # El objeto ya viene enriquecido desde el validator
+                    "location_name": getattr(a, "location_name", "Desconocida"),
+                }
+                for a in linked
+            ],
+        }
+
     async def generate_ticket_report(self, ticket, comments):
+        payload = self._ticket_payload(ticket)
+        comment_rows = [{"created_at": c.created_at, "user_name": c.user_name, "content": c.content} for c in comments]
+        content = await render_executor.run(self.render_ticket_report, payload, comment_rows, kind="ticket_pdf")
+        return io.BytesIO(content)
+
+    def render_ticket_report(self, ticket: Dict[str, Any], comments: List[Dict[str, Any]]) -> bytes:
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=50, leftMargin=50, topMargin=50, bottomMargin=50)
         
@@ -41,12 +69,12 @@ class PDFService:
 
         # --- TICKET INFO TABLE ---
         data = [
-            ["ID del Ticket:", str(ticket.id)[:13].upper()],
-            ["Asunto:", ticket.title],
-            ["Estado:", ticket.status.upper()],
-            ["Prioridad:", ticket.priority.upper()],
-            ["Creado por:", ticket.created_by_name or "Sistema"],
-            ["Fecha de Apertura:", ticket.created_at.strftime('%d/%m/%Y %H:%M') if ticket.created_at else "N/A"]
+            ["ID del Ticket:", ticket["id"][:13].upper()],
+            ["Asunto:", ticket["title"]],
+            ["Estado:", ticket["status"].upper()],
+            ["Prioridad:", ticket["priority"].upper()],
+            ["Creado por:", ticket["created_by_name"] or "Sistema"],
+            ["Fecha de Apertura:", ticket["created_at"].strftime('%d/%m/%Y %H:%M') if ticket["created_at"] else "N/A"]
         ]
         
         t = Table(data, colWidths=[1.5 * inch, 4.5 * inch])
@@ -62,23 +90,17 @@ class PDFService:
         elements.append(Paragraph("EQUIPOS AFECTADOS / RELACIONADOS", section_style))
         
         asset_data = [["Hostname", "IP Address", "MAC Address", "Ubicación Actual"]]
-        
-        # Combinar asset individual y lista de assets
-        all_linked = (ticket.assets or [])
-        if ticket.asset and ticket.asset not in all_linked:
-            all_linked.insert(0, ticket.asset)
 
+        all_linked = ticket["assets"]
         if not all_linked:
             asset_data.append(["N/A", "N/A", "N/A", "Sin equipos vinculados"])
         else:
             for a in all_linked:
-                # El objeto ya viene enriquecido desde el validator
-                loc_name = getattr(a, "location_name", "Desconocida")
                 asset_data.append([
-                    a.hostname or "---", 
-                    a.ip_address or "---", 
-                    a.mac_address or "---",
-                    loc_name
+                    a["hostname"] or "---", 
+                    a["ip_address"] or "---", 
+                    a["mac_address"] or "---",
+                    a["location_name"]
                 ])
 
         at = Table(asset_data, colWidths=[1.2 * inch, 1.2 * inch, 1.5 * inch, 2.1 * inch])
@@ -95,7 +117,7 @@ class PDFService:
         # --- DESCRIPTION ---
         elements.append(Paragraph("DESCRIPCIÓN DEL CASO", section_style))
         # Limpiar HTML básico para ReportLab
-        clean_desc = (ticket.description or "Sin descripción").replace("<p>", "").replace("</p>", "\n").replace("<br/>", "\n").replace("<br>", "\n")
+        clean_desc = (ticket["description"] or "Sin descripción").replace("<p>", "").replace("</p>", "\n").replace("<br/>", "\n").replace("<br>", "\n")
         elements.append(Paragraph(clean_desc, normal_style))
 
         # --- COMMENTS / TIMELINE ---
@@ -103,9 +125,9 @@ class PDFService:
         comment_data = [["Fecha", "Usuario", "Comentario"]]
         for c in comments:
             comment_data.append([
-                c.created_at.strftime('%d/%m/%Y %H:%M'),
-                c.user_name or "Usuario",
-                Paragraph(c.content[:200], styles["Normal"]) # Truncar o usar Paragraph para wrap
+                c["created_at"].strftime('%d/%m/%Y %H:%M'),
+                c["user_name"] or "Usuario",
+                Paragraph(c["content"][:200], styles["Normal"]) # Truncar o usar Paragraph para wrap
             ])
         
         if len(comment_data) > 1:
@@ -136,7 +158,6 @@ class PDFService:
         elements.append(st)
 
         doc.build(elements)
-        buffer.seek(0)
-        return buffer
+        return buffer.getvalue()
 
 pdf_service = PDFService()
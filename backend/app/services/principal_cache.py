@@ -0,0 +1,271 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Set
+from uuid import UUID
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from app.core.config import settings
+from app.db.models.user import User
+from app.db.models.group import Group
+from app.db.models.session import Session as SessionModel
+from app.db.models.iam import Role, Permission, RolePermission, UserRole
+logger = logging.getLogger(__name__)
+# Modelos cuyo cambio invalida TODA la caché (afectan a N usuarios)
+GLOBAL_MODELS = (Role, Permission, RolePermission, Group)
+# Modelos cuyo cambio invalida sólo al usuario afectado
+USER_MODELS = (User, UserRole)
+def _encode(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return {"__uuid__": str(value)}
+    if isinstance(value, datetime):
+        return {"__dt__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    return value
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict) and len(value) == 1:
+        if "__uuid__" in value:
+            return UUID(value["__uuid__"])
+        if "__dt__" in value:
+            return datetime.fromisoformat(value["__dt__"])
+        if "__date__" in value:
+            return date.fromisoformat(value["__date__"])
+    return value
+def _columns(obj: Any) -> Dict[str, Any]:
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
+def _detached(model: Any, values: Dict[str, Any]) -> Any:
+    obj = model(**values)
+    make_transient_to_detached(obj)
+    return obj
+class PrincipalCache:
+    """
+    Caché de principales autenticados por id de sesión (sid).
+    Guarda un snapshot (usuario, grupo, roles y set de permisos congelado) en
+    un LRU en proceso y, si REDIS_URL está configurado, en Redis compartido.
+    En un hit el usuario se reconstruye y se adjunta a la sesión con
+    merge(load=False), sin ningún round-trip a la base.
+    """
+    def __init__(self):
+        self.ttl = settings.PRINCIPAL_CACHE_TTL
+        self.local_ttl = min(settings.PRINCIPAL_CACHE_LOCAL_TTL, self.ttl)
+        self.max_entries = settings.PRINCIPAL_CACHE_MAX_ENTRIES
+        self.prefix = "principal:"
+        self._local: "OrderedDict[str, tuple]" = OrderedDict()
+        self._by_user: Dict[str, Set[str]] = {}
+        self._redis = None
+        self._redis_disabled = not settings.REDIS_URL
+    # --- Snapshot ---
+    def snapshot(self, user: User, session_id: UUID) -> Dict[str, Any]:
+        roles = []
+        for user_role in user.roles or []:
+            role = user_role.role
+            if not role:
+                continue
+            roles.append({
+                "role": _columns(role),
+                "permissions": [_columns(rp.permission) for rp in role.permissions or [] if rp.permission],
+            })
+        return {
+            "sid": str(session_id),
+            "user": _columns(user),
+            "group": _columns(user.group) if user.group else None,
+            "roles": roles,
+            "permissions": sorted(user.get_permissions()),
+        }
+    def hydrate(self, snap: Dict[str, Any]) -> User:
+        user = _detached(User, snap["user"])
+        group = _detached(Group, snap["group"]) if snap.get("group") else None
+        set_committed_value(user, "group", group)
+        user_roles = []
+        for entry in snap["roles"]:
+            role = _detached(Role, entry["role"])
+            role_perms = []
+            for perm_values in entry["permissions"]:
+                perm = _detached(Permission, perm_values)
+                rp = _detached(RolePermission, {"role_id": role.id, "permission_id": perm.id})
+                set_committed_value(rp, "permission", perm)
+                set_committed_value(rp, "role", role)
+                role_perms.append(rp)
+            set_committed_value(role, "permissions", role_perms)
+            ur = _detached(UserRole, {"user_id": user.id, "role_id": role.id})
+            set_committed_value(ur, "role", role)
+            set_committed_value(ur, "user", user)
+            user_roles.append(ur)
+        set_committed_value(user, "roles", user_roles)
+        return user
+    def _dumps(self, snap: Dict[str, Any]) -> str:
+        def walk(value):
+            if isinstance(value, dict):
+                return {k: walk(v) for k, v in value.items()}
+            if isinstance(value, list):
+                return [walk(v) for v in value]
+            return _encode(value)
+        return json.dumps(walk(snap))
+    def _loads(self, raw: str) -> Dict[str, Any]:
+        return json.loads(raw, object_hook=_decode)
+    # --- Redis (opcional) ---
+    async def _get_redis(self):
+        if self._redis_disabled:
+            return None
+        if self._redis is None:
+            try:
+                import redis.asyncio as aioredis
+                self._redis = aioredis.from_url(
+                    settings.REDIS_URL, socket_timeout=0.2, socket_connect_timeout=0.2, decode_responses=True
+                )
+            except Exception as e:
+                logger.warning(f"Principal cache: Redis no disponible, usando sólo LRU local: {e}")
+                self._redis_disabled = True
+                return None
+        return self._redis
+    # --- LRU local ---
+    def _local_get(self, sid: str) -> Optional[Dict[str, Any]]:
+        entry = self._local.get(sid)
+        if not entry:
+            return None
+        expires_at, snap = entry
+        if expires_at < time.monotonic():
+            self._local_drop(sid)
+            return None
+        self._local.move_to_end(sid)
+        return snap
+    def _local_put(self, sid: str, snap: Dict[str, Any]):
+        self._local[sid] = (time.monotonic() + self.local_ttl, snap)
+        self._local.move_to_end(sid)
+        self._by_user.setdefault(str(snap["user"]["id"]), set()).add(sid)
+        while len(self._local) > self.max_entries:
+            old_sid, _ = self._local.popitem(last=False)
+            self._unindex(old_sid)
+    def _local_drop(self, sid: str):
+        if self._local.pop(sid, None) is not None:
+            self._unindex(sid)
+    def _unindex(self, sid: str):
+        for uid, sids in list(self._by_user.items()):
+            if sid in sids:
+                sids.discard(sid)
+                if not sids:
+                    del self._by_user[uid]
+    # --- API pública ---
+    async def get(self, db: AsyncSession, session_id: UUID) -> Optional[User]:
+        """Devuelve el usuario adjunto a `db` si el principal está en caché."""
+        sid = str(session_id)
+        snap = self._local_get(sid)
+        if snap is None:
+            r = await self._get_redis()
+            if r is not None:
+                try:
+                    raw = await r.get(f"{self.prefix}sid:{sid}")
+                    if raw:
+                        snap = self._loads(raw)
+                        self._local_put(sid, snap)
+                except Exception as e:
+                    logger.debug(f"Principal cache: lectura Redis fallida: {e}")
+        if snap is None:
+            return None
+        user = await db.merge(self.hydrate(snap), load=False)
+        user.attach_permissions(snap["permissions"])
+        return user
+    async def set(self, user: User, session_id: UUID):
+        sid = str(session_id)
+        snap = self.snapshot(user, session_id)
+        user.attach_permissions(snap["permissions"])
+        self._local_put(sid, snap)
+        r = await self._get_redis()
+        if r is not None:
+            try:
+                pipe = r.pipeline()
+                pipe.set(f"{self.prefix}sid:{sid}", self._dumps(snap), ex=self.ttl)
+                pipe.sadd(f"{self.prefix}user:{user.id}", sid)
+                pipe.expire(f"{self.prefix}user:{user.id}", self.ttl)
+                await pipe.execute()
+            except Exception as e:
+                logger.debug(f"Principal cache: escritura Redis fallida: {e}")
+    def invalidate_local(self, session_ids=(), user_ids=(), everything: bool = False):
+        if everything:
+            self._local.clear()
+            self._by_user.clear()
+            return
+        for sid in session_ids:
+            self._local_drop(str(sid))
+        for uid in user_ids:
+            for sid in list(self._by_user.get(str(uid), ())):
+                self._local_drop(sid)
+    async def invalidate_shared(self, session_ids=(), user_ids=(), everything: bool = False):
+        r = await self._get_redis()
+        if r is None:
+            return
+        try:
+            if everything:
+                async for key in r.scan_iter(match=f"{self.prefix}*", count=500):
+                    await r.delete(key)
+                return
+            keys = [f"{self.prefix}sid:{sid}" for sid in session_ids]
+            for uid in user_ids:
+                sids = await r.smembers(f"{self.prefix}user:{uid}")
+                keys.extend(f"{self.prefix}sid:{sid}" for sid in sids)
+                keys.append(f"{self.prefix}user:{uid}")
+            if keys:
+                await r.delete(*keys)
+        except Exception as e:
+            logger.warning(f"Principal cache: invalidación Redis fallida: {e}")
+    async def invalidate(self, session_ids=(), user_ids=(), everything: bool = False):
+        self.invalidate_local(session_ids, user_ids, everything)
+        await self.invalidate_shared(session_ids, user_ids, everything)
+principal_cache = PrincipalCache()
+# --- Invalidación automática por eventos ORM ---
+# Se acumulan los cambios en session.info durante los flush y se aplican
+# sólo después del commit, para no re-cachear datos aún no confirmados.
+_PENDING_KEY = "principal_cache_pending"
+def _pending(session: OrmSession) -> Dict[str, Any]:
+    return session.info.setdefault(_PENDING_KEY, {"sids": set(), "uids": set(), "all": False})
+def _track(session: OrmSession, obj: Any):
+    if isinstance(obj, GLOBAL_MODELS):
+        _pending(session)["all"] = True
+    elif isinstance(obj, User):
+        _pending(session)["uids"].add(obj.id)
+    elif isinstance(obj, UserRole):
+        _pending(session)["uids"].add(obj.user_id)
+    elif isinstance(obj, SessionModel):
+        _pending(session)["sids"].add(obj.id)
+@event.listens_for(OrmSession, "after_flush")
+def _collect_flush(session, flush_context):
+    for obj in session.dirty:
+        if isinstance(obj, GLOBAL_MODELS + USER_MODELS + (SessionModel,)) and session.is_modified(obj):
+            _track(session, obj)
+    for obj in session.deleted:
+        _track(session, obj)
+    for obj in session.new:
+        if isinstance(obj, GLOBAL_MODELS + (UserRole,)):
+            _track(session, obj)
+@event.listens_for(OrmSession, "do_orm_execute")
+def _collect_bulk(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None:
+        return
+    model = mapper.class_
+    if issubclass(model, GLOBAL_MODELS + USER_MODELS + (SessionModel,)):
+        # Sin conocer las filas afectadas, se invalida todo
+        _pending(orm_execute_state.session)["all"] = True
+@event.listens_for(OrmSession, "after_commit")
+def _apply_after_commit(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending or not (pending["all"] or pending["sids"] or pending["uids"]):
+        return
+    principal_cache.invalidate_local(pending["sids"], pending["uids"], pending["all"])
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    loop.create_task(principal_cache.invalidate_shared(pending["sids"], pending["uids"], pending["all"]))
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
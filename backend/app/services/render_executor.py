@@ -0,0 +1,105 @@
+"""
+Ejecutor de renderizado de documentos (PDF, Excel, CSV, DOCX).
+ReportLab, pandas y docxtpl son CPU puro y bloquean el event loop si se llaman en
+la request: acá corren en un pool de procesos acotado por worker de gunicorn.
+- RENDER_WORKERS trabajos en paralelo; hasta RENDER_MAX_QUEUE esperando turno, el
+  resto se rechaza (RenderQueueFull -> 503) en lugar de acumular memoria.
+- Cada trabajo tiene timeout (RENDER_TIMEOUT); un trabajo colgado recicla el pool.
+- Lo que se envía debe ser picklable: funciones o métodos de singletons de módulo
+  y datos planos (dicts, listas), nunca objetos ORM.
+Los documentos grandes van como exportación en segundo plano (export_job_service).
+"""
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+from prometheus_client import Counter, Gauge, Histogram
+from app.core.config import settings
+logger = logging.getLogger(__name__)
+RENDER_QUEUE_DEPTH = Gauge("ticketera_render_queue_depth", "Trabajos de renderizado esperando un worker libre")
+RENDER_IN_PROGRESS = Gauge("ticketera_render_in_progress", "Trabajos de renderizado en ejecución")
+RENDER_SECONDS = Histogram("ticketera_render_seconds", "Duración de los trabajos de renderizado", ["kind"])
+RENDER_FAILURES = Counter("ticketera_render_failures_total", "Trabajos de renderizado fallidos", ["kind", "reason"])
+class RenderQueueFull(RuntimeError):
+    pass
+class RenderTimeout(RuntimeError):
+    pass
+class RenderExecutor:
+    def __init__(self):
+        self.workers = max(1, settings.RENDER_WORKERS)
+        self.max_queue = settings.RENDER_MAX_QUEUE
+        self.timeout = settings.RENDER_TIMEOUT
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop = None
+        self._waiting = 0
+        self._running = 0
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: el proceso padre tiene hilos (asyncpg, uvicorn) y fork no es seguro;
+            # max_tasks_per_child acota la memoria que retienen ReportLab / pandas
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                max_tasks_per_child=settings.RENDER_MAX_TASKS_PER_CHILD,
+            )
+        return self._pool
+    def _get_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots, self._slots_loop = asyncio.Semaphore(self.workers), loop
+        return self._slots
+    def _recycle(self, pool: ProcessPoolExecutor):
+        """Descarta un pool con un proceso colgado: no hay forma de cancelar un trabajo en curso."""
+        if self._pool is pool:
+            self._pool = None
+        # ProcessPoolExecutor no expone sus procesos; terminate() libera la CPU ya mismo
+        for process in list((getattr(pool, "_processes", None) or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+    def stats(self) -> Dict[str, int]:
+        return {"workers": self.workers, "running": self._running, "queued": self._waiting, "max_queue": self.max_queue}
+    async def run(self, fn: Callable, *args, kind: str = "document", timeout: Optional[float] = None) -> Any:
+        if self._waiting >= self.max_queue:
+            RENDER_FAILURES.labels(kind, "queue_full").inc()
+            raise RenderQueueFull("Cola de renderizado llena")
+        slots = self._get_slots()
+        self._waiting += 1
+        RENDER_QUEUE_DEPTH.inc()
+        try:
+            await slots.acquire()
+        finally:
+            self._waiting -= 1
+            RENDER_QUEUE_DEPTH.dec()
+        self._running += 1
+        RENDER_IN_PROGRESS.inc()
+        start = time.monotonic()
+        loop = asyncio.get_running_loop()
+        try:
+            for attempt in (0, 1):
+                pool = self._get_pool()
+                try:
+                    return await asyncio.wait_for(loop.run_in_executor(pool, fn, *args), timeout or self.timeout)
+                except asyncio.TimeoutError:
+                    RENDER_FAILURES.labels(kind, "timeout").inc()
+                    self._recycle(pool)
+                    raise RenderTimeout(f"El renderizado superó {timeout or self.timeout}s")
+                except BrokenProcessPool:
+                    # Otro trabajo forzó el reciclado del pool (o murió un proceso): un reintento
+                    self._recycle(pool)
+                    if attempt:
+                        RENDER_FAILURES.labels(kind, "broken_pool").inc()
+                        raise
+        finally:
+            self._running -= 1
+            RENDER_IN_PROGRESS.dec()
+            RENDER_SECONDS.labels(kind).observe(time.monotonic() - start)
+            slots.release()
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+render_executor = RenderExecutor()
@@ -8,6 +8,7 @@ from docx import Document
 from docx.oxml import OxmlElement
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from typing import Dict, Any, List
+from app.services.render_executor import render_executor
 
 logger = logging.getLogger(__name__)
 
@@ -181,4 +182,9 @@ class DailyReportGenerator:
         if not os.path.exists(file_path): return ""
         doc = Document(file_path)
         return '\n'.join([p.text for p in doc.paragraphs])
+    # Variantes para el event loop: docxtpl / python-docx corren en el pool de renderizado
+    async def generate_async(self, data: Dict[str, Any], output_path: str) -> str:
+        return await render_executor.run(self.generate, data, output_path, kind="daily_report_docx")
+    async def extract_text_async(self, file_path: str) -> str:
+        return await render_executor.run(self.extract_text, file_path, kind="docx_text")
 report_generator = DailyReportGenerator()
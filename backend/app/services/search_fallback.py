@@ -0,0 +1,394 @@
+"""
+Búsqueda de respaldo cuando Meilisearch no responde.
+- CircuitBreaker: tras SEARCH_FALLBACK_FAILURE_THRESHOLD fallas seguidas de comunicación
+  con Meilisearch las búsquedas van directo al respaldo, sin esperar timeouts. El loop de
+  fondo consulta /health cada SEARCH_FALLBACK_REFRESH_INTERVAL y cierra el circuito
+  cuando responde; cada SEARCH_FALLBACK_RESET_SECONDS una sola búsqueda de prueba va a Meilisearch.
+- LocalSearchIndex: índice invertido en SQLite FTS5 en memoria (por proceso) con los mismos
+  documentos (SOURCES) y settings (INDEX_SETTINGS) que Meilisearch: ranking bm25 por
+  atributo buscable, prefijo en cada término y el mismo formato de filtro (compile_filter).
+  Los textos se recortan a SEARCH_FALLBACK_TEXT_MAX_CHARS para acotar la copia de cada worker.
+- Se construye al abrirse el circuito desde Postgres y se mantiene al día con los avisos
+  del outbox de búsqueda, que no se borran mientras Meilisearch está caído: se releen por
+  created_at con OUTBOX_MARGIN (un aviso con id menor puede confirmarse después) y se
+  descartan los ya aplicados. Las escrituras en SQLite corren en un hilo, en lotes chicos.
+  Con el circuito cerrado se libera pasado SEARCH_FALLBACK_MAX_AGE.
+Mientras se construye, las búsquedas devuelven vacío como antes (los listados caen a SQL).
+"""
+import asyncio
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from prometheus_client import Counter, Gauge
+from sqlalchemy import func, select
+from app.core.config import settings
+from app.db.models.search_outbox import SearchOutbox
+logger = logging.getLogger(__name__)
+SEARCH_FALLBACK_STATE = Gauge("ticketera_search_fallback_open", "Circuito de Meilisearch abierto (búsqueda de respaldo activa)")
+SEARCH_FALLBACK_QUERIES = Counter("ticketera_search_fallback_queries_total", "Búsquedas atendidas por el respaldo local", ["index"])
+SEARCH_FALLBACK_DOCUMENTS = Gauge("ticketera_search_fallback_documents", "Documentos en el índice de respaldo", ["index"])
+# Avisos del outbox que se releen por si se confirmaron después de uno posterior (transacciones largas)
+OUTBOX_MARGIN = timedelta(minutes=1)
+# Documentos por escritura en el índice vivo: una búsqueda espera a lo sumo un lote
+REFRESH_WRITE_BATCH = 200
+class FallbackFilterError(ValueError):
+    pass
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+    def allow(self) -> bool:
+        """Cerrado; abierto, sólo una búsqueda de prueba cada reset_seconds (el resto va al respaldo)."""
+        if self.opened_at is None:
+            return True
+        now = time.monotonic()
+        if now - self.opened_at < self.reset_seconds:
+            return False
+        # La prueba reinicia la espera: las búsquedas concurrentes no llegan al Meilisearch caído
+        self.opened_at = now
+        return True
+    def record_success(self):
+        if self.opened_at is not None:
+            logger.info("Meilisearch respondió: se cierra el circuito de búsqueda")
+        self.failures = 0
+        self.opened_at = None
+        SEARCH_FALLBACK_STATE.set(0)
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning(f"Meilisearch no responde ({self.failures} fallas): búsqueda de respaldo local")
+            # Una prueba fallida reinicia la espera
+            self.opened_at = time.monotonic()
+            SEARCH_FALLBACK_STATE.set(1)
+# Sintaxis de filtros de Meilisearch: comparaciones, IN / NOT IN, TO, EXISTS, IS [NOT] NULL,
+# NOT / AND / OR y paréntesis. Arrays: elementos con AND, arrays anidados con OR.
+_FILTER_TOKEN = re.compile(r"""\s*(?:(?P<str>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')|(?P<op>!=|>=|<=|=|>|<|[()\[\],])|(?P<word>[^\s()\[\],=!<>'"]+))""")
+_KEYWORDS = {"AND", "OR", "NOT", "IN", "TO", "EXISTS", "IS", "NULL"}
+def _tokenize(expression: str) -> List[Tuple[str, str]]:
+    tokens, position = [], 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _FILTER_TOKEN.match(expression, position)
+        if not match:
+            raise FallbackFilterError(f"Filtro inválido cerca de: {expression[position:position + 20]!r}")
+        position = match.end()
+        if match.group("str") is not None:
+            tokens.append(("value", re.sub(r"\\(.)", r"\1", match.group("str")[1:-1])))
+        elif match.group("op") is not None:
+            tokens.append(("op", match.group("op")))
+        elif match.group("word").upper() in _KEYWORDS:
+            tokens.append(("kw", match.group("word").upper()))
+        else:
+            tokens.append(("value", match.group("word")))
+    return tokens
+class _FilterCompiler:
+    """Traduce una expresión a SQL sobre las columnas f_<atributo>; cada condición nunca es NULL."""
+    def __init__(self, tokens: List[Tuple[str, str]], attributes: List[str]):
+        self.tokens = tokens
+        self.position = 0
+        self.attributes = attributes
+        self.params: List[Any] = []
+    def _peek(self, kind: str, value: Optional[str] = None) -> bool:
+        if self.position >= len(self.tokens):
+            return False
+        token = self.tokens[self.position]
+        return token[0] == kind and (value is None or token[1] == value)
+    def _take(self, kind: str, value: Optional[str] = None) -> str:
+        if not self._peek(kind, value):
+            found = self.tokens[self.position][1] if self.position < len(self.tokens) else "fin del filtro"
+            raise FallbackFilterError(f"Filtro inválido: se esperaba {value or kind}, se encontró {found!r}")
+        self.position += 1
+        return self.tokens[self.position - 1][1]
+    def compile(self) -> str:
+        sql = self._or()
+        if self.position != len(self.tokens):
+            raise FallbackFilterError(f"Filtro inválido cerca de {self.tokens[self.position][1]!r}")
+        return sql
+    def _or(self) -> str:
+        parts = [self._and()]
+        while self._peek("kw", "OR"):
+            self.position += 1
+            parts.append(self._and())
+        return parts[0] if len(parts) == 1 else "(" + " OR ".join(parts) + ")"
+    def _and(self) -> str:
+        parts = [self._not()]
+        while self._peek("kw", "AND"):
+            self.position += 1
+            parts.append(self._not())
+        return parts[0] if len(parts) == 1 else "(" + " AND ".join(parts) + ")"
+    def _not(self) -> str:
+        if self._peek("kw", "NOT"):
+            self.position += 1
+            return f"(NOT {self._not()})"
+        if self._peek("op", "("):
+            self.position += 1
+            sql = self._or()
+            self._take("op", ")")
+            return sql
+        return self._condition()
+    def _column(self) -> str:
+        attribute = self._take("value")
+        if attribute not in self.attributes:
+            raise FallbackFilterError(f"El atributo '{attribute}' no es filtrable")
+        return f'"f_{attribute}"'
+    def _number(self, value: str) -> float:
+        try:
+            return float(value)
+        except ValueError:
+            raise FallbackFilterError(f"Se esperaba un número: {value!r}")
+    def _condition(self) -> str:
+        column = self._column()
+        if self._peek("kw", "EXISTS"):
+            self.position += 1
+            return f"({column} IS NOT NULL)"
+        if self._peek("kw", "IS"):
+            self.position += 1
+            negated = self._peek("kw", "NOT")
+            if negated:
+                self.position += 1
+            self._take("kw", "NULL")
+            return f"({column} IS {'NOT ' if negated else ''}NULL)"
+        if self._peek("kw", "NOT"):
+            self.position += 1
+            if self._peek("kw", "EXISTS"):
+                self.position += 1
+                return f"({column} IS NULL)"
+            self._take("kw", "IN")
+            return f"(NOT {self._in(column)})"
+        if self._peek("kw", "IN"):
+            self.position += 1
+            return self._in(column)
+        if self._peek("op"):
+            operator = self._take("op")
+            value = self._take("value")
+            if operator in ("=", "!="):
+                self.params.append(value)
+                sql = f"COALESCE({column} = ? COLLATE NOCASE, 0)"
+                return sql if operator == "=" else f"(NOT {sql})"
+            if operator in (">", ">=", "<", "<="):
+                self.params.append(self._number(value))
+                return f"COALESCE(CAST({column} AS REAL) {operator} ?, 0)"
+            raise FallbackFilterError(f"Operador inválido: {operator!r}")
+        low = self._number(self._take("value"))
+        self._take("kw", "TO")
+        high = self._number(self._take("value"))
+        self.params.extend([low, high])
+        return f"COALESCE(CAST({column} AS REAL) BETWEEN ? AND ?, 0)"
+    def _in(self, column: str) -> str:
+        self._take("op", "[")
+        values = [self._take("value")]
+        while self._peek("op", ","):
+            self.position += 1
+            if self._peek("op", "]"):
+                break
+            values.append(self._take("value"))
+        self._take("op", "]")
+        self.params.extend(values)
+        return f"COALESCE({column} COLLATE NOCASE IN ({', '.join('?' * len(values))}), 0)"
+def compile_filter(filters: Any, attributes: List[str]) -> Tuple[str, List[Any]]:
+    """Filtro de Meilisearch (texto o array) -> (condición SQL, parámetros)."""
+    if not filters:
+        return "1", []
+    if isinstance(filters, str):
+        compiler = _FilterCompiler(_tokenize(filters), attributes)
+        return compiler.compile(), compiler.params
+    parts, params = [], []
+    for element in filters:
+        if isinstance(element, list):
+            alternatives = [compile_filter(alternative, attributes) for alternative in element]
+            parts.append("(" + " OR ".join(sql for sql, _ in alternatives) + ")")
+            params.extend(p for _, alternative_params in alternatives for p in alternative_params)
+        else:
+            sql, element_params = compile_filter(element, attributes)
+            parts.append(sql)
+            params.extend(element_params)
+    return "(" + " AND ".join(parts) + ")", params
+def _filter_value(value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+class LocalSearchIndex:
+    def __init__(self, index_settings: Dict[str, Dict[str, List[str]]], max_chars: int = 0):
+        self.settings = index_settings
+        self.max_chars = max_chars
+        self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self.lock = threading.Lock()
+        for index, config in index_settings.items():
+            filterable = ", ".join(f'"f_{a}"' for a in config["filterableAttributes"])
+            searchable = ", ".join(f'"{a}"' for a in config["searchableAttributes"])
+            self.conn.execute(f'CREATE TABLE "docs_{index}" (rowid INTEGER PRIMARY KEY, id TEXT UNIQUE NOT NULL, body TEXT NOT NULL, {filterable})')
+            self.conn.execute(f'CREATE VIRTUAL TABLE "fts_{index}" USING fts5({searchable}, tokenize="unicode61 remove_diacritics 2")')
+    def upsert(self, index: str, documents: List[Dict[str, Any]]):
+        config = self.settings[index]
+        filterable, searchable = config["filterableAttributes"], config["searchableAttributes"]
+        filterable_columns = ", ".join('"f_%s"' % a for a in filterable)
+        searchable_columns = ", ".join('"%s"' % a for a in searchable)
+        if self.max_chars:
+            documents = [self._truncate(document) for document in documents]
+        with self.lock, self.conn:
+            self._delete(index, [d["id"] for d in documents])
+            for document in documents:
+                cursor = self.conn.execute(
+                    f'INSERT INTO "docs_{index}" (id, body, {filterable_columns}) '
+                    f'VALUES (?, ?, {", ".join("?" * len(filterable))})',
+                    [document["id"], json.dumps(document), *[_filter_value(document.get(a)) for a in filterable]],
+                )
+                self.conn.execute(
+                    f'INSERT INTO "fts_{index}" (rowid, {searchable_columns}) VALUES (?, {", ".join("?" * len(searchable))})',
+                    [cursor.lastrowid, *[str(document.get(a) or "") for a in searchable]],
+                )
+    def _truncate(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            k: v[:self.max_chars] if isinstance(v, str) and len(v) > self.max_chars else v
+            for k, v in document.items()
+        }
+    def delete(self, index: str, document_ids: List[str]):
+        with self.lock, self.conn:
+            self._delete(index, document_ids)
+    def _delete(self, index: str, document_ids: List[str]):
+        for document_id in document_ids:
+            row = self.conn.execute(f'SELECT rowid FROM "docs_{index}" WHERE id = ?', [document_id]).fetchone()
+            if row:
+                self.conn.execute(f'DELETE FROM "fts_{index}" WHERE rowid = ?', row)
+                self.conn.execute(f'DELETE FROM "docs_{index}" WHERE rowid = ?', row)
+    def count(self, index: str) -> int:
+        with self.lock:
+            return self.conn.execute(f'SELECT count(*) FROM "docs_{index}"').fetchone()[0]
+    def search(self, index: str, query: str, filters: Any = None, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        """Misma respuesta que Meilisearch (hits, estimatedTotalHits, ...) más degraded=True."""
+        start = time.monotonic()
+        config = self.settings[index]
+        where, params = compile_filter(filters, config["filterableAttributes"])
+        # Cada palabra como frase con prefijo ("10.0.0.1" -> 10 0 0 1* contiguos), todas obligatorias;
+        # ranking bm25 con más peso a los primeros atributos
+        terms = [term for term in (query or "").split() if re.search(r"\w", term)]
+        if terms:
+            match = " ".join('"' + term.replace('"', '""') + '"*' for term in terms)
+            count_weights = len(config["searchableAttributes"])
+            weights = ", ".join(str(2 ** (count_weights - i - 1)) for i in range(count_weights))
+            source = f'"docs_{index}" d JOIN "fts_{index}" ON "fts_{index}".rowid = d.rowid'
+            where = f'"fts_{index}" MATCH ? AND {where}'
+            params = [match, *params]
+            order = f'bm25("fts_{index}", {weights}), d.rowid'
+        else:
+            source, order = f'"docs_{index}" d', "d.rowid"
+        with self.lock:
+            total = self.conn.execute(f"SELECT count(*) FROM {source} WHERE {where}", params).fetchone()[0]
+            rows = self.conn.execute(
+                f"SELECT d.body FROM {source} WHERE {where} ORDER BY {order} LIMIT ? OFFSET ?", [*params, limit, offset]
+            ).fetchall()
+        return {
+            "hits": [json.loads(body) for body, in rows],
+            "query": query,
+            "limit": limit,
+            "offset": offset,
+            "estimatedTotalHits": total,
+            "processingTimeMs": int((time.monotonic() - start) * 1000),
+            "degraded": True,
+        }
+class SearchFallback:
+    def __init__(self, index_settings: Dict[str, Dict[str, List[str]]]):
+        self.settings = index_settings
+        self.enabled = settings.SEARCH_FALLBACK_ENABLED
+        self.breaker = CircuitBreaker(settings.SEARCH_FALLBACK_FAILURE_THRESHOLD, settings.SEARCH_FALLBACK_RESET_SECONDS)
+        self.interval = settings.SEARCH_FALLBACK_REFRESH_INTERVAL
+        self.max_age = settings.SEARCH_FALLBACK_MAX_AGE
+        self.index: Optional[LocalSearchIndex] = None
+        self.built_at = 0.0
+        self.closed_since: Optional[float] = None
+        # Ventana del outbox: avisos desde outbox_since - OUTBOX_MARGIN; applied = ids ya aplicados -> created_at
+        self.outbox_since = None
+        self.applied: Dict[int, Any] = {}
+    def search(self, index: str, query: str, filters: Any = None, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        local = self.index
+        if not self.enabled or local is None:
+            return {"hits": [], "estimatedTotalHits": 0}
+        try:
+            result = local.search(index, query, filters, limit=limit, offset=offset)
+        except (FallbackFilterError, sqlite3.Error) as e:
+            logger.error(f"Búsqueda de respaldo en '{index}' falló: {e}")
+            return {"hits": [], "estimatedTotalHits": 0}
+        SEARCH_FALLBACK_QUERIES.labels(index).inc()
+        return result
+    async def rebuild(self, db):
+        """Índice nuevo desde Postgres; reemplaza al anterior recién al terminar."""
+        from app.services.search_reindex_service import SOURCES
+        since = (await db.execute(select(func.now()))).scalar_one()
+        local = LocalSearchIndex(self.settings, settings.SEARCH_FALLBACK_TEXT_MAX_CHARS)
+        for index, (model, columns, document) in SOURCES.items():
+            result = await db.stream(
+                select(*[getattr(model, c) for c in columns]).where(model.deleted_at.is_(None))
+                .order_by(model.id).execution_options(yield_per=settings.SEARCH_REINDEX_BATCH_SIZE)
+            )
+            async for partition in result.partitions():
+                # Índice todavía no visible: el lote entero en un hilo, sin frenar el event loop
+                await asyncio.to_thread(local.upsert, index, [document(row) for row in partition])
+            SEARCH_FALLBACK_DOCUMENTS.labels(index).set(local.count(index))
+        await db.rollback()
+        self.index, self.outbox_since, self.applied, self.built_at = local, since, {}, time.monotonic()
+        logger.info("Índice de búsqueda de respaldo construido")
+    async def refresh(self, db) -> int:
+        """Aplica los avisos del outbox de la ventana que todavía no se aplicaron."""
+        from app.services.search_outbox_dispatcher import current_documents
+        now = (await db.execute(select(func.now()))).scalar_one()
+        window = self.outbox_since - OUTBOX_MARGIN
+        rows = (await db.execute(
+            select(SearchOutbox.id, SearchOutbox.index_name, SearchOutbox.document_id, SearchOutbox.created_at)
+            .where(SearchOutbox.created_at >= window).order_by(SearchOutbox.id)
+        )).all()
+        rows = [row for row in rows if row.id not in self.applied]
+        changed: Dict[str, set] = {}
+        for row in rows:
+            if row.index_name in self.settings:
+                changed.setdefault(row.index_name, set()).add(row.document_id)
+        for index, document_ids in changed.items():
+            document_ids = sorted(document_ids)
+            for i in range(0, len(document_ids), settings.SEARCH_OUTBOX_BATCH_SIZE):
+                documents, removed = await current_documents(db, index, set(document_ids[i:i + settings.SEARCH_OUTBOX_BATCH_SIZE]))
+                for j in range(0, len(documents), REFRESH_WRITE_BATCH):
+                    await asyncio.to_thread(self.index.upsert, index, documents[j:j + REFRESH_WRITE_BATCH])
+                await asyncio.to_thread(self.index.delete, index, removed)
+        await db.rollback()
+        self.applied.update((row.id, row.created_at) for row in rows)
+        self.outbox_since = now
+        # Los ids fuera de la próxima ventana ya no vuelven a leerse
+        self.applied = {k: v for k, v in self.applied.items() if v >= now - OUTBOX_MARGIN}
+        return len(rows)
+    async def run_loop(self, session_factory, indexer):
+        """Loop de fondo (lifespan): /health con el circuito abierto, y construcción y refresco del respaldo."""
+        while self.enabled:
+            try:
+                if self.breaker.is_open and await indexer.healthy():
+                    self.breaker.record_success()
+                now = time.monotonic()
+                if self.breaker.is_open:
+                    self.closed_since = None
+                    async with session_factory() as db:
+                        # Reconstrucción periódica: cubre transacciones más largas que OUTBOX_MARGIN
+                        if self.index is None or now - self.built_at > self.max_age:
+                            await self.rebuild(db)
+                        else:
+                            await self.refresh(db)
+                elif self.index is not None:
+                    self.closed_since = self.closed_since or now
+                    if now - self.closed_since > self.max_age:
+                        self.index = None
+                        logger.info("Índice de búsqueda de respaldo liberado")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error en la búsqueda de respaldo: {e}")
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,86 @@
+"""
+Escritura en Meilisearch: altas y bajas en lote con un cliente HTTP asíncrono.
+Qué enviar lo decide el despachador del outbox (search_outbox_dispatcher); acá sólo
+se resuelve el transporte:
+- Errores de red, 429 y 5xx se reintentan con backoff exponencial y jitter; agotados
+  los reintentos se propaga el error y el outbox conserva los cambios.
+- Un 4xx es un rechazo definitivo (SearchIndexError): reintentarlo no lo arregla.
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Dict, List, Optional
+import httpx
+from prometheus_client import Counter, Histogram
+from app.core.config import settings
+logger = logging.getLogger(__name__)
+SEARCH_INDEX_FLUSH_SECONDS = Histogram("ticketera_search_index_flush_seconds", "Duración de cada envío a Meilisearch", ["index"])
+SEARCH_INDEX_DOCUMENTS = Counter("ticketera_search_index_documents_total", "Documentos enviados a Meilisearch", ["index", "op"])
+SEARCH_INDEX_FAILURES = Counter("ticketera_search_index_failures_total", "Envíos a Meilisearch fallidos", ["index", "reason"])
+class SearchIndexError(RuntimeError):
+    pass
+class SearchIndexer:
+    def __init__(self, url: str, key: str, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.url = url.rstrip("/")
+        self.key = key
+        self.transport = transport
+        self.max_retries = settings.SEARCH_INDEX_MAX_RETRIES
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+    def _get_client(self) -> httpx.AsyncClient:
+        # Un cliente por event loop (la API, los scripts y los tests usan loops distintos)
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.url,
+                headers={"Authorization": f"Bearer {self.key}"},
+                timeout=settings.SEARCH_INDEX_TIMEOUT,
+                transport=self.transport,
+            )
+            self._client_loop = loop
+        return self._client
+    async def upsert(self, index: str, documents: List[Dict[str, Any]]):
+        """Alta o reemplazo completo de documentos (add_documents)."""
+        if documents:
+            await self._send(index, f"/indexes/{index}/documents", documents, params={"primaryKey": "id"})
+            SEARCH_INDEX_DOCUMENTS.labels(index, "upsert").inc(len(documents))
+    async def delete(self, index: str, document_ids: List[str]):
+        if document_ids:
+            await self._send(index, f"/indexes/{index}/documents/delete-batch", document_ids)
+            SEARCH_INDEX_DOCUMENTS.labels(index, "delete").inc(len(document_ids))
+    async def _send(self, index: str, path: str, payload: List[Any], params: Optional[Dict[str, str]] = None):
+        client = self._get_client()
+        start = time.monotonic()
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    response = await client.post(path, json=payload, params=params)
+                except httpx.TransportError:
+                    SEARCH_INDEX_FAILURES.labels(index, "network").inc()
+                    if attempt == self.max_retries:
+                        raise
+                else:
+                    if response.status_code < 400:
+                        return
+                    if response.status_code != 429 and response.status_code < 500:
+                        SEARCH_INDEX_FAILURES.labels(index, "rejected").inc()
+                        raise SearchIndexError(f"{response.status_code} {response.text[:200]}")
+                    SEARCH_INDEX_FAILURES.labels(index, f"http_{response.status_code // 100}xx").inc()
+                    if attempt == self.max_retries:
+                        response.raise_for_status()
+                # Backoff exponencial con jitter: 0.5s, 1s, 2s, ... (tope 10s)
+                await asyncio.sleep(min(0.5 * 2 ** attempt, 10) * random.uniform(0.5, 1.0))
+        finally:
+            SEARCH_INDEX_FLUSH_SECONDS.labels(index).observe(time.monotonic() - start)
+    async def healthy(self) -> bool:
+        """GET /health (lo usa el circuito de search_fallback)."""
+        try:
+            response = await self._get_client().get("/health")
+        except httpx.HTTPError:
+            return False
+        return response.status_code == 200
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
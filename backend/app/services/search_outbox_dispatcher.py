@@ -0,0 +1,103 @@
+"""
+Despachador del outbox de búsqueda.
+Los triggers de tickets / assets anotan en search_outbox cada cambio dentro de la
+misma transacción (ORM, UPDATE masivo, COPY, scripts, movimientos de ubicación): si el
+cambio se confirmó, su aviso existe. Este loop lo lleva a Meilisearch:
+- Toma hasta SEARCH_OUTBOX_BATCH_SIZE avisos en orden y lee el estado vigente de cada
+  documento: varios cambios del mismo id son un solo envío; si la fila ya no existe o
+  tiene deleted_at, es una baja.
+- Los avisos se borran en la misma transacción y sólo si Meilisearch aceptó los lotes;
+  tras una caída del proceso o de Meilisearch se reintenta hasta converger.
+- Un único despachador activo entre workers (advisory lock por transacción), así los
+  envíos de un mismo documento no se reordenan.
+Las escrituras nunca esperan al motor de búsqueda.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Set, Tuple
+from prometheus_client import Counter, Gauge
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.models.search_outbox import SearchOutbox
+from app.services.search_indexer import SearchIndexError
+from app.services.search_reindex_service import SOURCES
+from app.services.search_service import search_service
+logger = logging.getLogger(__name__)
+SEARCH_OUTBOX_LAG = Gauge("ticketera_search_outbox_lag_seconds", "Antigüedad del aviso más viejo del último lote del outbox")
+SEARCH_OUTBOX_DISPATCHED = Counter("ticketera_search_outbox_dispatched_total", "Avisos del outbox de búsqueda procesados")
+# Clave del advisory lock (arbitraria, única en la base)
+DISPATCH_LOCK_ID = 702301
+async def current_documents(db: AsyncSession, index_name: str, document_ids: Set[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Estado vigente de los documentos avisados: (altas, ids a borrar). También lo usa search_fallback."""
+    model, columns, document = SOURCES[index_name]
+    ids = [uuid.UUID(document_id) for document_id in document_ids]
+    result = await db.execute(
+        select(*[getattr(model, c) for c in columns]).where(model.id.in_(ids), model.deleted_at.is_(None))
+    )
+    documents = [document(row) for row in result.all()]
+    return documents, sorted(document_ids - {d["id"] for d in documents})
+class SearchOutboxDispatcher:
+    def __init__(self):
+        self.batch_size = settings.SEARCH_OUTBOX_BATCH_SIZE
+        self.interval = settings.SEARCH_OUTBOX_POLL_INTERVAL
+    async def dispatch_once(self, db: AsyncSession) -> int:
+        """Procesa un lote; devuelve cuántos avisos consumió (0 = vacío u otro worker despachando)."""
+        try:
+            locked = (await db.execute(select(func.pg_try_advisory_xact_lock(DISPATCH_LOCK_ID)))).scalar()
+            if not locked:
+                return 0
+            rows = (await db.execute(
+                select(SearchOutbox.id, SearchOutbox.index_name, SearchOutbox.document_id, SearchOutbox.created_at)
+                .order_by(SearchOutbox.id).limit(self.batch_size)
+            )).all()
+            if not rows:
+                SEARCH_OUTBOX_LAG.set(0)
+                return 0
+            SEARCH_OUTBOX_LAG.set((datetime.now(timezone.utc) - rows[0].created_at).total_seconds())
+            changed: Dict[str, Set[str]] = {}
+            for row in rows:
+                changed.setdefault(row.index_name, set()).add(row.document_id)
+            for index_name, document_ids in changed.items():
+                await self._sync(db, index_name, document_ids)
+            await db.execute(delete(SearchOutbox).where(SearchOutbox.id.in_([row.id for row in rows])))
+            await db.commit()
+        finally:
+            # Sin commit (vacío, lock ocupado o error): libera el lock y deja los avisos
+            await db.rollback()
+        SEARCH_OUTBOX_DISPATCHED.inc(len(rows))
+        return len(rows)
+    async def _sync(self, db: AsyncSession, index_name: str, document_ids: Set[str]):
+        if index_name not in SOURCES:
+            logger.warning(f"Outbox de búsqueda: índice desconocido '{index_name}', se descartan {len(document_ids)} avisos")
+            return
+        documents, removed = await current_documents(db, index_name, document_ids)
+        try:
+            await search_service.indexer.upsert(index_name, documents)
+            await search_service.indexer.delete(index_name, removed)
+        except SearchIndexError as e:
+            # Rechazo definitivo: reintentar bloquearía el outbox; el reindex completo lo repara
+            logger.error(f"Meilisearch rechazó {len(document_ids)} documentos de '{index_name}': {e}")
+    async def run_loop(self, session_factory):
+        """Loop de fondo (lifespan): vacía el outbox y, sin avisos, consulta cada SEARCH_OUTBOX_POLL_INTERVAL."""
+        failures = 0
+        while True:
+            try:
+                async with session_factory() as db:
+                    processed = await self.dispatch_once(db)
+                failures = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                failures += 1
+                processed = 0
+                logger.error(f"Error despachando el outbox de búsqueda: {e}")
+            if processed >= self.batch_size:
+                # Hay más avisos: el siguiente lote sin esperar
+                await asyncio.sleep(0)
+                continue
+            # Meilisearch caído: pausa creciente
+            await asyncio.sleep(self.interval if not failures else min(2 ** failures, 60))
+search_outbox_dispatcher = SearchOutboxDispatcher()
@@ -0,0 +1,287 @@
+"""
+Reindexado completo de Meilisearch (tickets / assets) desde Postgres.
+- Los ids (uuid4) se reparten en SEARCH_REINDEX_CHUNKS tramos de igual ancho; hasta
+  SEARCH_REINDEX_WORKERS tramos se leen a la vez, cada uno con su conexión y un cursor
+  del servidor (stream + yield_per) ordenado por id.
+- Los lotes de SEARCH_REINDEX_BATCH_SIZE van a un índice sombra con la configuración
+  del vivo (INDEX_SETTINGS); al terminar se intercambian con swap-indexes, así las
+  búsquedas nunca ven un índice a medio cargar, y se borra el anterior.
+- Avance, filas/s y el último id enviado por tramo quedan en search_reindex_runs:
+  resume retoma la última ejecución incompleta sin releer lo ya enviado.
+- Lo modificado durante el reindexado (updated_at / deleted_at) se reaplica antes y
+  después del swap para no perder escrituras que sólo llegaron al índice vivo.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Set
+import httpx
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from app.core.config import settings
+from app.crud.crud_asset import ASSET_SEARCH_COLUMNS, asset_search_document
+from app.crud.crud_ticket import TICKET_SEARCH_COLUMNS, ticket_search_document
+from app.db.models.asset import Asset
+from app.db.models.search_reindex_run import SearchReindexRun
+from app.db.models.ticket import Ticket
+from app.services.search_service import INDEX_SETTINGS, search_service
+logger = logging.getLogger(__name__)
+# índice -> (modelo, columnas leídas, fila -> documento)
+SOURCES = {
+    "tickets": (Ticket, TICKET_SEARCH_COLUMNS, ticket_search_document),
+    "assets": (Asset, ASSET_SEARCH_COLUMNS, asset_search_document),
+}
+# Transacciones abiertas antes del inicio que confirman después (su now() es anterior)
+DELTA_MARGIN = timedelta(minutes=1)
+class ReindexInProgress(RuntimeError):
+    pass
+class MeilisearchTaskFailed(RuntimeError):
+    pass
+class _Progress:
+    """Estado en memoria de una ejecución; lo persiste un único escritor (_save_progress)."""
+    def __init__(self, run: SearchReindexRun, chunks: int):
+        checkpoint = run.checkpoint or {}
+        # Al retomar manda la partición con la que se guardaron las posiciones
+        self.chunks = checkpoint.get("chunks") or chunks
+        self.positions: Dict[str, str] = dict(checkpoint.get("positions") or {})
+        self.indexed = run.indexed_rows or 0
+        self.total = run.total_rows
+        self.sent = 0
+        self.started = time.monotonic()
+    def advance(self, chunk: int, last_id: str, count: int):
+        self.positions[str(chunk)] = last_id
+        self.indexed += count
+        self.sent += count
+    @property
+    def chunks_done(self) -> int:
+        return sum(1 for value in self.positions.values() if value == "done")
+    @property
+    def checkpoint(self) -> Dict[str, Any]:
+        return {"chunks": self.chunks, "positions": dict(self.positions)}
+    @property
+    def rate(self) -> float:
+        return self.sent / max(time.monotonic() - self.started, 1e-6)
+def chunk_bounds(chunk: int, chunks: int) -> tuple:
+    """[desde, hasta) del tramo dentro del espacio de uuids; hasta=None en el último."""
+    step = (1 << 128) // chunks
+    low = uuid.UUID(int=chunk * step)
+    return low, (uuid.UUID(int=(chunk + 1) * step) if chunk < chunks - 1 else None)
+class SearchReindexService:
+    def __init__(self):
+        self.chunks = max(1, settings.SEARCH_REINDEX_CHUNKS)
+        self.workers = max(1, settings.SEARCH_REINDEX_WORKERS)
+        self.batch_size = settings.SEARCH_REINDEX_BATCH_SIZE
+        # Referencias fuertes a las ejecuciones lanzadas desde la API
+        self._tasks: Set[asyncio.Task] = set()
+    def _client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=search_service.url,
+            headers={"Authorization": f"Bearer {search_service.key}"},
+            timeout=60,
+        )
+    async def acquire(
+        self, db: AsyncSession, index_name: str, resume: bool = False, user_id: Optional[uuid.UUID] = None
+    ) -> SearchReindexRun:
+        """Crea la ejecución (o reabre la última incompleta con resume); una activa por índice."""
+        if index_name not in SOURCES:
+            raise ValueError(f"Índice desconocido: {index_name}")
+        result = await db.execute(
+            select(SearchReindexRun).where(SearchReindexRun.index_name == index_name)
+            .order_by(SearchReindexRun.started_at.desc()).limit(1)
+        )
+        latest = result.scalar_one_or_none()
+        stale_before = datetime.now(timezone.utc) - timedelta(minutes=settings.SEARCH_REINDEX_STALE_MINUTES)
+        if latest and latest.status == "running" and latest.updated_at and latest.updated_at >= stale_before:
+            raise ReindexInProgress(f"Ya hay un reindexado de '{index_name}' en curso")
+        if resume and latest and latest.status in ("running", "failed"):
+            latest.status, latest.error, latest.finished_at = "running", None, None
+            await db.commit()
+            await db.refresh(latest)
+            return latest
+        run = SearchReindexRun(
+            index_name=index_name, shadow_index=f"{index_name}_reindex_{uuid.uuid4().hex[:8]}",
+            status="running", started_by_id=user_id, checkpoint={}, indexed_rows=0,
+        )
+        db.add(run)
+        await db.commit()
+        await db.refresh(run)
+        return run
+    async def start(
+        self, db: AsyncSession, index_name: str, resume: bool = False, user_id: Optional[uuid.UUID] = None
+    ) -> SearchReindexRun:
+        """Lanza el reindexado en segundo plano (admin endpoint)."""
+        run = await self.acquire(db, index_name, resume=resume, user_id=user_id)
+        task = asyncio.create_task(self._guarded(db.bind, run.id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return run
+    async def _guarded(self, bind, run_id: uuid.UUID):
+        try:
+            await self.execute(bind, run_id)
+        except Exception as e:
+            logger.error(f"Reindexado {run_id} falló: {e}")
+    async def execute(
+        self, bind: AsyncEngine, run_id: uuid.UUID, on_progress: Optional[Callable[[SearchReindexRun, _Progress], Any]] = None
+    ) -> SearchReindexRun:
+        async with AsyncSession(bind, expire_on_commit=False) as db:
+            run = await db.get(SearchReindexRun, run_id)
+            model = SOURCES[run.index_name][0]
+            run.total_rows = (await db.execute(
+                select(func.count()).select_from(model).where(model.deleted_at.is_(None))
+            )).scalar_one()
+            await db.commit()
+        progress = _Progress(run, self.chunks)
+        client = self._client()
+        try:
+            await self._discard_superseded(bind, client, run)
+            await self._prepare_index(client, run.shadow_index, run.index_name)
+            pending = iter([n for n in range(progress.chunks) if progress.positions.get(str(n)) != "done"])
+            workers = [asyncio.create_task(self._chunk_worker(bind, client, run, pending, progress)) for _ in range(self.workers)]
+            reporter = asyncio.create_task(self._report_loop(bind, run, progress, on_progress))
+            try:
+                await asyncio.gather(*workers)
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                reporter.cancel()
+                await self._save_progress(bind, run, progress)
+            async with AsyncSession(bind) as db:
+                swap_from = (await db.execute(select(func.now()))).scalar_one()
+            await self._apply_changes(bind, client, run.index_name, run.shadow_index, run.started_at - DELTA_MARGIN)
+            await self._wait_idle(client, run.shadow_index)
+            # El vivo tiene que existir para el swap (primer reindexado)
+            await self._prepare_index(client, run.index_name)
+            await self._task(client, "POST", "/swap-indexes", json=[{"indexes": [run.index_name, run.shadow_index]}])
+            await self._apply_changes(bind, client, run.index_name, run.index_name, swap_from - DELTA_MARGIN)
+            # Tras el swap, el sombra tiene el contenido anterior
+            await self._task(client, "DELETE", f"/indexes/{run.shadow_index}")
+            await self._finish(bind, run, progress, "done")
+            logger.info(f"Reindexado de '{run.index_name}' terminado: {progress.indexed} documentos ({progress.rate:.0f}/s)")
+        except BaseException as e:
+            await self._finish(bind, run, progress, "failed", error=str(e) or type(e).__name__)
+            raise
+        finally:
+            await client.aclose()
+        if on_progress:
+            on_progress(run, progress)
+        return run
+    async def _chunk_worker(self, bind, client: httpx.AsyncClient, run: SearchReindexRun, pending, progress: _Progress):
+        model, columns, document = SOURCES[run.index_name]
+        # El iterador es compartido: cada worker toma el próximo tramo libre
+        for chunk in pending:
+            low, high = chunk_bounds(chunk, progress.chunks)
+            query = select(*[getattr(model, c) for c in columns]).where(model.deleted_at.is_(None), model.id >= low)
+            if high is not None:
+                query = query.where(model.id < high)
+            last_id = progress.positions.get(str(chunk))
+            if last_id:
+                query = query.where(model.id > uuid.UUID(last_id))
+            async with AsyncSession(bind) as db:
+                result = await db.stream(query.order_by(model.id).execution_options(yield_per=self.batch_size))
+                async for rows in result.partitions():
+                    await self._request(client, "POST", f"/indexes/{run.shadow_index}/documents",
+                                        json=[document(row) for row in rows], params={"primaryKey": "id"})
+                    progress.advance(chunk, str(rows[-1].id), len(rows))
+            progress.positions[str(chunk)] = "done"
+    async def _apply_changes(self, bind, client: httpx.AsyncClient, index_name: str, uid: str, since: datetime):
+        """Reenvía lo modificado desde `since` y borra lo dado de baja."""
+        model, columns, document = SOURCES[index_name]
+        changed = func.coalesce(model.updated_at, model.created_at) >= since
+        async with AsyncSession(bind) as db:
+            result = await db.stream(
+                select(*[getattr(model, c) for c in columns]).where(model.deleted_at.is_(None), changed)
+                .order_by(model.id).execution_options(yield_per=self.batch_size)
+            )
+            async for rows in result.partitions():
+                await self._request(client, "POST", f"/indexes/{uid}/documents",
+                                    json=[document(row) for row in rows], params={"primaryKey": "id"})
+            removed = (await db.execute(select(model.id).where(model.deleted_at >= since))).scalars().all()
+        if removed:
+            await self._request(client, "POST", f"/indexes/{uid}/documents/delete-batch", json=[str(i) for i in removed])
+    async def _discard_superseded(self, bind, client: httpx.AsyncClient, run: SearchReindexRun):
+        """Borra los índices sombra de ejecuciones incompletas anteriores (ya no se reanudan)."""
+        async with AsyncSession(bind) as db:
+            result = await db.execute(
+                select(SearchReindexRun.id, SearchReindexRun.shadow_index).where(
+                    SearchReindexRun.index_name == run.index_name, SearchReindexRun.id != run.id,
+                    SearchReindexRun.status.in_(("running", "failed")),
+                )
+            )
+            superseded = result.all()
+            for _, shadow in superseded:
+                await self._task(client, "DELETE", f"/indexes/{shadow}", allow=("index_not_found",))
+            if superseded:
+                await db.execute(
+                    update(SearchReindexRun).where(SearchReindexRun.id.in_([row.id for row in superseded]))
+                    .values(status="superseded", finished_at=func.now())
+                )
+                await db.commit()
+    async def _report_loop(self, bind, run: SearchReindexRun, progress: _Progress, on_progress):
+        while True:
+            await asyncio.sleep(settings.SEARCH_REINDEX_PROGRESS_INTERVAL)
+            await self._save_progress(bind, run, progress)
+            if on_progress:
+                on_progress(run, progress)
+    async def _save_progress(self, bind, run: SearchReindexRun, progress: _Progress):
+        # También es el latido: updated_at distingue una ejecución viva de una abandonada
+        async with AsyncSession(bind) as db:
+            await db.execute(
+                update(SearchReindexRun).where(SearchReindexRun.id == run.id).values(
+                    checkpoint=progress.checkpoint, indexed_rows=progress.indexed,
+                    rows_per_second=round(progress.rate, 1), updated_at=func.now(),
+                )
+            )
+            await db.commit()
+    async def _finish(self, bind, run: SearchReindexRun, progress: _Progress, status: str, error: Optional[str] = None):
+        run.status, run.error, run.indexed_rows = status, error, progress.indexed
+        async with AsyncSession(bind) as db:
+            await db.execute(
+                update(SearchReindexRun).where(SearchReindexRun.id == run.id).values(
+                    status=status, error=error, checkpoint=progress.checkpoint, indexed_rows=progress.indexed,
+                    rows_per_second=round(progress.rate, 1), finished_at=func.now(),
+                )
+            )
+            await db.commit()
+    async def _prepare_index(self, client: httpx.AsyncClient, uid: str, settings_of: Optional[str] = None):
+        await self._task(client, "POST", "/indexes", json={"uid": uid, "primaryKey": "id"}, allow=("index_already_exists",))
+        if settings_of:
+            await self._task(client, "PATCH", f"/indexes/{uid}/settings", json=INDEX_SETTINGS[settings_of])
+    async def _request(self, client: httpx.AsyncClient, method: str, path: str, attempts: int = 4, **kwargs) -> Dict[str, Any]:
+        for attempt in range(attempts):
+            try:
+                response = await client.request(method, path, **kwargs)
+                if response.status_code != 429 and response.status_code < 500:
+                    response.raise_for_status()
+                    return response.json() if response.content else {}
+                if attempt == attempts - 1:
+                    response.raise_for_status()
+            except httpx.TransportError:
+                if attempt == attempts - 1:
+                    raise
+            await asyncio.sleep(min(2 ** attempt, 30))
+    async def _task(self, client: httpx.AsyncClient, method: str, path: str, allow: tuple = (), **kwargs) -> Dict[str, Any]:
+        """Encola una operación de Meilisearch y espera a que termine."""
+        task_uid = (await self._request(client, method, path, **kwargs))["taskUid"]
+        while True:
+            task = await self._request(client, "GET", f"/tasks/{task_uid}")
+            if task["status"] == "succeeded":
+                return task
+            if task["status"] in ("failed", "canceled"):
+                error = task.get("error") or {}
+                if error.get("code") in allow:
+                    return task
+                raise MeilisearchTaskFailed(f"{method} {path}: {error.get('message', task['status'])}")
+            await asyncio.sleep(0.5)
+    async def _wait_idle(self, client: httpx.AsyncClient, uid: str):
+        """Espera a que Meilisearch procese todos los lotes del índice y verifica que ninguno falló."""
+        while (await self._request(client, "GET", "/tasks", params={"indexUids": uid, "statuses": "enqueued,processing", "limit": 1}))["results"]:
+            await asyncio.sleep(1)
+        failed = (await self._request(client, "GET", "/tasks", params={"indexUids": uid, "statuses": "failed", "limit": 1}))["results"]
+        if failed:
+            raise MeilisearchTaskFailed(f"Lote rechazado en '{uid}': {(failed[0].get('error') or {}).get('message')}")
+    async def runs(self, db: AsyncSession, limit: int = 20) -> List[SearchReindexRun]:
+        result = await db.execute(select(SearchReindexRun).order_by(SearchReindexRun.started_at.desc()).limit(limit))
+        return result.scalars().all()
+search_reindex_service = SearchReindexService()
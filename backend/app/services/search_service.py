@@ -1,9 +1,49 @@
+import json
 import meilisearch
 import os
 import logging
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from typing import List, Dict, Any, Optional, Union
+from meilisearch.errors import MeilisearchApiError
+from app.core.config import settings
+from app.services.search_indexer import SearchIndexer
+from app.services.search_fallback import SearchFallback
 logger = logging.getLogger(__name__)
+# Settings per index; also applied to the shadow index of a full reindex (search_reindex_service)
+INDEX_SETTINGS: Dict[str, Dict[str, List[str]]] = {
+    "tickets": {
+        "searchableAttributes": ["id", "title", "ticket_type", "description"],
+        # group / owner / creator / assignee / privacy / global: read scope filters (crud_ticket.search_scope)
+        "filterableAttributes": [
+            "status", "priority", "group_id", "owner_group_id", "assigned_to_id", "created_by_id",
+            "is_private", "is_global",
+        ],
+        "sortableAttributes": ["created_at", "updated_at"],
+    },
+    "assets": {
+        "searchableAttributes": [
+            "hostname",
+            "ip_address",
+            "mac_address",
+            "serial",
+            "asset_tag",
+            "codigo_dependencia",
+            "dependencia"
+        ],
+        "filterableAttributes": ["status", "criticality", "location_node_id", "device_type"],
+        "sortableAttributes": ["hostname", "last_seen"],
+    },
+}
+def filter_value(value: Any) -> str:
+    """Quoted literal for a Meilisearch filter expression."""
+    return json.dumps(str(value))
+def _filter_param(scope: Optional[str], filters: Optional[Union[str, List[Any]]]) -> List[Any]:
+    # Each array element is parsed on its own and ANDed: a caller filter cannot widen the scope
+    conditions = [scope] if scope else []
+    if isinstance(filters, list):
+        conditions.extend(filters)
+    elif filters:
+        conditions.append(filters)
+    return conditions
 class SearchService:
     def __init__(self):
         self.url = os.getenv("MEILISEARCH_URL", "http://meilisearch:7700")
@@ -11,12 +51,16 @@ class SearchService:
         self.client = None
         self.ticket_index = "tickets"
         self.asset_index = "assets"
+        # Writes come from the search outbox (search_outbox_dispatcher); the sync client is only used for searches
+        self.indexer = SearchIndexer(self.url, self.key)
+        # Local engine + circuit breaker used while Meilisearch is unreachable
+        self.fallback = SearchFallback(INDEX_SETTINGS)
         # Initialization removed from __init__ to prevent blocking imports
     def _ensure_client(self):
         if self.client:
             return True
         try:
-            self.client = meilisearch.Client(self.url, self.key)
+            self.client = meilisearch.Client(self.url, self.key, timeout=settings.SEARCH_QUERY_TIMEOUT)
             self._configure_indexes()
             return True
         except Exception as e:
@@ -28,121 +72,62 @@ class SearchService:
         if not self.client:
             return
         try:
-            # --- TICKETS INDEX ---
-            try:
-                self.client.get_index(self.ticket_index)
-            except Exception:
-                self.client.create_index(self.ticket_index, {"primaryKey": "id"})
-            
-            t_index = self.client.index(self.ticket_index)
-            t_index.update_searchable_attributes(["id", "title", "ticket_type", "description"])
-            t_index.update_filterable_attributes(["status", "priority", "group_id", "assigned_to_id", "created_by_id"])
-            t_index.update_sortable_attributes(["created_at", "updated_at"])
-
-            # --- ASSETS INDEX ---
-            try:
-                self.client.get_index(self.asset_index)
-            except Exception:
-                self.client.create_index(self.asset_index, {"primaryKey": "id"})
-            
-            a_index = self.client.index(self.asset_index)
-            a_index.update_searchable_attributes([
-                "hostname", 
-                "ip_address", 
-                "mac_address", 
-                "serial", 
-                "asset_tag", 
-                "codigo_dependencia",
-                "dependencia"
-            ])
-            a_index.update_filterable_attributes(["status", "criticality", "location_node_id", "device_type"])
-            a_index.update_sortable_attributes(["hostname", "last_seen"])
-
+            for uid, index_settings in INDEX_SETTINGS.items():
+                try:
+                    self.client.get_index(uid)
+                except Exception:
+                    self.client.create_index(uid, {"primaryKey": "id"})
+                self.client.index(uid).update_settings(index_settings)
             logger.info("Meilisearch indexes configured successfully.")
         except Exception as e:
+            # Not configured: _ensure_client drops the client and retries on the next search
             logger.error(f"Failed to configure Meilisearch indexes: {e}")
+            raise
 
-    def index_ticket(self, ticket_data: Dict[str, Any]):
-        """
-        Add or update a ticket in the search index.
-        """
-        if not self._ensure_client():
-            return
-        try:
-            # Ensure dates are strings
-            if ticket_data.get("created_at") and not isinstance(ticket_data["created_at"], str):
-                 ticket_data["created_at"] = ticket_data["created_at"].isoformat()
-            if ticket_data.get("updated_at") and not isinstance(ticket_data["updated_at"], str):
-                 ticket_data["updated_at"] = ticket_data["updated_at"].isoformat()
-            # Convert UUIDs to strings
-            for key, value in ticket_data.items():
-                if hasattr(value, "hex"): # Is UUID
-                    ticket_data[key] = str(value)
-            self.client.index(self.ticket_index).add_documents([ticket_data])
-            logger.info(f"Indexed ticket {ticket_data.get('id')}")
-        except Exception as e:
-            logger.error(f"Failed to index ticket: {e}")
-
-    def index_asset(self, asset_data: Dict[str, Any]):
-        """
-        Add or update an asset in the search index.
-        """
-        if not self._ensure_client():
-            return
-        try:
-            # Convert UUIDs to strings
-            for key, value in asset_data.items():
-                if hasattr(value, "hex"): # Is UUID
-                    asset_data[key] = str(value)
-                elif isinstance(value, datetime):
-                    asset_data[key] = value.isoformat()
-            
-            self.client.index(self.asset_index).add_documents([asset_data])
-            logger.info(f"Indexed asset {asset_data.get('hostname')} ({asset_data.get('id')})")
-        except Exception as e:
-            logger.error(f"Failed to index asset: {e}")
-
-    def search_tickets(self, query: str, filters: Optional[str] = None, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+    def search_tickets(
+        self, query: str, filters: Optional[Union[str, List[Any]]] = None, limit: int = 20, offset: int = 0,
+        scope: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """
-        Search for tickets.
+        Search for tickets. `scope` is the caller's read scope (crud_ticket.search_scope),
+        applied by the engine so hits and totals are already authorized.
         """
-        if not self._ensure_client():
-            return {"hits": [], "estimatedTotalHits": 0}
-        try:
-            search_params = {"limit": limit, "offset": offset}
-            if filters:
-                search_params["filter"] = filters
-            return self.client.index(self.ticket_index).search(query, search_params)
-        except Exception as e:
-            logger.error(f"Ticket search failed: {e}")
-            return {"hits": [], "estimatedTotalHits": 0}
+        return self._search(self.ticket_index, query, _filter_param(scope, filters), limit, offset)
 
     def search_assets(self, query: str, filters: Optional[str] = None, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
         """
         Search for assets.
         """
-        if not self._ensure_client():
-            return {"hits": [], "estimatedTotalHits": 0}
-        try:
-            search_params = {"limit": limit, "offset": offset}
-            if filters:
-                search_params["filter"] = filters
-            return self.client.index(self.asset_index).search(query, search_params)
-        except Exception as e:
-            logger.error(f"Asset search failed: {e}")
-            return {"hits": [], "estimatedTotalHits": 0}
-
-    def delete_ticket(self, ticket_id: str):
-        if not self.client: return
-        try:
-            self.client.index(self.ticket_index).delete_document(ticket_id)
-        except Exception as e:
-            logger.error(f"Failed to delete ticket from index: {e}")
+        return self._search(self.asset_index, query, filters, limit, offset)
 
-    def delete_asset(self, asset_id: str):
-        if not self.client: return
-        try:
-            self.client.index(self.asset_index).delete_document(asset_id)
-        except Exception as e:
-            logger.error(f"Failed to delete asset from index: {e}")
+    def _search(self, uid: str, query: str, filters: Any, limit: int, offset: int) -> Dict[str, Any]:
+        """
+        Meilisearch while the circuit is closed; the local fallback (same response and
+        filter syntax) while it is open. Rejected queries (4xx) do not count as failures.
+        """
+        breaker = self.fallback.breaker
+        # allow() once per search: while open it hands out the single probe
+        if breaker.allow():
+            if not self._ensure_client():
+                breaker.record_failure()
+                return self.fallback.search(uid, query, filters, limit=limit, offset=offset)
+            try:
+                search_params = {"limit": limit, "offset": offset}
+                if filters:
+                    search_params["filter"] = filters
+                result = self.client.index(uid).search(query, search_params)
+                breaker.record_success()
+                return result
+            except MeilisearchApiError as e:
+                if e.status_code is not None and e.status_code < 500:
+                    # Meilisearch answered: the query is at fault, not the engine
+                    breaker.record_success()
+                    logger.error(f"Search in '{uid}' rejected: {e}")
+                    return {"hits": [], "estimatedTotalHits": 0}
+                logger.error(f"Search in '{uid}' failed: {e}")
+                breaker.record_failure()
+            except Exception as e:
+                logger.error(f"Search in '{uid}' failed: {e}")
+                breaker.record_failure()
+        return self.fallback.search(uid, query, filters, limit=limit, offset=offset)
 search_service = SearchService()
@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -22,7 +22,7 @@ class SLAService:
         hours = config.get(type, 24)
         return datetime.utcnow() + timedelta(hours=hours)
 
-    async def apply_policy_to_ticket(self, db: AsyncSession, ticket: Ticket):
+    async def apply_policy_to_ticket(self, db: AsyncSession, ticket: Ticket, commit: bool = True) -> Optional[SLAMetric]:
         from app.db.models.sla import SLAPolicy
         from datetime import timezone
         # Buscar política que coincida con la prioridad
@@ -54,56 +54,105 @@ class SLAService:
         )
         db.add(sla)
         ticket.sla_deadline = sla.resolution_deadline
-        await db.commit()
+        if commit:
+            await db.commit()
+        return sla
 
-    async def handle_status_change(self, db: AsyncSession, ticket_id: UUID, old_status: str, new_status: str):
-        from datetime import timezone
-        res = await db.execute(select(SLAMetric).where(SLAMetric.ticket_id == ticket_id))
-        sla = res.scalar_one_or_none()
-        if not sla: return
-
-        pause_states = ['pending', 'waiting_info', 'on_hold']
-        active_states = ['open', 'in_progress']
-        now = datetime.now(timezone.utc) # Aware
+    PAUSE_STATES = ('pending', 'waiting_info', 'on_hold')
+    ACTIVE_STATES = ('open', 'in_progress')
+    # Columnas de SLAMetric que puede modificar un cambio de estado
+    STATUS_COLUMNS = (
+        "last_paused_at", "total_paused_seconds", "response_deadline", "resolution_deadline",
+        "responded_at", "resolved_at", "is_response_breached", "is_resolution_breached",
+    )
 
-        if new_status in pause_states and old_status not in pause_states:
-            sla.last_paused_at = now
-        elif new_status in active_states and old_status in pause_states:
-            if sla.last_paused_at:
-                # Asegurar que last_paused_at es aware para la resta
-                lp_at = sla.last_paused_at
-                if lp_at.tzinfo is None:
-                    lp_at = lp_at.replace(tzinfo=timezone.utc)
-                
-                paused_delta = now - lp_at
-                sla.total_paused_seconds += int(paused_delta.total_seconds())
-                if sla.response_deadline and not sla.responded_at:
-                    sla.response_deadline += paused_delta
-                if sla.resolution_deadline and not sla.resolved_at:
-                    sla.resolution_deadline += paused_delta
-                
-                res_t = await db.execute(select(Ticket).where(Ticket.id == ticket_id))
-                ticket = res_t.scalar_one_or_none()
-                if ticket: ticket.sla_deadline = sla.resolution_deadline
-                sla.last_paused_at = None
+    @staticmethod
+    def _aware(value: Optional[datetime]) -> Optional[datetime]:
+        from datetime import timezone
+        if value and value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value
 
+    def status_change_values(self, sla: Any, old_status: str, new_status: str, now: datetime) -> Dict[str, Any]:
+        """
+        Cambios a aplicar a una métrica (objeto ORM o fila) ante old_status -> new_status.
+        Si incluye total_paused_seconds, el SLA se reanudó y los vencimientos se corrieron.
+        """
+        changes: Dict[str, Any] = {}
+        if new_status in self.PAUSE_STATES and old_status not in self.PAUSE_STATES:
+            changes["last_paused_at"] = now
+        elif new_status in self.ACTIVE_STATES and old_status in self.PAUSE_STATES and sla.last_paused_at:
+            paused_delta = now - self._aware(sla.last_paused_at)
+            changes["total_paused_seconds"] = (sla.total_paused_seconds or 0) + int(paused_delta.total_seconds())
+            if sla.response_deadline and not sla.responded_at:
+                changes["response_deadline"] = sla.response_deadline + paused_delta
+            if sla.resolution_deadline and not sla.resolved_at:
+                changes["resolution_deadline"] = sla.resolution_deadline + paused_delta
+            changes["last_paused_at"] = None
         if new_status == 'in_progress' and not sla.responded_at:
-            sla.responded_at = now
-            # Comparación segura
-            rd = sla.response_deadline
-            if rd and rd.tzinfo is None: rd = rd.replace(tzinfo=timezone.utc)
-            if rd and now > rd: sla.is_response_breached = True
-
+            changes["responded_at"] = now
+            rd = self._aware(changes.get("response_deadline", sla.response_deadline))
+            if rd and now > rd:
+                changes["is_response_breached"] = True
         if new_status in ['resolved', 'closed'] and not sla.resolved_at:
-            sla.resolved_at = now
-            # Comparación segura
-            rsd = sla.resolution_deadline
-            if rsd and rsd.tzinfo is None: rsd = rsd.replace(tzinfo=timezone.utc)
-            if rsd and now > rsd: sla.is_resolution_breached = True
+            changes["resolved_at"] = now
+            rsd = self._aware(changes.get("resolution_deadline", sla.resolution_deadline))
+            if rsd and now > rsd:
+                changes["is_resolution_breached"] = True
+        return changes
 
+    async def handle_status_change(self, db: AsyncSession, ticket_id: UUID, old_status: str, new_status: str):
+        from datetime import timezone
+        res = await db.execute(select(SLAMetric).where(SLAMetric.ticket_id == ticket_id))
+        sla = res.scalar_one_or_none()
+        if not sla: return
+        changes = self.status_change_values(sla, old_status, new_status, datetime.now(timezone.utc))
+        for key, value in changes.items():
+            setattr(sla, key, value)
+        if "total_paused_seconds" in changes:
+            res_t = await db.execute(select(Ticket).where(Ticket.id == ticket_id))
+            ticket = res_t.scalar_one_or_none()
+            if ticket: ticket.sla_deadline = sla.resolution_deadline
         db.add(sla)
         await db.commit()
 
+    async def handle_bulk_status_change(self, db: AsyncSession, old_statuses: Dict[UUID, str], new_status: str) -> int:
+        """
+        handle_status_change para un lote: una lectura de las métricas, un UPDATE
+        (executemany) de sla_metrics y otro de tickets.sla_deadline para los reanudados.
+        No confirma. Retorna la cantidad de métricas modificadas.
+        """
+        from datetime import timezone
+        from sqlalchemy import bindparam, update
+        if not old_statuses:
+            return 0
+        metrics = SLAMetric.__table__
+        res = await db.execute(select(metrics).where(metrics.c.ticket_id.in_(list(old_statuses))))
+        now = datetime.now(timezone.utc)
+        sla_rows, deadline_rows = [], []
+        for sla in res.all():
+            changes = self.status_change_values(sla, old_statuses[sla.ticket_id], new_status, now)
+            if not changes:
+                continue
+            values = {column: changes.get(column, getattr(sla, column)) for column in self.STATUS_COLUMNS}
+            sla_rows.append({"b_id": sla.id, **{f"b_{k}": v for k, v in values.items()}})
+            if "total_paused_seconds" in changes:
+                deadline_rows.append({"b_ticket_id": sla.ticket_id, "b_sla_deadline": values["resolution_deadline"]})
+        if sla_rows:
+            await db.execute(
+                update(metrics).where(metrics.c.id == bindparam("b_id"))
+                .values({column: bindparam(f"b_{column}") for column in self.STATUS_COLUMNS}),
+                sla_rows,
+            )
+        if deadline_rows:
+            tickets = Ticket.__table__
+            await db.execute(
+                update(tickets).where(tickets.c.id == bindparam("b_ticket_id"))
+                .values(sla_deadline=bindparam("b_sla_deadline")),
+                deadline_rows,
+            )
+        return len(sla_rows)
+
     async def update_sla_status(self, db: AsyncSession, ticket_id: UUID, action: str):
         pass
 
@@ -0,0 +1,224 @@
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID, uuid4
+from pydantic import ValidationError
+from sqlalchemy import String, bindparam, select, update as sa_update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.bulk import bulk_insert
+from app.db.models.asset import Asset
+from app.db.models.asset_history import AssetEventLog
+from app.db.models.group import Group
+from app.db.models.location import LocationNode
+from app.db.models.notifications import Attachment
+from app.db.models.sla import SLAMetric, SLAPolicy
+from app.db.models.ticket import Ticket, TicketType, ticket_assets, ticket_locations
+from app.db.models.user import User
+from app.schemas.ticket import TicketBulkResult, TicketBulkRowResult, TicketCreate
+from app.services.sla_service import sla_service
+logger = logging.getLogger(__name__)
+_LINK_FIELDS = {"attachment_ids", "asset_ids", "location_ids"}
+class TicketImportService:
+    """
+    Alta masiva de tickets (POST /tickets/bulk y app/scripts/import_tickets.py).
+    El lote se valida entero por adelantado, con una consulta por tabla referenciada.
+    Las filas válidas se cargan set-wise en una sola transacción, con un INSERT
+    multi-fila o COPY por tabla: tickets, métricas SLA, vínculos M2M, auditoría y
+    eventos de activos. Las filas del COPY / INSERT llegan a Meilisearch por el outbox
+    de búsqueda (trigger tickets_search_outbox + search_outbox_dispatcher).
+    No se notifica a los asignados: un backfill no debe generar una notificación por fila.
+    """
+    async def import_tickets(
+        self,
+        db: AsyncSession,
+        items: List[Dict[str, Any]],
+        creator: User,
+        *,
+        ip_address: Optional[str] = None,
+        atomic: bool = False,
+        allow_reserved_types: bool = False,
+    ) -> TicketBulkResult:
+        errors: Dict[int, List[str]] = defaultdict(list)
+        parsed: Dict[int, TicketCreate] = {}
+        for index, raw in enumerate(items):
+            try:
+                parsed[index] = TicketCreate.model_validate(raw)
+            except ValidationError as e:
+                errors[index].extend(
+                    f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+                )
+        refs = await self._load_references(db, parsed.values())
+        claimed_attachments: Dict[UUID, int] = {}
+        for index, ticket_in in parsed.items():
+            errors[index].extend(
+                self._row_errors(index, ticket_in, creator, refs, claimed_attachments, allow_reserved_types)
+            )
+        valid = [index for index in parsed if not errors[index]]
+        has_errors = any(errors.values())
+        created: Dict[int, UUID] = {}
+        if valid and not (atomic and has_errors):
+            created = await self._load(db, [(index, parsed[index]) for index in valid], creator, ip_address)
+        results = []
+        for index in range(len(items)):
+            if index in created:
+                results.append(TicketBulkRowResult(index=index, status="created", id=created[index]))
+            elif errors[index]:
+                results.append(TicketBulkRowResult(index=index, status="invalid", errors=errors[index]))
+            else:
+                results.append(TicketBulkRowResult(
+                    index=index, status="skipped", errors=["Lote atómico con filas inválidas: no se insertó"]
+                ))
+        error_count = sum(1 for r in results if r.status == "invalid")
+        return TicketBulkResult(created_count=len(created), error_count=error_count, results=results)
+    @staticmethod
+    async def _existing(db: AsyncSession, column, ids: Set[UUID], *criteria) -> Set[UUID]:
+        if not ids:
+            return set()
+        res = await db.execute(select(column).where(column.in_(ids), *criteria))
+        return set(res.scalars().all())
+    async def _load_references(self, db: AsyncSession, tickets: Iterable[TicketCreate]) -> Dict[str, Any]:
+        """Una consulta por tabla para todo el lote."""
+        ids = defaultdict(set)
+        for t in tickets:
+            ids["types"].add(t.ticket_type_id)
+            ids["groups"].update(filter(None, [t.group_id]))
+            ids["users"].update(filter(None, [t.assigned_to_id]))
+            ids["assets"].update(filter(None, [t.asset_id, *(t.asset_ids or [])]))
+            ids["locations"].update(filter(None, [t.location_id, *(t.location_ids or [])]))
+            ids["attachments"].update(t.attachment_ids or [])
+            ids["parents"].update(filter(None, [t.parent_ticket_id]))
+        types = {}
+        if ids["types"]:
+            res_types = await db.execute(select(TicketType.id, TicketType.name).where(TicketType.id.in_(ids["types"])))
+            types = dict(res_types.all())
+        return {
+            "types": types,
+            "groups": await self._existing(db, Group.id, ids["groups"]),
+            "parent_groups": await self._existing(db, Group.parent_id, ids["groups"]),
+            "users": await self._existing(db, User.id, ids["users"]),
+            "assets": await self._existing(db, Asset.id, ids["assets"]),
+            "locations": await self._existing(db, LocationNode.id, ids["locations"]),
+            # Sólo adjuntos sueltos (subidos y todavía sin ticket)
+            "attachments": await self._existing(db, Attachment.id, ids["attachments"], Attachment.ticket_id.is_(None)),
+            "parents": await self._existing(db, Ticket.id, ids["parents"]),
+        }
+    @staticmethod
+    def _row_errors(
+        index: int,
+        t: TicketCreate,
+        creator: User,
+        refs: Dict[str, Any],
+        claimed_attachments: Dict[UUID, int],
+        allow_reserved_types: bool,
+    ) -> List[str]:
+        # Mismas reglas que POST /tickets, evaluadas contra las referencias precargadas
+        errors = []
+        for column in Ticket.__table__.columns:
+            value = getattr(t, column.key, None)
+            if isinstance(column.type, String) and column.type.length and isinstance(value, str) and len(value) > column.type.length:
+                errors.append(f"{column.key}: máximo {column.type.length} caracteres")
+        type_name = refs["types"].get(t.ticket_type_id)
+        if type_name is None:
+            errors.append(f"Tipo de ticket inexistente: {t.ticket_type_id}")
+        elif "ALERTA SIEM" in type_name.upper() and not allow_reserved_types:
+            errors.append("El tipo ALERTA SIEM es reservado para el sistema. No puede crearse manualmente.")
+        if t.group_id and t.group_id not in refs["groups"]:
+            errors.append(f"Grupo inexistente: {t.group_id}")
+        elif t.group_id in refs["parent_groups"] and not creator.is_superuser:
+            errors.append("No se pueden enviar tickets a un grupo padre. Seleccione un área específica.")
+        if not t.is_private:
+            if not t.group_id:
+                errors.append("Los tickets públicos deben tener un Grupo Responsable asignado.")
+            elif not creator.is_superuser and creator.group_id and t.group_id != creator.group_id:
+                errors.append("No tiene permisos para crear tickets en este grupo.")
+        if not (creator.group_id or t.group_id):
+            errors.append("Sin grupo propietario: el usuario no tiene grupo y la fila no indica group_id.")
+        if t.assigned_to_id and t.assigned_to_id not in refs["users"]:
+            errors.append(f"Usuario asignado inexistente: {t.assigned_to_id}")
+        for a_id in {*filter(None, [t.asset_id]), *(t.asset_ids or [])} - refs["assets"]:
+            errors.append(f"Activo inexistente: {a_id}")
+        for l_id in {*filter(None, [t.location_id]), *(t.location_ids or [])} - refs["locations"]:
+            errors.append(f"Ubicación inexistente: {l_id}")
+        if t.parent_ticket_id and t.parent_ticket_id not in refs["parents"]:
+            errors.append(f"Ticket padre inexistente: {t.parent_ticket_id}")
+        for att_id in t.attachment_ids or []:
+            if att_id not in refs["attachments"]:
+                errors.append(f"Adjunto inexistente o ya vinculado: {att_id}")
+            elif claimed_attachments.setdefault(att_id, index) != index:
+                errors.append(f"Adjunto {att_id} ya usado en la fila {claimed_attachments[att_id]}")
+        return errors
+    async def _load(
+        self,
+        db: AsyncSession,
+        rows: List[Tuple[int, TicketCreate]],
+        creator: User,
+        ip_address: Optional[str],
+    ) -> Dict[int, UUID]:
+        from app.crud.crud_audit import audit_log
+        now = datetime.now(timezone.utc)
+        # Misma elección que apply_policy_to_ticket: la política activa de la prioridad o cualquier activa
+        res_policies = await db.execute(select(SLAPolicy).where(SLAPolicy.is_active == True))
+        policies = res_policies.scalars().all()
+        policy_by_priority = {}
+        for policy in policies:
+            policy_by_priority.setdefault(policy.priority, policy)
+        fallback_policy = policies[0] if policies else None
+        created, ticket_rows, sla_rows, asset_links, location_links = {}, [], [], [], []
+        attachment_links, event_rows = [], []
+        for index, t in rows:
+            data = t.model_dump(exclude=_LINK_FIELDS)
+            ticket_id = uuid4()
+            priority = (data["priority"] or "medium").lower()
+            config = sla_service.PRIORITY_CONFIG.get(priority, sla_service.PRIORITY_CONFIG["medium"])
+            policy = policy_by_priority.get(priority) or fallback_policy
+            if policy:
+                data["sla_deadline"] = now + timedelta(hours=config["resolution"])
+                sla_rows.append({
+                    "ticket_id": ticket_id,
+                    "policy_id": policy.id,
+                    "response_deadline": now + timedelta(hours=config["response"]),
+                    "resolution_deadline": data["sla_deadline"],
+                })
+            elif not data["sla_deadline"]:
+                data["sla_deadline"] = now + timedelta(hours=config.get("resolution", 24))
+            ticket_rows.append({
+                **data,
+                "id": ticket_id,
+                "created_by_id": creator.id,
+                "owner_group_id": creator.group_id or t.group_id,
+                "created_at": now,
+            })
+            asset_links.extend({"ticket_id": ticket_id, "asset_id": a_id} for a_id in dict.fromkeys(t.asset_ids or []))
+            location_links.extend({"ticket_id": ticket_id, "location_id": l_id} for l_id in dict.fromkeys(t.location_ids or []))
+            attachment_links.extend({"b_attachment_id": att_id, "b_ticket_id": ticket_id} for att_id in t.attachment_ids or [])
+            if t.asset_id:
+                event_rows.append({
+                    "asset_id": t.asset_id,
+                    "event_type": "ticket_created",
+                    "description": f"Ticket creado: {t.title}"[:500],
+                    "user_id": creator.id,
+                    "details": {"ticket_id": str(ticket_id)},
+                })
+            created[index] = ticket_id
+        await bulk_insert(db, Ticket.__table__, ticket_rows)
+        await bulk_insert(db, SLAMetric.__table__, sla_rows)
+        await bulk_insert(db, ticket_assets, asset_links)
+        await bulk_insert(db, ticket_locations, location_links)
+        await bulk_insert(db, AssetEventLog.__table__, event_rows)
+        if attachment_links:
+            attachments = Attachment.__table__
+            await db.execute(
+                sa_update(attachments)
+                .where(attachments.c.id == bindparam("b_attachment_id"))
+                .values(ticket_id=bindparam("b_ticket_id")),
+                attachment_links,
+            )
+        await audit_log.create_logs(
+            db, user_id=creator.id, event_type="ticket_created", target_type="ticket", ip_address=ip_address,
+            entries=[(row["id"], {"title": row["title"], "bulk": True}) for row in ticket_rows]
+        )
+        await db.commit()
+        logger.info(f"Alta masiva: {len(ticket_rows)} tickets creados por {creator.id}")
+        return created
+ticket_import_service = TicketImportService()
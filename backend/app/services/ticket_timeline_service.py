@@ -0,0 +1,101 @@
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import String, and_, cast, func, literal, or_, select, union_all
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.pagination import keyset_predicate
+from app.db.models.audit_log import AuditLog
+from app.db.models.sla import SLAMetric
+from app.db.models.ticket import TicketComment
+from app.db.models.user import User
+# Texto de comentario que viaja en el timeline (el completo está en /comments)
+COMMENT_PREVIEW_CHARS = 500
+class TicketTimelineService:
+    """
+    Actividad de un ticket en un único flujo ordenado por (occurred_at, id): eventos de
+    auditoría (target_type/target_id indexados), comentarios y transiciones de SLA
+    derivadas de sla_metrics. Un UNION ALL con el predicado keyset en cada rama, así
+    cada una se resuelve sobre su índice y sólo se ordenan las filas de la página.
+    """
+    @staticmethod
+    def _sla_events(ticket_id: UUID) -> list:
+        # Un evento por hito cumplido/vencido; el id se deriva del de la métrica (md5 -> uuid)
+        now = func.now()
+        milestones = [
+            ("sla_responded", SLAMetric.responded_at, SLAMetric.responded_at.isnot(None), SLAMetric.response_deadline),
+            ("sla_resolved", SLAMetric.resolved_at, SLAMetric.resolved_at.isnot(None), SLAMetric.resolution_deadline),
+            (
+                "sla_response_breached", SLAMetric.response_deadline,
+                or_(SLAMetric.is_response_breached == True, and_(SLAMetric.responded_at.is_(None), SLAMetric.response_deadline < now)),
+                SLAMetric.response_deadline,
+            ),
+            (
+                "sla_resolution_breached", SLAMetric.resolution_deadline,
+                or_(SLAMetric.is_resolution_breached == True, and_(SLAMetric.resolved_at.is_(None), SLAMetric.resolution_deadline < now)),
+                SLAMetric.resolution_deadline,
+            ),
+            ("sla_paused", SLAMetric.last_paused_at, SLAMetric.last_paused_at.isnot(None), SLAMetric.resolution_deadline),
+        ]
+        return [
+            select(
+                ts.label("occurred_at"),
+                cast(func.md5(cast(SLAMetric.id, String).concat(event_type)), PG_UUID(as_uuid=True)).label("id"),
+                literal("sla").label("kind"),
+                literal(event_type).label("event_type"),
+                cast(None, PG_UUID(as_uuid=True)).label("user_id"),
+                func.jsonb_build_object("sla_metric_id", SLAMetric.id, "deadline", deadline).label("details"),
+            ).where(SLAMetric.ticket_id == ticket_id, condition)
+            for event_type, ts, condition, deadline in milestones
+        ]
+    async def get_timeline(
+        self,
+        db: AsyncSession,
+        ticket_id: UUID,
+        *,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        limit: int = 50,
+        descending: bool = True,
+    ) -> List[Any]:
+        audit = select(
+            AuditLog.created_at.label("occurred_at"),
+            AuditLog.id.label("id"),
+            literal("audit").label("kind"),
+            AuditLog.event_type.label("event_type"),
+            AuditLog.user_id.label("user_id"),
+            AuditLog.details.label("details"),
+        ).where(
+            AuditLog.target_type == "ticket", AuditLog.target_id == ticket_id,
+            # El comentario ya llega como entrada propia
+            AuditLog.event_type != "comment_added",
+        )
+        comments = select(
+            TicketComment.created_at.label("occurred_at"),
+            TicketComment.id.label("id"),
+            literal("comment").label("kind"),
+            literal("comment_added").label("event_type"),
+            TicketComment.user_id.label("user_id"),
+            func.jsonb_build_object(
+                "content", func.substr(TicketComment.content, 1, COMMENT_PREVIEW_CHARS),
+                "is_internal", TicketComment.is_internal,
+            ).label("details"),
+        ).where(TicketComment.ticket_id == ticket_id)
+        branches = [audit, comments, *self._sla_events(ticket_id)]
+        if after:
+            # El predicado se aplica en cada rama sobre sus propias columnas
+            branches = [
+                b.where(keyset_predicate(b.selected_columns.occurred_at, b.selected_columns.id, after[0], after[1], descending))
+                for b in branches
+            ]
+        events = union_all(*branches).subquery("timeline")
+        query = (
+            select(events, User.username.label("user_name"))
+            .outerjoin(User, User.id == events.c.user_id)
+        )
+        if descending:
+            query = query.order_by(events.c.occurred_at.desc(), events.c.id.desc())
+        else:
+            query = query.order_by(events.c.occurred_at.asc(), events.c.id.asc())
+        result = await db.execute(query.limit(limit))
+        return result.all()
+ticket_timeline_service = TicketTimelineService()
@@ -0,0 +1,42 @@
+import asyncio
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.models.ticket import Ticket
+from app.services.export_job_service import export_job_service
+@pytest.mark.asyncio
+async def test_background_export_and_resumable_download(
+    client: AsyncClient, db: AsyncSession, admin_token_headers, admin_user, default_group, default_ticket_type,
+    tmp_path, monkeypatch,
+):
+    monkeypatch.setattr(export_job_service, "directory", str(tmp_path))
+    await db.execute(insert(Ticket), [
+        {
+            "title": f"Job {i}", "ticket_type_id": default_ticket_type.id, "group_id": default_group.id,
+            "owner_group_id": default_group.id, "created_by_id": admin_user.id,
+        }
+        for i in range(1200)
+    ])
+    await db.commit()
+    url = f"{settings.API_V1_STR}/exports"
+    response = await client.post(url, json={"kind": "tickets", "format": "csv"}, headers=admin_token_headers)
+    assert response.status_code == 202
+    job = response.json()
+    for _ in range(100):
+        job = (await client.get(f"{url}/{job['id']}", headers=admin_token_headers)).json()
+        if job["status"] not in ("pending", "running"):
+            break
+        await asyncio.sleep(0.1)
+    assert job["status"] == "done" and job["progress_rows"] == job["total_rows"] == 1200
+    full = await client.get(f"{url}/{job['id']}/download", headers=admin_token_headers)
+    assert full.status_code == 200 and len(full.text.splitlines()) == 1201
+    # Reanudación: sólo el tramo pedido
+    partial = await client.get(f"{url}/{job['id']}/download", headers={**admin_token_headers, "Range": "bytes=10-"})
+    assert partial.status_code == 206
+    assert partial.headers["content-range"] == f"bytes 10-{len(full.content) - 1}/{len(full.content)}"
+    assert partial.content == full.content[10:]
+    response = await client.delete(f"{url}/{job['id']}", headers=admin_token_headers)
+    assert response.status_code == 204
+    assert (await client.get(f"{url}/{job['id']}", headers=admin_token_headers)).status_code == 404
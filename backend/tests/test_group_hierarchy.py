@@ -0,0 +1,18 @@
+import uuid
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models.group import Group
+from app.services.group_service import group_service
+@pytest.mark.asyncio
+async def test_closure_follows_group_moves(db: AsyncSession):
+    root = Group(id=uuid.uuid4(), name="Root")
+    child = Group(id=uuid.uuid4(), name="Child", parent_id=root.id)
+    leaf = Group(id=uuid.uuid4(), name="Leaf", parent_id=child.id)
+    other = Group(id=uuid.uuid4(), name="Other")
+    db.add_all([leaf, child, root, other])
+    await db.commit()
+    assert await group_service.get_all_child_group_ids(db, root.id) == [root.id, child.id, leaf.id]
+    child.parent_id = other.id
+    await db.commit()
+    assert await group_service.get_all_child_group_ids(db, root.id) == [root.id]
+    assert set(await group_service.get_all_child_group_ids(db, other.id)) == {other.id, child.id, leaf.id}
@@ -0,0 +1,66 @@
+import uuid
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.crud.crud_location import location as crud_location
+from app.db.models.asset import Asset
+from app.db.models.location import LocationNode
+from app.db.models.wiki import WikiPage, WikiPageHistory, WikiSpace
+@pytest.mark.asyncio
+async def test_location_delete_removes_nested_subtree_only(db: AsyncSession):
+    def node(name, parent=None):
+        path = f"{parent.path}/{name}" if parent else name
+        return LocationNode(id=uuid.uuid4(), name=name, path=path, parent_id=parent.id if parent else None)
+    root = node("Sede")
+    building = node("Edificio", root)
+    floor = node("Piso1", building)
+    office = node("Oficina", floor)
+    sibling = node("Anexo", root)
+    sibling_child = node("Deposito", sibling)
+    db.add_all([root, building, floor, office, sibling, sibling_child])
+    await db.flush()
+    asset = Asset(id=uuid.uuid4(), hostname="pc-oficina", status="operative", location_node_id=office.id)
+    db.add(asset)
+    await db.commit()
+    await crud_location.delete(db, id=building.id)
+    remaining = set((await db.execute(select(LocationNode.id))).scalars().all())
+    assert {building.id, floor.id, office.id}.isdisjoint(remaining)
+    assert {root.id, sibling.id, sibling_child.id} <= remaining
+    # Los activos del subárbol pasan a Lost and Found (0000)
+    lost_and_found = (await db.execute(select(LocationNode).where(LocationNode.dependency_code == "0000"))).scalar_one()
+    await db.refresh(asset)
+    assert asset.location_node_id == lost_and_found.id
+@pytest.mark.asyncio
+async def test_wiki_delete_page_removes_nested_subpages_only(
+    client: AsyncClient, db: AsyncSession, admin_token_headers, admin_user
+):
+    space = WikiSpace(id=uuid.uuid4(), name="Manuales", creator_id=admin_user.id)
+    db.add(space)
+    await db.flush()
+    def page(title, parent=None):
+        return WikiPage(
+            id=uuid.uuid4(), space_id=space.id, title=title, creator_id=admin_user.id,
+            parent_id=parent.id if parent else None,
+        )
+    root = page("Redes")
+    target = page("VPN", root)
+    child = page("Clientes", target)
+    grandchild = page("Windows", child)
+    sibling = page("WiFi", root)
+    sibling_child = page("Invitados", sibling)
+    db.add_all([root, target, child, grandchild, sibling, sibling_child])
+    await db.flush()
+    db.add_all([
+        WikiPageHistory(page_id=grandchild.id, editor_id=admin_user.id, content_snapshot="v1"),
+        WikiPageHistory(page_id=sibling_child.id, editor_id=admin_user.id, content_snapshot="v1"),
+    ])
+    await db.commit()
+    response = await client.delete(f"{settings.API_V1_STR}/wiki/pages/{target.id}", headers=admin_token_headers)
+    assert response.status_code == 200
+    remaining = set((await db.execute(select(WikiPage.id))).scalars().all())
+    assert {target.id, child.id, grandchild.id}.isdisjoint(remaining)
+    assert {root.id, sibling.id, sibling_child.id} <= remaining
+    history = (await db.execute(select(WikiPageHistory.page_id))).scalars().all()
+    assert history == [sibling_child.id]
@@ -0,0 +1,56 @@
+import uuid
+from uuid import UUID
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from httpx import AsyncClient
+from jose import jwt
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import get_current_user
+from app.core.config import settings
+from app.crud.crud_session import session as crud_session
+from app.db.models.iam import Permission, Role, RolePermission, UserRole
+from app.services.principal_cache import principal_cache
+async def _login(client: AsyncClient, user):
+    principal_cache.invalidate_local(everything=True)
+    r = await client.post(f"{settings.API_V1_STR}/auth/login", json={"identifier": user.email, "password": "testpass123"})
+    token = r.json()["access_token"]
+    sid = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM], options={"verify_aud": False})["sid"]
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token), UUID(sid)
+@pytest.mark.asyncio
+async def test_role_and_permission_changes_evict_the_principal(client: AsyncClient, db: AsyncSession, normal_user):
+    read = Permission(id=uuid.uuid4(), key="ticket:read:own", name="Ver propios")
+    role = Role(id=uuid.uuid4(), name="Operador", hidden_nav_items=[])
+    db.add_all([read, role])
+    await db.flush()
+    db.add_all([RolePermission(role_id=role.id, permission_id=read.id), UserRole(user_id=normal_user.id, role_id=role.id)])
+    await db.commit()
+    token, sid = await _login(client, normal_user)
+    user = await get_current_user(db, token)
+    assert principal_cache._local_get(str(sid)) is not None
+    assert user.has_permission("ticket:read:own") and not user.has_permission("ticket:update:own")
+    # Permiso nuevo en el rol: afecta a todos sus usuarios
+    update = Permission(id=uuid.uuid4(), key="ticket:update:own", name="Editar propios")
+    db.add(update)
+    await db.flush()
+    db.add(RolePermission(role_id=role.id, permission_id=update.id))
+    await db.commit()
+    assert principal_cache._local_get(str(sid)) is None
+    db.expunge_all()
+    assert (await get_current_user(db, token)).has_permission("ticket:update:own")
+    # Quitar el rol al usuario
+    await db.delete(await db.get(UserRole, (normal_user.id, role.id)))
+    await db.commit()
+    assert principal_cache._local_get(str(sid)) is None
+    db.expunge_all()
+    assert not (await get_current_user(db, token)).has_permission("ticket:read:own")
+@pytest.mark.asyncio
+async def test_session_revocation_evicts_the_principal(client: AsyncClient, db: AsyncSession, normal_user):
+    token, sid = await _login(client, normal_user)
+    await get_current_user(db, token)
+    assert principal_cache._local_get(str(sid)) is not None
+    await crud_session.deactivate_session(db, session_id=sid)
+    assert principal_cache._local_get(str(sid)) is None
+    with pytest.raises(HTTPException) as exc:
+        await get_current_user(db, token)
+    assert exc.value.status_code == 401
@@ -0,0 +1,30 @@
+import io
+import pytest
+from httpx import AsyncClient
+from openpyxl import load_workbook
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.models.ticket import Ticket
+@pytest.mark.asyncio
+async def test_ticket_export_streams_every_row(
+    client: AsyncClient, db: AsyncSession, admin_token_headers, admin_user, default_group, default_ticket_type
+):
+    rows = 1500  # más que el antiguo tope de 1000 y más de un lote
+    await db.execute(insert(Ticket), [
+        {
+            "title": f"Export {i}", "ticket_type_id": default_ticket_type.id, "group_id": default_group.id,
+            "owner_group_id": default_group.id, "created_by_id": admin_user.id,
+        }
+        for i in range(rows)
+    ])
+    await db.commit()
+    response = await client.get(f"{settings.API_V1_STR}/reports/tickets/csv", headers=admin_token_headers)
+    assert response.status_code == 200 and response.headers["content-type"].startswith("text/csv")
+    lines = response.text.splitlines()
+    assert lines[0] == "ID,Title,Status,Priority,Created At,SLA Deadline" and len(lines) == rows + 1
+    response = await client.get(f"{settings.API_V1_STR}/reports/tickets/excel", headers=admin_token_headers)
+    assert response.status_code == 200
+    assert load_workbook(io.BytesIO(response.content), read_only=True).active.max_row == rows + 1
+    response = await client.get(f"{settings.API_V1_STR}/reports/tickets/docx", headers=admin_token_headers)
+    assert response.status_code == 400
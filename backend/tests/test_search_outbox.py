@@ -0,0 +1,39 @@
+import json
+import httpx
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models.search_outbox import SearchOutbox
+from app.db.models.ticket import Ticket
+from app.services.search_outbox_dispatcher import search_outbox_dispatcher
+from app.services.search_service import search_service
+@pytest.mark.asyncio
+async def test_ticket_changes_reach_meilisearch_through_the_outbox(
+    db: AsyncSession, admin_user, default_group, default_ticket_type, monkeypatch
+):
+    calls = []
+    def handler(request: httpx.Request):
+        calls.append((request.url.path, json.loads(request.content)))
+        return httpx.Response(202, json={"taskUid": len(calls)})
+    monkeypatch.setattr(search_service.indexer, "transport", httpx.MockTransport(handler))
+    monkeypatch.setattr(search_service.indexer, "_client", None)
+    ticket = Ticket(
+        title="Outbox", ticket_type_id=default_ticket_type.id, group_id=default_group.id,
+        owner_group_id=default_group.id, created_by_id=admin_user.id,
+    )
+    db.add(ticket)
+    await db.commit()
+    # Dos cambios más del mismo ticket: un solo documento con el estado vigente
+    await db.execute(update(Ticket).where(Ticket.id == ticket.id).values(status="in_progress"))
+    await db.execute(update(Ticket).where(Ticket.id == ticket.id).values(title="Outbox editado"))
+    await db.commit()
+    assert await search_outbox_dispatcher.dispatch_once(db) == 3
+    assert [path for path, _ in calls] == ["/indexes/tickets/documents"]
+    sent = calls[0][1][0]
+    assert sent["id"] == str(ticket.id) and sent["title"] == "Outbox editado" and sent["status"] == "in_progress"
+    assert (await db.execute(select(func.count()).select_from(SearchOutbox))).scalar_one() == 0
+    # La baja lógica se envía como borrado
+    await db.execute(update(Ticket).where(Ticket.id == ticket.id).values(deleted_at=func.now()))
+    await db.commit()
+    assert await search_outbox_dispatcher.dispatch_once(db) == 1
+    assert calls[-1] == ("/indexes/tickets/documents/delete-batch", [str(ticket.id)])
@@ -0,0 +1,31 @@
+import uuid
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.models.audit_log import AuditLog
+from app.db.models.ticket import Ticket
+@pytest.mark.asyncio
+async def test_bulk_update_applies_status_rules_and_audits_each_ticket(
+    client: AsyncClient, db: AsyncSession, admin_token_headers, admin_user, default_group, default_ticket_type
+):
+    tickets = [
+        Ticket(
+            id=uuid.uuid4(), title=f"Lote {i}", status="open", ticket_type_id=default_ticket_type.id,
+            group_id=default_group.id, owner_group_id=default_group.id, created_by_id=admin_user.id,
+        )
+        for i in range(3)
+    ]
+    db.add_all(tickets)
+    await db.commit()
+    payload = {"ticket_ids": [str(t.id) for t in tickets], "status": "closed", "assigned_to_id": str(admin_user.id)}
+    response = await client.patch(f"{settings.API_V1_STR}/tickets/bulk-update", json=payload, headers=admin_token_headers)
+    assert response.status_code == 200
+    assert response.json() == {"updated": 3}
+    db.expire_all()
+    res = await db.execute(select(Ticket).where(Ticket.id.in_([t.id for t in tickets])))
+    assert all(t.status == "closed" and t.closed_at is not None for t in res.scalars())
+    res_audit = await db.execute(select(AuditLog).where(AuditLog.event_type == "ticket_updated"))
+    audits = res_audit.scalars().all()
+    assert len(audits) == 3 and all(a.details["new_status"] == "closed" for a in audits)
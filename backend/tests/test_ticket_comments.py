@@ -0,0 +1,38 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.models.ticket import Ticket, TicketComment
+@pytest.mark.asyncio
+async def test_comments_are_cursor_paginated_and_incremental(
+    client: AsyncClient, db: AsyncSession, admin_token_headers, admin_user, default_group, default_ticket_type
+):
+    ticket = Ticket(
+        title="Incidente largo", ticket_type_id=default_ticket_type.id, group_id=default_group.id,
+        owner_group_id=default_group.id, created_by_id=admin_user.id
+    )
+    db.add(ticket)
+    await db.flush()
+    start = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+    db.add_all([
+        TicketComment(ticket_id=ticket.id, user_id=admin_user.id, content=f"Log {i}", created_at=start + timedelta(minutes=i))
+        for i in range(5)
+    ])
+    await db.commit()
+    url = f"{settings.API_V1_STR}/tickets/{ticket.id}/comments"
+    response = await client.get(url, params={"limit": 3}, headers=admin_token_headers)
+    assert response.status_code == 200
+    page = response.json()
+    assert [c["content"] for c in page["items"]] == ["Log 0", "Log 1", "Log 2"]
+    assert page["has_more"] and page["items"][0]["user_name"] == admin_user.username
+    response = await client.get(url, params={"limit": 3, "cursor": page["next_cursor"]}, headers=admin_token_headers)
+    page = response.json()
+    assert [c["content"] for c in page["items"]] == ["Log 3", "Log 4"] and not page["has_more"]
+    # Polling con el último cursor: sólo lo nuevo
+    db.add(TicketComment(ticket_id=ticket.id, user_id=admin_user.id, content="Log 5", created_at=start + timedelta(minutes=5)))
+    await db.commit()
+    response = await client.get(url, params={"cursor": page["next_cursor"]}, headers=admin_token_headers)
+    assert [c["content"] for c in response.json()["items"]] == ["Log 5"]
+    response = await client.get(url, params={"since": (start + timedelta(minutes=3, seconds=30)).isoformat()}, headers=admin_token_headers)
+    assert [c["content"] for c in response.json()["items"]] == ["Log 4", "Log 5"]
@@ -0,0 +1,46 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.models.asset_history import AssetEventLog
+from app.db.models.audit_log import AuditLog
+@pytest.mark.asyncio
+async def test_create_ticket_writes_links_audit_and_asset_event_in_one_request(
+    client: AsyncClient, db: AsyncSession, admin_token_headers, admin_user, default_group, default_ticket_type, default_asset
+):
+    payload = {
+        "title": "Alta en una transacción",
+        "priority": "high",
+        "ticket_type_id": str(default_ticket_type.id),
+        "group_id": str(default_group.id),
+        "asset_id": str(default_asset.id),
+        "asset_ids": [str(default_asset.id), str(default_asset.id)],
+    }
+    response = await client.post(f"{settings.API_V1_STR}/tickets", json=payload, headers=admin_token_headers)
+    assert response.status_code == 201
+    data = response.json()
+    assert data["created_at"] is not None
+    assert [a["id"] for a in data["assets"]] == [str(default_asset.id)]
+    assert data["group"]["id"] == str(default_group.id)
+    res_audit = await db.execute(select(AuditLog).where(AuditLog.event_type == "ticket_created"))
+    audits = res_audit.scalars().all()
+    assert len(audits) == 1 and audits[0].details["target_id"] == data["id"]
+    res_event = await db.execute(select(AssetEventLog).where(AssetEventLog.asset_id == default_asset.id))
+    assert res_event.scalar_one().details["ticket_id"] == data["id"]
+@pytest.mark.asyncio
+async def test_bulk_create_reports_each_row(
+    client: AsyncClient, db: AsyncSession, admin_token_headers, admin_user, default_group, default_ticket_type, default_asset
+):
+    row = {"ticket_type_id": str(default_ticket_type.id), "group_id": str(default_group.id), "asset_ids": [str(default_asset.id)]}
+    payload = {"items": [{**row, "title": "Lote 1"}, {"title": "Sin tipo"}, {**row, "title": "Lote 2"}]}
+    response = await client.post(f"{settings.API_V1_STR}/tickets/bulk", json=payload, headers=admin_token_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created_count"] == 2 and data["error_count"] == 1
+    assert [r["status"] for r in data["results"]] == ["created", "invalid", "created"]
+    res_audit = await db.execute(select(AuditLog).where(AuditLog.event_type == "ticket_created"))
+    assert len(res_audit.scalars().all()) == 2
+    payload["atomic"] = True
+    response = await client.post(f"{settings.API_V1_STR}/tickets/bulk", json=payload, headers=admin_token_headers)
+    assert [r["status"] for r in response.json()["results"]] == ["skipped", "invalid", "skipped"]
@@ -0,0 +1,77 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.models.ticket import Ticket, TicketComment, TicketSubtask, TicketWatcher
+@pytest.mark.asyncio
+async def test_read_ticket_full_returns_requested_panels(
+    client: AsyncClient, db: AsyncSession, admin_token_headers, admin_user, default_group, default_ticket_type
+):
+    ticket = Ticket(
+        title="Detalle completo", ticket_type_id=default_ticket_type.id, group_id=default_group.id,
+        owner_group_id=default_group.id, created_by_id=admin_user.id
+    )
+    db.add(ticket)
+    await db.flush()
+    db.add_all([
+        TicketComment(ticket_id=ticket.id, user_id=admin_user.id, content="Primer comentario"),
+        TicketSubtask(ticket_id=ticket.id, title="Revisar logs"),
+        TicketWatcher(ticket_id=ticket.id, user_id=admin_user.id),
+    ])
+    await db.commit()
+    url = f"{settings.API_V1_STR}/tickets/{ticket.id}/full"
+    response = await client.get(url, headers=admin_token_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["ticket"]["id"] == str(ticket.id)
+    assert [c["content"] for c in data["comments"]["items"]] == ["Primer comentario"]
+    assert data["comments"]["has_more"] is False and data["comments"]["next_cursor"]
+    assert [w["username"] for w in data["watchers"]] == [admin_user.username]
+    assert [s["title"] for s in data["subtasks"]] == ["Revisar logs"]
+    assert data["relations"] == []
+    response = await client.get(url, params={"fields": "comments,watchers"}, headers=admin_token_headers)
+    data = response.json()
+    assert data["ticket"] is None and data["subtasks"] is None
+    assert len(data["comments"]["items"]) == 1 and len(data["watchers"]) == 1
+    response = await client.get(url, params={"fields": "history"}, headers=admin_token_headers)
+    assert response.status_code == 400
+@pytest.mark.asyncio
+async def test_ticket_detail_honours_if_none_match(
+    client: AsyncClient, db: AsyncSession, admin_token_headers, admin_user, default_group, default_ticket_type
+):
+    ticket = Ticket(
+        title="Con ETag", ticket_type_id=default_ticket_type.id, group_id=default_group.id,
+        owner_group_id=default_group.id, created_by_id=admin_user.id
+    )
+    db.add(ticket)
+    await db.commit()
+    url = f"{settings.API_V1_STR}/tickets/{ticket.id}"
+    response = await client.get(url, headers=admin_token_headers)
+    etag = response.headers["etag"]
+    assert response.status_code == 200 and etag.startswith('W/"')
+    response = await client.get(url, headers={**admin_token_headers, "If-None-Match": etag})
+    assert response.status_code == 304 and response.content == b""
+    full_url = f"{url}/full"
+    full_etag = (await client.get(full_url, headers=admin_token_headers)).headers["etag"]
+    db.add(TicketComment(ticket_id=ticket.id, user_id=admin_user.id, content="Cambia la versión"))
+    await db.commit()
+    response = await client.get(full_url, headers={**admin_token_headers, "If-None-Match": full_etag})
+    assert response.status_code == 200 and len(response.json()["comments"]["items"]) == 1
+@pytest.mark.asyncio
+async def test_full_returns_first_comment_page_and_cursor_continues(
+    client: AsyncClient, db: AsyncSession, admin_token_headers, admin_user, default_group, default_ticket_type
+):
+    ticket = Ticket(
+        title="Incidente largo", ticket_type_id=default_ticket_type.id, group_id=default_group.id,
+        owner_group_id=default_group.id, created_by_id=admin_user.id
+    )
+    db.add(ticket)
+    await db.flush()
+    db.add_all([TicketComment(ticket_id=ticket.id, user_id=admin_user.id, content=f"Nota {i}") for i in range(3)])
+    await db.commit()
+    url = f"{settings.API_V1_STR}/tickets/{ticket.id}"
+    response = await client.get(f"{url}/full", params={"fields": "comments", "comments_limit": 2}, headers=admin_token_headers)
+    page = response.json()["comments"]
+    assert len(page["items"]) == 2 and page["has_more"]
+    page = (await client.get(f"{url}/comments", params={"cursor": page["next_cursor"]}, headers=admin_token_headers)).json()
+    assert len(page["items"]) == 1 and not page["has_more"]
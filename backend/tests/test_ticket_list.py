@@ -0,0 +1,74 @@
+import uuid
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.models.group import Group
+from app.db.models.ticket import Ticket
+from app.db.models.notifications import Attachment
+@pytest.mark.asyncio
+async def test_summary_view_projects_names_and_attachment_count(
+    client: AsyncClient, db: AsyncSession, admin_token_headers, admin_user, default_group, default_ticket_type
+):
+    ticket = Ticket(
+        id=uuid.uuid4(), title="Resumen", status="open", priority="high",
+        ticket_type_id=default_ticket_type.id, group_id=default_group.id,
+        owner_group_id=default_group.id, created_by_id=admin_user.id,
+    )
+    db.add(ticket)
+    await db.flush()
+    db.add(Attachment(id=uuid.uuid4(), ticket_id=ticket.id, uploaded_by_id=admin_user.id, filename="log.txt", file_path="/tmp/log.txt"))
+    await db.commit()
+    response = await client.get(f"{settings.API_V1_STR}/tickets?view=summary", headers=admin_token_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["view"] == "summary"
+    item = data["items"][0]
+    assert item["group_name"] == default_group.name
+    assert item["ticket_type_name"] == default_ticket_type.name
+    assert item["created_by_name"] == admin_user.username
+    assert item["attachment_count"] == 1 and item["has_attachments"] is True
+    assert "description" not in item
+@pytest.mark.asyncio
+async def test_cursor_pagination_visits_every_ticket_once(
+    client: AsyncClient, db: AsyncSession, admin_token_headers, admin_user, default_group, default_ticket_type
+):
+    db.add_all([
+        Ticket(
+            id=uuid.uuid4(), title=f"T{i}", priority=["low", "high"][i % 2],
+            ticket_type_id=default_ticket_type.id, owner_group_id=default_group.id, created_by_id=admin_user.id,
+        )
+        for i in range(7)
+    ])
+    await db.commit()
+    seen, cursor = [], None
+    while True:
+        params = {"pagination": "cursor", "size": 3, "sort_by": "priority", "view": "summary"}
+        if cursor:
+            params["cursor"] = cursor
+        data = (await client.get(f"{settings.API_V1_STR}/tickets", params=params, headers=admin_token_headers)).json()
+        seen += [item["id"] for item in data["items"]]
+        cursor = data["next_cursor"]
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == 7
+@pytest.mark.asyncio
+async def test_group_filter_total_follows_group_moves(
+    client: AsyncClient, db: AsyncSession, admin_token_headers, admin_user, default_group, default_ticket_type
+):
+    child = Group(id=uuid.uuid4(), name="Soporte Norte")
+    db.add(child)
+    await db.flush()
+    db.add(Ticket(
+        id=uuid.uuid4(), title="Movido", status="open", priority="high", ticket_type_id=default_ticket_type.id,
+        group_id=child.id, owner_group_id=child.id, created_by_id=admin_user.id,
+    ))
+    await db.commit()
+    async def total():
+        params = {"group_id": str(default_group.id), "count_mode": "exact"}
+        return (await client.get(f"{settings.API_V1_STR}/tickets", params=params, headers=admin_token_headers)).json()["total"]
+    assert await total() == 0
+    # Mover el grupo cambia la expansión del filtro aunque no se toque ningún ticket
+    child.parent_id = default_group.id
+    await db.commit()
+    assert await total() == 1
@@ -0,0 +1,27 @@
+import uuid
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud.crud_ticket import ticket_text_search
+from app.db.models.ticket import Ticket
+@pytest.mark.asyncio
+async def test_full_text_search_is_accent_insensitive_and_ranked(db: AsyncSession, admin_user, default_group, default_ticket_type):
+    def make(title, description):
+        return Ticket(
+            id=uuid.uuid4(), title=title, description=description,
+            ticket_type_id=default_ticket_type.id, group_id=default_group.id,
+            owner_group_id=default_group.id, created_by_id=admin_user.id,
+        )
+    in_title = make("Caída del servidor de correo", "Sin detalle")
+    in_description = make("Incidente", "Se reporta caida intermitente en el enlace")
+    unrelated = make("Alta de usuario", "Crear cuenta nueva")
+    db.add_all([in_title, in_description, unrelated])
+    await db.commit()
+    matches, rank = ticket_text_search("caida")
+    result = await db.execute(select(Ticket.id).where(matches).order_by(rank.desc()))
+    assert result.scalars().all() == [in_title.id, in_description.id]
+    # El trigger mantiene el vector al editar
+    unrelated.description = "Caída de la VPN"
+    await db.commit()
+    result = await db.execute(select(Ticket.id).where(ticket_text_search("caídas")[0]))
+    assert set(result.scalars().all()) == {in_title.id, in_description.id, unrelated.id}
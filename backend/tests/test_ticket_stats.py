@@ -0,0 +1,74 @@
+import uuid
+from datetime import datetime, timezone
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.db.models.integrations import SIEMConfiguration
+from app.db.models.ticket import Ticket, TicketCounter
+from app.db.models.user import User
+@pytest.mark.asyncio
+async def test_counters_follow_inserts_updates_and_soft_deletes(
+    client: AsyncClient, db: AsyncSession, admin_token_headers, admin_user, default_group, default_ticket_type
+):
+    siem_user = User(
+        email="fortisiem_test@example.com", username="fortisiem_test", hashed_password=get_password_hash("x"),
+        is_active=True, first_name="Forti", last_name="SIEM", group_id=default_group.id,
+    )
+    db.add(siem_user)
+    await db.flush()
+    db.add(SIEMConfiguration(siem_user_id=siem_user.id, api_username="fortisiem"))
+    await db.commit()
+    def new_ticket(title, status="open", priority="high", created_by=admin_user):
+        return Ticket(
+            id=uuid.uuid4(), title=title, status=status, priority=priority,
+            ticket_type_id=default_ticket_type.id, group_id=default_group.id,
+            owner_group_id=default_group.id, created_by_id=created_by.id,
+        )
+    tickets = [
+        new_ticket("Impresora"), new_ticket("Red"), new_ticket("ALERTA SIEM: login", priority="critical"),
+        new_ticket("Evento 4625", created_by=siem_user), new_ticket("Evento 4624", status="closed", created_by=siem_user),
+    ]
+    db.add_all(tickets)
+    await db.commit()
+    tickets[0].status = "closed"
+    tickets[1].deleted_at = datetime.now(timezone.utc)
+    await db.commit()
+    response = await client.get(f"{settings.API_V1_STR}/tickets/stats", headers=admin_token_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == {"closed": 2, "open": 2}
+    assert data["priority"] == {"high": 3, "critical": 1}
+    # siem_alerts: sólo los abiertos creados por el usuario de siem_configuration (no por título)
+    assert data["siem_alerts"] == 1
+    # Dashboard: excluye SIEM por título / tipo, no los creados por el usuario FortiSIEM
+    response = await client.get(f"{settings.API_V1_STR}/dashboard/stats", headers=admin_token_headers)
+    assert response.json()["tickets"] == {"total": 3, "open": 1, "in_progress": 0, "resolved": 0, "closed": 2}
+    res_total = await db.execute(select(func.sum(TicketCounter.count)))
+    assert res_total.scalar() == 4
+@pytest.mark.asyncio
+async def test_renaming_a_ticket_type_moves_its_counters(
+    client: AsyncClient, db: AsyncSession, admin_token_headers, admin_user, default_group, default_ticket_type
+):
+    db.add_all([
+        Ticket(
+            id=uuid.uuid4(), title=title, status="open", priority="high", ticket_type_id=default_ticket_type.id,
+            group_id=default_group.id, owner_group_id=default_group.id, created_by_id=admin_user.id,
+        )
+        for title in ("Impresora", "Red", "ALERTA: disco")
+    ])
+    await db.commit()
+    async def dashboard_total():
+        response = await client.get(f"{settings.API_V1_STR}/dashboard/stats", headers=admin_token_headers)
+        return response.json()["tickets"]["total"]
+    assert await dashboard_total() == 2
+    default_ticket_type.name = "Alertas SIEM"
+    await db.commit()
+    assert await dashboard_total() == 0
+    default_ticket_type.name = "Incidentes"
+    await db.commit()
+    assert await dashboard_total() == 2
+    res_total = await db.execute(select(func.sum(TicketCounter.count)))
+    assert res_total.scalar() == 3
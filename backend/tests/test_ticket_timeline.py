@@ -0,0 +1,64 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.crud.crud_audit import audit_log
+from app.db.models.ticket import Ticket, TicketComment
+@pytest.mark.asyncio
+async def test_timeline_merges_audit_and_comments_by_cursor(
+    client: AsyncClient, db: AsyncSession, admin_token_headers, admin_user, default_group, default_ticket_type
+):
+    ticket = Ticket(
+        title="Incidente con historia", ticket_type_id=default_ticket_type.id, group_id=default_group.id,
+        owner_group_id=default_group.id, created_by_id=admin_user.id
+    )
+    db.add(ticket)
+    await db.flush()
+    start = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+    db.add_all([
+        TicketComment(ticket_id=ticket.id, user_id=admin_user.id, content=f"Nota {i}", created_at=start + timedelta(minutes=2 * i))
+        for i in range(2)
+    ])
+    for i in range(2):
+        # Sin target explícito: se infiere de details["ticket_id"]
+        log = await audit_log.create_log(
+            db, user_id=admin_user.id, event_type="ticket_updated", details={"ticket_id": str(ticket.id), "paso": i}, commit=False
+        )
+        log.created_at = start + timedelta(minutes=2 * i + 1)
+    await db.commit()
+    assert log.target_type == "ticket" and log.target_id == ticket.id
+    url = f"{settings.API_V1_STR}/tickets/{ticket.id}/timeline"
+    response = await client.get(url, params={"limit": 3}, headers=admin_token_headers)
+    assert response.status_code == 200
+    page = response.json()
+    assert [(e["kind"], e["event_type"]) for e in page["items"]] == [
+        ("audit", "ticket_updated"), ("comment", "comment_added"), ("audit", "ticket_updated")
+    ]
+    assert page["has_more"] and page["items"][1]["details"]["content"] == "Nota 1"
+    assert page["items"][0]["user_name"] == admin_user.username
+    response = await client.get(url, params={"limit": 3, "cursor": page["next_cursor"]}, headers=admin_token_headers)
+    page = response.json()
+    assert [e["details"].get("content") for e in page["items"]] == ["Nota 0"] and not page["has_more"]
+    response = await client.get(url, params={"order": "asc", "limit": 2}, headers=admin_token_headers)
+    assert [e["kind"] for e in response.json()["items"]] == ["comment", "audit"]
+    response = await client.get(f"{settings.API_V1_STR}/audit", params={"ticket_id": str(ticket.id)}, headers=admin_token_headers)
+    assert response.status_code == 200 and len(response.json()) == 2
+@pytest.mark.asyncio
+async def test_bulk_audit_logs_infer_ticket_target(
+    client: AsyncClient, db: AsyncSession, admin_token_headers, admin_user, default_group, default_ticket_type
+):
+    ticket = Ticket(
+        title="Importado", ticket_type_id=default_ticket_type.id, group_id=default_group.id,
+        owner_group_id=default_group.id, created_by_id=admin_user.id
+    )
+    db.add(ticket)
+    await db.flush()
+    # Sin target explícito, igual que create_log: se infiere de details["ticket_id"]
+    await audit_log.create_logs(
+        db, user_id=admin_user.id, event_type="ticket_imported",
+        entries=[(None, {"ticket_id": str(ticket.id), "fila": i}) for i in range(2)],
+    )
+    await db.commit()
+    response = await client.get(f"{settings.API_V1_STR}/tickets/{ticket.id}/timeline", headers=admin_token_headers)
+    assert [e["event_type"] for e in response.json()["items"]] == ["ticket_imported", "ticket_imported"]
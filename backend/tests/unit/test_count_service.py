@@ -0,0 +1,29 @@
+import asyncio
+from sqlalchemy import Column, Integer, MetaData, Table, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from app.services.count_service import CountService, _Explain
+metadata = MetaData()
+items = Table("items", metadata, Column("id", Integer, primary_key=True), Column("kind", Integer))
+def test_explain_keeps_bind_parameters():
+    sql = str(_Explain(select(items).where(items.c.kind == 3)).compile(dialect=postgresql.dialect()))
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT") and "%(kind_1)s" in sql
+def test_normalize_filters_ignores_empty_values():
+    assert CountService.normalize_filters({"b": 2, "a": "x", "q": None, "me": False}) == (("a", "x"), ("b", "2"))
+def test_count_is_memoized_until_table_changes():
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+            await conn.execute(items.insert(), [{"kind": i % 2} for i in range(5)])
+        service = CountService()
+        async with AsyncSession(engine) as db:
+            query = select(items).where(items.c.kind == 1)
+            first = await service.count(db, query, endpoint="items", tables=("items",), filters={"kind": 1}, mode="auto")
+            await db.execute(items.insert().values(kind=1))
+            cached = await service.count(db, query, endpoint="items", tables=("items",), filters={"kind": 1}, mode="auto")
+            service.bump(["items"])
+            fresh = await service.count(db, query, endpoint="items", tables=("items",), filters={"kind": 1}, mode="auto")
+        await engine.dispose()
+        return first, cached, fresh
+    assert asyncio.run(run()) == ((2, True), (2, True), (3, True))
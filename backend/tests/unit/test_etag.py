@@ -0,0 +1,20 @@
+from datetime import datetime, timezone
+from uuid import UUID
+from starlette.requests import Request
+from app.core.etag import etag_matches, make_etag
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+def test_etag_is_weak_and_depends_on_every_part():
+    ts = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+    etag = make_etag("ticket", UUID(int=1), ts, 3)
+    assert etag.startswith('W/"') and etag == make_etag("ticket", UUID(int=1), ts, 3)
+    assert etag != make_etag("ticket", UUID(int=1), ts, 4)
+    assert etag != make_etag("ticket", UUID(int=1), None, 3)
+def test_if_none_match_uses_weak_comparison():
+    etag = make_etag("groups", 1)
+    assert not etag_matches(_request(), etag)
+    assert etag_matches(_request(etag), etag)
+    assert etag_matches(_request(f'"otro", {etag.removeprefix("W/")}'), etag)
+    assert etag_matches(_request("*"), etag)
+    assert not etag_matches(_request('W/"otro"'), etag)
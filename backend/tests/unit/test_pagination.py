@@ -0,0 +1,16 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+import pytest
+from app.core.pagination import encode_cursor, decode_cursor
+def test_cursor_roundtrip_datetime():
+    last_id = uuid4()
+    value = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    position = decode_cursor(encode_cursor("created_at", "desc", value, last_id))
+    assert position == {"k": "created_at", "o": "desc", "v": value, "id": last_id}
+def test_cursor_roundtrip_null_value():
+    last_id = uuid4()
+    position = decode_cursor(encode_cursor("platform", "asc", None, last_id))
+    assert position["v"] is None and position["id"] == last_id
+def test_invalid_cursor():
+    with pytest.raises(ValueError):
+        decode_cursor("no-es-un-cursor")
@@ -0,0 +1,12 @@
+from app.core.permissions import PermissionIndex
+def test_scopes_are_indexed_by_resource_and_action():
+    index = PermissionIndex(["ticket:read:group", "ticket:read:own", "ticket:comment", "admin:users:read"])
+    assert index.scopes("ticket", "read") == frozenset({"group", "own"})
+    assert index.scopes("ticket", "comment") == frozenset({None})
+    assert index.scopes("ticket", "delete") == frozenset()
+    assert index.scopes("admin:users", "read") == frozenset({None})
+def test_exact_key_lookup():
+    index = PermissionIndex(["ticket:update:own"])
+    assert index.has("ticket:update:own")
+    assert "ticket:update:own" in index
+    assert not index.has("ticket:update:group")
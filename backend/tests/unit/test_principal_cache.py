@@ -0,0 +1,56 @@
+import uuid
+from datetime import datetime, timezone
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from app.api.deps import get_current_user
+from app.core.security import create_access_token
+from app.services.principal_cache import PrincipalCache, principal_cache
+def _snap(user_id, sid):
+    return {"sid": sid, "user": {"id": user_id}, "group": None, "roles": [], "permissions": ["ticket:read:own"]}
+def test_json_roundtrip_preserves_types():
+    cache = PrincipalCache()
+    uid = uuid.uuid4()
+    now = datetime.now(timezone.utc)
+    snap = {"user": {"id": uid, "created_at": now, "recovery_codes": ["a"]}, "roles": []}
+    restored = cache._loads(cache._dumps(snap))
+    assert restored["user"]["id"] == uid
+    assert restored["user"]["created_at"] == now
+    assert restored["user"]["recovery_codes"] == ["a"]
+def test_lru_evicts_oldest_entry():
+    cache = PrincipalCache()
+    cache.max_entries = 2
+    for sid in ("s1", "s2", "s3"):
+        cache._local_put(sid, _snap(uuid.uuid4(), sid))
+    assert cache._local_get("s1") is None
+    assert cache._local_get("s3") is not None
+def test_invalidate_by_user_drops_all_its_sessions():
+    cache = PrincipalCache()
+    uid = uuid.uuid4()
+    cache._local_put("a", _snap(uid, "a"))
+    cache._local_put("b", _snap(uid, "b"))
+    cache._local_put("c", _snap(uuid.uuid4(), "c"))
+    cache.invalidate_local(user_ids=[uid])
+    assert cache._local_get("a") is None and cache._local_get("b") is None
+    assert cache._local_get("c") is not None
+@pytest.mark.asyncio
+async def test_cache_hit_authenticates_without_queries():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    uid, sid = uuid.uuid4(), uuid.uuid4()
+    snap = _snap(uid, str(sid))
+    snap["user"].update(username="cached", is_active=True, is_superuser=False)
+    principal_cache._local_put(str(sid), snap)
+    token = create_access_token(uid, claims={"sid": str(sid), "scope": "session"})
+    try:
+        async with AsyncSession(engine) as db:
+            user = await get_current_user(db, HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+            assert user.id == uid and user.username == "cached"
+            assert user.has_permission("ticket:read:own")
+        # Sin tablas creadas: cualquier consulta habría fallado
+        assert statements == []
+    finally:
+        principal_cache.invalidate_local(session_ids=[sid])
+        await engine.dispose()
@@ -0,0 +1,43 @@
+import asyncio
+import time
+from datetime import datetime
+import pytest
+from app.services.export_service import export_service
+from app.services.pdf_service import pdf_service
+from app.services.render_executor import RenderExecutor, RenderQueueFull, RenderTimeout
+ROWS = [{"ID": str(i), "Title": f"Ticket {i}", "Status": "open"} for i in range(3)]
+def test_documents_render_in_worker_processes():
+    async def run():
+        executor = RenderExecutor()
+        try:
+            csv = await executor.run(export_service.to_csv, ROWS, kind="csv")
+            ticket = {
+                "id": "0" * 32, "title": "Caída de enlace", "status": "open", "priority": "high",
+                "created_by_name": None, "created_at": datetime(2026, 3, 1, 12, 0), "description": "<p>Sin enlace</p>",
+                "assets": [{"hostname": "pc-01", "ip_address": None, "mac_address": None, "location_name": "Piso 1"}],
+            }
+            comments = [{"created_at": datetime(2026, 3, 1, 12, 5), "user_name": "admin", "content": "Revisando"}]
+            pdf = await executor.run(pdf_service.render_ticket_report, ticket, comments, kind="ticket_pdf")
+            return csv, pdf, executor.stats()
+        finally:
+            executor.shutdown()
+    csv, pdf, stats = asyncio.run(run())
+    assert csv.decode().splitlines()[0] == "ID,Title,Status" and pdf.startswith(b"%PDF")
+    assert stats["running"] == 0 and stats["queued"] == 0
+def test_hung_job_times_out_and_pool_recovers():
+    async def run():
+        executor = RenderExecutor()
+        try:
+            with pytest.raises(RenderTimeout):
+                await executor.run(time.sleep, 30, timeout=1)
+            return await executor.run(export_service.to_csv, ROWS[:1])
+        finally:
+            executor.shutdown()
+    assert asyncio.run(run()).decode().startswith("ID,Title,Status")
+def test_full_queue_is_rejected():
+    async def run():
+        executor = RenderExecutor()
+        executor.max_queue = 0
+        with pytest.raises(RenderQueueFull):
+            await executor.run(export_service.to_csv, ROWS)
+    asyncio.run(run())
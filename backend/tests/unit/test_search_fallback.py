@@ -0,0 +1,65 @@
+import pytest
+from app.services.search_fallback import CircuitBreaker, FallbackFilterError, LocalSearchIndex, compile_filter
+from app.services.search_service import INDEX_SETTINGS, SearchService
+TICKETS = [
+    {"id": "t1", "title": "Falla de impresora", "description": "Piso 3", "status": "open", "group_id": "g1",
+     "created_by_id": "u1", "is_global": False, "is_private": None},
+    {"id": "t2", "title": "Acceso VPN", "description": "No conecta la impresión", "status": "closed", "group_id": "g2",
+     "created_by_id": "u2", "assigned_to_id": "u1", "is_global": False, "is_private": True},
+    {"id": "t3", "title": "Impresión lenta", "description": "", "status": "open", "group_id": "g3",
+     "created_by_id": "u3", "is_global": True, "is_private": True},
+]
+def _index():
+    index = LocalSearchIndex(INDEX_SETTINGS)
+    index.upsert("tickets", TICKETS)
+    return index
+def test_ranked_prefix_search_ignores_case_and_accents():
+    index = _index()
+    # El título pesa más que la descripción
+    assert [h["id"] for h in index.search("tickets", "IMPRESION")["hits"]] == ["t3", "t2"]
+    assert [h["id"] for h in index.search("tickets", "impres", limit=1, offset=1)["hits"]] == ["t1"]
+    index.upsert("tickets", [{"id": "t1", "title": "Cambiado", "status": "closed"}])
+    index.delete("tickets", ["t2"])
+    result = index.search("tickets", "")
+    assert [h["id"] for h in result["hits"]] == ["t3", "t1"] and result["degraded"]
+def test_long_texts_are_truncated():
+    index = LocalSearchIndex(INDEX_SETTINGS, max_chars=10)
+    index.upsert("tickets", [{"id": "t1", "title": "Impresora", "description": "corta " + "x" * 100 + " oculto"}])
+    assert index.search("tickets", "corta")["hits"][0]["description"] == "corta xxxx"
+    assert index.search("tickets", "oculto")["hits"] == []
+def test_meilisearch_filter_syntax():
+    index = _index()
+    def ids(filters):
+        return [h["id"] for h in index.search("tickets", "", filters)["hits"]]
+    # != incluye documentos sin el atributo, como en Meilisearch
+    assert ids(['(is_private != true OR created_by_id = "u1" OR assigned_to_id = "u1")', "status = OPEN"]) == ["t1"]
+    assert ids('group_id IN ["g1", g2] AND NOT status = open') == ["t2"]
+    assert ids([["status = closed", "is_global = true"]]) == ["t2", "t3"]
+    assert ids("assigned_to_id NOT EXISTS AND group_id NOT IN [g3]") == ["t1"]
+    for invalid in ["hostname = x", "status = (", "status IN [open"]:
+        with pytest.raises(FallbackFilterError):
+            compile_filter(invalid, INDEX_SETTINGS["tickets"]["filterableAttributes"])
+def test_unreachable_meilisearch_opens_the_circuit():
+    service = SearchService()
+    service.url = "http://127.0.0.1:9"
+    service.fallback.enabled = True
+    service.fallback.index = _index()
+    breaker = service.fallback.breaker
+    for _ in range(breaker.failure_threshold):
+        assert service.search_tickets("lenta")["hits"][0]["id"] == "t3"
+    assert breaker.is_open and not breaker.allow()
+    result = service.search_tickets("impres", filters="status = closed", scope="is_private != true")
+    assert result["hits"] == [] and result["degraded"]
+    breaker.record_success()
+    assert breaker.allow()
+def test_half_open_circuit_allows_a_single_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+    breaker.record_failure()
+    breaker.reset_seconds = 60
+    breaker.opened_at -= 60
+    # Las búsquedas concurrentes siguen en el respaldo mientras la prueba está en curso
+    assert breaker.allow() and not breaker.allow() and not breaker.allow()
+    breaker.record_failure()
+    assert breaker.is_open and not breaker.allow()
+    breaker.record_success()
+    assert breaker.allow() and breaker.allow()
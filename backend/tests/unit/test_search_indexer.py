@@ -0,0 +1,41 @@
+import asyncio
+import json
+import httpx
+import pytest
+from app.services.search_indexer import SearchIndexer, SearchIndexError
+def _indexer(responses, calls):
+    def handler(request: httpx.Request):
+        calls.append((request.url.path, json.loads(request.content)))
+        return httpx.Response(responses.pop(0), json={})
+    indexer = SearchIndexer("http://meili", "key", transport=httpx.MockTransport(handler))
+    indexer.max_retries = 1
+    return indexer
+def test_upserts_and_deletes_are_sent_in_batches():
+    calls = []
+    async def run():
+        indexer = _indexer([202, 202], calls)
+        await indexer.upsert("tickets", [{"id": "t1"}, {"id": "t2"}])
+        await indexer.delete("assets", ["a1"])
+        await indexer.upsert("tickets", [])
+        await indexer.close()
+    asyncio.run(run())
+    assert calls == [
+        ("/indexes/tickets/documents", [{"id": "t1"}, {"id": "t2"}]),
+        ("/indexes/assets/documents/delete-batch", ["a1"]),
+    ]
+def test_transient_errors_are_retried():
+    calls = []
+    async def run():
+        indexer = _indexer([503, 202], calls)
+        await indexer.upsert("tickets", [{"id": "t1"}])
+        await indexer.close()
+    asyncio.run(run())
+    assert len(calls) == 2
+def test_rejections_and_exhausted_retries_raise():
+    async def run(responses, error):
+        indexer = _indexer(responses, [])
+        with pytest.raises(error):
+            await indexer.upsert("tickets", [{"id": "t1"}])
+        await indexer.close()
+    asyncio.run(run([400], SearchIndexError))
+    asyncio.run(run([503, 503], httpx.HTTPStatusError))
@@ -0,0 +1,19 @@
+import uuid
+from types import SimpleNamespace
+from app.services.search_reindex_service import _Progress, chunk_bounds
+def test_chunks_cover_the_uuid_space_without_gaps():
+    bounds = [chunk_bounds(n, 16) for n in range(16)]
+    assert bounds[0][0] == uuid.UUID(int=0) and bounds[-1][1] is None
+    assert all(bounds[n][1] == bounds[n + 1][0] for n in range(15))
+    probe = uuid.uuid4()
+    owners = [n for n, (low, high) in enumerate(bounds) if low <= probe and (high is None or probe < high)]
+    assert len(owners) == 1
+def test_resume_keeps_the_saved_partition_and_positions():
+    progress = _Progress(SimpleNamespace(checkpoint={}, indexed_rows=0, total_rows=10), chunks=8)
+    progress.advance(3, "00000000-0000-0000-0000-0000000000aa", 5)
+    progress.positions["5"] = "done"
+    saved = SimpleNamespace(checkpoint=progress.checkpoint, indexed_rows=progress.indexed, total_rows=10)
+    # Otra configuración de tramos al retomar: manda la de la ejecución
+    resumed = _Progress(saved, chunks=64)
+    assert resumed.chunks == 8 and resumed.indexed == 5 and resumed.chunks_done == 1
+    assert resumed.positions["3"].endswith("aa")
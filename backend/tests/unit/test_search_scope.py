@@ -0,0 +1,33 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+from app.core.permissions import PermissionIndex
+from app.crud.crud_ticket import ticket as crud_ticket
+from app.services.group_service import group_service
+from app.services.search_service import _filter_param
+def _user(*keys, superuser=False):
+    return SimpleNamespace(
+        id=uuid.UUID(int=1), group_id=uuid.UUID(int=10), is_superuser=superuser,
+        permission_index=PermissionIndex(keys),
+    )
+def test_read_scope_is_compiled_into_a_meilisearch_filter(monkeypatch):
+    async def child_ids(db, group_id):
+        return [group_id, uuid.UUID(int=11)]
+    monkeypatch.setattr(group_service, "get_all_child_group_ids", child_ids)
+    me = '"00000000-0000-0000-0000-000000000001"'
+    groups = '["00000000-0000-0000-0000-00000000000a", "00000000-0000-0000-0000-00000000000b"]'
+    private = f"(is_private != true OR created_by_id = {me} OR assigned_to_id = {me})"
+    scope = asyncio.run(crud_ticket.search_scope(None, _user("ticket:read:group", "ticket:read:own")))
+    assert scope == (
+        f"{private} AND (is_global = true OR group_id IN {groups} OR owner_group_id IN {groups}"
+        f" OR created_by_id = {me} OR assigned_to_id = {me})"
+    )
+    assert asyncio.run(crud_ticket.search_scope(None, _user("ticket:read:global"))) == private
+    assert asyncio.run(crud_ticket.search_scope(None, _user())) == f"{private} AND (is_global = true)"
+    assert asyncio.run(crud_ticket.search_scope(None, _user(superuser=True))) is None
+def test_caller_filters_are_separate_expressions():
+    assert _filter_param("scope", 'status = "open") OR (is_global = false') == [
+        "scope", 'status = "open") OR (is_global = false'
+    ]
+    assert _filter_param(None, None) == []
+    assert _filter_param("scope", ["a", "b"]) == ["scope", "a", "b"]
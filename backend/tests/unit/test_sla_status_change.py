@@ -0,0 +1,23 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from app.services.sla_service import sla_service
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+def _metric(**kwargs):
+    values = dict(
+        last_paused_at=None, total_paused_seconds=0, responded_at=None, resolved_at=None,
+        response_deadline=NOW + timedelta(hours=1), resolution_deadline=NOW + timedelta(hours=8),
+    )
+    values.update(kwargs)
+    return SimpleNamespace(**values)
+def test_pause_records_timestamp():
+    assert sla_service.status_change_values(_metric(), "open", "pending", NOW) == {"last_paused_at": NOW}
+def test_resume_shifts_deadlines_and_marks_response():
+    metric = _metric(last_paused_at=(NOW - timedelta(hours=2)).replace(tzinfo=None))
+    changes = sla_service.status_change_values(metric, "pending", "in_progress", NOW)
+    assert changes["total_paused_seconds"] == 7200 and changes["last_paused_at"] is None
+    assert changes["resolution_deadline"] == NOW + timedelta(hours=10)
+    # Vencimiento de respuesta corrido: 3h desde NOW, no vencido
+    assert changes["responded_at"] == NOW and "is_response_breached" not in changes
+def test_close_after_deadline_is_breached():
+    changes = sla_service.status_change_values(_metric(resolution_deadline=NOW - timedelta(minutes=1)), "open", "closed", NOW)
+    assert changes["resolved_at"] == NOW and changes["is_resolution_breached"] is True
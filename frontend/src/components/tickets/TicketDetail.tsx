@@ -26,6 +26,8 @@ interface SLAMetric {
 interface TicketDetailProps {
  ticket: any; comments: Comment[]; relations: Relation[]; attachments: Attachment[]; subtasks: Subtask[]; 
  watchers: Watcher[]; history: any[]; users: any[]; groups: any[];
+ hasMoreComments?: boolean;
+ onLoadMoreComments?: () => Promise<void>;
  onAddComment: (content: string, isInternal: boolean) => Promise<void>;
  onAddRelation: (targetId: string, type: string) => Promise<void>;
  onUploadFile: (file: File) => Promise<void>;
@@ -40,13 +42,14 @@ interface TicketDetailProps {
 
 const TicketDetail: React.FC<TicketDetailProps> = ({
  ticket, comments, relations, attachments, subtasks, watchers, history, users, groups,
- onAddComment, onAddRelation, onUploadFile, onDownloadFile, onToggleWatch, onToggleSubtask, onAddSubtask, onDeleteSubtask, onUpdateTicket, onDeleteTicket
+ hasMoreComments, onLoadMoreComments, onAddComment, onAddRelation, onUploadFile, onDownloadFile, onToggleWatch, onToggleSubtask, onAddSubtask, onDeleteSubtask, onUpdateTicket, onDeleteTicket
 }) => {
  const { theme } = useTheme();
  const { user: currentUser } = useAuth();
  const isDark = theme === 'dark' || theme === 'soc';
  
  const [submitting, setSubmitting] = useState(false);
+ const [loadingComments, setLoadingComments] = useState(false);
  const [pendingFiles, setPendingFiles] = useState<File[]>([]);
  const [uploadingFiles, setUploadingFiles] = useState(false);
  const [showDeleteModal, setShowDeleteModal] = useState(false);
@@ -194,6 +197,18 @@ const TicketDetail: React.FC<TicketDetailProps> = ({
   }
  };
 
+ const handleLoadMoreComments = async () => {
+  if (!onLoadMoreComments) return;
+  setLoadingComments(true);
+  try {
+   await onLoadMoreComments();
+  } catch (err) {
+   console.error('Error loading comments:', err);
+  } finally {
+   setLoadingComments(false);
+  }
+ };
+
  const formatAuditDetail = (h: any) => {
   const d = h.details;
   const actor = h.user?.username || 'Sistema';
@@ -410,7 +425,7 @@ const TicketDetail: React.FC<TicketDetailProps> = ({
       </Card>
 
       <Tabs defaultActiveKey="comments" className="custom-tabs mb-4 border-0">
-       <Tab eventKey="comments" title={`Actividad (${comments.length})`}>
+       <Tab eventKey="comments" title={`Actividad (${comments.length}${hasMoreComments ? '+' : ''})`}>
         <Card className="border-0 shadow-sm bg-card">
          <Card.Body className="p-4">
           {ticket.status === 'closed' ? (
@@ -448,6 +463,13 @@ const TicketDetail: React.FC<TicketDetailProps> = ({
             </div>
            </div>
           ))}
+          {hasMoreComments && onLoadMoreComments && (
+           <div className="text-center">
+            <Button variant="outline-primary" size="sm" className="fw-bold x-small" disabled={loadingComments} onClick={handleLoadMoreComments}>
+             {loadingComments ? <Spinner animation="border" size="sm" /> : 'VER MÁS COMENTARIOS'}
+            </Button>
+           </div>
+          )}
          </Card.Body>
         </Card>
        </Tab>
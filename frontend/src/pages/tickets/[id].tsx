@@ -11,6 +11,9 @@ export default function TicketPage() {
   
   const [ticket, setTicket] = useState<any>(null);
   const [comments, setComments] = useState<any[]>([]);
+  // Posición del último comentario cargado (GET /tickets/{id}/comments?cursor=...)
+  const [commentsCursor, setCommentsCursor] = useState<string | null>(null);
+  const [commentsHasMore, setCommentsHasMore] = useState(false);
   const [history, setHistory] = useState<any[]>([]);
   const [attachments, setAttachments] = useState<any[]>([]);
   const [subtasks, setSubtasks] = useState<any[]>([]);
@@ -21,27 +24,29 @@ export default function TicketPage() {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
-  const fetchAllData = useCallback(async () => {
+  // withComments=false: refresca el ticket sin descartar las páginas de comentarios ya cargadas
+  const fetchAllData = useCallback(async (withComments: boolean = true) => {
     if (!id) return;
     setLoading(true);
     try {
-      // 1. Fetch Ticket Core (Attachments are included by default in backend options)
-      const res = await api.get(`/tickets/${id}`);
-      const ticketData = res.data;
-      setTicket(ticketData);
-      setAttachments(ticketData.attachments || []);
-
-      // 2. Fetch Related Data using correct endpoints
-      const [coms, watch, usrs, grps, hist] = await Promise.all([
-        api.get(`/tickets/${id}/comments`),
-        api.get(`/tickets/${id}/watchers`),
+      // 1. Ticket + paneles en una sola petición (se autoriza una vez en el backend)
+      const [full, usrs, grps, hist] = await Promise.all([
+        api.get(`/tickets/${id}/full`, { params: { fields: withComments ? 'ticket,comments,watchers' : 'ticket,watchers' } }),
         api.get('/users'),
         api.get('/groups'),
         api.get('/audit', { params: { ticket_id: id, limit: 50 } })
       ]);
+      const ticketData = full.data.ticket;
+      setTicket(ticketData);
+      setAttachments(ticketData.attachments || []);
 
-      setComments(coms.data);
-      setWatchers(watch.data);
+      if (withComments) {
+        const commentsPage = full.data.comments || { items: [], next_cursor: null, has_more: false };
+        setComments(commentsPage.items);
+        setCommentsCursor(commentsPage.next_cursor);
+        setCommentsHasMore(commentsPage.has_more);
+      }
+      setWatchers(full.data.watchers || []);
       setUsers(usrs.data);
       setGroups(grps.data);
       setHistory(hist.data || []);
@@ -59,21 +64,30 @@ export default function TicketPage() {
     if (id) fetchAllData();
   }, [id, fetchAllData]);
 
+  // Página siguiente desde el último comentario cargado; sin páginas pendientes trae sólo los nuevos
+  const fetchNextComments = useCallback(async () => {
+    const res = await api.get(`/tickets/${id}/comments`, { params: commentsCursor ? { cursor: commentsCursor } : {} });
+    setComments(prev => [...prev, ...res.data.items]);
+    setCommentsCursor(res.data.next_cursor);
+    setCommentsHasMore(res.data.has_more);
+  }, [id, commentsCursor]);
+
   const handleAddComment = async (content: string, isInternal: boolean) => {
     await api.post(`/tickets/${id}/comments`, { content, is_internal: isInternal });
-    fetchAllData();
+    // Con páginas pendientes el comentario nuevo llega al cargarlas
+    if (!commentsHasMore) await fetchNextComments();
   };
 
   const handleUpdateTicket = async (data: any) => {
     await api.put(`/tickets/${id}`, data);
-    fetchAllData();
+    fetchAllData(false);
   };
 
   const handleUploadFile = async (file: File) => {
     const formData = new FormData();
     formData.append('file', file);
     await api.post(`/attachments/tickets/${id}`, formData);
-    fetchAllData();
+    fetchAllData(false);
   };
 
   const handleDownloadFile = async (attachmentId: string, filename: string) => {
@@ -109,6 +123,8 @@ export default function TicketPage() {
           <TicketDetail 
             ticket={ticket}
             comments={comments}
+            hasMoreComments={commentsHasMore}
+            onLoadMoreComments={fetchNextComments}
             history={history}
             attachments={attachments}
             subtasks={subtasks}
@@ -122,11 +138,11 @@ export default function TicketPage() {
             onDownloadFile={handleDownloadFile}
             onAddRelation={async (targetId, type) => {
               await api.post(`/tickets/${id}/relations`, { target_ticket_id: targetId, relation_type: type });
-              fetchAllData();
+              fetchAllData(false);
             }}
             onToggleWatch={async () => {
               await api.post(`/tickets/${id}/watchers`);
-              fetchAllData();
+              fetchAllData(false);
             }}
             onToggleSubtask={async () => {}}
             onAddSubtask={async () => {}}